@@ -0,0 +1,235 @@
+import argparse
+import importlib.util
+import json
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from selenium import webdriver
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+from crawler_common.browser_metrics import capture_page_metrics
+from crawler_common.deadline import Deadline
+from crawler_common.fingerprint import FingerprintStore
+from crawler_common.timing import StageTimings
+from generate_fixtures import FIXTURE_DIR, load_manifest
+
+# -----------------------
+# 오프라인 추출 벤치마크
+# -----------------------
+#
+# 네트워크/사이트 상태와 상관없이 추출 코드만의 속도를 재려고, 저장된 HTML fixture를
+# 로컬 Chrome(file://)으로 열고 각 스크립트의 실제 추출 함수를 그대로 호출합니다.
+# - 전략 = 스크립트별 추출 구현 (fragrantica main / mainfunc / sub, parfumo main)
+# - 제품 정보: scrape_product_details를 repeat번 호출 → products/s
+# - 리뷰: 매번 중복 지문 저장소를 비우고 추출 → 'review_extraction' 단계 시간 기준 reviews/s
+#   (mainfunc는 scrape_reviews 전체를 돌리되 Deadline(0)으로 첫 배치 후 바로 끝냄)
+# - 메모리: Python 쪽 tracemalloc 최대치, 브라우저 쪽 JS 힙 (capture_page_metrics)
+# - 추출 결과를 manifest 기대값과 비교해서 틀리면 ok=False
+# - --baseline 으로 이전 결과 JSON을 주면 처리량이 threshold 이상 떨어진 항목을 표시하고 종료 코드 1
+#
+# 사용법: python bench/bench_extraction.py [--repeat 3] [--output bench_results.json] [--baseline old.json]
+# (fixture가 없으면 generate_fixtures로 먼저 생성)
+
+STRATEGIES = {
+    'fragrantica.main': ('fragrantica', os.path.join(ROOT_DIR, 'fragrantica', 'main.py')),
+    'fragrantica.mainfunc': ('fragrantica', os.path.join(ROOT_DIR, 'fragrantica', 'mainfunc.py')),
+    'fragrantica.sub': ('fragrantica', os.path.join(ROOT_DIR, 'fragrantica', 'sub.py')),
+    'parfumo.main': ('parfumo', os.path.join(ROOT_DIR, 'perfumo', 'main.py')),
+}
+
+# manifest 기대값 중 제품 정보와 비교할 키 (사이트별)
+PRODUCT_KEYS = {
+    'fragrantica': ('product_name', 'target_gender', 'top_notes', 'middle_notes', 'base_notes'),
+    'parfumo': ('product_name', 'brand_name', 'target_gender', 'release_year',
+                'top_notes', 'heart_notes', 'base_notes'),
+}
+
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.15  # 처리량 15% 이상 감소 → 회귀
+
+
+def load_strategy(name):
+    """스크립트를 전략별 이름으로 import (import만으로는 파일/스레드를 만들지 않음)"""
+    _, path = STRATEGIES[name]
+    spec = importlib.util.spec_from_file_location(f"bench_{name.replace('.', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.console.set_level('WARNING')
+    return module
+
+
+def create_driver(headless=True):
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1280,900')
+    return webdriver.Chrome(options=options)
+
+
+def scrape_product(module, name, driver, url):
+    if name == 'parfumo.main':
+        return module.scrape_product_details(driver)
+    return module.scrape_product_details(driver, url)
+
+
+def extract_reviews(module, name, driver, product_name, url):
+    """전략별 리뷰 추출 한 번 (저장한 리뷰 수 반환)"""
+    if name == 'fragrantica.mainfunc':
+        return module.scrape_reviews(driver, product_name, url, deadline=Deadline(0))
+    with module.stage_timings.time('review_extraction'):
+        if name == 'fragrantica.sub':
+            _, saved = module.extract_new_reviews(
+                driver, product_name, url, module.REVIEW_CONTAINER_CSS_CANDIDATES[0], 0)
+        else:
+            _, saved = module.extract_new_reviews(driver, product_name, url, 0)
+    return saved
+
+
+def check_product(site, expected, product_data):
+    """틀린 필드 이름 리스트 (없으면 빈 리스트)"""
+    return [key for key in PRODUCT_KEYS[site] if str(product_data.get(key, '')).strip() != expected[key]]
+
+
+def bench_case(module, name, driver, site, fixture, expected, repeat):
+    url = pathlib.Path(FIXTURE_DIR, expected['file']).as_uri()
+    started = time.perf_counter()
+    driver.get(url)
+    load_s = time.perf_counter() - started
+
+    tracemalloc.reset_peak()
+    result = {'strategy': name, 'fixture': f"{site}/{fixture}", 'reviews': expected['reviews'],
+              'load_s': round(load_s, 3), 'ok': True, 'problems': []}
+
+    # --- 제품 정보 ---
+    product_name = expected['product_name']
+    if hasattr(module, 'scrape_product_details'):
+        elapsed = 0.0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            product_name, product_data = scrape_product(module, name, driver, url)
+            elapsed += time.perf_counter() - started
+        result['products_per_s'] = round(repeat / elapsed, 2) if elapsed else None
+        wrong = check_product(site, expected, product_data)
+        if wrong:
+            result['problems'].append(f"제품 정보 불일치: {', '.join(wrong)}")
+
+    # --- 리뷰 ---
+    extraction_s = 0.0
+    for _ in range(repeat):
+        module.review_store = FingerprintStore(None)
+        module.stage_timings = StageTimings()
+        saved = extract_reviews(module, name, driver, product_name, url)
+        stages = module.stage_timings.snapshot()['stages']
+        extraction_s += stages.get('review_extraction', {}).get('total', 0.0)
+        if saved != expected['reviews']:
+            result['problems'].append(f"리뷰 {saved}개 추출 (기대 {expected['reviews']}개)")
+
+    result['extraction_s'] = round(extraction_s / repeat, 3)
+    result['reviews_per_s'] = round(expected['reviews'] * repeat / extraction_s, 1) if extraction_s else None
+    result['python_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    result['js_heap_used_mb'] = capture_page_metrics(driver).get('js_heap_used_mb')
+    result['ok'] = not result['problems']
+    return result
+
+
+def compare_baseline(results, baseline_path, threshold):
+    """이전 결과 대비 처리량이 threshold 이상 떨어진 항목 설명 리스트"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['strategy'], r['fixture']): r for r in json.load(f)['results']}
+    regressions = []
+    for r in results:
+        old = baseline.get((r['strategy'], r['fixture']))
+        if old is None:
+            continue
+        for key in ('reviews_per_s', 'products_per_s'):
+            before, after = old.get(key), r.get(key)
+            if before and after is not None and after < before * (1 - threshold):
+                regressions.append(f"{r['strategy']} {r['fixture']} {key}: {before} → {after} "
+                                   f"({(after / before - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def main(strategies=None, fixtures=None, repeat=DEFAULT_REPEAT, output=None, baseline=None,
+         threshold=DEFAULT_THRESHOLD, headless=True):
+    manifest = load_manifest()
+    strategies = strategies or list(STRATEGIES)
+    workdir = tempfile.mkdtemp(prefix='crawler-bench-')
+    old_cwd = os.getcwd()
+    os.chdir(workdir)  # 추출하면서 쓰는 CSV/지문/수집 이력 파일은 임시 폴더로
+
+    tracemalloc.start()
+    driver = create_driver(headless)
+    results = []
+    modules = []
+    try:
+        for name in strategies:
+            site, _ = STRATEGIES[name]
+            module = load_strategy(name)
+            module.init_runtime()
+            modules.append(module)
+            for fixture, expected in manifest['sites'][site].items():
+                if fixtures and fixture not in fixtures:
+                    continue
+                result = bench_case(module, name, driver, site, fixture, expected, repeat)
+                results.append(result)
+                mark = '✅' if result['ok'] else '❌'
+                print(f"{mark} {name:22s} {result['fixture']:30s} "
+                      f"리뷰 {result['reviews_per_s'] or 0:8.1f}/s  "
+                      f"제품 {result.get('products_per_s') or 0:6.2f}/s  "
+                      f"Python 최대 {result['python_peak_mb']:.1f}MB  JS 힙 {result['js_heap_used_mb']}MB")
+                for problem in result['problems']:
+                    print(f"   ⚠️  {problem}")
+    finally:
+        driver.quit()
+        tracemalloc.stop()
+        for module in modules:
+            module.csv_writer.close()
+            module.console.stop()
+        os.chdir(old_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'repeat': repeat,
+        'fixture_seed': manifest.get('seed'),
+        'results': results,
+    }
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {output}")
+
+    failed = [r for r in results if not r['ok']]
+    regressions = compare_baseline(results, baseline, threshold) if baseline else []
+    for line in regressions:
+        print(f"📉 회귀: {line}")
+    if failed:
+        print(f"❌ 추출 결과 불일치 {len(failed)}건")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 HTML fixture로 추출 속도/메모리 측정")
+    parser.add_argument('--strategy', action='append', choices=list(STRATEGIES),
+                        help="측정할 전략 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument('--fixture', action='append',
+                        help="측정할 fixture 이름 (small, medium, large, no_notes, undivided_notes / 기본: 전부)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f"케이스별 반복 횟수 (기본: {DEFAULT_REPEAT})")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"회귀로 볼 처리량 감소 비율 (기본: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--show-browser', action='store_true', help="Chrome 창을 띄워서 실행")
+    args = parser.parse_args()
+    sys.exit(main(args.strategy, args.fixture, args.repeat, args.output, args.baseline,
+                  args.threshold, headless=not args.show_browser))
@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from urllib.parse import quote
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+from crawler_common.deadline import Deadline
+from crawler_common.fingerprint import FingerprintStore
+from crawler_common.timing import StageTimings
+from bench_extraction import create_driver, load_strategy
+from replay_server import start_servers
+
+# -----------------------
+# 스크롤/페이지 로딩 전략 벤치마크
+# -----------------------
+#
+# 리뷰/제품 목록을 끝까지 불러오는 로더 세 가지는 대기 시간과 "변화 없음" 횟수를 감으로 맞춰 둔 상태라,
+# 재생 서버(replay_server)에 로딩 지연을 바꿔 가며 각 로더를 실제 함수 그대로 돌려 보고
+# "얼마나 빨리, 빠짐없이" 불러오는지 비교합니다.
+# - fragrantica.reviews: fragrantica/main.py scrape_reviews (무한 스크롤, REVIEW_SCROLL_* 설정)
+# - fragrantica.designers: main.py / mainfunc.py collect_all_product_urls (디자이너 페이지 무한 스크롤)
+# - parfumo.reviews: perfumo/main.py scrape_reviews ('More reviews' 클릭, MORE_REVIEWS_* 설정)
+# - 변형(variant) = 로더 설정값 묶음, 'current'는 지금 스크립트 값
+# - 완결성 = 로더가 가져온 항목 수 / 서버에 있는 항목 수
+#   시간에 따른 완결성은 서버가 항목을 내준 시각으로 기록 (t50/t90/t100 = 50/90/100%가 로드된 시각)
+# - tail = 전부 로드된 뒤 로더가 끝날 때까지 기다린 시간 (줄일 수 있는 부분)
+# - 지연별로 모든 대상을 100% 불러온 변형 중 가장 빠른 것을 추천
+#
+# 사용법: python bench/bench_loading.py [--latency 0,0.5,2] [--loader fragrantica.reviews] [--output loading.json]
+
+BRAND = 'Bench House'
+DEFAULT_LATENCIES = '0,0.5,2'
+DEFAULT_PRODUCTS = 120  # 브랜드 제품 수 = 디자이너 페이지 카드 수
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_DEADLINE = 600  # 초, 대상 하나당 (fragrantica main.py의 'reviews' 단계 제한과 같음)
+REVIEW_TARGETS = (60, 300, 1000)  # 리뷰 수가 이 값에 가장 가까운 제품을 대상으로
+
+# 로더 → (사이트, bench_extraction 전략 이름)
+LOADERS = {
+    'fragrantica.reviews': ('fragrantica', 'fragrantica.main'),
+    'fragrantica.designers': ('fragrantica', 'fragrantica.main'),
+    'fragrantica.designers.mainfunc': ('fragrantica', 'fragrantica.mainfunc'),
+    'parfumo.reviews': ('parfumo', 'parfumo.main'),
+}
+
+# 로더별 변형: 대문자 키는 모듈 설정값, 소문자 키는 함수 인자
+VARIANTS = {
+    'fragrantica.reviews': {
+        'current': {'REVIEW_SCROLL_WAIT': 3.0, 'REVIEW_SCROLL_IDLE_WAIT': 2.0, 'REVIEW_SCROLL_MAX_NO_CHANGE': 5},
+        'short': {'REVIEW_SCROLL_WAIT': 1.5, 'REVIEW_SCROLL_IDLE_WAIT': 1.0, 'REVIEW_SCROLL_MAX_NO_CHANGE': 3},
+        'eager': {'REVIEW_SCROLL_WAIT': 0.5, 'REVIEW_SCROLL_IDLE_WAIT': 0.5, 'REVIEW_SCROLL_MAX_NO_CHANGE': 2},
+    },
+    'fragrantica.designers': {
+        'current': {'max_same_rounds': 8, 'wait_between_scrolls': 4.0},
+        'short': {'max_same_rounds': 3, 'wait_between_scrolls': 2.0},
+        'eager': {'max_same_rounds': 2, 'wait_between_scrolls': 1.0},
+    },
+    'fragrantica.designers.mainfunc': {
+        'current': {'max_same_rounds': 3, 'wait_between_scrolls': 2.0},
+    },
+    'parfumo.reviews': {
+        'current': {'MORE_REVIEWS_BUTTON_WAIT': 5, 'MORE_REVIEWS_CLICK_DELAY': 0.5, 'MORE_REVIEWS_SETTLE': 1.0},
+        'short': {'MORE_REVIEWS_BUTTON_WAIT': 3, 'MORE_REVIEWS_CLICK_DELAY': 0.2, 'MORE_REVIEWS_SETTLE': 0.5},
+        'eager': {'MORE_REVIEWS_BUTTON_WAIT': 2, 'MORE_REVIEWS_CLICK_DELAY': 0.0, 'MORE_REVIEWS_SETTLE': 0.0},
+    },
+}
+
+
+def review_targets(catalog, page_size):
+    """리뷰 수가 REVIEW_TARGETS에 가장 가까운 제품들 (처음부터 다 보이는 제품은 제외)"""
+    specs = [spec for spec in catalog.brand(BRAND) if spec['reviews'] > page_size]
+    picked = []
+    for target in REVIEW_TARGETS:
+        spec = min(specs, key=lambda s: abs(s['reviews'] - target), default=None)
+        if spec is not None and spec not in picked:
+            picked.append(spec)
+    return picked
+
+
+def apply_variant(module, params):
+    """모듈 설정값을 바꾸고 (함수 인자, 원래 설정값) 반환"""
+    kwargs, saved = {}, {}
+    for key, value in params.items():
+        if key.isupper():
+            saved[key] = getattr(module, key)
+            setattr(module, key, value)
+        else:
+            kwargs[key] = value
+    return kwargs, saved
+
+
+def run_reviews(module, site, driver, base_url, spec, kwargs, deadline):
+    """리뷰 로더 한 번 → 가져온 리뷰 수"""
+    url = base_url + quote(spec['path'])
+    module.review_store = FingerprintStore(None)
+    module.stage_timings = StageTimings()
+    if site == 'parfumo':
+        driver.get(url)
+    return module.scrape_reviews(driver, spec['name'], url, deadline=Deadline(deadline), **kwargs)
+
+
+def run_designers(module, base_url, kwargs):
+    """디자이너 페이지 로더 한 번 (드라이버는 함수가 직접 띄움) → 가져온 제품 URL 수"""
+    urls = module.collect_all_product_urls(f"{base_url}/designers/{quote(BRAND.replace(' ', '-'))}.html", **kwargs)
+    return len([url for url in urls if '/perfume/' in url])
+
+
+def summarize(available, got, started, finished, loads):
+    """로드 기록 → 완결성/도달 시각 요약"""
+    curve = [(round(at - started, 2), round(loaded / available, 3)) for at, loaded in loads]
+    result = {
+        'available': available,
+        'loaded': got,
+        'completeness': round(got / available, 3) if available else None,
+        'total_s': round(finished - started, 2),
+        'curve': curve,
+    }
+    for name, share in (('t50_s', 0.5), ('t90_s', 0.9), ('t100_s', 1.0)):
+        result[name] = next((t for t, done in curve if done >= share), None)
+    result['tail_s'] = round(result['total_s'] - result['t100_s'], 2) if result['t100_s'] is not None else None
+    return result
+
+
+def bench_case(loader, variant, module, site, driver, base_url, stats, catalog, target, latency, deadline):
+    kwargs, saved = apply_variant(module, VARIANTS[loader][variant])
+    try:
+        if target is None:
+            path = f"/designers/{BRAND.replace(' ', '-')}.html"
+            available = len(catalog.brand(BRAND))
+            started = time.monotonic()
+            got = run_designers(module, base_url, kwargs)
+            label = f"designer {available}개"
+        else:
+            path = target['path']
+            available = target['reviews']
+            started = time.monotonic()
+            got = run_reviews(module, site, driver, base_url, target, kwargs, deadline)
+            label = f"리뷰 {available}개"
+        finished = time.monotonic()
+    finally:
+        for key, value in saved.items():
+            setattr(module, key, value)
+
+    result = summarize(available, got, started, finished, stats.loads_since(site, path, started))
+    result.update({'loader': loader, 'variant': variant, 'latency': latency, 'target': label})
+    return result
+
+
+def recommend(results):
+    """(로더, 지연)별로 모든 대상을 100% 불러온 변형 중 총 시간이 가장 짧은 것"""
+    groups = {}
+    for r in results:
+        groups.setdefault((r['loader'], r['latency']), {}).setdefault(r['variant'], []).append(r)
+    picks = []
+    for (loader, latency), variants in groups.items():
+        complete = {
+            variant: sum(r['total_s'] for r in rows)
+            for variant, rows in variants.items() if all(r['completeness'] == 1.0 for r in rows)
+        }
+        best = min(complete, key=complete.get) if complete else None
+        current = sum(r['total_s'] for r in variants.get('current', [])) or None
+        picks.append({'loader': loader, 'latency': latency, 'variant': best,
+                      'total_s': round(complete[best], 2) if best else None,
+                      'current_total_s': round(current, 2) if current else None})
+    return picks
+
+
+def format_seconds(value):
+    return '-' if value is None else f"{value:.1f}"
+
+
+def main(loaders=None, variants=None, latencies=DEFAULT_LATENCIES, products=DEFAULT_PRODUCTS,
+         page_size=DEFAULT_PAGE_SIZE, deadline=DEFAULT_DEADLINE, output=None, headless=True):
+    loaders = loaders or list(LOADERS)
+    latencies = [float(x) for x in str(latencies).split(',')]
+    base_urls, servers, stats = start_servers(
+        ports={'fragrantica': 0, 'parfumo': 0}, products=products, page_size=page_size,
+        designer_page_size=page_size,
+    )
+    config = servers[0].RequestHandlerClass.config
+    catalogs = {server.RequestHandlerClass.site: server.RequestHandlerClass.catalog for server in servers}
+
+    # 스크립트는 import 시점에 BASE_URL / HEADLESS를 읽고, init_runtime() 때 CSV/지문 파일을 현재 폴더에 만듦
+    os.environ['FRAGRANTICA_BASE_URL'] = base_urls['fragrantica']
+    os.environ['PARFUMO_BASE_URL'] = base_urls['parfumo']
+    if headless:
+        os.environ['CRAWLER_HEADLESS'] = '1'
+    workdir = tempfile.mkdtemp(prefix='crawler-loading-')
+    old_cwd = os.getcwd()
+    os.chdir(workdir)
+
+    driver = create_driver(headless)
+    modules = {}
+    results = []
+    try:
+        for latency in latencies:
+            config['load_latency'] = latency
+            print(f"\n⏱  묶음 로딩 지연 {latency:g}초")
+            for loader in loaders:
+                site, strategy = LOADERS[loader]
+                if strategy not in modules:
+                    modules[strategy] = load_strategy(strategy)
+                    modules[strategy].init_runtime()
+                module = modules[strategy]
+                targets = [None] if '.designers' in loader else review_targets(catalogs[site], page_size)
+                for variant in VARIANTS[loader]:
+                    if variants and variant not in variants:
+                        continue
+                    for target in targets:
+                        result = bench_case(loader, variant, module, site, driver, base_urls[site], stats,
+                                            catalogs[site], target, latency, deadline)
+                        results.append(result)
+                        mark = '✅' if result['completeness'] == 1.0 else '⚠️ '
+                        print(f"{mark} {loader:31s} {variant:8s} {result['target']:14s} "
+                              f"완결성 {result['completeness'] * 100:5.1f}%  "
+                              f"t50 {format_seconds(result['t50_s']):>6}  t90 {format_seconds(result['t90_s']):>6}  "
+                              f"t100 {format_seconds(result['t100_s']):>6}  총 {result['total_s']:6.1f}s  "
+                              f"tail {format_seconds(result['tail_s']):>5}s")
+    finally:
+        driver.quit()
+        for module in modules.values():
+            module.csv_writer.close()
+            module.console.stop()
+        for server in servers:
+            server.shutdown()
+        os.chdir(old_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    picks = recommend(results)
+    print("\n🏁 지연별 추천 (모든 대상 100% 로드 중 가장 빠른 변형)")
+    for pick in picks:
+        if pick['variant'] is None:
+            print(f"   ❌ {pick['loader']} (지연 {pick['latency']:g}초): 전부 불러온 변형 없음")
+            continue
+        print(f"   ✅ {pick['loader']} (지연 {pick['latency']:g}초): {pick['variant']} "
+              f"{pick['total_s']:.1f}s (current {format_seconds(pick['current_total_s'])}s) "
+              f"→ {VARIANTS[pick['loader']][pick['variant']]}")
+
+    if output:
+        report = {
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'products': products,
+            'page_size': page_size,
+            'variants': {loader: VARIANTS[loader] for loader in loaders},
+            'results': results,
+            'recommendations': picks,
+        }
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="재생 서버에서 로딩 지연별로 스크롤/페이지 로더의 완결성과 시간 비교")
+    parser.add_argument('--loader', action='append', choices=list(LOADERS),
+                        help="측정할 로더 (여러 번 지정 가능, 기본: 전부)")
+    parser.add_argument('--variant', action='append', help="측정할 변형 이름 (current, short, eager / 기본: 전부)")
+    parser.add_argument('--latency', default=DEFAULT_LATENCIES,
+                        help=f"묶음 로딩 지연(초), 쉼표 구분 (기본: {DEFAULT_LATENCIES})")
+    parser.add_argument('--products', type=int, default=DEFAULT_PRODUCTS,
+                        help=f"브랜드 제품 수 = 디자이너 페이지 카드 수 (기본: {DEFAULT_PRODUCTS})")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"한 번에 불러오는 리뷰/카드 수 (기본: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE,
+                        help=f"리뷰 로더 한 번의 시간 제한(초) (기본: {DEFAULT_DEADLINE})")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--show-browser', action='store_true', help="Chrome 창을 띄워서 실행")
+    args = parser.parse_args()
+    sys.exit(main(args.loader, args.variant, args.latency, args.products, args.page_size, args.deadline,
+                  args.output, headless=not args.show_browser))
@@ -0,0 +1,264 @@
+import argparse
+import html
+import json
+import os
+import random
+
+# -----------------------
+# 벤치마크용 HTML fixture 생성
+# -----------------------
+#
+# 실제 사이트 대신 추출 코드가 쓰는 선택자/XPath 구조를 그대로 갖춘 제품 페이지를 만듭니다.
+# (사이트 HTML을 그대로 저장해 두면 용량/저작권 문제가 있어서, 구조만 본뜬 합성 페이지를 씀)
+# - 사이트별: small(리뷰 20개) / medium(200개) / large(2,000개) + 노트 없음 / 통합 노트(fragrantica)
+# - 같은 seed면 항상 같은 내용 → 실행 간 비교 가능
+# - manifest.json에 fixture별 기대값(제품명, 노트, 리뷰 수)을 남겨 벤치마크에서 추출 결과를 검증
+#
+# 사용법: python bench/generate_fixtures.py [--out bench/fixtures] [--seed 7]
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# (이름, 리뷰 수, 노트 구성)
+FIXTURES = {
+    'fragrantica': [
+        ('small', 20, 'pyramid'),
+        ('medium', 200, 'pyramid'),
+        ('large', 2000, 'pyramid'),
+        ('no_notes', 20, 'none'),
+        ('undivided_notes', 20, 'undivided'),
+    ],
+    'parfumo': [
+        ('small', 20, 'pyramid'),
+        ('medium', 200, 'pyramid'),
+        ('large', 2000, 'pyramid'),
+        ('no_notes', 20, 'none'),
+    ],
+}
+
+NOTES = [
+    'Bergamot', 'Lemon', 'Mandarin Orange', 'Pink Pepper', 'Cardamom', 'Neroli', 'Rose', 'Jasmine',
+    'Iris', 'Violet', 'Lavender', 'Geranium', 'Orange Blossom', 'Sandalwood', 'Cedar', 'Vetiver',
+    'Patchouli', 'Musk', 'Amber', 'Vanilla', 'Tonka Bean', 'Oakmoss', 'Leather', 'Incense',
+]
+WORDS = (
+    'fresh sweet powdery citrus woody warm bright soft dry green smoky creamy floral spicy clean '
+    'lasting projection sillage opening drydown skin summer winter office evening compliment bottle '
+    'note blend accord lovely heavy light subtle strong gentle cozy elegant playful classic modern'
+).split()
+
+
+def _sentence(rng):
+    words = rng.sample(WORDS, rng.randint(6, 14))
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraphs(rng):
+    return [' '.join(_sentence(rng) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 3))]
+
+
+def _notes(rng):
+    picked = rng.sample(NOTES, 9)
+    return {'top': picked[:3], 'middle': picked[3:6], 'base': picked[6:]}
+
+
+def _date(rng):
+    return f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2012, 2025)}"
+
+
+def _page(title, body):
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title></head>\n<body>\n{body}\n</body></html>\n"
+    )
+
+
+# --- fragrantica ---
+#
+# spec: {'seed', 'name', 'brand', 'reviews', 'notes'} (notes: 'pyramid' / 'undivided' / 'none')
+# 리뷰 i번의 내용은 (seed, i)로만 정해져서, 재생 서버가 일부 구간만 따로 만들어도 같은 내용이 나옴
+
+def _fragrantica_note_block(header_html, notes):
+    items = ''.join(
+        f'<div style="margin: 0.2rem;"><div><img src="data:," alt=""></div><div>{html.escape(n)}</div></div>'
+        for n in notes
+    )
+    return f'{header_html}\n<div style="display: flex; justify-content: center; flex-flow: wrap;">{items}</div>\n'
+
+
+def _fragrantica_review(rng, i):
+    member = f"member{rng.randint(1000, 99999)}"
+    paragraphs = ''.join(f'<p>{html.escape(p)}</p>' for p in _paragraphs(rng))
+    return (
+        '<div class="fragrance-review-box" itemprop="review" itemscope itemtype="https://schema.org/Review">'
+        f'<div itemprop="author" itemscope itemtype="https://schema.org/Person"><meta itemprop="name" content="{member}"></div>'
+        f'<p><b><a href="https://www.fragrantica.com/member/{i}">{member}</a></b></p>'
+        f'<span itemprop="datePublished">{_date(rng)}</span>'
+        f'<div itemprop="reviewBody">{paragraphs}</div>'
+        '</div>'
+    )
+
+
+def fragrantica_reviews(spec, start, count):
+    """리뷰 start번부터 count개 HTML (spec의 리뷰 수를 넘지 않음)"""
+    end = min(start + count, spec['reviews'])
+    return '\n'.join(_fragrantica_review(random.Random(f"{spec['seed']}:review:{i}"), i) for i in range(start, end))
+
+
+def fragrantica_page(spec, loaded=None, extra_html=''):
+    """
+    제품 페이지 HTML과 기대값.
+    loaded: 처음부터 들어 있는 리뷰 수 (기본: 전부), extra_html: 리뷰 목록 뒤에 붙일 HTML (재생 서버의 스크롤 로딩 등)
+    """
+    rng = random.Random(f"{spec['seed']}:product")
+    product, brand = spec['name'], spec['brand']
+    notes = _notes(rng)
+    if spec['notes'] == 'pyramid':
+        notes_html = ''.join(
+            _fragrantica_note_block(f'<h4><b>{label} Notes</b></h4>', notes[key])
+            for label, key in (('Top', 'top'), ('Middle', 'middle'), ('Base', 'base'))
+        )
+        expected = {k: ', '.join(v) for k, v in notes.items()}
+    elif spec['notes'] == 'undivided':
+        flat = notes['top'] + notes['middle'] + notes['base']
+        notes_html = _fragrantica_note_block('<span>Fragrance Notes</span>', flat)
+        expected = {'top': '', 'middle': ', '.join(flat), 'base': ''}
+    else:
+        notes_html = '<p>No notes yet.</p>'
+        expected = {'top': '', 'middle': '', 'base': ''}
+
+    reviews = fragrantica_reviews(spec, 0, spec['reviews'] if loaded is None else loaded)
+    body = (
+        f'<div id="main-content">\n'
+        f'<h1 itemprop="name">{html.escape(product)}<small>for women and men</small>'
+        f'<span itemprop="brand" itemscope><a href="/designers/{html.escape(brand)}.html">'
+        f'<span itemprop="name">{html.escape(brand)}</span></a></span></h1>\n'
+        f'<img itemprop="image" src="data:," alt="{html.escape(product)}">\n'
+        f'<div id="pyramid">\n{notes_html}</div>\n'
+        f'<div id="all-reviews">\n{reviews}\n</div>\n{extra_html}'
+        f'</div>'
+    )
+    expectation = {
+        'product_name': product,
+        'brand_name': brand,
+        'target_gender': 'for women and men',
+        'top_notes': expected['top'],
+        'middle_notes': expected['middle'],
+        'base_notes': expected['base'],
+        'reviews': spec['reviews'],
+    }
+    return _page(product, body), expectation
+
+
+# --- parfumo ---
+
+def _parfumo_review(rng, i):
+    gender = rng.choice(['fa-mars', 'fa-venus'])
+    paragraphs = ' '.join(_paragraphs(rng))
+    return (
+        f'<article class="review" id="review_{i}">'
+        f'<a class="review_user_photo" href="/Users/u{i}"><i class="fa {gender}"></i>'
+        f'<span class="text-xs">{rng.randint(1, 400)} Reviews</span></a>'
+        f'<span itemprop="author" itemscope><span itemprop="name">user{rng.randint(1000, 99999)}</span></span>'
+        f'<div itemprop="datePublished">{_date(rng)}</div>'
+        f'<div class="text-lg bold"><span itemprop="name">{html.escape(_sentence(rng)[:40])}</span></div>'
+        f'<div class="leading-7">{html.escape(paragraphs)}</div>'
+        f'<span class="useful_desc_1">{rng.choice(["Helpful", "Very helpful", "Most helpful"])}</span>'
+        f'<span id="nr_awards_{i}">{rng.randint(0, 30)}</span>'
+        '</article>'
+    )
+
+
+def parfumo_reviews(spec, start, count):
+    """리뷰 start번부터 count개 HTML (spec의 리뷰 수를 넘지 않음)"""
+    end = min(start + count, spec['reviews'])
+    return '\n'.join(_parfumo_review(random.Random(f"{spec['seed']}:review:{i}"), i) for i in range(start, end))
+
+
+def parfumo_page(spec, loaded=None, extra_html=''):
+    """제품 페이지 HTML과 기대값 (인자는 fragrantica_page와 같음, 통합 노트 구성은 없음)"""
+    rng = random.Random(f"{spec['seed']}:product")
+    product, brand = spec['name'], spec['brand']
+    notes = _notes(rng)
+    if spec['notes'] == 'pyramid':
+        notes_html = ''.join(
+            f'<span data-nt="{code}">' + ''.join(f'<span class="nowrap">{html.escape(n)}</span>' for n in notes[key])
+            + '</span>'
+            for code, key in (('t', 'top'), ('m', 'middle'), ('b', 'base'))
+        )
+        expected = {k: ', '.join(v) for k, v in notes.items()}
+    else:
+        notes_html = ''
+        expected = {'top': '', 'middle': '', 'base': ''}
+
+    reviews = parfumo_reviews(spec, 0, spec['reviews'] if loaded is None else loaded)
+    body = (
+        f'<h1 class="p_name_h1" itemprop="name">{html.escape(product)} '
+        f'<span itemprop="brand" itemscope><span itemprop="name">{html.escape(brand)}</span></span> '
+        f'<span class="label_a">2019</span></h1>\n'
+        f'<div class="p_gender_big"><i class="fa fa-venus"></i></div>\n'
+        f'<div class="pyramid_block">{notes_html}</div>\n'
+        f'<div id="reviews_holder">\n{reviews}\n</div>\n{extra_html}'
+    )
+    expectation = {
+        'product_name': product,
+        'brand_name': brand,
+        'target_gender': 'F',
+        'release_year': '2019',
+        'top_notes': expected['top'],
+        'heart_notes': expected['middle'],
+        'base_notes': expected['base'],
+        'reviews': spec['reviews'],
+    }
+    return _page(product, body), expectation
+
+
+BUILDERS = {'fragrantica': fragrantica_page, 'parfumo': parfumo_page}
+REVIEW_BUILDERS = {'fragrantica': fragrantica_reviews, 'parfumo': parfumo_reviews}
+
+
+def generate(out_dir=FIXTURE_DIR, seed=7):
+    """fixture 파일과 manifest.json 생성, manifest dict 반환"""
+    manifest = {'seed': seed, 'sites': {}}
+    for site, fixtures in FIXTURES.items():
+        site_dir = os.path.join(out_dir, site)
+        os.makedirs(site_dir, exist_ok=True)
+        manifest['sites'][site] = {}
+        for name, review_count, note_layout in fixtures:
+            spec = {
+                'seed': f"{seed}:{site}:{name}",
+                'name': f"Bench {name.replace('_', ' ').title()}",
+                'brand': 'Bench',
+                'reviews': review_count,
+                'notes': note_layout,
+            }
+            page, expectation = BUILDERS[site](spec)
+            filename = f"{name}.html"
+            with open(os.path.join(site_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(page)
+            expectation['file'] = f"{site}/{filename}"
+            manifest['sites'][site][name] = expectation
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_manifest(out_dir=FIXTURE_DIR):
+    """manifest.json (없으면 생성)"""
+    path = os.path.join(out_dir, 'manifest.json')
+    if not os.path.exists(path):
+        return generate(out_dir)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 HTML fixture 생성")
+    parser.add_argument('--out', default=FIXTURE_DIR, help=f"출력 폴더 (기본: {FIXTURE_DIR})")
+    parser.add_argument('--seed', type=int, default=7, help="내용 생성 seed (기본: 7)")
+    args = parser.parse_args()
+    result = generate(args.out, args.seed)
+    for site, fixtures in result['sites'].items():
+        for name, expectation in fixtures.items():
+            size = os.path.getsize(os.path.join(args.out, expectation['file']))
+            print(f"📄 {expectation['file']}: 리뷰 {expectation['reviews']}개, {size / 1024:.0f}KB")
+    print(f"✅ manifest: {os.path.join(args.out, 'manifest.json')}")
@@ -0,0 +1,552 @@
+import argparse
+import collections
+import html
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_fixtures import BUILDERS, REVIEW_BUILDERS, _page
+
+# -----------------------
+# 로컬 재생 서버 (fragrantica / parfumo 흉내)
+# -----------------------
+#
+# 실제 사이트에 부하 테스트를 하면 바로 막히니까, 두 사이트와 같은 구조의 페이지를 로컬에서 내주고
+# 크롤러 전체 흐름(드라이버 풀, 대기, 재시도, rate limit 감지)을 오프라인으로 돌려 봅니다.
+# - 사이트마다 포트 하나 (경로 구조가 실제 사이트와 같아야 URL 필터가 그대로 동작)
+#   fragrantica: /designers/<브랜드>.html, /perfume/<브랜드>/<이름>-<id>.html
+#                리뷰는 page_size개만 먼저 주고, 목록 끝이 화면에 가까워지면 다음 묶음을 불러옴 (무한 스크롤)
+#                designer_page_size > 0 이면 디자이너 페이지의 제품 카드도 같은 방식으로 나눠서 불러옴
+#                robots.txt → /sitemap.xml (인덱스) → sitemap_designers 브랜드별 제품 사이트맵 + 제품 아닌 사이트맵 하나
+#   parfumo:     /, /s_perfumes_x.php?filter=<검색어>, /Perfumes/<브랜드>, /Perfumes/<브랜드>/<이름>
+#                쿠키 동의 iframe(첫 방문), 목록 페이지네이션, 'More reviews' 버튼
+#                pager_window > 0 이면 페이지 번호는 현재 페이지 앞뒤 pager_window개만 보여 줌 (Next 링크는 항상)
+# - 제품/리뷰 내용은 (seed, 사이트, 브랜드)로 정해져서 어떤 브랜드를 요청해도 항상 같은 카탈로그가 나옴
+# - 지연(latency + jitter)은 모든 응답에, 장애 주입(429 / 'Attention Required' 차단 페이지 /
+#   초당 요청 제한)은 페이지 요청에만 적용 (리뷰 묶음 요청은 지연만)
+# - load_latency: 스크롤/'More reviews'로 불러오는 묶음 요청에만 더하는 지연 (로딩 전략 비교용)
+# - /_replay/stats: 지금까지의 요청/장애 수 (JSON), ReplayStats.loads_since: 페이지별 로드된 항목 수 기록
+#
+# 사용법: python bench/replay_server.py [--products 40] [--latency 0.2] [--rate-limit-rate 0.02]
+# 크롤러 쪽: FRAGRANTICA_BASE_URL=http://127.0.0.1:8801 PARFUMO_BASE_URL=http://127.0.0.1:8802 CRAWLER_HEADLESS=1
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORTS = {'fragrantica': 8801, 'parfumo': 8802}
+DEFAULT_PRODUCTS = 40
+DEFAULT_PAGE_SIZE = 20
+LISTING_PAGE_SIZE = 20  # parfumo 목록 한 페이지의 제품 수
+MAX_REVIEWS = 2000
+
+CONSENT_COOKIE = 'replay_consent'
+
+RATE_LIMITED_PAGE = _page(
+    '429 Too Many Requests',
+    '<h1>Error 429</h1><p>Too Many Requests. You are being rate limited.</p>',
+)
+CHALLENGE_PAGE = _page(
+    'Attention Required! | Cloudflare',
+    '<h1>Sorry, you have been blocked</h1><p>Attention Required! Please complete the security check.</p>',
+)
+
+# 목록 끝(sentinel)이 화면 아래 600px 안으로 들어오면 다음 리뷰 묶음을 붙임
+FRAGRANTICA_SCROLL_JS = """
+<div id="replay-sentinel" style="height: 1px;"></div>
+<script>
+(function () {
+    var holder = document.getElementById('all-reviews');
+    var sentinel = document.getElementById('replay-sentinel');
+    var total = %(total)d, busy = false;
+    function loaded() { return holder.querySelectorAll('div.fragrance-review-box').length; }
+    function near() { return sentinel.getBoundingClientRect().top < window.innerHeight + 600; }
+    function load() {
+        if (busy || loaded() >= total || !near()) return;
+        busy = true;
+        fetch('/_replay/reviews' + location.pathname + '?offset=' + loaded())
+            .then(function (r) { return r.text(); })
+            .then(function (chunk) {
+                holder.insertAdjacentHTML('beforeend', chunk);
+                busy = false;
+                setTimeout(load, 0);
+            })
+            .catch(function () { busy = false; });
+    }
+    window.addEventListener('scroll', load, {passive: true});
+    load();
+})();
+</script>
+"""
+
+# 디자이너 페이지 제품 카드 (FRAGRANTICA_SCROLL_JS와 같은 방식, 묶음은 /_replay/designer/<디자이너>)
+FRAGRANTICA_DESIGNER_SCROLL_JS = """
+<div id="replay-sentinel" style="height: 1px;"></div>
+<script>
+(function () {
+    var holder = document.getElementById('replay-designer');
+    var sentinel = document.getElementById('replay-sentinel');
+    var total = %(total)d, busy = false;
+    function loaded() { return holder.querySelectorAll('a.prefumeHbox').length; }
+    function near() { return sentinel.getBoundingClientRect().top < window.innerHeight + 600; }
+    function load() {
+        if (busy || loaded() >= total || !near()) return;
+        busy = true;
+        fetch('/_replay/designer/%(designer)s?offset=' + loaded())
+            .then(function (r) { return r.text(); })
+            .then(function (chunk) {
+                holder.insertAdjacentHTML('beforeend', chunk);
+                busy = false;
+                setTimeout(load, 0);
+            })
+            .catch(function () { busy = false; });
+    }
+    window.addEventListener('scroll', load, {passive: true});
+    load();
+})();
+</script>
+"""
+
+PARFUMO_MORE_JS = """
+<span class="action_more_reviews" style="display: inline-block; padding: 8px; cursor: pointer;">More reviews</span>
+<script>
+(function () {
+    var holder = document.getElementById('reviews_holder');
+    var button = document.querySelector('span.action_more_reviews');
+    var total = %(total)d, busy = false;
+    function loaded() { return holder.querySelectorAll('article.review').length; }
+    if (loaded() >= total) { button.remove(); return; }
+    button.addEventListener('click', function () {
+        if (busy) return;
+        busy = true;
+        fetch('/_replay/reviews' + location.pathname + '?offset=' + loaded())
+            .then(function (r) { return r.text(); })
+            .then(function (chunk) {
+                holder.insertAdjacentHTML('beforeend', chunk);
+                busy = false;
+                if (loaded() >= total) button.remove();
+            })
+            .catch(function () { busy = false; });
+    });
+})();
+</script>
+"""
+
+# 첫 방문 쿠키 동의 팝업 (iframe 안 'Settings or reject' → 'Save & Exit' 순서로 눌러야 닫힘)
+CONSENT_IFRAME = """
+<iframe id="sp_message_iframe_902160" src="/_replay/consent"
+        style="position: fixed; left: 10%; top: 10%; width: 80%; height: 300px; z-index: 1000; background: #fff;"></iframe>
+<script>
+window.addEventListener('message', function (e) {
+    if (e.data !== 'replay-consent') return;
+    document.cookie = '""" + CONSENT_COOKIE + """=1; path=/';
+    var frame = document.getElementById('sp_message_iframe_902160');
+    if (frame) frame.remove();
+});
+</script>
+"""
+
+CONSENT_PAGE = _page('Privacy', """
+<p>We value your privacy.</p>
+<button title="Accept" onclick="parent.postMessage('replay-consent', '*')">Accept all</button>
+<button title="Settings or reject" onclick="document.getElementById('save').style.display = 'inline-block'">Settings</button>
+<button id="save" class="sp_choice_type_SAVE_AND_EXIT" style="display: none;"
+        onclick="parent.postMessage('replay-consent', '*')">Save &amp; Exit</button>
+""")
+
+
+def _brand_key(text):
+    """'Acqua di Parma' / 'Acqua_Di_Parma' / 'acqua-di-parma' -> 'acquadiparma'"""
+    return re.sub(r'[^a-z0-9]', '', unquote(text or '').lower())
+
+
+def _brand_display(text):
+    return re.sub(r'[_\-+]+', ' ', unquote(text or '')).strip().title()
+
+
+class Catalog:
+    """
+    사이트 하나의 브랜드별 제품 목록 (처음 요청될 때 만들고 캐시).
+    리뷰 수는 로그정규 분포 (대부분 수십 개, 가끔 수백~max_reviews개), 노트 구성도 가끔 없음/통합.
+    """
+
+    def __init__(self, site, products=DEFAULT_PRODUCTS, seed=7, max_reviews=MAX_REVIEWS):
+        self.site = site
+        self.products = products
+        self.seed = seed
+        self.max_reviews = max_reviews
+        self._lock = threading.Lock()
+        self._brands = {}
+
+    def brand(self, name):
+        """브랜드 이름(어떤 표기든) → 제품 spec 리스트"""
+        key = _brand_key(name)
+        with self._lock:
+            if key not in self._brands:
+                self._brands[key] = self._build(key, _brand_display(name))
+            return self._brands[key]
+
+    def _build(self, key, display):
+        specs = []
+        for i in range(1, self.products + 1):
+            rng = random.Random(f"{self.seed}:{self.site}:{key}:{i}")
+            layouts = ['pyramid'] * 17 + ['none'] * 2 + (['undivided'] if self.site == 'fragrantica' else ['pyramid'])
+            name = f"{display} No {i}"
+            if self.site == 'fragrantica':
+                slug = display.replace(' ', '-')
+                path = f"/perfume/{slug}/{slug}-No-{i}-{1000 + i}.html"
+            else:
+                path = f"/Perfumes/{display.replace(' ', '_')}/No_{i}"
+            specs.append({
+                'seed': f"{self.seed}:{self.site}:{key}:{i}",
+                'name': name,
+                'brand': display,
+                'reviews': min(self.max_reviews, int(rng.lognormvariate(3.2, 1.2))),
+                'notes': rng.choice(layouts),
+                'path': path,
+            })
+        return specs
+
+    def product(self, path):
+        """제품 경로 → spec (브랜드 부분으로 카탈로그를 찾음), 없으면 None"""
+        parts = [p for p in path.split('/') if p]
+        if len(parts) != 3:
+            return None
+        for spec in self.brand(parts[1]):
+            if spec['path'] == path:
+                return spec
+        return None
+
+
+class ReplayStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = collections.Counter()
+        self._recent = collections.defaultdict(collections.deque)
+        self._loads = collections.deque(maxlen=100000)
+
+    def record(self, site, kind):
+        with self._lock:
+            self.counts[f"{site}.{kind}"] += 1
+
+    def over_rate(self, site, max_rps):
+        """최근 1초 페이지 요청 수가 max_rps를 넘으면 True (넘은 요청은 세지 않음)"""
+        now = time.monotonic()
+        with self._lock:
+            recent = self._recent[site]
+            while recent and now - recent[0] > 1.0:
+                recent.popleft()
+            if len(recent) >= max_rps:
+                return True
+            recent.append(now)
+            return False
+
+    def record_load(self, site, path, loaded):
+        """페이지(path)에 지금까지 내준 항목(리뷰/제품 카드) 수 기록"""
+        with self._lock:
+            self._loads.append((time.monotonic(), site, path, loaded))
+
+    def loads_since(self, site, path, since):
+        """since(time.monotonic 기준) 이후 path의 로드 기록 [(시각, 항목 수), ...]"""
+        with self._lock:
+            return [(at, loaded) for at, s, p, loaded in self._loads if s == site and p == path and at >= since]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(sorted(self.counts.items()))
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """사이트별 서버가 서브클래스로 site / catalog / config를 채워서 씀"""
+
+    site = None
+    catalog = None
+    config = None
+    stats = None
+    protocol_version = 'HTTP/1.1'
+
+    # --- 공통 ---
+
+    def log_message(self, format, *args):
+        if self.config.get('verbose'):
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _delay(self, extra=0.0):
+        latency = self.config['latency'] + extra + random.uniform(0, self.config['jitter'])
+        if latency > 0:
+            time.sleep(latency)
+
+    def _fault(self):
+        """장애 주입: 응답을 보냈으면 True"""
+        config = self.config
+        if config['max_rps'] and self.stats.over_rate(self.site, config['max_rps']):
+            self.stats.record(self.site, 'throttled')
+            self._send(429, RATE_LIMITED_PAGE, headers={'Retry-After': '1'})
+            return True
+        roll = random.random()
+        if roll < config['rate_limit_rate']:
+            self.stats.record(self.site, 'rate_limited')
+            self._send(429, RATE_LIMITED_PAGE, headers={'Retry-After': '30'})
+            return True
+        if roll < config['rate_limit_rate'] + config['challenge_rate']:
+            self.stats.record(self.site, 'challenged')
+            self._send(403, CHALLENGE_PAGE)
+            return True
+        return False
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path, query = unquote(parts.path), parse_qs(parts.query)
+        self._delay(self.config['load_latency'] if path.startswith(LOAD_PREFIXES) else 0.0)
+        if path == '/_replay/stats':
+            self._send(200, json.dumps(self.stats.snapshot(), indent=2), 'application/json')
+            return
+        if path.startswith('/_replay/reviews/'):
+            self._reviews(path[len('/_replay/reviews'):], query)
+            return
+        if not path.startswith('/_replay/') and self._fault():
+            return
+        page = self.route(path, query)
+        if page is None:
+            self.stats.record(self.site, 'not_found')
+            self._send(404, _page('Not Found', '<h1>404 Not Found</h1>'))
+            return
+        self.stats.record(self.site, 'pages')
+        self._send(200, page)
+
+    def _reviews(self, product_path, query):
+        spec = self.catalog.product(product_path)
+        if spec is None:
+            self._send(404, '')
+            return
+        offset = int(query.get('offset', ['0'])[0])
+        self.stats.record(self.site, 'review_chunks')
+        self.stats.record_load(self.site, product_path, min(spec['reviews'], offset + self.config['page_size']))
+        self._send(200, REVIEW_BUILDERS[self.site](spec, offset, self.config['page_size']))
+
+
+    def _product_page(self, path, script):
+        spec = self.catalog.product(path)
+        if spec is None:
+            return None
+        page_size = self.config['page_size']
+        page, _ = BUILDERS[self.site](spec, loaded=page_size, extra_html=script % {'total': spec['reviews']})
+        self.stats.record_load(self.site, path, min(spec['reviews'], page_size))
+        return page
+
+    def route(self, path, query):
+        raise NotImplementedError
+
+
+class FragranticaHandler(ReplayHandler):
+    site = 'fragrantica'
+
+    def route(self, path, query):
+        if path == '/robots.txt':
+            return f'User-agent: *\nDisallow:\nSitemap: {self._base_url()}/sitemap.xml\n'
+        if path == '/sitemap.xml':
+            children = [f'/sitemap_perfumes_{n}.xml' for n in range(1, len(self.config['sitemap_designers']) + 1)]
+            return self._sitemap('sitemapindex', 'sitemap', children + ['/sitemap_news.xml'])
+        if path == '/sitemap_news.xml':
+            return self._sitemap('urlset', 'url', ['/news/1.html', '/designers/index.html'])
+        match = re.fullmatch(r'/sitemap_perfumes_(\d+)\.xml', path)
+        if match and 1 <= int(match.group(1)) <= len(self.config['sitemap_designers']):
+            designer = self.config['sitemap_designers'][int(match.group(1)) - 1]
+            return self._sitemap('urlset', 'url', [quote(spec['path']) for spec in self.catalog.brand(designer)])
+        match = re.fullmatch(r'/designers/([^/]+)\.html', path)
+        if match:
+            return self._designer_page(path, match.group(1))
+        if path.startswith('/_replay/designer/'):
+            return self._designer_chunk(path[len('/_replay/designer/'):], query)
+        if path.startswith('/perfume/'):
+            return self._product_page(path, FRAGRANTICA_SCROLL_JS)
+        return None
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host')}"
+
+    def _sitemap(self, root, entry, paths):
+        """사이트맵(인덱스) XML - 실제 사이트처럼 절대 URL"""
+        base = self._base_url()
+        entries = '\n'.join(f'<{entry}><loc>{html.escape(base + path)}</loc></{entry}>' for path in paths)
+        return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{entries}\n</{root}>\n')
+
+    @staticmethod
+    def _cards(specs):
+        return '\n'.join(
+            f'<div class="cell"><a class="prefumeHbox" href="{quote(spec["path"])}">{html.escape(spec["name"])}</a></div>'
+            for spec in specs
+        )
+
+    def _designer_page(self, path, designer):
+        specs = self.catalog.brand(designer)
+        page_size = self.config['designer_page_size'] or len(specs)
+        script = ''
+        if page_size < len(specs):
+            script = FRAGRANTICA_DESIGNER_SCROLL_JS % {'total': len(specs), 'designer': quote(designer)}
+        self.stats.record_load(self.site, path, min(len(specs), page_size))
+        return _page(
+            f"{_brand_display(designer)} perfumes",
+            f'<h1>{html.escape(_brand_display(designer))}</h1>\n'
+            f'<div id="replay-designer">{self._cards(specs[:page_size])}</div>\n{script}',
+        )
+
+    def _designer_chunk(self, designer, query):
+        specs = self.catalog.brand(designer)
+        offset = int(query.get('offset', ['0'])[0])
+        end = min(len(specs), offset + self.config['designer_page_size'])
+        self.stats.record(self.site, 'designer_chunks')
+        self.stats.record_load(self.site, f"/designers/{designer}.html", end)
+        return self._cards(specs[offset:end])
+
+
+class ParfumoHandler(ReplayHandler):
+    site = 'parfumo'
+
+    def _with_consent(self, body):
+        if f'{CONSENT_COOKIE}=1' in (self.headers.get('Cookie') or ''):
+            return body
+        return body + CONSENT_IFRAME
+
+    def route(self, path, query):
+        if path == '/_replay/consent':
+            return CONSENT_PAGE
+        if path == '/':
+            return _page('Parfumo', self._with_consent(
+                '<form action="/s_perfumes_x.php" method="get">'
+                '<input id="s_top" name="filter" type="search" placeholder="Search Perfume">'
+                '<button class="btn-s-ext" type="submit">Search</button></form>'
+            ))
+        page_num = int(query.get('current_page', ['1'])[0])
+        if path == '/s_perfumes_x.php':
+            keyword = query.get('filter', [''])[0]
+            return self._listing(path, {'filter': keyword}, keyword, page_num, decoys=True)
+        parts = [p for p in path.split('/') if p]
+        if len(parts) == 2 and parts[0] == 'Perfumes':
+            return self._listing(path, {}, parts[1], page_num, decoys=False)
+        if len(parts) == 3 and parts[0] == 'Perfumes':
+            return self._product_page(path, PARFUMO_MORE_JS)
+        return None
+
+    def _listing(self, path, params, brand, page_num, decoys):
+        specs = self.catalog.brand(brand)
+        page_count = max(1, -(-len(specs) // LISTING_PAGE_SIZE))
+        chunk = specs[(page_num - 1) * LISTING_PAGE_SIZE:page_num * LISTING_PAGE_SIZE]
+        if decoys:
+            # 검색 결과에는 다른 브랜드 제품도 섞여 나옴 (BRAND_FILTER 확인용)
+            chunk = chunk + self.catalog.brand('Other House')[page_num - 1:page_num]
+        cards = '\n'.join(
+            f'<div class="col"><div class="name"><a href="{quote(spec["path"])}">{html.escape(spec["name"])}</a></div>'
+            f'<div class="brand"><a>{html.escape(spec["brand"])}</a></div></div>'
+            for spec in chunk
+        )
+
+        def page_link(n, text=None, rel=''):
+            query = '&'.join(f"{k}={quote(v)}" for k, v in list(params.items()) + [('current_page', str(n))])
+            return f'<a class="paging_links"{rel} href="{path}?{query}">{text or n}</a>'
+
+        window = self.config['pager_window']
+        shown = range(max(1, page_num - window), min(page_count, page_num + window) + 1) if window else range(1, page_count + 1)
+        links = [page_link(n) for n in shown]
+        if page_num < page_count:
+            links.insert(0, page_link(page_num + 1, 'Next', ' rel="next"'))
+        return _page(f"{brand} - Parfumo", self._with_consent(f'{cards}\n<div class="paging">{" ".join(links)}</div>'))
+
+
+HANDLERS = {'fragrantica': FragranticaHandler, 'parfumo': ParfumoHandler}
+LOAD_PREFIXES = ('/_replay/reviews/', '/_replay/designer/')
+
+
+def start_servers(host=DEFAULT_HOST, ports=None, products=DEFAULT_PRODUCTS, seed=7, page_size=DEFAULT_PAGE_SIZE,
+                  latency=0.0, jitter=0.0, rate_limit_rate=0.0, challenge_rate=0.0, max_rps=0,
+                  max_reviews=MAX_REVIEWS, verbose=False, load_latency=0.0, designer_page_size=0,
+                  sitemap_designers=(), pager_window=0):
+    """
+    사이트별 서버를 백그라운드 스레드로 시작.
+    반환: ({사이트: 기본 URL}, [서버...], ReplayStats) — 끝낼 때 서버마다 shutdown()
+    설정은 두 서버가 dict 하나를 같이 씀 (server.RequestHandlerClass.config, 실행 중에 바꿔도 다음 요청부터 반영)
+    """
+    ports = dict(DEFAULT_PORTS, **(ports or {}))
+    config = {
+        'page_size': page_size, 'latency': latency, 'jitter': jitter,
+        'rate_limit_rate': rate_limit_rate, 'challenge_rate': challenge_rate,
+        'max_rps': max_rps, 'verbose': verbose,
+        'load_latency': load_latency, 'designer_page_size': designer_page_size,
+        'sitemap_designers': list(sitemap_designers), 'pager_window': pager_window,
+    }
+    stats = ReplayStats()
+    base_urls = {}
+    servers = []
+    for site, handler in HANDLERS.items():
+        handler_class = type(handler.__name__, (handler,), {
+            'catalog': Catalog(site, products, seed, max_reviews),
+            'config': config,
+            'stats': stats,
+        })
+        server = ThreadingHTTPServer((host, ports[site]), handler_class)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f'replay-{site}', daemon=True).start()
+        base_urls[site] = f"http://{host}:{server.server_address[1]}"
+        servers.append(server)
+    return base_urls, servers, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="fragrantica / parfumo 구조의 페이지를 로컬에서 내주는 재생 서버")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--fragrantica-port', type=int, default=DEFAULT_PORTS['fragrantica'])
+    parser.add_argument('--parfumo-port', type=int, default=DEFAULT_PORTS['parfumo'])
+    parser.add_argument('--products', type=int, default=DEFAULT_PRODUCTS, help=f"브랜드당 제품 수 (기본: {DEFAULT_PRODUCTS})")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"처음/추가로 내주는 리뷰 묶음 크기 (기본: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument('--max-reviews', type=int, default=MAX_REVIEWS, help="제품당 최대 리뷰 수")
+    parser.add_argument('--latency', type=float, default=0.0, help="응답마다 기본 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연에 더할 무작위 값 최대치 (초)")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="페이지 요청 중 429로 응답할 비율")
+    parser.add_argument('--challenge-rate', type=float, default=0.0, help="페이지 요청 중 'Attention Required' 차단 페이지 비율")
+    parser.add_argument('--max-rps', type=float, default=0, help="사이트별 초당 페이지 요청 한도 (넘으면 429, 0이면 없음)")
+    parser.add_argument('--load-latency', type=float, default=0.0, help="스크롤/버튼으로 불러오는 묶음 요청에 더할 지연 (초)")
+    parser.add_argument('--designer-page-size', type=int, default=0,
+                        help="디자이너 페이지에 처음/추가로 내주는 제품 카드 수 (0이면 한 번에 전부)")
+    parser.add_argument('--sitemap-designer', action='append', default=[],
+                        help="fragrantica 사이트맵에 넣을 디자이너 (여러 번 지정 가능)")
+    parser.add_argument('--pager-window', type=int, default=0,
+                        help="parfumo 목록에 현재 페이지 앞뒤로 보여 줄 페이지 번호 수 (0이면 전부)")
+    parser.add_argument('--verbose', action='store_true', help="요청마다 접근 로그 출력")
+    args = parser.parse_args()
+
+    urls, running, replay_stats = start_servers(
+        args.host, {'fragrantica': args.fragrantica_port, 'parfumo': args.parfumo_port},
+        args.products, args.seed, args.page_size, args.latency, args.jitter,
+        args.rate_limit_rate, args.challenge_rate, args.max_rps, args.max_reviews, args.verbose,
+        args.load_latency, args.designer_page_size, args.sitemap_designer, args.pager_window,
+    )
+    for site_name, url in urls.items():
+        print(f"🌐 {site_name}: {url}")
+    print(f"   크롤러 실행 예: FRAGRANTICA_BASE_URL={urls['fragrantica']} PARFUMO_BASE_URL={urls['parfumo']} "
+          f"CRAWLER_HEADLESS=1 python fragrantica/main.py")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in running:
+            server.shutdown()
+        print("📊 요청 통계: " + json.dumps(replay_stats.snapshot(), ensure_ascii=False))
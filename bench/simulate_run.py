@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+from bench_extraction import load_strategy
+from crawler_common.simulation import CrawlPolicy, SiteModel, simulate
+
+# -----------------------
+# 워커 수 / 대기 정책 시뮬레이션
+# -----------------------
+#
+# 실제 크롤링 없이 가상 시계로 "워커 N개 × 딜레이 범위" 조합별 예상 소요 시간과 차단/실패 수를 비교합니다.
+# fragrantica main.py의 제품 작업 코드를 그대로 돌리고 브라우저/시간만 바꿔 끼움 (crawler_common.simulation)
+# - --set NAME=VALUE: 스크립트 설정 상수를 바꿔서 비교 (예: --set BREAKER_COOLDOWN=60, 값은 JSON)
+# - 조합마다 seed를 바꿔 --runs번 돌린 중앙값을 표로 출력
+# - --timings stage_timings.json: 실제 실행의 단계 시간으로 접속/추출 시간 분포를 맞춤
+# - --compare run_metadata.json: 실제 실행(제품 수/워커 수/소요 시간)과 같은 조건의 예측을 나란히 출력
+#
+# 사용법: python bench/simulate_run.py --products 600 --workers 1,3,6 --delay 3-7 --delay 1-3
+
+DEFAULT_PRODUCTS = 600
+DEFAULT_WORKERS = '1,2,3,4,6'
+DEFAULT_RUNS = 3
+
+
+def parse_delay(text):
+    low, _, high = text.partition('-')
+    return (float(low), float(high or low))
+
+
+def parse_setting(text):
+    name, _, value = text.partition('=')
+    try:
+        return name.strip(), json.loads(value)
+    except ValueError:
+        return name.strip(), value
+
+
+def run_case(module, products, workers, delay_range, site, args):
+    policy = CrawlPolicy(workers=workers, delay_range=delay_range, settings=dict(args.set))
+    results = [simulate(module, products, site, policy, seed=args.seed + i) for i in range(args.runs)]
+    summary = {key: statistics.median(r[key] for r in results)
+               for key in ('wall_time', 'products_per_hour', 'success', 'partial', 'failed', 'reviews',
+                           'blocked_pages', 'review_backoffs', 'breaker_opened', 'retries_denied')}
+    summary.update({'workers': workers, 'delay_range': list(delay_range), 'runs': args.runs,
+                    'timings': results[0]['timings']})
+    return summary
+
+
+def format_duration(seconds):
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h{rest // 60:02d}m" if hours else f"{rest // 60}m{rest % 60:02d}s"
+
+
+def print_table(rows):
+    print(f"{'워커':>4} {'딜레이':>9} {'예상 시간':>10} {'제품/h':>8} {'성공':>5} {'부분':>5} {'실패':>5} "
+          f"{'차단':>5} {'리뷰대기':>6} {'브레이커':>6}")
+    for r in rows:
+        low, high = r['delay_range']
+        print(f"{r['workers']:>4} {f'{low:g}-{high:g}s':>9} {format_duration(r['wall_time']):>10} "
+              f"{r['products_per_hour']:>8.1f} {r['success']:>5g} {r['partial']:>5g} {r['failed']:>5g} "
+              f"{r['blocked_pages']:>5g} {r['review_backoffs']:>6g} {r['breaker_opened']:>6g}")
+
+
+def compare_run(module, metadata_path, site, args):
+    """실제 실행 기록과 같은 조건(제품 수, 워커 수)으로 예측해서 비교"""
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    counts = metadata.get('counts', {})
+    products = sum(counts.get(key, 0) for key in ('success', 'partial', 'failed'))
+    workers = metadata.get('workers') or int(args.workers.split(',')[0])
+    actual = metadata.get('elapsed', {}).get('scraping')
+    if not products or actual is None:
+        print(f"⚠️ {metadata_path}에 counts/elapsed.scraping 정보가 없어 비교할 수 없습니다.")
+        return None
+
+    predicted = run_case(module, products, workers, parse_delay(args.delay[0]), site, args)
+    error = (predicted['wall_time'] - actual) / actual if actual else None
+    print(f"\n📊 실제 실행 비교 (제품 {products}개, 워커 {workers}개)")
+    print(f"   실제 {format_duration(actual)} / 예측 {format_duration(predicted['wall_time'])}"
+          + (f" ({error * 100:+.0f}%)" if error is not None else ""))
+    print(f"   실제 성공/부분/실패 {counts.get('success', 0)}/{counts.get('partial', 0)}/{counts.get('failed', 0)}, "
+          f"예측 {predicted['success']:g}/{predicted['partial']:g}/{predicted['failed']:g}")
+    return {'products': products, 'workers': workers, 'actual_s': actual,
+            'predicted_s': predicted['wall_time'], 'error': error}
+
+
+def main(args):
+    site = SiteModel(nav_median=args.nav_median, review_mu=args.review_mu, block_rate=args.block_rate,
+                     safe_rpm=args.safe_rpm)
+    if args.timings:
+        with open(args.timings, 'r', encoding='utf-8') as f:
+            site.calibrate(json.load(f))
+        print(f"🔧 타이밍 보정: 접속 중앙값 {site.nav_median:.2f}s, 제품 정보 추출 {site.detail_median:.2f}s")
+
+    module = load_strategy('fragrantica.main')
+    rows = []
+    for delay in args.delay:
+        for workers in (int(w) for w in args.workers.split(',')):
+            rows.append(run_case(module, args.products, workers, parse_delay(delay), site, args))
+    print_table(rows)
+
+    comparison = compare_run(module, args.compare, site, args) if args.compare else None
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'products': args.products, 'site': vars(site), 'results': rows, 'comparison': comparison},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가상 시계로 워커 수/대기 정책별 크롤링 시간 예측")
+    parser.add_argument('--products', type=int, default=DEFAULT_PRODUCTS, help=f"제품 수 (기본: {DEFAULT_PRODUCTS})")
+    parser.add_argument('--workers', default=DEFAULT_WORKERS, help=f"비교할 워커 수, 쉼표 구분 (기본: {DEFAULT_WORKERS})")
+    parser.add_argument('--delay', action='append',
+                        help="제품 사이 딜레이 범위(초) 예: 3-7 (여러 번 지정 가능, 기본: 3-7)")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help=f"조합별 반복 횟수 (기본: {DEFAULT_RUNS})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--set', action='append', type=parse_setting, default=[], metavar='NAME=VALUE',
+                        help="덮어쓸 스크립트 설정 상수 (여러 번 지정 가능) 예: --set PRODUCT_DEADLINE=600")
+    parser.add_argument('--nav-median', type=float, default=2.5, help="페이지 접속 시간 중앙값(초)")
+    parser.add_argument('--review-mu', type=float, default=3.2, help="제품당 리뷰 수 로그정규 mu")
+    parser.add_argument('--block-rate', type=float, default=0.01, help="기본 차단 확률")
+    parser.add_argument('--safe-rpm', type=float, default=20.0, help="차단이 늘기 시작하는 분당 요청 수")
+    parser.add_argument('--timings', help="보정에 쓸 실제 stage_timings.json")
+    parser.add_argument('--compare', help="비교할 실제 run_metadata.json")
+    parser.add_argument('--json', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    args.delay = args.delay or ['3-7']
+    sys.exit(main(args))
@@ -0,0 +1 @@
+"""fragrantica / parfumo 크롤러가 함께 쓰는 공통 모듈."""
@@ -0,0 +1,94 @@
+# -----------------------
+# 브라우저 쪽 페이지 지표
+# -----------------------
+#
+# 느린 제품이 네트워크 때문인지, 사이트(무거운 페이지) 때문인지, 우리 Chrome 때문인지 구분하려고
+# 리뷰 로딩이 끝난 시점에 브라우저가 직접 잰 값을 모읍니다.
+# - Navigation Timing: 첫 바이트(TTFB), DOMContentLoaded, load 까지 걸린 시간, 문서 전송 크기
+# - Resource Timing: 요청 수, 전송 크기 합계 (버퍼 기본 250개가 차면 resources_capped=True)
+# - 메모리/DOM: JS 힙 사용량, DOM 노드 수
+# - DevTools(CDP) Performance.getMetrics가 되면 레이아웃/스크립트/작업 시간도 같이 기록
+# 어느 값이든 못 읽으면 빠지기만 하고 예외는 내지 않습니다 (수집 자체를 방해하지 않도록).
+
+PAGE_METRICS_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var transfer = 0;
+for (var i = 0; i < resources.length; i++) { transfer += resources[i].transferSize || 0; }
+var result = {
+    resources: resources.length,
+    resource_transfer: transfer,
+    dom_nodes: document.getElementsByTagName('*').length
+};
+if (nav) {
+    result.ttfb = nav.responseStart - nav.startTime;
+    result.dom_content_loaded = nav.domContentLoadedEventEnd - nav.startTime;
+    result.load = nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null;
+    result.document_transfer = nav.transferSize;
+}
+if (performance.memory) {
+    result.js_heap_used = performance.memory.usedJSHeapSize;
+    result.js_heap_total = performance.memory.totalJSHeapSize;
+}
+return result;
+"""
+
+# Performance.getMetrics 이름 → 기록할 키 (초 단위 값은 ms로 변환)
+CDP_METRICS = {
+    'JSHeapUsedSize': 'js_heap_used',
+    'Nodes': 'dom_nodes',
+    'JSEventListeners': 'js_event_listeners',
+    'LayoutCount': 'layout_count',
+    'LayoutDuration': 'layout_ms',
+    'ScriptDuration': 'script_ms',
+    'TaskDuration': 'task_ms',
+}
+RESOURCE_BUFFER_DEFAULT = 250
+
+
+def _cdp_metrics(driver):
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    except Exception:
+        return {}
+    result = {}
+    for metric in metrics:
+        key = CDP_METRICS.get(metric.get('name'))
+        if key is None:
+            continue
+        value = metric.get('value')
+        result[key] = value * 1000 if key.endswith('_ms') else value
+    return result
+
+
+def capture_page_metrics(driver, use_cdp=True):
+    """
+    현재 페이지의 브라우저 지표 dict.
+    시간은 ms, 크기는 KB/MB로 반올림 (읽지 못한 항목은 없음)
+    """
+    try:
+        raw = driver.execute_script(PAGE_METRICS_JS) or {}
+    except Exception:
+        raw = {}
+    if use_cdp:
+        # CDP 값이 있으면 JS 값보다 우선 (performance.memory는 보안 설정에 따라 부정확할 수 있음)
+        raw.update(_cdp_metrics(driver))
+
+    metrics = {}
+    for key in ('ttfb', 'dom_content_loaded', 'load', 'layout_ms', 'script_ms', 'task_ms'):
+        if raw.get(key) is not None:
+            name = key if key.endswith('_ms') else f'{key}_ms'
+            metrics[name] = round(raw[key], 1)
+    for key in ('document_transfer', 'resource_transfer'):
+        if raw.get(key) is not None:
+            metrics[f'{key}_kb'] = round(raw[key] / 1024, 1)
+    for key in ('js_heap_used', 'js_heap_total'):
+        if raw.get(key) is not None:
+            metrics[f'{key}_mb'] = round(raw[key] / (1024 * 1024), 1)
+    for key in ('resources', 'dom_nodes', 'js_event_listeners', 'layout_count'):
+        if raw.get(key) is not None:
+            metrics[key] = int(raw[key])
+    if metrics.get('resources', 0) >= RESOURCE_BUFFER_DEFAULT:
+        metrics['resources_capped'] = True
+    return metrics
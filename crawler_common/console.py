@@ -0,0 +1,130 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# -----------------------
+# 큐 기반 콘솔 로그
+# -----------------------
+#
+# 예전 safe_print는 전역 print_lock을 잡고 바로 print 해서, 리뷰/스크롤 단위 메시지가 많으면
+# 워커끼리 콘솔 출력에서 줄을 섰습니다 (Windows 콘솔 + 이모지면 특히 느림).
+# - 워커는 QueueHandler로 레코드를 큐에 넣기만 하고 바로 반환 (큐는 무제한이라 막히지 않음)
+# - 실제 출력은 QueueListener 스레드 하나가 담당 (콘솔 + 선택적으로 JSON lines 파일)
+# - 레벨: DEBUG = 리뷰/스크롤 단위 진행 메시지, INFO = 제품 단위 진행, WARNING/ERROR = 문제
+#   레벨을 INFO 이상으로 두면 DEBUG 메시지는 레코드도 만들지 않고 버려짐
+# - 메인 스레드의 메시지는 앞서 쌓인 메시지를 먼저 내보낸 뒤 바로 출력
+#   (배너/통계처럼 메인 스레드에서 print와 섞어 쓰는 출력의 순서 유지)
+# - 출력 스레드는 start()에서 시작 (스크립트를 import만 할 때는 스레드 없이 바로 출력)
+# - crawler_common 모듈들의 로거(logging.getLogger(__name__))도 같은 큐/수준으로 출력
+
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+
+
+class JsonLineFormatter(logging.Formatter):
+    """레코드 하나를 JSON 한 줄로 (extra=로 넘긴 필드도 포함)"""
+
+    _STANDARD = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        data = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self._STANDARD and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _ConsoleQueueHandler(QueueHandler):
+    """워커 스레드는 큐로, 메인 스레드는 큐를 비운 뒤 직접 출력"""
+
+    def __init__(self, console):
+        super().__init__(console._queue)
+        self._console = console
+
+    def emit(self, record):
+        if self._console.running and threading.current_thread() is not threading.main_thread():
+            super().emit(record)
+            return
+        # 메인 스레드이거나 출력 스레드가 이미 멈췄으면 (종료 중) 직접 출력
+        self._console.flush()
+        self._console.handle_now(record)
+
+
+class AsyncConsole:
+    """
+    스크립트별 로거 + 출력 스레드.
+    - logger: 워커에서 쓰는 logging.Logger (propagate=False, 핸들러는 QueueHandler 하나)
+    - library_logger: 같은 핸들러/수준을 붙일 공용 모듈 로거 이름 (기본 'crawler_common')
+    - start(): 출력 스레드 시작 (그 전에는 모든 메시지를 호출한 스레드에서 바로 출력)
+    - set_level(): 실행 중 출력 수준 변경 ('DEBUG' / 'INFO' / ...)
+    - flush(): 큐에 쌓인 메시지를 모두 출력할 때까지 대기 (메인 스레드에서 print 하기 전)
+    """
+
+    def __init__(self, name, level='INFO', log_file=None, stream=None, library_logger='crawler_common'):
+        self._queue = queue.Queue()
+        self._listener = None
+        self.logger = logging.getLogger(name)
+        self._loggers = [self.logger]
+        if library_logger:
+            self._loggers.append(logging.getLogger(library_logger))
+        queue_handler = _ConsoleQueueHandler(self)
+        for logger in self._loggers:
+            logger.propagate = False
+            logger.handlers[:] = [queue_handler]
+        self.set_level(level)
+
+        console_handler = logging.StreamHandler(stream or sys.stdout)
+        console_handler.setFormatter(logging.Formatter('%(message)s'))
+        handlers = [console_handler]
+        if log_file:
+            file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+            file_handler.setFormatter(JsonLineFormatter())
+            handlers.append(file_handler)
+        self._handlers = handlers
+
+    def start(self):
+        if self._listener is not None:
+            return
+        self._listener = QueueListener(self._queue, *self._handlers)
+        self._listener.start()
+        atexit.register(self.stop)
+
+    @property
+    def running(self):
+        return self._listener is not None
+
+    def handle_now(self, record):
+        for handler in self._handlers:
+            handler.handle(record)
+
+    def set_level(self, level):
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+        for logger in self._loggers:
+            logger.setLevel(level)
+
+    def flush(self):
+        if self._listener is not None:
+            self._queue.join()
+
+    def stop(self):
+        """남은 메시지를 모두 출력하고 출력 스레드 종료"""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+        for handler in self._handlers:
+            handler.flush()
+            if isinstance(handler, logging.FileHandler):
+                handler.close()
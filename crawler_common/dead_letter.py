@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+import time
+
+# -----------------------
+# 실패 작업 보관 (dead letter)
+# -----------------------
+#
+# 실패한 제품을 JSONL 한 줄씩 남겨 두고, --retry-failed 실행에서 그것만 다시 처리합니다.
+# 다시 성공하면 같은 url로 resolved 줄을 추가 (파일은 append만 하므로 중간에 끊겨도 안전).
+
+
+class DeadLetterStore:
+    """
+    실패 기록 JSONL.
+    줄 형식: {"url", "site", "brand", "product_name", "stage", "failure", "error_type", "error", "ts"}
+    해결 표시: {"url", "site", "resolved": true, "ts"}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.recorded = 0
+        self.resolved = 0
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 쓰다 끊긴 마지막 줄
+                key = (entry.get('site'), entry.get('url'))
+                if entry.get('resolved'):
+                    self._pending.pop(key, None)
+                else:
+                    self._pending[key] = entry
+
+    def _append(self, entry):
+        entry['ts'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def pending(self, site, brand=None):
+        """아직 해결되지 않은 실패 기록 (brand를 주면 해당 브랜드만)"""
+        with self._lock:
+            return [
+                entry for (entry_site, _), entry in self._pending.items()
+                if entry_site == site and (brand is None or entry.get('brand') == brand)
+            ]
+
+    def record(self, site, brand, url, stage, failure, error_type, error, product_name=''):
+        with self._lock:
+            entry = {
+                'url': url,
+                'site': site,
+                'brand': brand,
+                'product_name': product_name,
+                'stage': stage,
+                'failure': failure,
+                'error_type': error_type,
+                'error': error,
+            }
+            self._append(dict(entry))
+            self._pending[(site, url)] = entry
+            self.recorded += 1
+
+    def resolve(self, site, url):
+        """보관 중인 실패였다면 해결 표시"""
+        with self._lock:
+            if (site, url) not in self._pending:
+                return False
+            del self._pending[(site, url)]
+            self._append({'url': url, 'site': site, 'resolved': True})
+            self.resolved += 1
+            return True
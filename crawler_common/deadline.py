@@ -0,0 +1,74 @@
+import threading
+import time
+
+# -----------------------
+# 제품/단계별 시간 제한 (deadline)
+# -----------------------
+#
+# 횟수로만 묶인 루프(스크롤 100회, rate limit 30회, 'More reviews' 무한 클릭)는
+# 이상한 제품 하나가 워커를 한 시간씩 붙잡을 수 있어서 벽시계 기준 제한을 같이 둡니다.
+# - 제품 전체 Deadline 하나를 만들고, 단계마다 stage(이름, 초)로 하위 Deadline을 꺼냄
+#   (하위 제한은 제품 전체 남은 시간을 넘지 않음)
+# - 루프는 expired()를 확인해서 멈추고, 지금까지 로드한 것만 저장한 뒤 다음으로 넘어감
+# - 만료된 단계 이름은 제품 Deadline의 expired_stages에 남아 '부분 수집' 표시에 쓰임
+
+
+class Deadline:
+    """
+    벽시계 제한.
+    - seconds=None이면 제한 없음
+    - stage(): 하위 단계 제한 (부모의 남은 시간과 단계 제한 중 짧은 쪽)
+    - clock / sleep: 시각/대기 함수 (시뮬레이션에서는 가상 시계), 하위 단계도 같은 것을 씀
+    """
+
+    def __init__(self, seconds=None, name='product', parent=None, clock=time.monotonic, sleep=time.sleep):
+        self.name = name
+        self._clock = clock
+        self._sleep = sleep
+        self._parent = parent
+        self._root = parent._root if parent is not None else self
+        self.started = clock()
+        self._expires_at = None if seconds is None else self.started + seconds
+        if parent is not None and parent._expires_at is not None:
+            if self._expires_at is None or parent._expires_at < self._expires_at:
+                self._expires_at = parent._expires_at
+        if parent is None:
+            self._lock = threading.Lock()
+            self.expired_stages = []
+
+    def stage(self, name, seconds=None):
+        return Deadline(seconds, name=name, parent=self, clock=self._clock, sleep=self._sleep)
+
+    def elapsed(self):
+        return self._clock() - self.started
+
+    def remaining(self):
+        """남은 시간(초), 제한 없으면 None"""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - self._clock())
+
+    def expired(self):
+        """만료됐으면 True (처음 확인될 때 단계 이름을 기록)"""
+        if self._expires_at is None or self._clock() < self._expires_at:
+            return False
+        root = self._root
+        with root._lock:
+            if self.name not in root.expired_stages:
+                root.expired_stages.append(self.name)
+        return True
+
+    def cap(self, seconds):
+        """대기 시간을 남은 시간 이하로 자름"""
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def sleep(self, seconds):
+        """남은 시간 안에서만 대기. 대기 후에도 시간이 남아 있으면 True"""
+        self._sleep(self.cap(seconds))
+        return not self.expired()
+
+    @property
+    def partial(self):
+        """어느 단계든 만료된 적이 있으면 True"""
+        return bool(self._root.expired_stages)
@@ -0,0 +1,92 @@
+import re
+import xml.etree.ElementTree as ET
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from crawler_common.http_fetch import extract_links
+from crawler_common.url_registry import canonicalize_url
+
+# -----------------------
+# 브라우저 없는 제품 URL 수집 (fragrantica)
+# -----------------------
+#
+# 디자이너 페이지 HTML에는 스크롤 없이도 해당 디자이너의 향수 링크가 모두 들어 있어
+# HTTP 한 번으로 목록을 얻을 수 있습니다. 디자이너 페이지가 막히면 사이트맵을 훑습니다.
+# 둘 다 실패하면 호출 쪽에서 기존 브라우저 수집으로 넘어갑니다.
+
+FRAGRANTICA_BASE_URL = "https://www.fragrantica.com"
+# 사이트맵 인덱스가 여러 개로 나뉘어 있을 때 제품 사이트맵만 고르기 위한 힌트
+SITEMAP_NAME_HINT = 'perfume'
+MAX_SITEMAPS = 200
+
+_SITEMAP_NS = re.compile(r'^\{[^}]*\}')
+
+
+def fragrantica_product_filter(designer):
+    """/perfume/<designer>/<이름>-<id>.html 형태만 통과 (디자이너 이름은 대소문자 무시)"""
+    pattern = re.compile(r'^/perfume/' + re.escape(designer) + r'/[^/]+-\d+\.html$', re.IGNORECASE)
+    return lambda url: bool(pattern.match(urlsplit(url).path))
+
+
+def designer_page_urls(fetcher, designer, base_url=FRAGRANTICA_BASE_URL):
+    """디자이너 페이지 HTML 한 번으로 제품 URL 목록"""
+    page_url = f"{base_url}/designers/{designer}.html"
+    html = fetcher.fetch(page_url)
+    urls = extract_links(html, page_url, href_filter=fragrantica_product_filter(designer))
+    return [canonicalize_url(url) for url in urls]
+
+
+def _iter_sitemap(fetcher, sitemap_url):
+    """사이트맵 하나를 스트리밍 파싱 → ('sitemap' | 'url', loc) 순회"""
+    body = fetcher.fetch(sitemap_url)
+    for _, elem in ET.iterparse(BytesIO(body.encode('utf-8')), events=('end',)):
+        tag = _SITEMAP_NS.sub('', elem.tag)
+        if tag == 'loc' and elem.text:
+            yield elem.text.strip()
+        elem.clear()
+
+
+def sitemap_urls(fetcher, designer, base_url=FRAGRANTICA_BASE_URL):
+    """
+    robots.txt의 Sitemap 항목(없으면 /sitemap.xml)부터 사이트맵 인덱스를 따라가며
+    해당 디자이너의 제품 URL 수집.
+    """
+    robots = fetcher.fetch(f"{base_url}/robots.txt")
+    pending = [
+        line.split(':', 1)[1].strip()
+        for line in robots.splitlines()
+        if line.lower().startswith('sitemap:')
+    ] or [f"{base_url}/sitemap.xml"]
+
+    is_product = fragrantica_product_filter(designer)
+    urls = []
+    seen = set()
+    visited = 0
+    while pending and visited < MAX_SITEMAPS:
+        sitemap_url = pending.pop(0)
+        visited += 1
+        children = []
+        for loc in _iter_sitemap(fetcher, sitemap_url):
+            if loc.endswith('.xml') or loc.endswith('.xml.gz'):
+                children.append(loc)
+            elif is_product(loc):
+                url = canonicalize_url(loc)
+                if url not in seen:
+                    seen.add(url)
+                    urls.append(url)
+        hinted = [loc for loc in children if SITEMAP_NAME_HINT in loc.lower()]
+        pending.extend(hinted or children)
+    return urls
+
+
+def compare_discovery(http_urls, browser_urls):
+    """HTTP 수집 결과와 브라우저 수집 결과 비교 (정규화 후)"""
+    http_set = {canonicalize_url(url) for url in http_urls}
+    browser_set = {canonicalize_url(url) for url in browser_urls}
+    return {
+        'http': len(http_set),
+        'browser': len(browser_set),
+        'common': len(http_set & browser_set),
+        'only_http': sorted(http_set - browser_set),
+        'only_browser': sorted(browser_set - http_set),
+    }
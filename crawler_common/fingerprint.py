@@ -0,0 +1,126 @@
+import hashlib
+import os
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import chain
+
+# -----------------------
+# 리뷰 지문 (fingerprint)
+# -----------------------
+#
+# 사이트 + 제품 + 작성자 + 날짜 + 본문(공백/대소문자 정규화)을 64비트 정수 하나로 압축.
+# SQLite INTEGER 키와 맞추기 위해 부호 있는 64비트 값으로 반환합니다.
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _normalize(text):
+    return _WHITESPACE_RE.sub(' ', str(text or '')).strip().lower()
+
+
+def review_fingerprint(site, review):
+    """리뷰 dict -> 부호 있는 64비트 지문"""
+    product = review.get('product_url') or review.get('product_name', '')
+    parts = [
+        site,
+        _normalize(product),
+        _normalize(review.get('reviewer_name')),
+        _normalize(review.get('review_date')),
+        _normalize(review.get('review_content')),
+    ]
+    digest = hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class FingerprintStore:
+    """
+    디스크에 유지되는 리뷰 지문 집합 (실행 간 / 파일 간 / 사이트 간 중복 제거).
+    - 파일: 8바이트 지문을 이어 붙인 append-only 바이너리
+    - 메모리: 정렬된 array('q') (지문당 8바이트) + 최근 추가분 set (merge_threshold 마다 병합)
+    쓰기 전에 add()로 확인하고, False면 이미 저장된 리뷰이므로 건너뜁니다.
+    add()는 메모리에만 기록하고, 파일에는 writer가 그 리뷰 행을 쓴 뒤 persist_rows()로 추가
+    (AsyncWriter.add_flush_listener) → 중간에 죽어도 "지문만 있고 CSV 행은 없는" 리뷰가 생기지 않음
+    """
+
+    def __init__(self, path, merge_threshold=50000):
+        self.path = path
+        self.merge_threshold = merge_threshold
+        self._lock = threading.Lock()
+        self._base = array('q')
+        self._recent = set()
+        self._file = None
+        self.duplicates = 0
+
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            loaded = array('q')
+            loaded.frombytes(data[:len(data) - len(data) % 8])  # 잘린 마지막 항목은 무시
+            if sys.byteorder != 'little':
+                loaded.byteswap()
+            self._base = array('q', sorted(loaded))
+
+    def __len__(self):
+        return len(self._base) + len(self._recent)
+
+    def __contains__(self, fingerprint):
+        with self._lock:
+            return self._contains(fingerprint)
+
+    def _contains(self, fingerprint):
+        if fingerprint in self._recent:
+            return True
+        i = bisect_left(self._base, fingerprint)
+        return i < len(self._base) and self._base[i] == fingerprint
+
+    def is_known(self, fingerprint):
+        """이미 기록된 지문인지 확인 (있으면 중복 수 증가). 기록은 add()로."""
+        with self._lock:
+            if self._contains(fingerprint):
+                self.duplicates += 1
+                return True
+            return False
+
+    def add(self, fingerprint):
+        """새 지문이면 (메모리에) 기록하고 True, 이미 있으면 False"""
+        with self._lock:
+            if self._contains(fingerprint):
+                self.duplicates += 1
+                return False
+            self._recent.add(fingerprint)
+            if len(self._recent) >= self.merge_threshold:
+                self._base = array('q', sorted(chain(self._base, self._recent)))
+                self._recent = set()
+            return True
+
+    def persist_rows(self, site, rows):
+        """writer가 리뷰 행을 파일에 쓴 뒤 호출: 그 리뷰들의 지문을 파일에 추가하고 flush"""
+        if not self.path or not rows:
+            return
+        data = b''.join(review_fingerprint(site, row).to_bytes(8, 'little', signed=True) for row in rows)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'ab')
+            self._file.write(data)
+            self._file.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def fsync(self):
+        """writer가 출력 파일을 fsync 한 직후 호출"""
+        with self._lock:
+            if self._file:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
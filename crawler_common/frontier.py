@@ -0,0 +1,121 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# -----------------------
+# 작업 frontier / 제한된 제출
+# -----------------------
+#
+# 작업 전체를 한 번에 executor.submit 하지 않고, 진행 중인 작업을 window 개로 유지하면서
+# 하나가 끝날 때마다 frontier에서 다음 작업을 꺼내 제출합니다.
+# frontier는 기본 작업 generator + 나중에 들어온 작업용 우선순위 힙으로 되어 있어서
+# push(task, PRIORITY_HIGH)로 넣은 작업은 남은 기본 작업보다 먼저 나갑니다.
+# requeue(task, key)는 같은 key를 한 번만 다시 넣음 (드라이버 문제로 실패한 제품 재시도)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+class TaskFrontier:
+    """
+    작업 공급원.
+    - source: 기본 작업 iterable (generator 권장, 필요할 때 하나씩만 꺼냄)
+    - push(): 실행 중에 작업 추가 (priority가 작을수록 먼저)
+    - requeue(): 실패한 작업을 key당 한 번만 다시 넣음 (requeued: 다시 넣은 key)
+    """
+
+    def __init__(self, source=(), default_priority=PRIORITY_NORMAL):
+        self._source = iter(source)
+        self._source_done = False
+        self._default_priority = default_priority
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.requeued = set()
+
+    def push(self, task, priority=PRIORITY_HIGH):
+        with self._lock:
+            heapq.heappush(self._heap, (priority, next(self._seq), task))
+
+    def requeue(self, task, key, priority=PRIORITY_HIGH):
+        """key를 아직 다시 넣은 적이 없으면 task를 넣고 True (이미 한 번 넣었으면 False)"""
+        with self._lock:
+            if key in self.requeued:
+                return False
+            self.requeued.add(key)
+        self.push(task, priority)
+        return True
+
+    def pop(self):
+        """다음 작업 (없으면 None)"""
+        with self._lock:
+            # 기본 작업보다 우선순위가 높거나 같은 추가 작업이 있으면 먼저
+            if self._heap and self._heap[0][0] <= self._default_priority:
+                return heapq.heappop(self._heap)[2]
+            if not self._source_done:
+                try:
+                    return next(self._source)
+                except StopIteration:
+                    self._source_done = True
+            if self._heap:
+                return heapq.heappop(self._heap)[2]
+            return None
+
+    def pending_pushed(self):
+        with self._lock:
+            return len(self._heap)
+
+
+class BoundedSubmitter:
+    """
+    진행 중 작업을 window 개 이하로 유지하는 제출기.
+    as_completed()는 concurrent.futures.as_completed처럼 끝난 Future를 순서대로 돌려주며,
+    반복 도중 frontier.push()로 넣은 작업도 이어서 제출합니다.
+    wait: 끝난 작업을 기다리는 함수 (concurrent.futures.wait 형태, 시뮬레이션에서는 가상 시계용)
+    """
+
+    def __init__(self, executor, fn, frontier, window, *fn_args, wait=wait):
+        self.executor = executor
+        self._wait = wait
+        self.fn = fn
+        self.frontier = frontier
+        self.window = max(1, window)
+        self.fn_args = fn_args
+        self._tasks = {}
+        self._stopped = False
+        self.submitted = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def task_for(self, future):
+        """Future에 해당하는 작업 인자"""
+        return self._tasks.get(future)
+
+    def stop(self):
+        """새 작업 제출 중단 (진행 중인 작업은 끝까지 반환)"""
+        self._stopped = True
+
+    def _fill(self, in_flight):
+        while not self._stopped and len(in_flight) < self.window:
+            task = self.frontier.pop()
+            if task is None:
+                break
+            future = self.executor.submit(self.fn, task, *self.fn_args)
+            self._tasks[future] = task
+            in_flight.add(future)
+            self.submitted += 1
+        self.in_flight = len(in_flight)
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def as_completed(self):
+        in_flight = set()
+        self._fill(in_flight)
+        while in_flight:
+            done, in_flight = self._wait(in_flight, return_when=FIRST_COMPLETED)
+            self.in_flight = len(in_flight)
+            for future in done:
+                yield future
+                self._tasks.pop(future, None)
+            self._fill(in_flight)
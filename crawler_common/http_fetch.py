@@ -0,0 +1,220 @@
+import gzip
+import threading
+import time
+import zlib
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+# -----------------------
+# 브라우저 없는 HTTP 수집 경로
+# -----------------------
+#
+# 목록/사이트맵처럼 JS 없이도 내용이 들어 있는 페이지는 Chrome 대신 urllib로 받습니다.
+# 드라이버의 쿠키/User-Agent를 그대로 넘겨받아 같은 세션처럼 요청하고,
+# 호스트별 최소 간격(HostRateLimiter)을 지킵니다.
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# 끝 태그가 없는 요소 (부모 추적 스택에 넣지 않음)
+_VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+
+class HostRateLimiter:
+    """
+    호스트별 최소 요청 간격.
+    여러 스레드가 같은 호스트를 요청해도 min_interval(초) 간격으로 차례를 배정합니다.
+    """
+
+    def __init__(self, min_interval=1.0, clock=time.monotonic, sleep=time.sleep):
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self.total_wait = 0.0
+
+    def reserve(self, host):
+        """차례를 예약하고 기다려야 할 시간(초)만 반환 (대기는 호출 쪽에서, 시뮬레이션용)"""
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+            wait = slot - now
+            self.total_wait += wait
+        return wait
+
+    def acquire(self, host):
+        """차례가 올 때까지 대기. 실제로 기다린 시간(초) 반환."""
+        wait = self.reserve(host)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class HttpFetcher:
+    """urllib 기반 GET (쿠키/UA 공유, gzip 해제, 호스트별 간격 제한)"""
+
+    def __init__(self, user_agent=None, cookies=None, rate_limiter=None, timeout=15):
+        self.headers = dict(DEFAULT_HEADERS)
+        if user_agent:
+            self.headers['User-Agent'] = user_agent
+        if cookies:
+            self.headers['Cookie'] = '; '.join(f"{c['name']}={c['value']}" for c in cookies)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.timeout = timeout
+        self.requests = 0
+        self.failures = 0
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """현재 드라이버 세션의 쿠키/User-Agent로 생성"""
+        user_agent = driver.execute_script("return navigator.userAgent")
+        return cls(user_agent=user_agent, cookies=driver.get_cookies(), **kwargs)
+
+    def fetch(self, url):
+        """본문 문자열 반환. HTTP 오류는 예외로 올라감."""
+        self.rate_limiter.acquire(urlsplit(url).netloc)
+        self.requests += 1
+        try:
+            with urlopen(Request(url, headers=self.headers), timeout=self.timeout) as resp:
+                body = resp.read()
+                encoding = resp.headers.get('Content-Encoding', '')
+                charset = resp.headers.get_content_charset() or 'utf-8'
+        except Exception:
+            self.failures += 1
+            raise
+        if encoding == 'gzip' or body[:2] == b'\x1f\x8b':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+        return body.decode(charset, errors='replace')
+
+
+class _LinkParser(HTMLParser):
+    """
+    <a href> 와 바로 위 부모 요소의 class(+ 링크의 rel)를 함께 수집.
+    text_class를 주면 그 class를 가진 요소의 텍스트도 모음 (카드 안 브랜드 표시 등).
+    요소마다 번호를 매겨 링크/텍스트가 어느 조상 요소 안에 있었는지도 기록.
+    """
+
+    def __init__(self, text_class=None):
+        super().__init__(convert_charrefs=True)
+        self._stack = []
+        self._next_id = 0
+        self._text_class = text_class
+        self._capture = None  # (스택 깊이, 조상 번호, 텍스트 조각)
+        self.links = []  # (href, 부모 class, 링크 class, 조상 번호 - 가까운 순, rel)
+        self.texts = []  # (텍스트, 조상 번호 집합)
+
+    def _ancestors(self):
+        return [node_id for _, _, node_id in reversed(self._stack)]
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = set((attrs.get('class') or '').split())
+        if tag == 'a' and attrs.get('href'):
+            parent_classes = self._stack[-1][1] if self._stack else set()
+            rel = set((attrs.get('rel') or '').lower().split())
+            self.links.append((attrs['href'], parent_classes, classes, self._ancestors(), rel))
+        if self._text_class and self._capture is None and self._text_class in classes and tag not in _VOID_TAGS:
+            self._capture = (len(self._stack), set(self._ancestors()), [])
+        if tag not in _VOID_TAGS:
+            self._stack.append((tag, classes, self._next_id))
+            self._next_id += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'a':
+            self.handle_starttag(tag, attrs)
+            self._stack.pop()
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._capture[2].append(data)
+
+    def handle_endtag(self, tag):
+        # 닫히지 않은 태그가 섞여 있어도 같은 이름의 태그까지 되감음
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                del self._stack[i:]
+                break
+        if self._capture is not None and len(self._stack) <= self._capture[0]:
+            depth, ancestors, parts = self._capture
+            self.texts.append((' '.join(''.join(parts).split()), ancestors))
+            self._capture = None
+
+
+def _parse_links(html, base_url, parent_class=None, link_class=None, href_filter=None, text_class=None,
+                 rel=None):
+    parser = _LinkParser(text_class)
+    parser.feed(html)
+    parser.close()
+
+    matched = []
+    for href, parent_classes, classes, ancestors, link_rel in parser.links:
+        if parent_class and parent_class not in parent_classes:
+            continue
+        if link_class and link_class not in classes:
+            continue
+        if rel and rel not in link_rel:
+            continue
+        url = urljoin(base_url, href)
+        if href_filter and not href_filter(url):
+            continue
+        matched.append((url, ancestors))
+    return matched, parser.texts
+
+
+def extract_links(html, base_url, parent_class=None, link_class=None, href_filter=None, rel=None):
+    """
+    HTML에서 링크 추출 (절대 URL, 문서 순서, 중복 제거).
+    - parent_class: 바로 위 부모 요소가 이 class를 가진 링크만 (예: 'name' → div.name > a)
+    - link_class: 링크 자체가 이 class를 가진 것만
+    - href_filter: 절대 URL을 받아 True/False
+    - rel: rel 속성에 이 값이 있는 링크만 (예: 'next' → 다음 페이지 링크)
+    """
+    matched, _ = _parse_links(html, base_url, parent_class, link_class, href_filter, rel=rel)
+    urls = []
+    seen = set()
+    for url, _ in matched:
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def extract_cards(html, base_url, text_class, parent_class=None, link_class=None, href_filter=None,
+                  max_depth=4):
+    """
+    extract_links와 같은 링크를 [(URL, 카드 텍스트), ...]로 반환.
+    카드 텍스트: 링크에서 위로 max_depth 단계까지 올라가며, 다른 대상 링크를 함께 품지 않은 가장 가까운 조상 안의
+    첫 text_class 요소 텍스트 (없으면 ''). 드라이버 쪽 목록 카드 스크립트와 같은 규칙.
+    """
+    matched, texts = _parse_links(html, base_url, parent_class, link_class, href_filter, text_class)
+    link_counts = {}
+    for _, ancestors in matched:
+        for node_id in ancestors:
+            link_counts[node_id] = link_counts.get(node_id, 0) + 1
+
+    cards = []
+    seen = set()
+    for url, ancestors in matched:
+        if url in seen:
+            continue
+        seen.add(url)
+        text = ''
+        for node_id in ancestors[:max_depth]:
+            if link_counts[node_id] > 1:
+                break
+            text = next((t for t, text_ancestors in texts if node_id in text_ancestors and t), '')
+            if text:
+                break
+        cards.append((url, text))
+    return cards
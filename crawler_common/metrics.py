@@ -0,0 +1,284 @@
+import collections
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# 실행 중 지표 (Prometheus 텍스트 형식)
+# -----------------------
+#
+# 콘솔 로그 대신 http://127.0.0.1:<port>/metrics 로 진행 상황을 확인합니다.
+# - Counter: 누적 값 (라벨별)
+# - 게이지: 요청이 올 때마다 콜백을 호출해서 현재 값을 읽음 (풀 여유, 큐 길이 등)
+# - RateWindow: 최근 window초 동안의 분당 처리량 (products/min, reviews/min)
+# 표준 라이브러리 http.server만 사용하고, 서버 스레드는 daemon이라 종료를 막지 않습니다.
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_value(value):
+    if value is None:
+        return 'NaN'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class Counter:
+    """라벨별 누적 값"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple((name, labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.label_names:
+            items = [((), 0)]
+        return [(self.name, labels, value) for labels, value in items]
+
+
+class RateWindow:
+    """최근 window초 동안의 이벤트 수 → 분당 처리량"""
+
+    def __init__(self, window=300.0, clock=time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._events = collections.deque()
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def mark(self, amount=1):
+        with self._lock:
+            self._events.append((self._clock(), amount))
+
+    def per_minute(self):
+        now = self._clock()
+        with self._lock:
+            while self._events and self._events[0][0] < now - self.window:
+                self._events.popleft()
+            total = sum(amount for _, amount in self._events)
+        # 시작 직후에는 지난 시간만큼으로 나눔
+        span = min(self.window, max(1.0, now - self._started))
+        return total * 60.0 / span
+
+
+class MetricsRegistry:
+    """
+    지표 모음.
+    - counter(): Counter 생성/등록
+    - gauge(): 콜백 게이지 등록. 콜백은 숫자, 또는 (라벨 dict, 값[, 이름 접미사]) 리스트를 반환
+      (예: [({'host': 'a.com'}, 3), ...])
+    """
+
+    def __init__(self, prefix='crawler'):
+        self.prefix = prefix
+        self._metrics = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _full_name(self, name):
+        return f"{self.prefix}_{name}" if self.prefix else name
+
+    def counter(self, name, help_text, label_names=()):
+        counter = Counter(self._full_name(name), help_text, label_names)
+        with self._lock:
+            self._metrics[counter.name] = ('counter', counter)
+        return counter
+
+    def gauge(self, name, help_text, fn, metric_type='gauge'):
+        full_name = self._full_name(name)
+        with self._lock:
+            self._metrics[full_name] = (metric_type, (help_text, fn))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.items())
+        lines = []
+        for name, (metric_type, metric) in metrics:
+            if isinstance(metric, Counter):
+                help_text, samples = metric.help, metric.samples()
+            else:
+                help_text, fn = metric
+                try:
+                    value = fn()
+                except Exception:
+                    # 실행 중 상태가 바뀌는 도중이면 이번 요청에서는 생략
+                    continue
+                if isinstance(value, list):
+                    samples = []
+                    for item in value:
+                        suffix = item[2] if len(item) > 2 else ''
+                        samples.append((name + suffix, tuple(item[0].items()), item[1]))
+                else:
+                    samples = [(name, (), value)]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """/metrics 를 제공하는 로컬 HTTP 서버 (daemon 스레드)"""
+
+    def __init__(self, registry, host='127.0.0.1', port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 콘솔에 찍히지 않도록
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def register_common_metrics(registry, csv_writer=None, failure_stats=None, stage_timings=None,
+                            retry_budgets=None, host_breakers=None):
+    """
+    스크립트 공통 게이지 등록 (있는 것만).
+    writer 큐 길이, 실패 유형별 횟수, 브라우저 재시작, 호스트별 재시도/브레이커, 단계별 소요 시간 분위수
+    """
+    if csv_writer is not None:
+        registry.gauge('writer_queue_depth', '디스크에 아직 쓰지 않은 행 수', csv_writer.queue_depth)
+    if failure_stats is not None:
+        registry.gauge('failures_total', '실패 유형별 누적 횟수', lambda: [
+            ({'class': name}, count) for name, count in sorted(failure_stats.counts.items())
+        ], metric_type='counter')
+        registry.gauge('driver_restarts_total', '브라우저 재시작 누적 횟수',
+                       lambda: failure_stats.restarts, metric_type='counter')
+    if retry_budgets is not None:
+        registry.gauge('retries_total', '호스트별 재시도 누적 횟수', lambda: [
+            ({'host': host}, budget.retries) for host, budget in retry_budgets.items()
+        ], metric_type='counter')
+        registry.gauge('retries_denied_total', '예산 부족으로 포기한 재시도 누적 횟수', lambda: [
+            ({'host': host}, budget.denied) for host, budget in retry_budgets.items()
+        ], metric_type='counter')
+    if host_breakers is not None:
+        registry.gauge('breaker_open', '호스트별 서킷 브레이커 열림 여부 (반열림 포함)', lambda: [
+            ({'host': host}, breaker.state != 'closed') for host, breaker in host_breakers.items()
+        ])
+        registry.gauge('breaker_opened_total', '호스트별 서킷 브레이커 열림 누적 횟수', lambda: [
+            ({'host': host}, breaker.opened_count) for host, breaker in host_breakers.items()
+        ], metric_type='counter')
+    if stage_timings is not None:
+        def stage_samples():
+            samples = []
+            for stage, s in stage_timings.snapshot()['stages'].items():
+                if not s['count']:
+                    continue
+                for key, quantile in (('p50', '0.5'), ('p95', '0.95'), ('p99', '0.99')):
+                    samples.append(({'stage': stage, 'quantile': quantile}, s[key]))
+                samples.append(({'stage': stage}, s['total'], '_sum'))
+                samples.append(({'stage': stage}, s['count'], '_count'))
+            return samples
+        registry.gauge('stage_seconds', '제품당 단계별 소요 시간(초)', stage_samples, metric_type='summary')
+
+
+class CrawlMetrics:
+    """
+    크롤러 스크립트용 기본 지표 묶음.
+    - product_done(): 제품 결과(success/partial/failed/requeued)와 저장 리뷰 수 반영
+    - watch_run(): 실행 중에만 있는 객체(드라이버 풀, 제출기)의 게이지 등록
+    - serve(): /metrics 서버 시작 (포트를 못 열면 경고만 출력하고 계속 진행)
+    """
+
+    def __init__(self, rate_window=300.0):
+        self.registry = MetricsRegistry()
+        self.products = self.registry.counter('products_total', '처리한 제품 수 (결과별)', ('status',))
+        self.reviews = self.registry.counter('reviews_saved_total', '저장한 리뷰 수')
+        self.rate_limit_events = self.registry.counter('rate_limit_events_total', 'rate limit 페이지 감지 횟수')
+        self._product_rate = RateWindow(rate_window)
+        self._review_rate = RateWindow(rate_window)
+        minutes = f"{rate_window / 60:.0f}"
+        self.registry.gauge('products_per_minute', f'최근 {minutes}분 분당 처리 제품 수',
+                            self._product_rate.per_minute)
+        self.registry.gauge('reviews_per_minute', f'최근 {minutes}분 분당 저장 리뷰 수',
+                            self._review_rate.per_minute)
+        self._server = None
+
+    def product_done(self, status, review_count=0):
+        self.products.inc(status=status)
+        if status != 'requeued':
+            self._product_rate.mark()
+        if review_count:
+            self.reviews.inc(review_count)
+            self._review_rate.mark(review_count)
+
+    def watch_run(self, total, driver_pool=None, submitter=None, frontier=None):
+        self.registry.gauge('products_target', '이번 실행의 수집 대상 제품 수', lambda: total)
+        if driver_pool is not None:
+            self.registry.gauge('driver_pool_size', '드라이버 풀 크기', lambda: driver_pool.size)
+            self.registry.gauge('driver_pool_idle', '풀에서 대기 중인(쉬는) 드라이버 수', driver_pool.pool.qsize)
+        if submitter is not None:
+            self.registry.gauge('tasks_in_flight', '제출되어 진행/대기 중인 작업 수', lambda: submitter.in_flight)
+            self.registry.gauge('tasks_submitted_total', '제출한 작업 누적 수',
+                                lambda: submitter.submitted, metric_type='counter')
+        if frontier is not None:
+            self.registry.gauge('frontier_requeued_pending', '다시 넣은 작업 중 아직 제출되지 않은 수',
+                                frontier.pending_pushed)
+
+    def serve(self, host, port):
+        try:
+            self._server = MetricsServer(self.registry, host, port).start()
+        except OSError as e:
+            logger.warning(f"⚠️ 지표 서버를 열지 못했습니다 ({host}:{port}): {e} → 지표 없이 진행")
+            return None
+        logger.info(f"📈 실행 중 지표: http://{host}:{self._server.port}/metrics")
+        return self._server
+
+    def stop(self):
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
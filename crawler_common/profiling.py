@@ -0,0 +1,214 @@
+import cProfile
+import collections
+import functools
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+# -----------------------
+# 표본 작업 프로파일링 / 메모리 추적
+# -----------------------
+#
+# 느린 실행을 손으로 도구를 붙이지 않고 들여다보기 위한 옵트인 훅입니다.
+# - TaskProfiler.wrap(fn): 작업 함수를 감싸서 N번째 호출마다 프로파일을 작업별 파일로 저장
+#   · 'cprofile': 결정적 프로파일 (.prof → `python -m pstats`, snakeviz 등으로 열기)
+#     cProfile은 한 번에 하나만 켤 수 있어서, 다른 작업을 프로파일 중이면 다음 호출로 미룸
+#   · 'sample': 해당 작업 스레드의 스택을 interval초마다 떠서 접힌 스택(.folded)으로 저장
+#     (speedscope, flamegraph.pl 등으로 열기, 오버헤드가 작아 여러 작업을 동시에 떠도 됨)
+# - MemoryTracker: tracemalloc 스냅샷을 제품 N개마다 떠서 직전 스냅샷 대비 증가 상위 줄을 파일로 남김
+# - every=0 이면 아무것도 하지 않음 (wrap()은 원래 함수를 그대로 돌려줌)
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+
+def _slug(text, limit=60):
+    text = str(text).rstrip('/').rsplit('/', 1)[-1]
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', text)[:limit] or 'task'
+
+
+class StackSampler:
+    """스레드 하나의 호출 스택을 주기적으로 떠서 접힌 스택별 횟수로 모음"""
+
+    def __init__(self, thread_id, interval=0.01):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.counts[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class TaskProfiler:
+    """
+    작업 함수 N번째 호출마다 프로파일.
+    - every: 0이면 끔, 1이면 모든 호출
+    - label: 작업 인자 → 파일 이름에 쓸 문자열 (기본: 첫 인자의 첫 값, 보통 URL)
+    - log: 저장 후 한 줄 알림 (스크립트의 safe_print)
+    """
+
+    def __init__(self, every=0, out_dir='profiles', mode='cprofile', interval=0.01, log=print):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode는 {PROFILE_MODES} 중 하나: {mode!r}")
+        self.every = every
+        self.out_dir = out_dir
+        self.mode = mode
+        self.interval = interval
+        self.log = log
+        self.calls = 0
+        self.profiled = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._cprofile_busy = threading.Lock()
+
+    def _should_profile(self):
+        with self._lock:
+            self.calls += 1
+            return self.every > 0 and self.calls % self.every == 0, self.calls
+
+    def wrap(self, fn, label=None):
+        if not self.every:
+            return fn
+        label = label or (lambda task, *_: task[0] if isinstance(task, (tuple, list)) else task)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            selected, call_no = self._should_profile()
+            if not selected:
+                return fn(*args, **kwargs)
+            name = f"{call_no:05d}_{_slug(label(*args))}"
+            if self.mode == 'sample':
+                return self._run_sampled(name, fn, args, kwargs)
+            return self._run_cprofile(name, fn, args, kwargs)
+
+        return wrapper
+
+    def _path(self, name, ext):
+        os.makedirs(self.out_dir, exist_ok=True)
+        return os.path.join(self.out_dir, f"{name}.{ext}")
+
+    def _run_cprofile(self, name, fn, args, kwargs):
+        if not self._cprofile_busy.acquire(blocking=False):
+            # 다른 작업을 프로파일 중 → 다음 호출이 대신 뽑히도록 카운터를 되돌림
+            with self._lock:
+                self.calls -= 1
+                self.skipped += 1
+            return fn(*args, **kwargs)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                path = self._path(name, 'prof')
+                profiler.dump_stats(path)
+                self._done(path, time.perf_counter() - started)
+        finally:
+            self._cprofile_busy.release()
+
+    def _run_sampled(self, name, fn, args, kwargs):
+        sampler = StackSampler(threading.get_ident(), self.interval).start()
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sampler.stop()
+            path = self._path(name, 'folded')
+            sampler.write(path)
+            self._done(path, time.perf_counter() - started, f", 표본 {sampler.samples}개")
+
+    def _done(self, path, elapsed, extra=''):
+        with self._lock:
+            self.profiled += 1
+        self.log(f"   🔬 프로파일 저장: {path} ({elapsed:.1f}초{extra})")
+
+
+class MemoryTracker:
+    """
+    tracemalloc 스냅샷 비교.
+    maybe_snapshot(done)을 메인 루프에서 부르면 every개마다 직전 스냅샷 대비 증가 상위 top줄을 파일로 저장.
+    """
+
+    _IGNORE = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    )
+
+    def __init__(self, every=0, out_dir='profiles', top=15, frames=1):
+        self.every = every
+        self.out_dir = out_dir
+        self.top = top
+        self.frames = frames
+        self._previous = None
+        self._last_done = 0
+
+    @property
+    def enabled(self):
+        return self.every > 0
+
+    def start(self):
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._previous = self._take()
+
+    def _take(self):
+        return tracemalloc.take_snapshot().filter_traces(self._IGNORE)
+
+    def maybe_snapshot(self, done):
+        """done: 지금까지 끝난 제품 수. 스냅샷을 떴으면 요약 줄 리스트, 아니면 None"""
+        if not self.enabled or not tracemalloc.is_tracing() or done - self._last_done < self.every:
+            return None
+        self._last_done = done
+        snapshot = self._take()
+        stats = snapshot.compare_to(self._previous, 'lineno')[:self.top]
+        self._previous = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"memory_{done:05d}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"# 제품 {done}개 처리 후 / 추적 중 {current / 1e6:.1f}MB (최대 {peak / 1e6:.1f}MB)\n")
+            for stat in stats:
+                f.write(f"{stat}\n")
+        lines = [f"메모리 (제품 {done}개): 추적 중 {current / 1e6:.1f}MB, 최대 {peak / 1e6:.1f}MB → {path}"]
+        for stat in stats[:3]:
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                lines.append(f"  +{stat.size_diff / 1024:.0f}KB {os.path.basename(frame.filename)}:{frame.lineno}")
+        return lines
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
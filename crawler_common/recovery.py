@@ -0,0 +1,136 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# 실패 분류 / 드라이버 복구
+# -----------------------
+#
+# 예외를 세 가지로 나눠서, 브라우저가 실제로 죽은 경우에만 Chrome을 새로 띄웁니다.
+# - page: 요소 없음, 타임아웃, 클릭 실패 등 (드라이버는 멀쩡함 → 그대로 풀에 반환)
+# - session: 세션/창이 사라짐 (브라우저 재시작 필요)
+# - browser: chromedriver/Chrome 프로세스와 통신 불가 (브라우저 재시작 필요)
+# selenium을 import하지 않도록 예외 클래스 이름과 메시지로 판단합니다.
+
+FAILURE_PAGE = 'page'
+FAILURE_SESSION = 'session'
+FAILURE_BROWSER = 'browser'
+FAILURE_CLASSES = (FAILURE_PAGE, FAILURE_SESSION, FAILURE_BROWSER)
+
+SESSION_EXCEPTION_NAMES = {
+    'InvalidSessionIdException',
+    'NoSuchWindowException',
+}
+BROWSER_EXCEPTION_NAMES = {
+    'ConnectionError',
+    'ConnectionRefusedError',
+    'ConnectionResetError',
+    'BrokenPipeError',
+    'RemoteDisconnected',
+    'ProtocolError',
+    'MaxRetryError',
+    'NewConnectionError',
+    'URLError',
+}
+
+SESSION_MESSAGES = (
+    'invalid session id',
+    'no such window',
+    'target window already closed',
+    'session deleted',
+    'web view not found',
+)
+BROWSER_MESSAGES = (
+    'chrome not reachable',
+    'tab crashed',
+    'session not created',
+    'disconnected: not connected to devtools',
+    'unable to receive message from renderer',
+    'cannot connect to chrome',
+    'failed to establish a new connection',
+    'connection refused',
+    'max retries exceeded',
+)
+
+
+def _classify_exception(exc):
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    message = str(exc).lower()
+    if names & BROWSER_EXCEPTION_NAMES or any(m in message for m in BROWSER_MESSAGES):
+        return FAILURE_BROWSER
+    if names & SESSION_EXCEPTION_NAMES or any(m in message for m in SESSION_MESSAGES):
+        return FAILURE_SESSION
+    return FAILURE_PAGE
+
+
+def classify_failure(exc, driver=None):
+    """
+    예외 -> 'page' / 'session' / 'browser'.
+    예외만으로 page로 보이면 driver에 가벼운 명령을 보내 실제로 살아 있는지 한 번 더 확인.
+    """
+    failure = _classify_exception(exc)
+    if failure == FAILURE_PAGE and driver is not None:
+        try:
+            driver.execute_script("return 1;")
+        except Exception as probe_exc:
+            failure = _classify_exception(probe_exc)
+            if failure == FAILURE_PAGE:
+                failure = FAILURE_SESSION
+    return failure
+
+
+class FailureStats:
+    """실행 중 실패 유형별 횟수 (+ 브라우저 재시작 횟수)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {name: 0 for name in FAILURE_CLASSES}
+        self.restarts = 0
+
+    def record(self, failure):
+        with self._lock:
+            self.counts[failure] = self.counts.get(failure, 0) + 1
+
+    def record_restart(self):
+        with self._lock:
+            self.restarts += 1
+
+    def summary(self):
+        return (f"페이지 {self.counts[FAILURE_PAGE]}회 / 세션 {self.counts[FAILURE_SESSION]}회 / "
+                f"브라우저 {self.counts[FAILURE_BROWSER]}회 (브라우저 재시작 {self.restarts}회)")
+
+
+def recover_driver(driver_pool, driver, failure, create_driver, stats=None):
+    """
+    실패 유형에 맞게 드라이버를 풀에 되돌림.
+    - page: 진행 중인 로딩만 끊고(about:blank) 같은 드라이버 반환
+    - session/browser: 종료 후 create_driver()로 새로 만들어 반환
+    반환: 풀에 넣은 드라이버 (생성 실패 시 None)
+    """
+    if driver is None:
+        return None
+
+    if failure == FAILURE_PAGE:
+        try:
+            driver.get("about:blank")
+            driver_pool.put(driver)
+            return driver
+        except Exception:
+            # about:blank 이동도 안 되면 실제로는 세션이 죽은 것
+            failure = FAILURE_SESSION
+
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+    try:
+        new_driver = create_driver()
+    except Exception as e:
+        logger.error(f"  (E) 새 드라이버 생성 실패: {e}.")
+        return None
+    if stats is not None:
+        stats.record_restart()
+    driver_pool.put(new_driver)
+    return new_driver
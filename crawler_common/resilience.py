@@ -0,0 +1,208 @@
+import threading
+import time
+from collections import deque
+
+from crawler_common.recovery import FAILURE_PAGE
+
+# -----------------------
+# 재시도 예산 / 서킷 브레이커
+# -----------------------
+#
+# 사이트가 느려지거나 막히기 시작하면 모든 워커가 동시에 재시도를 쏟아붓게 됩니다.
+# - RetryBudget: 호스트별로 "정상 요청 수 × ratio" 만큼만 재시도를 허용 (토큰 버킷)
+# - CircuitBreaker: 최근 실패율이 기준을 넘으면 열림 → cooldown 동안 모든 워커 대기
+#   → 반열림(half-open)에서 워커 하나만 시험 요청 → 성공하면 닫힘, 실패하면 다시 열림
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+
+class RetryBudget:
+    """
+    재시도 토큰 버킷.
+    - 정상 요청마다 ratio 토큰 적립 (최대 max_tokens)
+    - 재시도 한 번에 토큰 1개 사용, 부족하면 재시도하지 않음
+    """
+
+    def __init__(self, ratio=0.2, initial_tokens=10.0, max_tokens=20.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = initial_tokens
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.denied = 0
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """재시도 가능하면 토큰을 쓰고 True"""
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+
+class CircuitBreaker:
+    """
+    실패율 기반 서킷 브레이커 (블로킹 acquire).
+    - window: 최근 결과 몇 개로 실패율을 볼지
+    - min_calls: 이 개수 이상 쌓여야 판단
+    - failure_rate: 이 비율 이상 실패면 열림
+    - cooldown: 열린 뒤 반열림까지 대기(초), 반열림 시험이 실패할 때마다 2배 (max_cooldown까지)
+    - clock: 시각 함수 (기본 time.monotonic, 시뮬레이션에서는 가상 시계)
+    - sleep: 주면 acquire()가 조건 변수 대신 이 함수로 기다렸다가 다시 확인 (가상 시계용)
+    """
+
+    def __init__(self, window=20, min_calls=10, failure_rate=0.5, cooldown=30.0, max_cooldown=300.0,
+                 clock=time.monotonic, sleep=None):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._sleep = sleep
+
+        self._cond = threading.Condition()
+        self._results = deque(maxlen=window)
+        self._state = STATE_CLOSED
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probe_owner = None
+
+        self.opened_count = 0
+        self.blocked_time = 0.0
+
+    @property
+    def state(self):
+        return self._state
+
+    def _open(self, now):
+        self._state = STATE_OPEN
+        self._open_until = now + self._cooldown
+        self._probe_owner = None
+        self.opened_count += 1
+
+    def _try_acquire_locked(self, me, now):
+        """허가면 0, 아니면 다시 확인하기까지 기다릴 시간(초)"""
+        if self._state == STATE_CLOSED:
+            return 0
+        if self._state == STATE_OPEN and now >= self._open_until:
+            self._state = STATE_HALF_OPEN
+            self._probe_owner = None
+        if self._state == STATE_HALF_OPEN and self._probe_owner is None:
+            self._probe_owner = me
+            return 0
+        # 열림 → 남은 cooldown만큼, 반열림 → 시험 결과가 나올 때까지 대기
+        if self._state == STATE_OPEN:
+            return max(0.01, self._open_until - now)
+        return 1.0
+
+    def acquire(self):
+        """요청 허가가 날 때까지 대기. 반열림 상태에서는 한 스레드만 통과(시험 요청)."""
+        me = threading.get_ident()
+        started = self._clock()
+        if self._sleep is not None:
+            while True:
+                with self._cond:
+                    timeout = self._try_acquire_locked(me, self._clock())
+                if not timeout:
+                    break
+                self._sleep(timeout)
+        else:
+            with self._cond:
+                while True:
+                    timeout = self._try_acquire_locked(me, self._clock())
+                    if not timeout:
+                        break
+                    self._cond.wait(timeout)
+        self.blocked_time += self._clock() - started
+
+    def record_success(self):
+        with self._cond:
+            if self._state == STATE_HALF_OPEN and self._probe_owner == threading.get_ident():
+                # 시험 성공 → 닫힘, 기록 초기화
+                self._state = STATE_CLOSED
+                self._cooldown = self.base_cooldown
+                self._results.clear()
+                self._probe_owner = None
+            self._results.append(True)
+            self._cond.notify_all()
+
+    def record_failure(self):
+        with self._cond:
+            now = self._clock()
+            if self._state == STATE_HALF_OPEN and self._probe_owner == threading.get_ident():
+                # 시험 실패 → 더 길게 다시 열림
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open(now)
+            else:
+                self._results.append(False)
+                if self._state == STATE_CLOSED and len(self._results) >= self.min_calls:
+                    failures = self._results.count(False)
+                    if failures / len(self._results) >= self.failure_rate:
+                        self._open(now)
+            self._cond.notify_all()
+
+    def release(self):
+        """결과를 판단할 수 없을 때(드라이버 문제 등) 시험 권한만 반납"""
+        with self._cond:
+            if self._state == STATE_HALF_OPEN and self._probe_owner == threading.get_ident():
+                self._probe_owner = None
+            self._cond.notify_all()
+
+
+class PerHost:
+    """호스트별 인스턴스 (처음 요청될 때 factory()로 생성)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, host):
+        with self._lock:
+            if host not in self._items:
+                self._items[host] = self._factory()
+            return self._items[host]
+
+    def items(self):
+        with self._lock:
+            return list(self._items.items())
+
+
+def guarded_call(breaker, budget, attempt_fn, max_attempts=3, classify=None,
+                 backoff_base=2.0, backoff_max=10.0, sleep=time.sleep):
+    """
+    서킷 브레이커 + 재시도 예산 아래에서 attempt_fn(attempt 번호) 실행.
+    - 페이지 수준 실패만 브레이커 실패로 기록하고 재시도 (예산이 남아 있을 때만)
+    - 세션/브라우저 실패는 사이트 문제가 아니므로 기록 없이 바로 예외 전달
+    """
+    for attempt in range(max_attempts):
+        breaker.acquire()
+        if attempt == 0:
+            budget.deposit()
+        try:
+            result = attempt_fn(attempt)
+        except Exception as e:
+            failure = classify(e) if classify else FAILURE_PAGE
+            if failure != FAILURE_PAGE:
+                breaker.release()
+                raise
+            breaker.record_failure()
+            if attempt + 1 >= max_attempts or not budget.withdraw():
+                raise
+            sleep(min(backoff_max, backoff_base * (2 ** attempt)))
+            continue
+        breaker.record_success()
+        return result
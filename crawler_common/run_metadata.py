@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import time
+
+# -----------------------
+# 실행 기록 (run metadata)
+# -----------------------
+#
+# 실행 한 번의 정보를 JSON 파일 하나에 모읍니다 (실행마다 덮어씀).
+# - 시간 제한에 걸려 일부 리뷰만 저장한 제품 목록 ('partial')
+# - 제품 페이지별 브라우저 지표 ('pages', 켜져 있을 때만): 느린 제품과 무거운 페이지를 비교하는 용도
+# - 그 밖의 요약 값은 set(key, value)로 추가
+
+
+class RunMetadata:
+    """
+    실행 기록 JSON.
+    형식: {"site", "brand", "started", "finished", "partial": [...], "pages": [...], <set()으로 넣은 키>...}
+    """
+
+    def __init__(self, path, site, brand):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {
+            'site': site,
+            'brand': brand,
+            'started': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'finished': None,
+            'partial': [],
+            'pages': [],
+        }
+
+    @property
+    def partial_count(self):
+        with self._lock:
+            return len(self._data['partial'])
+
+    def mark_partial(self, url, product_name, stages, review_count, elapsed):
+        """시간 제한으로 중간에 넘어간 제품 (저장된 리뷰는 유지)"""
+        with self._lock:
+            self._data['partial'].append({
+                'url': url,
+                'product_name': product_name,
+                'expired_stages': list(stages),
+                'review_count': review_count,
+                'elapsed': round(elapsed, 1),
+            })
+
+    def record_page(self, url, product_name, metrics, elapsed, review_count):
+        """제품 하나의 브라우저 지표 (browser_metrics.capture_page_metrics 결과)"""
+        with self._lock:
+            self._data['pages'].append({
+                'url': url,
+                'product_name': product_name,
+                'elapsed': round(elapsed, 1),
+                'review_count': review_count,
+                'metrics': metrics,
+            })
+
+    def page_summary(self, keys=('load_ms', 'resource_transfer_kb', 'dom_nodes', 'js_heap_used_mb')):
+        """기록된 페이지 수와 항목별 평균 (값이 있는 페이지만)"""
+        with self._lock:
+            pages = [page['metrics'] for page in self._data['pages']]
+        means = {}
+        for key in keys:
+            values = [m[key] for m in pages if m.get(key) is not None]
+            if values:
+                means[key] = round(sum(values) / len(values), 1)
+        return len(pages), means
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def save(self, finished=False):
+        if not self.path:
+            return
+        with self._lock:
+            if finished:
+                self._data['finished'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# 선택자 캐시 (마지막으로 맞은 선택자 우선)
+# -----------------------
+#
+# 후보 선택자를 하나씩 20초씩 기다리는 대신, 한 번의 execute_script로 모든 후보의
+# 일치 개수를 세고 그중 (지난번 성공한 선택자 우선으로) 처음 맞는 것을 고릅니다.
+# 사이트/그룹별 마지막 성공 선택자와 적중 횟수는 JSON으로 남겨 다음 실행에서 씁니다.
+
+PROBE_JS = """
+var selectors = arguments[0];
+var counts = [];
+for (var i = 0; i < selectors.length; i++) {
+    try {
+        counts.push(document.querySelectorAll(selectors[i]).length);
+    } catch (e) {
+        counts.push(0);
+    }
+}
+return counts;
+"""
+
+
+class SelectorRegistry:
+    """
+    사이트/그룹별 선택자 적중 기록.
+    파일 형식: {site: {group: {'last': css, 'probes': n, 'wins': {css: n}}}}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ 선택자 캐시({path}) 읽기 실패, 새로 시작: {e}")
+                self._data = {}
+
+    def _entry(self, site, group):
+        return self._data.setdefault(site, {}).setdefault(group, {'last': None, 'probes': 0, 'wins': {}})
+
+    def ordered(self, site, group, candidates):
+        """지난번 성공한 선택자를 맨 앞으로 (나머지는 원래 순서)"""
+        with self._lock:
+            last = self._entry(site, group)['last']
+        if last in candidates:
+            return [last] + [css for css in candidates if css != last]
+        return list(candidates)
+
+    def probe(self, driver, site, group, candidates, record=True):
+        """
+        모든 후보를 한 번에 확인해서 (선택자, 일치 개수) 반환. 없으면 (None, 0).
+        record=False면 적중 기록을 남기지 않음 (대기 중 반복 확인용).
+        """
+        order = self.ordered(site, group, candidates)
+        counts = driver.execute_script(PROBE_JS, order) or []
+        winner, count = next(((css, n) for css, n in zip(order, counts) if n), (None, 0))
+        if record:
+            self.record(site, group, winner)
+        return winner, count
+
+    def wait_for(self, driver, site, group, candidates, timeout=20, poll=0.25):
+        """
+        후보 중 하나라도 나타날 때까지 대기 (후보 수와 상관없이 최대 timeout초).
+        반환: (선택자, 일치 개수) 또는 (None, 0)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            winner, count = self.probe(driver, site, group, candidates, record=False)
+            if winner or time.monotonic() >= deadline:
+                self.record(site, group, winner)
+                return winner, count
+            time.sleep(poll)
+
+    def record(self, site, group, winner):
+        with self._lock:
+            entry = self._entry(site, group)
+            entry['probes'] += 1
+            if winner:
+                entry['last'] = winner
+                entry['wins'][winner] = entry['wins'].get(winner, 0) + 1
+
+    def hit_rates(self, site, group):
+        """{선택자: 적중률} (해당 그룹 확인 횟수 대비)"""
+        with self._lock:
+            entry = self._entry(site, group)
+            probes = entry['probes'] or 1
+            return {css: wins / probes for css, wins in entry['wins'].items()}
+
+    def summary(self, site):
+        """그룹별 한 줄 요약 리스트"""
+        lines = []
+        for group in sorted(self._data.get(site, {})):
+            rates = self.hit_rates(site, group)
+            best = ", ".join(f"{css} {rate:.0%}" for css, rate in sorted(rates.items(), key=lambda x: -x[1]))
+            lines.append(f"{group}: {best or '적중 없음'}")
+        return lines
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,617 @@
+import heapq
+import itertools
+import math
+import random
+import threading
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from crawler_common.fingerprint import FingerprintStore
+from crawler_common.frontier import BoundedSubmitter, TaskFrontier
+from crawler_common.metrics import CrawlMetrics
+from crawler_common.recovery import FAILURE_PAGE, FailureStats
+from crawler_common.resilience import CircuitBreaker, PerHost, RetryBudget
+from crawler_common.timing import StageTimings
+from crawler_common.tracing import TraceRecorder
+
+# -----------------------
+# 가상 시계 시뮬레이션
+# -----------------------
+#
+# 600개짜리 브랜드를 실제로 돌리면 RATE_LIMIT_DELAY_RANGE, 스크롤 대기, 60~180초 rate limit 대기 때문에
+# 몇 시간이 걸려서 워커 수/대기 정책을 바꿔 가며 비교하기 어렵습니다.
+# 여기서는 크롤러 스크립트(fragrantica main.py)의 작업 코드를 그대로 실행하고 시간만 가상 시계로 흐르게 해서
+# 몇 시간짜리 실행을 몇 초 안에 예측합니다.
+# - process_single_product(load_product_details/guarded_call, 페이지 스크롤, scrape_reviews), DriverPool,
+#   TaskFrontier/BoundedSubmitter, ThreadPoolExecutor를 그대로 씀 → 크롤러 코드가 바뀌면 시뮬레이션도 따라감
+# - 스크립트의 clock/sleep, stage_timings, tracer, 호스트별 브레이커를 VirtualScheduler용으로 바꿔 끼움
+#   (patched_runtime, 끝나면 원래대로 되돌림)
+# - 작업 스레드는 한 번에 하나만 실행되고 (가상) sleep 때 다음 차례로 넘어감 → seed가 같으면 결과도 같음
+# - 브라우저 대신 SimulatedDriver: 스크립트가 보내는 명령만 SiteModel(응답 지연, 리뷰 수, 차단 확률)로 흉내 내고,
+#   모르는 스크립트가 오면 실행 끝에 오류 → 크롤러의 페이지 조작이 바뀌면 여기도 맞춰야 함을 바로 알 수 있음
+
+
+def _lognormal(rng, median, sigma):
+    return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+class VirtualScheduler:
+    """
+    가상 시계 + 스레드 차례 관리.
+    - 참여 스레드(시뮬레이션을 돌리는 스레드, VirtualExecutor 작업 스레드) 중 한 번에 하나만 실행
+    - sleep(): 깨어날 가상 시각을 등록하고 가장 먼저 깨어날 스레드에게 차례를 넘김
+    - 호출하면 현재 가상 시각 (clock= 인자로 그대로 넘김)
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self._lock = threading.Lock()
+        self._ready = []  # (깨어날 시각, 순번, Event)
+        self._seq = itertools.count()
+        self._starting = 0  # 제출돼서 곧 스레드에서 시작될 작업 수 (모두 자리를 잡기 전에는 차례를 넘기지 않음)
+        self._idle = False  # 차례를 가진 스레드가 없음
+        self._waiter = None  # 작업이 끝나기를 기다리는 스레드 (VirtualExecutor.wait)
+        self._closed = False
+
+    def __call__(self):
+        return self.now
+
+    def _push(self, at, event, seq=None):
+        heapq.heappush(self._ready, (at, next(self._seq) if seq is None else seq, event))
+
+    def _switch(self):
+        """(락 안에서) 다음 스레드에 차례를 넘김"""
+        if self._starting or not self._ready:
+            self._idle = True
+            return
+        at, _, event = heapq.heappop(self._ready)
+        self.now = max(self.now, at)
+        self._idle = False
+        event.set()
+
+    def sleep(self, seconds):
+        event = threading.Event()
+        with self._lock:
+            if self._closed:
+                return
+            self._push(self.now + max(0.0, seconds), event)
+            self._switch()
+        event.wait()
+
+    def close(self):
+        """기다리는 스레드를 모두 풀어 줌 (이후 sleep은 바로 반환, 오류로 중단할 때)"""
+        with self._lock:
+            self._closed = True
+            events = [event for _, _, event in self._ready]
+            if self._waiter is not None:
+                events.append(self._waiter)
+            self._ready.clear()
+            self._waiter = None
+        for event in events:
+            event.set()
+
+
+class VirtualExecutor:
+    """
+    ThreadPoolExecutor를 감싸서 작업이 VirtualScheduler 차례에 맞춰 돌게 함.
+    BoundedSubmitter에 executor로 넘기고 wait=executor.wait로 완료 대기도 가상 시계에 맞춤.
+    """
+
+    def __init__(self, scheduler, max_workers):
+        self.scheduler = scheduler
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sim-worker')
+        self._active = 0  # 스레드를 차지한(또는 곧 차지할) 작업 수
+        self._queued = 0  # 스레드가 비기를 기다리는 작업 수
+        self._tokens = {}
+        self._finished = []  # 끝난 작업 (끝난 순서)
+
+    def submit(self, fn, *args):
+        scheduler = self.scheduler
+        token = object()
+        with scheduler._lock:
+            # 시작 순서는 스레드가 뜨는 순서가 아니라 제출 순서로 고정
+            seq = next(scheduler._seq)
+            if self._active < self.max_workers:
+                self._active += 1
+                scheduler._starting += 1
+            else:
+                self._queued += 1
+        future = self._executor.submit(self._run, token, seq, fn, *args)
+        self._tokens[future] = token
+        return future
+
+    def _run(self, token, seq, fn, *args):
+        scheduler = self.scheduler
+        event = threading.Event()
+        with scheduler._lock:
+            scheduler._starting -= 1
+            scheduler._push(scheduler.now, event, seq)
+            if scheduler._idle:
+                scheduler._switch()
+        event.wait()
+        try:
+            return fn(*args)
+        finally:
+            with scheduler._lock:
+                self._finished.append(token)
+                if self._queued:
+                    # 이 스레드가 바로 다음 작업을 꺼내 감
+                    self._queued -= 1
+                    scheduler._starting += 1
+                else:
+                    self._active -= 1
+                if scheduler._waiter is not None:
+                    scheduler._push(scheduler.now, scheduler._waiter)
+                    scheduler._waiter = None
+                scheduler._switch()
+
+    def wait(self, futures, return_when=FIRST_COMPLETED):
+        """
+        concurrent.futures.wait 대신 (끝난 작업이 없으면 차례를 넘기고 대기).
+        done은 끝난 순서대로의 list (같은 가상 시각에 여러 개가 끝나도 처리 순서가 매번 같도록)
+        """
+        scheduler = self.scheduler
+        futures = set(futures)
+        event = None
+        with scheduler._lock:
+            if not scheduler._closed and not any(self._tokens.get(f) in self._finished for f in futures):
+                event = scheduler._waiter = threading.Event()
+                scheduler._switch()
+        if event is not None:
+            event.wait()
+        with scheduler._lock:
+            finished = list(self._finished)
+        order = {token: i for i, token in enumerate(finished)}
+        done = sorted((f for f in futures if self._tokens.get(f) in order), key=lambda f: order[self._tokens[f]])
+        if not done and scheduler._closed:
+            done = list(wait(futures, return_when=return_when).done)
+        # 작업 함수는 끝났고 Future 결과만 곧 채워짐
+        wait(done, return_when=ALL_COMPLETED)
+        with scheduler._lock:
+            for future in done:
+                token = self._tokens.pop(future, None)
+                if token in self._finished:
+                    self._finished.remove(token)
+        return done, futures.difference(done)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class SiteModel:
+    """
+    사이트 동작 모델 (시간은 초).
+    - nav_median / nav_sigma: 페이지 접속(driver.get) 시간 로그정규 분포
+    - detail_median: 제품 페이지가 그려지고 정보를 읽기 시작할 때까지 (페이지마다 첫 요소 조회에 한 번)
+    - review_mu / review_sigma / max_reviews: 제품당 리뷰 수 로그정규 분포
+    - page_size: 처음/스크롤 한 번에 로드되는 리뷰 수, chunk_latency: 스크롤 후 다음 묶음이 붙기까지
+    - per_review: 리뷰 하나 추출 시간
+    - block_rate: 기본 차단 확률, safe_rpm을 넘는 분당 요청에는 overload_slope 비율로 추가
+      (예: safe_rpm=20, 분당 30회 → block_rate + 0.5 × overload_slope)
+    - detail_timeout: 차단된 페이지에서 요소를 기다리다 포기하는 시간 (WebDriverWait 제한)
+    - page_height: 제품 페이지 높이(px, 페이지 스크롤 횟수가 정해짐)
+    """
+
+    def __init__(self, nav_median=2.5, nav_sigma=0.5, detail_median=0.4, review_mu=3.2, review_sigma=1.2,
+                 max_reviews=3000, page_size=20, chunk_latency=1.0, per_review=0.02, block_rate=0.01,
+                 safe_rpm=20.0, overload_slope=0.5, detail_timeout=10.0, page_height=4000):
+        self.nav_median = nav_median
+        self.nav_sigma = nav_sigma
+        self.detail_median = detail_median
+        self.review_mu = review_mu
+        self.review_sigma = review_sigma
+        self.max_reviews = max_reviews
+        self.page_size = page_size
+        self.chunk_latency = chunk_latency
+        self.per_review = per_review
+        self.block_rate = block_rate
+        self.safe_rpm = safe_rpm
+        self.overload_slope = overload_slope
+        self.detail_timeout = detail_timeout
+        self.page_height = page_height
+
+    def review_count(self, rng):
+        return min(self.max_reviews, int(rng.lognormvariate(self.review_mu, self.review_sigma)))
+
+    def block_probability(self, rpm):
+        overload = max(0.0, rpm / self.safe_rpm - 1.0) if self.safe_rpm else 0.0
+        return min(0.95, self.block_rate + overload * self.overload_slope)
+
+    def calibrate(self, timings):
+        """
+        실제 실행의 타이밍 파일(StageTimings snapshot)로 지연 분포 중앙값을 맞춤.
+        navigation은 제품당 합계(상세 + 리뷰 재접속)라서 절반을 한 번 접속 시간으로 봄.
+        """
+        stages = timings.get('stages', {})
+        if stages.get('navigation', {}).get('p50'):
+            self.nav_median = stages['navigation']['p50'] / 2
+        if stages.get('detail_extraction', {}).get('p50'):
+            self.detail_median = stages['detail_extraction']['p50']
+        return self
+
+
+class SimulatedSite:
+    """가상 시계 위의 사이트 상태 (드라이버들이 같이 씀: 최근 1분 요청 수, 제품별 리뷰 수/노트 구성)"""
+
+    CHALLENGE_HTML = '<html><title>Attention Required! | Cloudflare</title><body>Sorry, you have been blocked</body></html>'
+    PAGE_HTML = '<html><body><h1 itemprop="name">{name}</h1><div id="all-reviews"></div></body></html>'
+    # 노트 구성 비율 (T/M/B 구분 17 : 노트 없음 2 : 'Fragrance Notes' 통합 1)
+    NOTE_LAYOUTS = ('pyramid',) * 17 + ('none',) * 2 + ('undivided',)
+
+    def __init__(self, model, scheduler, rng):
+        self.model = model
+        self.scheduler = scheduler
+        self.rng = rng
+        self._requests = []
+        self._products = {}
+        self.blocked_pages = 0
+        self.unknown_commands = set()
+
+    def product(self, url):
+        """제품 URL → {'reviews': 리뷰 수, 'notes': 노트 구성} (처음 접속할 때 정해짐)"""
+        if url not in self._products:
+            self._products[url] = {
+                'reviews': self.model.review_count(self.rng),
+                'notes': self.rng.choice(self.NOTE_LAYOUTS),
+            }
+        return self._products[url]
+
+    def navigate(self):
+        """페이지 접속 한 번 (접속 시간만큼 가상 대기, 차단됐으면 True)"""
+        now = self.scheduler.now
+        self._requests = [at for at in self._requests if now - at <= 60.0]
+        self._requests.append(now)
+        blocked = self.rng.random() < self.model.block_probability(len(self._requests))
+        if blocked:
+            self.blocked_pages += 1
+        self.scheduler.sleep(_lognormal(self.rng, self.model.nav_median, self.model.nav_sigma))
+        return blocked
+
+
+class _Element:
+    """SimulatedDriver가 돌려주는 요소 (text, get_attribute, 하위 요소 조회만)"""
+
+    def __init__(self, text='', attrs=None, children=None):
+        self.text = text
+        self._attrs = attrs or {}
+        self._children = children or {}
+
+    def get_attribute(self, name):
+        return self._attrs.get(name, '')
+
+    def find_element(self, by, value):
+        found = self._children.get(value)
+        if isinstance(found, list):
+            return found[0]
+        return found or _Element()
+
+    def find_elements(self, by, value):
+        found = self._children.get(value, [])
+        return found if isinstance(found, list) else [found]
+
+
+def _timeout_error(message):
+    # selenium은 크롤러 스크립트가 이미 import 한 상태 (시뮬레이션만 쓸 때는 필요 없음)
+    from selenium.common.exceptions import TimeoutException
+    return TimeoutException(message)
+
+
+class SimulatedDriver:
+    """
+    fragrantica main.py의 제품 작업이 보내는 WebDriver 명령만 흉내 내는 드라이버.
+    시간이 드는 곳: 접속(get), 페이지 첫 요소 조회(detail_median), 리뷰 추출(per_review × 개수),
+    차단 페이지에서 요소 대기(detail_timeout 후 TimeoutException), 스크롤 후 다음 리뷰 묶음 도착(chunk_latency)
+    """
+
+    # (스크립트에 들어 있는 표시, 처리 메서드) - 위에서부터 확인
+    SCRIPT_HANDLERS = (
+        ('Array.prototype.slice.call', '_new_reviews'),
+        ('scrollIntoView', '_scroll_reviews'),
+        ("querySelectorAll('div.fragrance-review-box", '_review_count'),
+        ("getElementById('all-reviews')", '_page_ok'),
+        ('!!document.querySelector', '_page_ok'),
+        ('firstChild.textContent', '_first_text'),
+        ('document.body.scrollHeight', '_page_height'),
+        ('window.scrollTo', '_noop'),
+        ('.click()', '_noop'),
+        ('return 1;', '_alive'),
+    )
+
+    def __init__(self, site):
+        self.site = site
+        self.current_url = 'about:blank'
+        self._page = None
+
+    # --- 탐색 ---
+
+    def get(self, url):
+        self.current_url = url
+        if url == 'about:blank':
+            self._page = None
+            return
+        blocked = self.site.navigate()
+        product_url = url.split('#')[0]
+        product = self.site.product(product_url)
+        self._page = {
+            'url': product_url,
+            'name': product_url.rstrip('/').split('/')[-1].rsplit('.', 1)[0],
+            'blocked': blocked,
+            'rendered': False,
+            'total': product['reviews'],
+            'notes': product['notes'],
+            'loaded': min(product['reviews'], self.site.model.page_size),
+            'pending': None,  # (도착 시각, 도착 후 리뷰 수)
+        }
+
+    @property
+    def page_source(self):
+        if self._page is None:
+            return ''
+        if self._page['blocked']:
+            return self.site.CHALLENGE_HTML
+        return self.site.PAGE_HTML.format(name=self._page['name'])
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        self._page = None
+
+    # --- 요소 조회 ---
+
+    def _require_page(self):
+        page = self._page
+        if page is None or page['blocked']:
+            self.site.scheduler.sleep(self.site.model.detail_timeout)
+            raise _timeout_error("simulated page has no content (blocked)")
+        if not page['rendered']:
+            page['rendered'] = True
+            self.site.scheduler.sleep(_lognormal(self.site.rng, self.site.model.detail_median, 0.3))
+        return page
+
+    def find_element(self, by, value):
+        return _Element(self._require_page()['name'])
+
+    def find_elements(self, by, value):
+        layout = self._require_page()['notes']
+        if 'Fragrance Notes' in value:
+            count = 4 if layout == 'undivided' else 0
+        elif ' Notes' in value:
+            count = 3 if layout == 'pyramid' else 0
+        else:
+            count = 0
+        return [_Element(f"note {i}") for i in range(1, count + 1)]
+
+    # --- 스크립트 ---
+
+    def execute_script(self, script, *args):
+        for marker, handler in self.SCRIPT_HANDLERS:
+            if marker in script:
+                return getattr(self, handler)(*args)
+        command = ' '.join(script.split())[:100]
+        self.site.unknown_commands.add(command)
+        raise NotImplementedError(f"SimulatedDriver가 모르는 스크립트: {command}")
+
+    def _alive(self, *args):
+        return 1
+
+    def _noop(self, *args):
+        return None
+
+    def _page_ok(self, *args):
+        return self._page is not None and not self._page['blocked']
+
+    def _first_text(self, element, *args):
+        return element.text
+
+    def _page_height(self, *args):
+        return self.site.model.page_height
+
+    def _visible(self):
+        page = self._page
+        if page['pending'] and self.site.scheduler.now >= page['pending'][0]:
+            page['loaded'] = page['pending'][1]
+            page['pending'] = None
+        return page['loaded']
+
+    def _review_count(self, *args):
+        return self._visible() if self._page_ok() else 0
+
+    def _scroll_reviews(self, *args):
+        if not self._page_ok():
+            return 0
+        page = self._page
+        loaded = self._visible()
+        if page['pending'] is None and loaded < page['total']:
+            model = self.site.model
+            arrives = self.site.scheduler.now + _lognormal(self.site.rng, model.chunk_latency, 0.3)
+            page['pending'] = (arrives, min(page['total'], loaded + model.page_size))
+        return loaded
+
+    def _new_reviews(self, selector, start_index):
+        if not self._page_ok():
+            return []
+        page = self._page
+        end = self._visible()
+        self.site.scheduler.sleep(max(0, end - start_index) * self.site.model.per_review)
+        return [self._review(page, i) for i in range(start_index, end)]
+
+    @staticmethod
+    def _review(page, i):
+        body = _Element(children={'p': [_Element(f"{page['url']} review {i}")]})
+        return _Element(children={
+            'meta[itemprop="name"]': _Element(attrs={'content': f"member{i}"}),
+            'span[itemprop="datePublished"]': _Element(f"day {i}"),
+            'div[itemprop="reviewBody"]': body,
+        })
+
+
+class _RowCounter:
+    """csv_writer 대신 파일별 행 수만 셈 (시뮬레이션은 파일을 만들지 않음)"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def submit(self, key, rows, fieldnames=None):
+        self.rows[key] = self.rows.get(key, 0) + len(rows)
+
+    def queue_depth(self):
+        return 0
+
+
+class CrawlPolicy:
+    """
+    비교할 크롤러 설정.
+    - workers: 드라이버 풀 / 작업 스레드 수
+    - delay_range: 제품 사이 딜레이 (스크립트의 RATE_LIMIT_DELAY_RANGE 자리)
+    - settings: 그 밖에 덮어쓸 스크립트 설정 상수 (예: {'BREAKER_COOLDOWN': 60, 'PRODUCT_DEADLINE': 600})
+    """
+
+    def __init__(self, workers=3, delay_range=(3.0, 7.0), settings=None):
+        self.workers = workers
+        self.delay_range = tuple(delay_range)
+        self.settings = dict(settings or {})
+
+
+@contextmanager
+def patched_runtime(module, scheduler, seed, policy):
+    """
+    크롤러 스크립트 모듈의 전역 상태를 가상 시계용으로 바꿨다가 끝나면 되돌림.
+    브레이커/재시도 예산/타이밍/지표는 실행마다 새로 만들고 (설정 값은 스크립트 상수 그대로), 출력 파일은 만들지 않음.
+    """
+    settings = dict(policy.settings, RATE_LIMIT_DELAY_RANGE=policy.delay_range)
+    unknown = sorted(name for name in settings if not hasattr(module, name))
+    if unknown:
+        raise ValueError(f"스크립트에 없는 설정: {', '.join(unknown)}")
+    saved = {name: getattr(module, name) for name in settings}
+    for name, value in settings.items():
+        setattr(module, name, value)
+
+    tracer = TraceRecorder(sleep=scheduler.sleep)
+    replacements = {
+        'clock': scheduler,
+        'sleep': scheduler.sleep,
+        'random': random.Random(f"{seed}:crawler"),
+        'tracer': tracer,
+        'stage_timings': StageTimings(tracer=tracer, clock=scheduler, sleep=scheduler.sleep),
+        'failure_stats': FailureStats(),
+        'crawl_metrics': CrawlMetrics(),
+        'retry_budgets': PerHost(lambda: RetryBudget(ratio=module.RETRY_BUDGET_RATIO)),
+        'host_breakers': PerHost(lambda: CircuitBreaker(
+            window=module.BREAKER_WINDOW, min_calls=module.BREAKER_WINDOW // 2,
+            failure_rate=module.BREAKER_FAILURE_RATE, cooldown=module.BREAKER_COOLDOWN,
+            clock=scheduler, sleep=scheduler.sleep,
+        )),
+        'csv_writer': _RowCounter(),
+        'review_store': FingerprintStore(None),
+    }
+    saved.update({name: getattr(module, name) for name in replacements})
+    for name, value in replacements.items():
+        setattr(module, name, value)
+    console_level = module.console.logger.level
+    module.console.set_level('ERROR')
+    try:
+        yield module
+    finally:
+        module.console.set_level(console_level)
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+class CrawlSimulation:
+    """
+    크롤러 스크립트 모듈(module)의 제품 작업 products개를 가상 시계로 실행.
+    driver_class: SimulatedDriver 대신 쓸 드라이버 (장애를 넣은 하위 클래스 등)
+    run() → 예상 소요 시간, 결과별 제품 수, 차단/브레이커/재시도 횟수, 단계별 시간(StageTimings snapshot)
+    """
+
+    def __init__(self, module, products, site=None, policy=None, seed=0, driver_class=None):
+        self.module = module
+        self.products = products
+        self.site_model = site or SiteModel()
+        self.policy = policy or CrawlPolicy()
+        self.seed = seed
+        self.driver_class = driver_class or SimulatedDriver
+
+    def product_urls(self):
+        base_url = self.module.BASE_URL
+        return [f"{base_url}/perfume/Simulated/Simulated-No-{i}-{1000 + i}.html" for i in range(1, self.products + 1)]
+
+    def run(self, max_time=None):
+        module, policy = self.module, self.policy
+        scheduler = VirtualScheduler()
+        site = SimulatedSite(self.site_model, scheduler, random.Random(f"{self.seed}:site"))
+        counts = {'success': 0, 'partial': 0, 'failed': 0, 'requeued': 0, 'reviews': 0}
+        finished = True
+
+        with patched_runtime(module, scheduler, self.seed, policy):
+            pool_class = type('SimulatedDriverPool', (module.DriverPool,), {
+                '_create_driver': lambda pool, user_agent=None: self.driver_class(site),
+            })
+            executor = VirtualExecutor(scheduler, policy.workers)
+            try:
+                driver_pool = pool_class(size=policy.workers)
+                started = scheduler.now
+                urls = self.product_urls()
+                frontier = TaskFrontier((url, i + 1, len(urls)) for i, url in enumerate(urls))
+                submitter = BoundedSubmitter(
+                    executor, module.process_single_product, frontier,
+                    policy.workers * module.SUBMIT_WINDOW_PER_WORKER, driver_pool, wait=executor.wait,
+                )
+                # main()의 결과 처리와 같은 규칙 (드라이버 문제로 실패한 제품은 한 번만 대기열 앞에 다시 넣음)
+                for future in submitter.as_completed():
+                    result = future.result()
+                    if result['status'] == 'success':
+                        counts['partial' if result['partial'] else 'success'] += 1
+                        counts['reviews'] += result['review_count']
+                    elif result['failure'] != FAILURE_PAGE and frontier.requeue(submitter.task_for(future), result['url']):
+                        counts['requeued'] += 1
+                    else:
+                        counts['failed'] += 1
+                    if max_time is not None and scheduler.now - started >= max_time and finished:
+                        submitter.stop()
+                        finished = False
+                wall = scheduler.now - started
+                driver_pool.close_all()
+            except BaseException:
+                scheduler.close()
+                raise
+            finally:
+                executor.shutdown()
+
+            if site.unknown_commands:
+                raise RuntimeError(
+                    "SimulatedDriver가 처리하지 못한 명령이 있습니다 (크롤러의 페이지 조작이 바뀌었으면 "
+                    f"SimulatedDriver.SCRIPT_HANDLERS를 맞춰 주세요): {sorted(site.unknown_commands)}"
+                )
+            breakers = [breaker for _, breaker in module.host_breakers.items()]
+            budgets = [budget for _, budget in module.retry_budgets.items()]
+            review_backoffs = sum(value for _, _, value in module.crawl_metrics.rate_limit_events.samples())
+            timings = module.stage_timings.snapshot()['stages']
+
+        done = counts['success'] + counts['partial'] + counts['failed']
+        return {
+            'products': self.products,
+            'workers': policy.workers,
+            'delay_range': list(policy.delay_range),
+            'finished': finished,
+            'wall_time': round(wall, 1),
+            'products_per_hour': round(done / wall * 3600, 1) if wall else None,
+            'success': counts['success'],
+            'partial': counts['partial'],
+            'failed': counts['failed'],
+            'requeued': counts['requeued'],
+            'reviews': counts['reviews'],
+            'blocked_pages': site.blocked_pages,
+            'review_backoffs': review_backoffs,
+            'breaker_opened': sum(breaker.opened_count for breaker in breakers),
+            'retries': sum(budget.retries for budget in budgets),
+            'retries_denied': sum(budget.denied for budget in budgets),
+            'timings': timings,
+        }
+
+
+def simulate(module, products, site=None, policy=None, seed=0, max_time=None):
+    """CrawlSimulation 한 번 실행 결과 (module: fragrantica main.py를 import 한 모듈)"""
+    return CrawlSimulation(module, products, site, policy, seed).run(max_time)
@@ -0,0 +1,258 @@
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import time
+
+from crawler_common.fingerprint import review_fingerprint
+from crawler_common.writer import CsvSink
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# 추가 출력 대상 (Parquet / SQLite)
+# -----------------------
+#
+# AsyncWriter에 CSV와 함께(또는 대신) 등록하는 출력 대상들.
+# 모두 writer 스레드에서만 호출되므로 별도 락이 필요 없습니다.
+
+# 숫자로 다루는 컬럼 (그 외는 모두 문자열)
+PARQUET_COLUMN_TYPES = {
+    'release_year': 'int16',
+    'reviewer_total_reviews': 'int32',
+    'award_count': 'int32',
+}
+
+
+# 같은 프로세스 안에서 part 파일 이름이 겹치지 않게 붙이는 번호
+_PART_SEQ = itertools.count(1)
+
+
+def brand_slug(keyword):
+    """'acqua di parma' -> 'acqua-di-parma' (파티션 디렉터리 이름용)"""
+    return keyword.lower().strip().replace(" ", "-")
+
+
+_THOUSANDS_RE = re.compile(r'(?<=\d)[,\s](?=\d{3}(?!\d))')
+
+
+def _to_int(value):
+    """'1,234 reviews' -> 1234 (천 단위 구분자 제거 후 첫 숫자)"""
+    if value is None:
+        return None
+    match = re.search(r'\d+', _THOUSANDS_RE.sub('', str(value)))
+    return int(match.group(0)) if match else None
+
+
+class ParquetSink:
+    """
+    site/brand 파티션 Parquet 출력.
+    경로: {root}/{kind}/site={site}/brand={brand}/part-{시작시각}-{pid}-{번호}.parquet
+    (같은 초에 여러 개를 열거나 여러 프로세스가 같은 폴더에 써도 이름이 겹치지 않음)
+    - kind: 'perfumes' 또는 'reviews'
+    - flush 때 row_group_rows 이상 쌓여 있으면 row group 하나로 기록
+      (리뷰는 스크롤 묶음 단위로 들어오므로 제품 경계와 상관없이 끊김 → 한 제품이 두 row group에 걸칠 수 있음)
+    - 파일 footer는 close() 때 기록됨. 그 전까지는 '.part-...parquet.inprogress'로 쓰고 close()에서 이름을 바꿈
+      → 실행이 중간에 죽으면 .inprogress 파일만 남고 읽을 수 없음 (숨김 파일이라 pyarrow dataset은 무시)
+        그 실행의 행은 CSV/SQLite 출력(flush마다 기록)에서 확인, 다시 실행하면 새 part 파일에 씀
+    """
+
+    def __init__(self, root, site, brand, kind, fieldnames, row_group_rows=500, compression='zstd'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow)") from e
+
+        self._pa = pa
+        self._pq = pq
+        self.fieldnames = list(fieldnames)
+        self.row_group_rows = row_group_rows
+
+        self.schema = pa.schema([
+            (name, getattr(pa, PARQUET_COLUMN_TYPES.get(name, 'string'))())
+            for name in self.fieldnames
+        ])
+
+        partition_dir = os.path.join(root, kind, f"site={site}", f"brand={brand_slug(brand)}")
+        os.makedirs(partition_dir, exist_ok=True)
+        part = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_PART_SEQ):04d}.parquet"
+        self.filename = os.path.join(partition_dir, part)
+        self._temp_filename = os.path.join(partition_dir, f".{part}.inprogress")
+
+        self._file = open(self._temp_filename, 'wb')
+        self._writer = pq.ParquetWriter(self._file, self.schema, compression=compression)
+        self._buffer = []
+
+    def _convert(self, rows):
+        columns = {}
+        for name in self.fieldnames:
+            values = [row.get(name) for row in rows]
+            if name in PARQUET_COLUMN_TYPES:
+                values = [_to_int(v) for v in values]
+            else:
+                values = [None if v is None else str(v) for v in values]
+            columns[name] = values
+        return self._pa.table(columns, schema=self.schema)
+
+    def _write_row_group(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        self._writer.write_table(self._convert(rows), row_group_size=len(rows))
+
+    def write_rows(self, rows):
+        self._buffer.extend(rows)
+
+    def flush(self):
+        if len(self._buffer) >= self.row_group_rows:
+            self._write_row_group()
+            self._file.flush()
+
+    def fsync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        try:
+            self._write_row_group()
+            self._writer.close()
+        finally:
+            self._file.close()
+        os.replace(self._temp_filename, self.filename)
+
+
+class SqliteSink:
+    """
+    SQLite 저장소 (upsert).
+    - {site}_perfumes: url 기본키
+    - {site}_reviews: 리뷰 지문(fingerprint) 기본키, product_url / review_date 인덱스
+    재실행해도 같은 행은 갱신만 되므로 중복이 쌓이지 않습니다.
+    flush 한 번이 트랜잭션 하나 (executemany 배치).
+    """
+
+    def __init__(self, db_path, site, brand, kind, fieldnames):
+        self.filename = db_path
+        self.site = site
+        self.brand = brand_slug(brand)
+        self.kind = kind
+        self.table = f"{site}_{kind}"
+        self.fieldnames = [name for name in fieldnames if name not in ('url', 'product_url')]
+        self._buffer = []
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        ensure_schema(self._conn, site, kind, self.fieldnames)
+
+        if kind == 'perfumes':
+            self._key_columns = ['url']
+        else:
+            self._key_columns = ['fingerprint', 'product_url']
+        columns = self._key_columns + ['brand'] + self.fieldnames + ['updated_at']
+        conflict_key = 'url' if kind == 'perfumes' else 'fingerprint'
+        column_sql = ", ".join(f'"{c}"' for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f'"{c}"=excluded."{c}"' for c in columns if c != conflict_key)
+        self._sql = (
+            f'INSERT INTO "{self.table}" ({column_sql}) VALUES ({placeholders}) '
+            f'ON CONFLICT("{conflict_key}") DO UPDATE SET {updates}'
+        )
+
+    def _params(self, row, now):
+        if self.kind == 'perfumes':
+            keys = [row.get('url') or row.get('product_name', '')]
+        else:
+            keys = [review_fingerprint(self.site, row), row.get('product_url', '')]
+        return keys + [self.brand] + [row.get(name, '') for name in self.fieldnames] + [now]
+
+    def write_rows(self, rows):
+        self._buffer.extend(rows)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+        with self._conn:
+            self._conn.executemany(self._sql, [self._params(row, now) for row in rows])
+
+    def fsync(self):
+        # 커밋 시점에 SQLite가 WAL 기록을 처리
+        pass
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
+
+
+def ensure_schema(conn, site, kind, fieldnames):
+    """테이블/인덱스 생성. 기존 테이블에 없는 컬럼은 추가."""
+    table = f"{site}_{kind}"
+    if kind == 'perfumes':
+        key_sql = '"url" TEXT PRIMARY KEY'
+    else:
+        key_sql = '"fingerprint" INTEGER PRIMARY KEY, "product_url" TEXT'
+    field_sql = ", ".join(f'"{name}" TEXT' for name in fieldnames)
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS "{table}" ({key_sql}, "brand" TEXT, {field_sql}, "updated_at" TEXT)'
+    )
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+    for name in fieldnames:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" TEXT')
+
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_brand" ON "{table}" ("brand")')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_product" ON "{table}" ("product_name")')
+    if kind == 'reviews':
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_product_url" ON "{table}" ("product_url")')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_date" ON "{table}" ("review_date")')
+    conn.commit()
+
+
+def products_missing_reviews(db_path, site, brand):
+    """
+    리뷰가 한 건도 저장되지 않은 제품 [(url, product_name), ...].
+    (product_url 인덱스 조회 — CSV 전체 스캔 불필요)
+    리뷰가 원래 0개인 제품도 포함되지만, 그런 제품은 다시 수집해도 금방 끝납니다.
+    """
+    if not os.path.exists(db_path):
+        return []
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        if f"{site}_perfumes" not in tables:
+            return []
+        if f"{site}_reviews" not in tables:
+            return list(conn.execute(
+                f'SELECT url, product_name FROM "{site}_perfumes" WHERE brand = ?', (brand_slug(brand),)
+            ))
+        return list(conn.execute(
+            f'SELECT p.url, p.product_name FROM "{site}_perfumes" p '
+            f'WHERE p.brand = ? AND NOT EXISTS '
+            f'(SELECT 1 FROM "{site}_reviews" r WHERE r.product_url = p.url)',
+            (brand_slug(brand),)
+        ))
+    finally:
+        conn.close()
+
+
+def configure_outputs(writer, site, brand, formats, outputs, parquet_dir='parquet', sqlite_path='crawl.sqlite3'):
+    """
+    출력 형식별 대상을 writer에 등록.
+    outputs: {csv 파일명: (kind, fieldnames)} — 스크래퍼는 계속 csv 파일명을 key로 write_batch_to_csv 호출
+    """
+    for filename, (kind, fieldnames) in outputs.items():
+        if 'csv' in formats:
+            writer.add_sink(filename, CsvSink(filename, fieldnames))
+        if 'parquet' in formats:
+            try:
+                sink = ParquetSink(parquet_dir, site, brand, kind, fieldnames)
+                writer.add_sink(filename, sink)
+                logger.info(f"✅ Parquet 출력: {sink.filename}")
+            except ImportError as e:
+                logger.warning(f"⚠️ {e} → Parquet 출력 건너뜀")
+        if 'sqlite' in formats:
+            writer.add_sink(filename, SqliteSink(sqlite_path, site, brand, kind, fieldnames))
@@ -0,0 +1,207 @@
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# -----------------------
+# 단계별 소요 시간 히스토그램
+# -----------------------
+#
+# 제품 작업 하나를 단계(풀 대기, 접속, 스크롤, 정보 추출, 리뷰 로딩/추출, CSV 기록, 대기)로 나눠
+# 제품마다 단계별 합계를 히스토그램에 넣고 p50/p95/p99를 JSON으로 남깁니다.
+# - 단계는 중첩될 수 있고, 바깥 단계에는 안쪽 단계를 뺀 시간만 들어감
+#   (예: review_loading 안의 review_extraction / csv_write / rate_limit_sleep은 따로 집계)
+# - begin_task() ~ end_task() 사이(같은 스레드)의 기록은 제품 단위로 합쳐서 한 번에 반영,
+#   작업 밖에서 잰 시간은 바로 반영
+# - tracer(TraceRecorder)를 넘기면 같은 구간을 타임라인 이벤트로도 남김 (이쪽은 안쪽 단계 포함 시간)
+# - 히스토그램은 로그 버킷(약 5% 간격)이라 샘플 수와 관계없이 메모리가 일정
+
+TASK_STAGE = 'task'
+
+
+class LatencyHistogram:
+    """로그 버킷 히스토그램 (초 단위, 백분위 오차 약 ±2.5%)"""
+
+    def __init__(self, growth=1.05, min_value=0.001):
+        self._log_growth = math.log(growth)
+        self.growth = growth
+        self.min_value = min_value
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value <= self.min_value:
+            return 0
+        return int(math.ceil(math.log(value / self.min_value) / self._log_growth))
+
+    def observe(self, value):
+        index = self._index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        """q(0~100) 백분위 값 (버킷의 기하 중앙값, 실제 최솟값~최댓값 범위로 자름)"""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * q / 100.0)))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                value = self.min_value * self.growth ** (index - 0.5) if index else self.min_value
+                return max(self.min, min(self.max, value))
+        return self.max
+
+    def snapshot(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total': round(self.total, 3),
+            'mean': round(self.total / self.count, 3),
+            'min': round(self.min, 3),
+            'p50': round(self.percentile(50), 3),
+            'p95': round(self.percentile(95), 3),
+            'p99': round(self.percentile(99), 3),
+            'max': round(self.max, 3),
+        }
+
+
+class StageTimings:
+    """
+    단계 이름별 LatencyHistogram 모음.
+    - time(stage): with 블록 시간 측정 (안쪽 단계 시간은 제외)
+    - sleep(stage, seconds): 측정하면서 대기
+    - maybe_dump(): dump_interval초마다 JSON 저장 (메인 루프에서 호출)
+    - clock / sleep: 구간 측정/대기 함수 (시뮬레이션에서는 가상 시계)
+    """
+
+    def __init__(self, dump_path=None, dump_interval=60.0, tracer=None, clock=time.perf_counter, sleep=time.sleep):
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.tracer = tracer
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._hists = {}
+        self._started = time.time()
+        self._last_dump = time.monotonic()
+        self.tasks = 0
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            hist = self._hists.get(stage)
+            if hist is None:
+                hist = self._hists[stage] = LatencyHistogram()
+            hist.observe(seconds)
+
+    def _add(self, stage, seconds):
+        totals = getattr(self._local, 'totals', None)
+        if totals is None:
+            self.observe(stage, seconds)
+        else:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+
+    def begin_task(self, label=None):
+        """현재 스레드에서 제품 작업 시작 (이후 기록은 end_task()에서 한 번에 반영)"""
+        self._local.totals = {}
+        self._local.task_label = label
+        self._local.task_started = self._clock()
+        self._stack().clear()
+
+    def end_task(self):
+        totals = getattr(self._local, 'totals', None)
+        if totals is None:
+            return
+        self._local.totals = None
+        for stage, seconds in totals.items():
+            self.observe(stage, seconds)
+        elapsed = self._clock() - self._local.task_started
+        self.observe(TASK_STAGE, elapsed)
+        if self.tracer is not None:
+            self.tracer.complete(TASK_STAGE, self._local.task_started, elapsed, cat='task',
+                                 product=self._local.task_label)
+        with self._lock:
+            self.tasks += 1
+
+    @contextmanager
+    def time(self, stage):
+        stack = self._stack()
+        # [단계, 시작 시각, 안쪽 단계가 쓴 시간]
+        frame = [stage, self._clock(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = self._clock() - frame[1]
+            if stack:
+                stack[-1][2] += elapsed
+            self._add(stage, elapsed - frame[2])
+            if self.tracer is not None:
+                self.tracer.complete(stage, frame[1], elapsed)
+
+    def sleep(self, stage, seconds):
+        with self.time(stage):
+            self._sleep(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            stages = {stage: hist.snapshot() for stage, hist in sorted(self._hists.items())}
+            tasks = self.tasks
+        return {
+            'updated': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'uptime': round(time.time() - self._started, 1),
+            'tasks': tasks,
+            'stages': stages,
+        }
+
+    def dump(self):
+        if not self.dump_path:
+            return
+        data = self.snapshot()
+        tmp_path = self.dump_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.dump_path)
+        self._last_dump = time.monotonic()
+
+    def maybe_dump(self):
+        if time.monotonic() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    def summary(self):
+        """단계별 한 줄 요약 리스트 (합계가 큰 단계부터)"""
+        stages = self.snapshot()['stages']
+        lines = []
+        for stage, s in sorted(stages.items(), key=lambda item: -item[1].get('total', 0)):
+            if not s['count'] or stage == TASK_STAGE:
+                continue
+            lines.append(f"{stage}: 합계 {s['total']:.0f}초 / p50 {s['p50']:.1f}초 / "
+                         f"p95 {s['p95']:.1f}초 / p99 {s['p99']:.1f}초 (n={s['count']})")
+        return lines
+
+
+def previous_task_mean(path, default):
+    """지난 실행의 타이밍 파일에서 제품당 평균 소요 시간 (없으면 default)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            mean = json.load(f)['stages'][TASK_STAGE]['mean']
+    except (OSError, ValueError, KeyError, TypeError):
+        return default
+    return mean or default
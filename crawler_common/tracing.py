@@ -0,0 +1,151 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# -----------------------
+# 실행 타임라인 (Chrome trace-event 형식)
+# -----------------------
+#
+# 단계별 히스토그램(timing.py)은 합계/분위수만 남아서 "워커 2가 왜 3분 동안 놀았는지"는 안 보입니다.
+# 추적 모드를 켜면 워커 스레드별 구간(span)을 trace-event JSON으로 남기고,
+# chrome://tracing 이나 https://ui.perfetto.dev 에서 실행 전체를 타임라인으로 볼 수 있습니다.
+# - 기본은 꺼짐: start(path)를 호출하기 전에는 모든 기록 함수가 바로 반환
+# - 이벤트는 모아 두었다가 flush_events개마다 파일에 이어 씀 (중간에 죽어도 그때까지는 남음,
+#   닫는 ']'가 없는 파일도 두 뷰어 모두 읽음)
+# - 스레드 이름은 처음 기록할 때 메타데이터 이벤트로 한 번 남김
+
+TRACE_PID = os.getpid()
+
+
+class TraceRecorder:
+    """
+    trace-event 기록기.
+    - span(name, **args): with 블록 구간 ('X' 이벤트)
+    - complete(name, start, duration): 이미 잰 구간 (start는 time.perf_counter() 값)
+    - sleep(name, seconds): 구간으로 기록하면서 대기
+    - instant(name, **args): 시점 표시 ('i' 이벤트)
+    - counter(name, **values): 값 변화 트랙 ('C' 이벤트, 진행 중 작업 수 등)
+    - sleep: 대기 함수 (시뮬레이션에서는 가상 시계, 이때는 기록을 켜지 않음)
+    """
+
+    def __init__(self, flush_events=2000, max_events=2_000_000, sleep=time.sleep):
+        self.path = None
+        self._sleep = sleep
+        self.flush_events = flush_events
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._file = None
+        self._buffer = []
+        self._written = False
+        self._named_threads = set()
+        self._origin = time.perf_counter()
+        self.events = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self):
+        return self._file is not None
+
+    def start(self, path):
+        """path에 기록 시작 (기존 파일은 덮어씀)"""
+        with self._lock:
+            if self._file is not None:
+                return
+            self.path = path
+            self._file = open(path, 'w', encoding='utf-8')
+            self._file.write('[\n')
+            self._origin = time.perf_counter()
+        atexit.register(self.close)
+
+    def _ts(self, perf_time):
+        return round((perf_time - self._origin) * 1_000_000, 1)
+
+    def _emit(self, event):
+        thread = threading.current_thread()
+        tid = thread.ident
+        event['pid'] = TRACE_PID
+        event['tid'] = tid
+        with self._lock:
+            if self._file is None:
+                return
+            if self.events >= self.max_events:
+                self.dropped += 1
+                return
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self._buffer.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': TRACE_PID, 'tid': tid,
+                    'args': {'name': thread.name},
+                })
+            self._buffer.append(event)
+            self.events += 1
+            if len(self._buffer) >= self.flush_events:
+                self._flush_locked()
+
+    def complete(self, name, start, duration, cat='stage', **args):
+        if self._file is None:
+            return
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': self._ts(start), 'dur': round(duration * 1_000_000, 1)}
+        if args:
+            event['args'] = args
+        self._emit(event)
+
+    @contextmanager
+    def span(self, name, cat='stage', **args):
+        if self._file is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, start, time.perf_counter() - start, cat, **args)
+
+    def sleep(self, name, seconds, **args):
+        with self.span(name, cat='sleep', **args):
+            self._sleep(seconds)
+
+    def instant(self, name, cat='mark', **args):
+        if self._file is None:
+            return
+        event = {'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': self._ts(time.perf_counter())}
+        if args:
+            event['args'] = args
+        self._emit(event)
+
+    def counter(self, name, **values):
+        if self._file is None:
+            return
+        self._emit({'name': name, 'ph': 'C', 'ts': self._ts(time.perf_counter()), 'args': values})
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        chunks = [json.dumps(e, ensure_ascii=False) for e in self._buffer]
+        # 이벤트 사이 구분 쉼표는 앞에 붙임 (파일이 어느 시점에 끊겨도 마지막 이벤트까지 유효)
+        self._file.write((',\n' if self._written else '') + ',\n'.join(chunks))
+        self._written = True
+        self._file.flush()
+        self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+
+    def close(self):
+        """남은 이벤트를 쓰고 JSON 배열을 닫음"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append({
+                'name': 'process_name', 'ph': 'M', 'pid': TRACE_PID, 'tid': 0,
+                'args': {'name': f'crawler (이벤트 {self.events}개, 버림 {self.dropped}개)'},
+            })
+            self._flush_locked()
+            self._file.write('\n]\n')
+            self._file.close()
+            self._file = None
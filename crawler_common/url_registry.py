@@ -0,0 +1,175 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# -----------------------
+# 제품 URL 정규화 / 수집 이력
+# -----------------------
+#
+# 같은 제품이 다른 브랜드 키워드로, 또는 재실행 때 다시 수집되지 않도록
+# 정규화한 URL을 디스크(SQLite)에 남기고, 조회는 Bloom filter로 먼저 거릅니다.
+# Bloom filter 크기는 capacity로 고정되므로 URL이 늘어도 메모리는 일정합니다.
+
+# 제품 식별과 무관한 쿼리 파라미터 (추적/정렬/세션용)
+NOISE_QUERY_PARAMS = {
+    'fbclid', 'gclid', 'msclkid', 'ref', 'referrer', 'source', 'src',
+    'sort', 'order', 'page', 'lang', 'sid', 'session', 'phpsessid',
+}
+NOISE_QUERY_PREFIXES = ('utm_',)
+
+# 경로 끝에 붙어도 같은 페이지인 변형
+TRAILING_PATH_VARIANTS = ('/index.html', '/index.php', '/')
+
+
+def canonicalize_url(url):
+    """
+    제품 URL 정규화.
+    - scheme/host 소문자, 기본 포트 제거
+    - fragment(#all-reviews 등) 제거
+    - 추적/정렬 파라미터 제거, 남은 파라미터는 정렬
+    - 끝의 '/' 또는 '/index.html' 제거
+    """
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'https').lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not (scheme == 'http' and parts.port == 80 or scheme == 'https' and parts.port == 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    for variant in TRAILING_PATH_VARIANTS:
+        if path.endswith(variant) and len(path) > len(variant):
+            path = path[:-len(variant)]
+            break
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in NOISE_QUERY_PARAMS and not key.lower().startswith(NOISE_QUERY_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class BloomFilter:
+    """
+    고정 크기 Bloom filter (bytearray 비트 배열).
+    capacity 개를 넣었을 때 오탐률이 error_rate가 되도록 크기/해시 수를 정합니다.
+    해시는 blake2b 128비트 하나를 둘로 나눠 double hashing.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def size_bytes(self):
+        return len(self._bits)
+
+
+class SeenUrlRegistry:
+    """
+    사이트 간 / 실행 간 공유되는 수집 완료 제품 URL 목록.
+    - 정확한 목록: SQLite 테이블 seen_urls (url 기본키)
+    - 빠른 조회: Bloom filter → "없음"이면 DB 조회 없이 바로 판정, "있을 수도"일 때만 DB 확인
+    - 시작 시 DB를 커서로 훑어 Bloom filter만 채움 (URL 문자열을 메모리에 들고 있지 않음)
+    """
+
+    def __init__(self, db_path, capacity=1_000_000, error_rate=0.001):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+
+        self.bloom_negatives = 0
+        self.exact_lookups = 0
+        self.false_positives = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS "seen_urls" '
+            '("url" TEXT PRIMARY KEY, "site" TEXT, "brand" TEXT, "first_seen" TEXT)'
+        )
+        self._conn.commit()
+        for (url,) in self._conn.execute('SELECT url FROM "seen_urls"'):
+            self._bloom.add(url)
+
+    def __len__(self):
+        return self._bloom.count
+
+    def __contains__(self, url):
+        key = canonicalize_url(url)
+        with self._lock:
+            if key not in self._bloom:
+                self.bloom_negatives += 1
+                return False
+            self.exact_lookups += 1
+            row = self._conn.execute('SELECT 1 FROM "seen_urls" WHERE url = ?', (key,)).fetchone()
+            if row is None:
+                self.false_positives += 1
+                return False
+            return True
+
+    def add(self, url, site='', brand=''):
+        """수집 완료 표시. 새로 추가되면 True."""
+        key = canonicalize_url(url)
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO "seen_urls" (url, site, brand, first_seen) VALUES (?, ?, ?, ?)',
+                (key, site, brand, time.strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                self._bloom.add(key)
+                return True
+            return False
+
+    def filter_unseen(self, urls):
+        """수집 이력이 없는 URL만 (정규화 + 목록 내 중복 제거, 순서 유지)"""
+        unseen = []
+        batch = set()
+        for url in urls:
+            key = canonicalize_url(url)
+            if key in batch:
+                continue
+            batch.add(key)
+            if key not in self:
+                unseen.append(key)
+        return unseen
+
+    def stats(self):
+        return {
+            'urls': len(self),
+            'bloom_bytes': self._bloom.size_bytes,
+            'bloom_negatives': self.bloom_negatives,
+            'exact_lookups': self.exact_lookups,
+            'false_positives': self.false_positives,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
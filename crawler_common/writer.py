@@ -0,0 +1,260 @@
+import atexit
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# 비동기 출력 writer
+# -----------------------
+#
+# 워커는 행(row)을 큐에 넣기만 하고, 디스크 I/O는 전용 writer 스레드 하나가 담당합니다.
+# 파일 핸들은 열린 채로 유지되며, 행 수/시간 기준으로 모아서 flush 하고
+# fsync 주기는 설정으로 조절합니다.
+# 행이 파일에 들어간 뒤에 해야 하는 일(리뷰 지문 저장 등)은 add_flush_listener로 등록합니다.
+
+
+class CsvSink:
+    """열린 파일 핸들을 유지하는 CSV 출력 대상"""
+
+    def __init__(self, filename, fieldnames):
+        self.filename = filename
+        self.fieldnames = fieldnames
+        write_header = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self._file = open(filename, 'a', newline='', encoding='utf-8-sig')
+        # 출력 대상별 부가 컬럼(url 등)은 CSV 헤더에 없으면 무시
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            self._writer.writeheader()
+
+    def write_rows(self, rows):
+        self._writer.writerows(rows)
+
+    def flush(self):
+        self._file.flush()
+
+    def fsync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        try:
+            self._file.flush()
+        finally:
+            self._file.close()
+
+
+class AsyncWriter:
+    """
+    큐 기반 단일 writer 스레드.
+    - flush_rows: 이 행 수만큼 쌓이면 즉시 flush
+    - flush_interval: 마지막 flush 후 이 시간(초)이 지나면 flush
+    - fsync_interval: 마지막 fsync 후 이 시간(초)이 지나면 fsync (0이면 매 flush, None이면 안 함)
+    - tracer: TraceRecorder를 넘기면 flush마다 writer 스레드 구간을 기록
+    """
+
+    _STOP = object()
+
+    def __init__(self, flush_rows=200, flush_interval=1.0, fsync_interval=10.0, tracer=None):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.tracer = tracer
+
+        self._queue = queue.Queue()
+        self._sinks = {}
+        self._sinks_lock = threading.Lock()
+        self._listeners = {}
+        self._pending = {}
+        self._pending_keys = {}
+        self._pending_rows = 0
+        self._dirty = {}
+        self._last_flush = time.monotonic()
+        self._last_fsync = time.monotonic()
+
+        self.rows_written = 0
+        self.flush_count = 0
+        self.fsync_count = 0
+        self.errors = 0
+        self.rows_dropped = 0
+
+        self._thread = threading.Thread(target=self._run, name='async-writer', daemon=True)
+        self._thread.start()
+        # 비정상 종료 시에도 버퍼에 남은 행을 최대한 기록
+        atexit.register(self.close, 5.0)
+
+    # --- 워커 쪽 API ---
+
+    def add_sink(self, key, sink):
+        """key(보통 CSV 파일명)에 출력 대상을 추가. 한 key에 여러 대상을 둘 수 있음."""
+        with self._sinks_lock:
+            self._sinks.setdefault(key, []).append(sink)
+
+    def add_flush_listener(self, key, on_flush, on_fsync=None):
+        """
+        key의 행이 모든 출력 대상에 기록(flush)된 뒤 writer 스레드에서 on_flush(rows) 호출.
+        한 대상이라도 쓰기에 실패한 묶음은 알리지 않음. on_fsync()는 출력 대상을 fsync 한 직후 호출.
+        (Parquet는 row group이 찰 때까지 메모리에 있으므로 CSV/SQLite 기준)
+        """
+        with self._sinks_lock:
+            self._listeners.setdefault(key, []).append((on_flush, on_fsync))
+
+    def submit(self, key, rows, fieldnames=None):
+        """
+        행을 큐에 넣고 즉시 반환.
+        key에 등록된 대상이 없고 fieldnames가 주어지면 CSV 대상을 자동 생성.
+        둘 다 없으면 행을 쓸 곳이 없으므로 ValueError.
+        """
+        if not rows:
+            return
+        if fieldnames is None:
+            with self._sinks_lock:
+                if not self._sinks.get(key):
+                    raise ValueError(f"출력 대상이 없는 key: {key} (add_sink 또는 fieldnames 필요)")
+        self._queue.put((key, list(rows), fieldnames))
+
+    def queue_depth(self):
+        """아직 디스크에 쓰지 않은 행 수 (큐 + 버퍼)"""
+        return self._queue.qsize() + self._pending_rows
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth(),
+            'rows_written': self.rows_written,
+            'flush_count': self.flush_count,
+            'fsync_count': self.fsync_count,
+            'errors': self.errors,
+            'rows_dropped': self.rows_dropped,
+        }
+
+    def close(self, timeout=None):
+        """남은 행을 모두 쓰고 파일을 닫음."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+    # --- writer 스레드 ---
+
+    def _sinks_for(self, key, fieldnames):
+        with self._sinks_lock:
+            sinks = self._sinks.get(key)
+            if not sinks and fieldnames is not None:
+                sinks = [CsvSink(key, fieldnames)]
+                self._sinks[key] = sinks
+            return sinks or []
+
+    def _run(self):
+        while True:
+            timeout = max(0.05, self.flush_interval - (time.monotonic() - self._last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(force_fsync=True)
+                self._close_sinks()
+                return
+
+            if item is not None:
+                key, rows, fieldnames = item
+                try:
+                    sinks = self._sinks_for(key, fieldnames)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"❌ [writer] 출력 대상 생성 실패 ({key}): {repr(e)}")
+                    continue
+                if not sinks:
+                    # submit()에서 막지만, 그 사이 대상이 사라진 경우에도 조용히 버리지 않음
+                    self.errors += 1
+                    self.rows_dropped += len(rows)
+                    logger.error(f"❌ [writer] 출력 대상 없음 ({key}): {len(rows)}행 버림")
+                    continue
+                for sink in sinks:
+                    self._pending.setdefault(id(sink), (sink, []))[1].extend(rows)
+                self._pending_rows += len(rows)
+                if key in self._listeners:
+                    self._pending_keys.setdefault(key, []).extend(rows)
+
+            if (self._pending_rows >= self.flush_rows
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+
+    def _flush(self, force_fsync=False):
+        if self.tracer is not None and self._pending_rows:
+            with self.tracer.span('writer_flush', cat='io', rows=self._pending_rows):
+                self._write_pending(force_fsync)
+        else:
+            self._write_pending(force_fsync)
+
+    def _write_pending(self, force_fsync):
+        now = time.monotonic()
+        pending, self._pending = self._pending, {}
+        pending_keys, self._pending_keys = self._pending_keys, {}
+        written_rows = self._pending_rows
+        self._pending_rows = 0
+
+        do_fsync = force_fsync or (
+            self.fsync_interval is not None and now - self._last_fsync >= self.fsync_interval
+        )
+
+        failed = set()
+        for sink, rows in pending.values():
+            try:
+                sink.write_rows(rows)
+                sink.flush()
+                self._dirty[id(sink)] = sink
+            except Exception as e:
+                self.errors += 1
+                failed.add(id(sink))
+                logger.error(f"❌ [writer] 쓰기 실패 ({getattr(sink, 'filename', sink)}): {repr(e)}")
+
+        with self._sinks_lock:
+            listeners = {key: self._listeners[key] for key in self._listeners}
+            key_sinks = {key: list(self._sinks.get(key, [])) for key in pending_keys}
+        for key, rows in pending_keys.items():
+            if any(id(sink) in failed for sink in key_sinks[key]):
+                continue
+            for on_flush, _ in listeners[key]:
+                try:
+                    on_flush(rows)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"❌ [writer] flush 후 처리 실패 ({key}): {repr(e)}")
+
+        if do_fsync and self._dirty:
+            for sink in self._dirty.values():
+                try:
+                    sink.fsync()
+                except Exception:
+                    self.errors += 1
+            self._dirty = {}
+            self.fsync_count += 1
+        if do_fsync:
+            self._last_fsync = now
+            for key_listeners in listeners.values():
+                for _, on_fsync in key_listeners:
+                    if on_fsync is None:
+                        continue
+                    try:
+                        on_fsync()
+                    except Exception:
+                        self.errors += 1
+
+        if pending:
+            self.flush_count += 1
+        self.rows_written += written_rows
+        self._last_flush = now
+
+    def _close_sinks(self):
+        with self._sinks_lock:
+            all_sinks = [s for sinks in self._sinks.values() for s in sinks]
+        for sink in all_sinks:
+            try:
+                sink.close()
+            except Exception:
+                self.errors += 1
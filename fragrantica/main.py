@@ -1,7 +1,6 @@
 import time
 import traceback
 import undetected_chromedriver as uc
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -9,18 +8,39 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     ElementClickInterceptedException,
-    WebDriverException,
 )
+import argparse
 import csv
 import os
 import sys
-from tenacity import retry, stop_after_attempt, wait_exponential
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 from queue import Queue
 import random  # 랜덤 딜레이 및 UA 선택용
 
+# 공통 모듈 (저장소 루트의 crawler_common)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawler_common.writer import AsyncWriter
+from crawler_common.dead_letter import DeadLetterStore
+from crawler_common.frontier import BoundedSubmitter, TaskFrontier
+from crawler_common.resilience import CircuitBreaker, PerHost, RetryBudget, guarded_call
+from crawler_common.recovery import FAILURE_PAGE, FailureStats, classify_failure, recover_driver
+from crawler_common.fingerprint import FingerprintStore, review_fingerprint
+from crawler_common.sinks import configure_outputs
+from crawler_common.url_registry import SeenUrlRegistry, canonicalize_url
+from crawler_common.http_fetch import HostRateLimiter, HttpFetcher
+from crawler_common.discovery import compare_discovery, designer_page_urls, sitemap_urls
+from crawler_common.selector_cache import SelectorRegistry
+from crawler_common.deadline import Deadline
+from crawler_common.run_metadata import RunMetadata
+from crawler_common.browser_metrics import capture_page_metrics
+from crawler_common.timing import StageTimings, previous_task_mean
+from crawler_common.metrics import CrawlMetrics, register_common_metrics
+from crawler_common.tracing import TraceRecorder
+from crawler_common.console import LEVELS, AsyncConsole
+from crawler_common.profiling import PROFILE_MODES, MemoryTracker, TaskProfiler
+
 # -----------------------
 # 1. 기본 설정 / 로그
 # -----------------------
@@ -50,6 +70,11 @@ REVIEW_CSV_FILE = f'fragrantica_reviews_{SEARCH_KEYWORD.lower().replace(" ", "-"
 RATE_LIMIT_DELAY_RANGE = (3.0, 7.0)
 MAX_WORKERS = 3
 
+# 사이트 주소 (오프라인 벤치마크 때는 환경 변수로 로컬 재생 서버를 가리킴, bench/replay_server.py)
+BASE_URL = os.environ.get('FRAGRANTICA_BASE_URL', 'https://www.fragrantica.com').rstrip('/')
+# 화면 없는 리눅스 서버 등에서 돌릴 때 CRAWLER_HEADLESS=1
+HEADLESS = os.environ.get('CRAWLER_HEADLESS') == '1'
+
 # [추가] User-Agent 리스트 (브라우저 위장)
 USER_AGENT_LIST = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -87,9 +112,168 @@ REVIEW_CONTENT_SELECTOR = (By.CSS_SELECTOR, 'div[itemprop="reviewBody"] p')
 REVIEW_DATE_SELECTOR = (By.CSS_SELECTOR, 'span[itemprop="datePublished"]')
 REVIEWER_NAME_SELECTOR = (By.CSS_SELECTOR, 'p > b > a[href*="member"]')
 
-# --- 2.4. 스레드 락 (Locks) ---
-csv_lock = threading.Lock()
-print_lock = threading.Lock()
+# --- 2.4. 콘솔 로그 ---
+# 출력은 큐 기반 로거로 넘기고 전용 스레드가 콘솔에 씀 (워커는 콘솔 I/O를 기다리지 않음)
+# LOG_LEVEL='DEBUG'면 리뷰/스크롤 단위 진행 메시지까지 출력, LOG_FILE을 지정하면 JSON lines로도 저장
+LOG_LEVEL = 'INFO'
+LOG_FILE = None  # 예: 'crawler_log.jsonl'
+console = AsyncConsole('fragrantica', LOG_LEVEL, LOG_FILE)
+logger = console.logger
+
+# --- 2.5. 출력 writer 설정 ---
+# 디스크 쓰기는 전용 writer 스레드가 담당 (워커는 큐에 넣고 바로 다음 작업 진행)
+WRITER_FLUSH_ROWS = 200       # 이만큼 쌓이면 즉시 flush
+WRITER_FLUSH_INTERVAL = 1.0   # 초, 마지막 flush 후 이 시간이 지나면 flush
+WRITER_FSYNC_INTERVAL = 10.0  # 초, 0이면 매 flush마다, None이면 fsync 안 함
+
+# --- 2.6. 출력 형식 ---
+# 'csv', 'parquet', 'sqlite' 조합
+# - parquet: pyarrow 필요, site/brand 파티션으로 저장
+# - sqlite: 제품은 url, 리뷰는 지문 기준 upsert (재실행해도 중복 없음)
+OUTPUT_FORMATS = ('csv',)
+PARQUET_OUTPUT_DIR = 'parquet'
+SQLITE_DB_FILE = 'crawl.sqlite3'
+
+# --- 2.7. 리뷰 중복 제거 ---
+# 리뷰 지문(64비트)을 파일에 누적해서 실행/브랜드 파일이 달라도 같은 리뷰는 다시 쓰지 않음
+REVIEW_FINGERPRINT_FILE = 'seen_reviews.fp'
+
+# --- 2.8. 제품 수집 이력 ---
+# 수집을 마친 제품 URL(정규화)을 기록해 두고, 다른 키워드/재실행에서 같은 제품은 건너뜀
+SEEN_URL_DB_FILE = 'seen_urls.sqlite3'
+SKIP_SEEN_PRODUCTS = True
+
+# --- 2.9. 제품 URL 수집 방식 ---
+# 'http': 디자이너 페이지 HTML (브라우저 없음) / 'sitemap': 사이트맵 / 'browser': 기존 스크롤 방식
+# http/sitemap이 실패하거나 결과가 없으면 browser로 자동 전환
+DISCOVERY_MODE = 'http'
+DISCOVERY_MIN_INTERVAL = 1.0  # 초, HTTP 수집 시 호스트당 요청 간격
+# True면 HTTP 결과를 브라우저 결과와 비교해서 차이를 출력 (실제 사이트 점검용, 느림)
+# 재생 서버로 하는 자동 비교는 tests/test_discovery.py
+DISCOVERY_CROSSCHECK = False
+
+# --- 2.10. 선택자 캐시 ---
+# 지난 실행에서 맞은 선택자를 먼저 시도하고, 후보 전체를 한 번에 확인 (후보마다 20초씩 기다리지 않음)
+SELECTOR_CACHE_FILE = 'selector_cache.json'
+SELECTOR_WAIT_TIMEOUT = 20  # 초, 후보 전체 합산 대기 시간
+
+# --- 2.11. 제품 정보 재시도 / 서킷 브레이커 ---
+# 재시도는 호스트별 예산(정상 요청의 RETRY_BUDGET_RATIO 비율) 안에서만,
+# 최근 실패율이 BREAKER_FAILURE_RATE 이상이면 BREAKER_COOLDOWN초 동안 모든 워커가 대기 후 워커 하나로 시험
+PRODUCT_MAX_ATTEMPTS = 3
+RETRY_BUDGET_RATIO = 0.2
+BREAKER_WINDOW = 20
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_COOLDOWN = 30.0  # 초
+
+# --- 2.12. 실패 기록 (dead letter) ---
+# 실패한 제품을 단계/오류 유형과 함께 남김 → `python main.py --retry-failed` 로 그것만 재처리
+DEAD_LETTER_FILE = 'failed_products.jsonl'
+RETRY_FAILED_WORKERS = 1  # 재처리는 낮은 동시성으로
+
+# --- 2.13. 작업 제출 ---
+# 워커당 미리 제출해 두는 작업 수 (나머지는 frontier에서 대기)
+SUBMIT_WINDOW_PER_WORKER = 2
+
+# --- 2.14. 제품/단계별 시간 제한 ---
+# 제한을 넘기면 지금까지 로드한 리뷰만 저장하고 다음 제품으로 넘어감 (RUN_METADATA_FILE에 부분 수집으로 기록)
+# None이면 제한 없음
+PRODUCT_DEADLINE = 900  # 초, 제품 하나 전체
+STAGE_DEADLINES = {
+    'page_scroll': 60,
+    'reviews': 600,  # rate limit 대기 포함
+}
+DISCOVERY_SCROLL_DEADLINE = 900  # 초, 브라우저 URL 수집(스크롤/페이지 넘김) 전체
+RUN_METADATA_FILE = 'run_metadata.json'
+
+# --- 2.15. 단계별 소요 시간 ---
+# 제품마다 단계별(풀 대기/접속/스크롤/정보 추출/리뷰 로딩/리뷰 추출/CSV 기록/대기) 시간을
+# 히스토그램으로 모아 p50/p95/p99를 TIMING_FILE에 저장 (실행 중 TIMING_DUMP_INTERVAL초마다 + 종료 시)
+TIMING_FILE = 'stage_timings.json'
+TIMING_DUMP_INTERVAL = 60.0  # 초
+
+# --- 2.16. 실행 중 지표 ---
+# 실행 중 http://METRICS_HOST:METRICS_PORT/metrics 에서 Prometheus 형식 지표 제공
+# (처리량, 진행 중 작업, 드라이버 풀, 재시도/브레이커, writer 큐, 단계별 소요 시간). None이면 끔
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9108
+
+# --- 2.17. 실행 타임라인 (trace) ---
+# 파일명을 지정하면 워커 스레드별 단계 구간(풀 대기, 접속, 스크롤, 대기, CSV 기록 등)을
+# Chrome trace-event JSON으로 기록 (chrome://tracing 또는 ui.perfetto.dev 에서 열기). None이면 끔
+TRACE_FILE = None  # 예: 'trace.json'
+
+# --- 2.18. 프로파일링 ---
+# PROFILE_EVERY번째 제품 작업마다 하나씩 프로파일을 PROFILE_DIR에 작업별 파일로 저장 (0이면 끔)
+# PROFILE_MODE: 'cprofile'(결정적, .prof) 또는 'sample'(스택 표본, .folded)
+# MEMORY_SNAPSHOT_EVERY개 제품마다 tracemalloc 스냅샷 → 직전 대비 증가 상위 MEMORY_TOP줄 저장 (0이면 끔)
+PROFILE_EVERY = 0
+PROFILE_MODE = 'cprofile'
+PROFILE_DIR = 'profiles'
+MEMORY_SNAPSHOT_EVERY = 0
+MEMORY_TOP = 15
+
+# --- 2.19. 브라우저 페이지 지표 ---
+# True면 리뷰 로딩 후 제품 페이지의 브라우저 지표(Navigation Timing, 요청 수/전송 크기, JS 힙, DOM 노드 수,
+# CDP Performance 지표)를 RUN_METADATA_FILE의 'pages'에 제품별로 기록
+BROWSER_METRICS = False
+
+# --- 2.20. 리뷰 스크롤 로딩 ---
+# 스크롤할 때마다 새 리뷰가 붙었으면 REVIEW_SCROLL_WAIT초, 안 붙었으면 REVIEW_SCROLL_IDLE_WAIT초 대기하고
+# REVIEW_SCROLL_MAX_NO_CHANGE번 연속 변화가 없으면 끝 (bench/bench_loading.py로 지연별 완결성/시간 비교)
+REVIEW_SCROLL_WAIT = 3.0  # 초
+REVIEW_SCROLL_IDLE_WAIT = 2.0  # 초
+REVIEW_SCROLL_MAX_NO_CHANGE = 5
+
+# 제품 작업의 시간 제한(Deadline)과 드라이버 풀이 쓰는 시계/대기 함수
+# (crawler_common.simulation이 가상 시계로 바꿔 끼워서 같은 작업 흐름을 몇 초 만에 돌려 봄)
+clock = time.monotonic
+sleep = time.sleep
+
+tracer = TraceRecorder()
+failure_stats = FailureStats()
+retry_budgets = PerHost(lambda: RetryBudget(ratio=RETRY_BUDGET_RATIO))
+host_breakers = PerHost(lambda: CircuitBreaker(
+    window=BREAKER_WINDOW, min_calls=BREAKER_WINDOW // 2,
+    failure_rate=BREAKER_FAILURE_RATE, cooldown=BREAKER_COOLDOWN,
+))
+discovery_rate_limiter = HostRateLimiter(DISCOVERY_MIN_INTERVAL)
+run_metadata = RunMetadata(RUN_METADATA_FILE, 'fragrantica', SEARCH_KEYWORD)
+stage_timings = StageTimings(TIMING_FILE, TIMING_DUMP_INTERVAL, tracer=tracer)
+crawl_metrics = CrawlMetrics()
+
+# 파일/스레드를 만드는 객체는 init_runtime()에서 생성 (import만 할 때는 아무것도 만들지 않음)
+csv_writer = None
+review_store = None
+dead_letters = None
+url_registry = None
+selector_registry = None
+
+
+def init_runtime():
+    """writer/콘솔 스레드, 지문/수집 이력/실패 기록/선택자 캐시 준비 (main() 시작 시, 두 번째 호출부터는 무시)"""
+    global csv_writer, review_store, dead_letters, url_registry, selector_registry
+    if csv_writer is not None:
+        return
+    console.start()
+    csv_writer = AsyncWriter(
+        flush_rows=WRITER_FLUSH_ROWS,
+        flush_interval=WRITER_FLUSH_INTERVAL,
+        fsync_interval=WRITER_FSYNC_INTERVAL,
+        tracer=tracer,
+    )
+    review_store = FingerprintStore(REVIEW_FINGERPRINT_FILE)
+    # 리뷰 지문은 writer가 그 행을 파일에 쓴 뒤에만 저장, fsync도 writer 주기에 맞춤
+    csv_writer.add_flush_listener(
+        REVIEW_CSV_FILE, lambda rows: review_store.persist_rows('fragrantica', rows), lambda: review_store.fsync(),
+    )
+    dead_letters = DeadLetterStore(DEAD_LETTER_FILE)
+    url_registry = SeenUrlRegistry(SEEN_URL_DB_FILE)
+    selector_registry = SelectorRegistry(SELECTOR_CACHE_FILE)
+    register_common_metrics(
+        crawl_metrics.registry, csv_writer=csv_writer, failure_stats=failure_stats, stage_timings=stage_timings,
+        retry_budgets=retry_budgets, host_breakers=host_breakers,
+    )
 
 
 # -----------------------
@@ -110,7 +294,7 @@ class DriverPool:
                 driver = self._create_driver(user_agent=user_agent)
                 self.pool.put(driver)
                 safe_print(f"   ✅ 드라이버 {i + 1}/{size} 생성 완료 (UA: {user_agent[:40]}...)")
-                time.sleep(1)
+                sleep(1)
             except Exception as e:
                 safe_print(f"   ❌ 드라이버 {i + 1} 생성 실패: {repr(e)}")
         safe_print(f"✅ 드라이버 풀 준비 완료\n")
@@ -119,6 +303,8 @@ class DriverPool:
         """단일 드라이버 생성"""
         options = uc.ChromeOptions()
         options.add_argument('--no-sandbox')
+        if HEADLESS:
+            options.add_argument('--headless=new')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--disable-extensions')
@@ -276,17 +462,16 @@ def is_rate_limited_page(driver):
 # ======================================================================
 
 def write_batch_to_csv(filename, fieldnames, data_batch):
+    """배치 데이터를 writer 큐에 넣기 (파일 쓰기는 writer 스레드가 처리)."""
     if not data_batch:
         return
-    with csv_lock:
-        with open(filename, 'a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writerows(data_batch)
+    with stage_timings.time('csv_write'):
+        csv_writer.submit(filename, data_batch, fieldnames=fieldnames)
 
 
-def safe_print(message):
-    with print_lock:
-        print(message)
+def safe_print(message, level=logging.INFO):
+    """콘솔 출력 (로그 큐에 넣고 바로 반환)"""
+    logger.log(level, message)
 
 
 # -----------------------
@@ -298,6 +483,8 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
     safe_print(f"🚀 [1단계] '{start_url}'에서 URL 수집 시작...")
     options = uc.ChromeOptions()
     options.add_argument('--no-sandbox')
+    if HEADLESS:
+        options.add_argument('--headless=new')
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--start-maximized')
     options.add_argument(f'--user-agent={random.choice(USER_AGENT_LIST)}')
@@ -313,21 +500,21 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
         ALTERNATIVE_PRODUCT_LINK_SELECTOR
     ]
     selector_in_use = None
+    discovery_deadline = Deadline(DISCOVERY_SCROLL_DEADLINE, name='discovery')
 
     try:
         driver.get(start_url)
         time.sleep(3)  # 초기 로딩 대기
         safe_print(f"✅ '{start_url}' 접속 완료")
 
-        # 🔧 선택자 찾기
-        for i, selector in enumerate(selectors_to_try):
-            try:
-                wait.until(EC.presence_of_element_located(selector))
-                selector_in_use = selector
-                safe_print(f"🔎 선택자 #{i + 1} 로 제품 요소 확인됨.")
-                break
-            except TimeoutException:
-                safe_print(f"⚠️ 선택자 #{i + 1} 없음. 다음 시도...")
+        # 🔧 선택자 찾기 (지난번 성공한 선택자 우선, 후보 전체를 한 번에 확인)
+        css, found = selector_registry.wait_for(
+            driver, 'fragrantica', 'product_link',
+            [selector[1] for selector in selectors_to_try], timeout=SELECTOR_WAIT_TIMEOUT
+        )
+        if css:
+            selector_in_use = (By.CSS_SELECTOR, css)
+            safe_print(f"🔎 선택자 '{css}' 로 제품 요소 {found}개 확인됨.")
 
         if not selector_in_use:
             safe_print("❌ 모든 선택자로 요소를 찾지 못함. selector를 다시 확인하세요.")
@@ -345,8 +532,11 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
             scroll_attempt = 0
 
             while True:
+                if discovery_deadline.expired():
+                    safe_print("⌛ URL 수집 시간 제한 도달. 지금까지 모은 URL로 진행합니다.")
+                    break
                 scroll_attempt += 1
-                safe_print(f"   🔄 스크롤 시도 #{scroll_attempt}")
+                logger.debug(f"   🔄 스크롤 시도 #{scroll_attempt}")
 
                 try:
                     elements = driver.find_elements(*selector_in_use)
@@ -355,9 +545,9 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
                             wait.until(EC.presence_of_element_located(selector_in_use))
                             elements = driver.find_elements(*selector_in_use)
                         except TimeoutException:
-                            safe_print("... 아직 제품 요소가 없음 (잠시 후 재시도)")
+                            logger.debug("... 아직 제품 요소가 없음 (잠시 후 재시도)")
 
-                    page_urls = [e.get_attribute('href') for e in elements if e.get_attribute('href')]
+                    page_urls = [canonicalize_url(e.get_attribute('href')) for e in elements if e.get_attribute('href')]
                     newly_found = set(page_urls) - all_product_urls_set
                     if newly_found:
                         all_product_urls_set.update(newly_found)
@@ -384,15 +574,15 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
                         )
                         prev_count = len(driver.find_elements(*selector_in_use))
                         same_rounds = 0
-                        safe_print("🔄 요소 수 증가 확인 — 계속 수집")
+                        logger.debug("🔄 요소 수 증가 확인 — 계속 수집")
                     except TimeoutException:
                         same_rounds += 1
-                        safe_print(f"⏱ 변화 없음 (연속 {same_rounds}/{max_same_rounds})")
+                        logger.debug(f"⏱ 변화 없음 (연속 {same_rounds}/{max_same_rounds})")
 
                     new_height = driver.execute_script("return document.body.scrollHeight")
                     if new_height == last_height:
                         same_rounds += 1
-                        safe_print(f"📏 페이지 높이 변화 없음 (연속: {same_rounds})")
+                        logger.debug(f"📏 페이지 높이 변화 없음 (연속: {same_rounds})")
                     else:
                         last_height = new_height
                         same_rounds = 0
@@ -413,6 +603,9 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
             safe_print("   (i) '페이지네이션' 방식으로 수집합니다")
             page_num = 1
             while True:
+                if discovery_deadline.expired():
+                    safe_print("⌛ URL 수집 시간 제한 도달. 지금까지 모은 URL로 진행합니다.")
+                    break
                 try:
                     wait.until(EC.presence_of_element_located(selector_in_use))
                     elements = driver.find_elements(*selector_in_use)
@@ -420,8 +613,8 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
                     page_urls = []
                     for elem in elements:
                         href = elem.get_attribute('href')
-                        if href and href.startswith("https://www.fragrantica.com/perfume/"):
-                            page_urls.append(href)
+                        if href and href.startswith(f"{BASE_URL}/perfume/"):
+                            page_urls.append(canonicalize_url(href))
 
                     new_urls_count = len(set(page_urls) - all_product_urls_set)
                     all_product_urls_set.update(page_urls)
@@ -450,11 +643,79 @@ def collect_all_product_urls(start_url, max_same_rounds=8, wait_between_scrolls=
 
     return list(all_product_urls_set)
 
+def discover_product_urls(start_url, designer):
+    """
+    DISCOVERY_MODE에 따라 제품 URL 수집.
+    HTTP(디자이너 페이지/사이트맵)가 실패하거나 비어 있으면 브라우저 방식으로 전환.
+    """
+    if DISCOVERY_MODE in ('http', 'sitemap'):
+        fetcher = HttpFetcher(user_agent=random.choice(USER_AGENT_LIST), rate_limiter=discovery_rate_limiter)
+        try:
+            if DISCOVERY_MODE == 'http':
+                safe_print(f"🌐 [1단계] 디자이너 페이지 HTML에서 URL 수집 ({designer})...")
+                urls = designer_page_urls(fetcher, designer, BASE_URL)
+            else:
+                safe_print(f"🗺️  [1단계] 사이트맵에서 URL 수집 ({designer})...")
+                urls = sitemap_urls(fetcher, designer, BASE_URL)
+        except Exception as e:
+            safe_print(f"⚠️ HTTP 수집 실패: {repr(e)[:120]}")
+            urls = []
+
+        if urls:
+            safe_print(f"✅ HTTP 수집: {len(urls)}개 (요청 {fetcher.requests}회)")
+            if DISCOVERY_CROSSCHECK:
+                report = compare_discovery(urls, collect_all_product_urls(start_url))
+                safe_print(
+                    f"🔁 비교: HTTP {report['http']}개 / 브라우저 {report['browser']}개 / 공통 {report['common']}개"
+                )
+                for url in report['only_http']:
+                    safe_print(f"   + HTTP에만: {url}")
+                for url in report['only_browser']:
+                    safe_print(f"   - 브라우저에만: {url}")
+            return urls
+        safe_print("ℹ️  HTTP 수집 결과 없음 → 브라우저 방식으로 전환")
+
+    return collect_all_product_urls(start_url)
+
+
 # -----------------------
 # 6. 핵심 스크래핑 함수
 # -----------------------
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+def needs_navigation(driver, url):
+    """재시도 전에 다시 접속해야 하는지 (다른 페이지에 있거나 제품명 h1이 없으면)"""
+    try:
+        if canonicalize_url(driver.current_url) != canonicalize_url(url):
+            return True
+        return not driver.execute_script(
+            "return !!document.querySelector(arguments[0]);", PRODUCT_NAME_H1_SELECTOR[1]
+        )
+    except Exception:
+        return True
+
+
+def load_product_details(driver, url):
+    """
+    제품 페이지 접속 + 정보 수집 (호스트별 서킷 브레이커 / 재시도 예산 적용).
+    재시도 때는 페이지가 제대로 떠 있으면 다시 접속하지 않고 추출만 다시 시도.
+    """
+    host = urlsplit(url).netloc
+
+    def attempt(n):
+        if n == 0 or needs_navigation(driver, url):
+            with stage_timings.time('navigation'):
+                driver.get(url)
+        with stage_timings.time('detail_extraction'):
+            return scrape_product_details(driver, url)
+
+    return guarded_call(
+        host_breakers[host], retry_budgets[host], attempt,
+        max_attempts=PRODUCT_MAX_ATTEMPTS,
+        classify=lambda e: classify_failure(e, driver),
+        sleep=lambda seconds: stage_timings.sleep('rate_limit_sleep', seconds),
+    )
+
+
 def scrape_product_details(driver, url):
     """
     제품 상세 페이지에서 향수 정보를 스크랩.
@@ -499,12 +760,79 @@ def scrape_product_details(driver, url):
     return product_name, product_data
 
 
-def scrape_reviews(driver, product_name, base_url):
+NEW_REVIEWS_JS = """
+    return Array.prototype.slice.call(document.querySelectorAll(arguments[0]), arguments[1]);
+"""
+
+
+def extract_new_reviews(driver, product_name, base_url, start_index):
+    """
+    start_index 이후에 새로 로드된 리뷰만 추출해서 바로 writer로 넘김.
+    (다음 start_index, 이번에 저장한 리뷰 수) 반환
+    """
+    review_elements = driver.execute_script(NEW_REVIEWS_JS, REVIEW_CONTAINER_SELECTOR[1], start_index)
+    reviews_chunk = []
+
+    for review in review_elements:
+        try:
+            # 리뷰어 이름
+            reviewer_name_text = "Guest"
+            try:
+                meta_name = review.find_element(By.CSS_SELECTOR, 'meta[itemprop="name"]')
+                reviewer_name_text = meta_name.get_attribute("content")
+            except:
+                pass
+
+            # 날짜
+            review_date_text = "NA"
+            try:
+                date_span = review.find_element(By.CSS_SELECTOR, 'span[itemprop="datePublished"]')
+                review_date_text = date_span.text.strip()
+            except:
+                pass
+
+            # 리뷰 내용
+            content = ""
+            try:
+                content_div = review.find_element(By.CSS_SELECTOR, 'div[itemprop="reviewBody"]')
+                paragraphs = content_div.find_elements(By.TAG_NAME, 'p')
+                content = " ".join([p.text.strip() for p in paragraphs if p.text.strip()])
+            except:
+                pass
+
+            if not content:
+                continue
+
+            review_data = {
+                'product_name': product_name,
+                'review_content': content,
+                'review_date': review_date_text,
+                'reviewer_name': reviewer_name_text,
+                'product_url': base_url,
+            }
+
+            # 중복 체크 (같은 제품 + 이전 실행 + 다른 브랜드 파일까지 전역 지문으로 확인)
+            if not review_store.add(review_fingerprint('fragrantica', review_data)):
+                continue
+
+            reviews_chunk.append(review_data)
+
+        except Exception as e:
+            continue
+
+    write_batch_to_csv(REVIEW_CSV_FILE, REVIEW_FIELDNAMES, reviews_chunk)
+    return start_index + len(review_elements), len(reviews_chunk)
+
+
+def scrape_reviews(driver, product_name, base_url, deadline=None):
     """
     [15차 최종] #all-reviews 앵커 링크로 직접 이동
+    스크롤로 새 리뷰가 로드될 때마다 그 부분만 추출/저장 (저장한 리뷰 수 반환)
+    deadline이 만료되면 이미 로드된 리뷰까지만 저장하고 종료
     """
-    reviews_batch = []
-    processed_review_identifiers = set()
+    deadline = deadline or Deadline(clock=clock, sleep=sleep)
+    extracted_count = 0
+    saved_count = 0
 
     try:
         # 🔧 STEP 1: 리뷰 섹션으로 직접 이동
@@ -514,24 +842,30 @@ def scrape_reviews(driver, product_name, base_url):
         # 429 / 차단 페이지 감지용 재시도 루프
         max_attempts = 30
         for attempt in range(1, max_attempts + 1):
-            driver.get(review_url)
-            time.sleep(4)  # 기본 로딩 대기
+            with stage_timings.time('navigation'):
+                driver.get(review_url)
+            tracer.sleep('page_settle', 4)  # 기본 로딩 대기
 
             if not is_rate_limited_page(driver):
                 # 정상 페이지면 바로 진행
                 break
 
             # 여기까지 왔다 = rate limit 의심
+            crawl_metrics.rate_limit_events.inc()
             wait_sec = random.randint(60, 180)  # 1~3분 랜덤 대기
             safe_print(
                 f"      ⏱ {product_name}: 리뷰 요청이 rate limit에 걸린 것 같아요 "
                 f"({attempt}/{max_attempts}) → {wait_sec}초 대기 후 재시도"
             )
-            time.sleep(wait_sec)
+            with stage_timings.time('rate_limit_sleep'):
+                waited = deadline.sleep(wait_sec)
+            if not waited:
+                safe_print(f"      ⌛ {product_name}: rate limit 대기 중 리뷰 시간 제한 도달 → 리뷰는 건너뜁니다.")
+                return 0
         else:
-            # for-else: 3번 모두 rate-limited였다면 리뷰는 포기하고 넘어감
-            safe_print(f"      ❌ {product_name}: 3번 시도했지만 리뷰 페이지가 열리지 않아, 리뷰는 건너뜁니다.")
-            return []
+            # for-else: 모두 rate-limited였다면 리뷰는 포기하고 넘어감
+            safe_print(f"      ❌ {product_name}: {max_attempts}번 시도했지만 리뷰 페이지가 열리지 않아, 리뷰는 건너뜁니다.")
+            return 0
 
         # 🔧 STEP 2: 리뷰 섹션 존재 확인
         section_exists = driver.execute_script("""
@@ -541,10 +875,10 @@ def scrape_reviews(driver, product_name, base_url):
 
         if not section_exists:
             safe_print(f"      ℹ️  {product_name}: 리뷰 섹션 없음 -> 리뷰 0개")
-            return []
+            return 0
 
         safe_print(f"      ✅ {product_name}: 리뷰 섹션 발견!")
-        time.sleep(2)
+        tracer.sleep('page_settle', 2)
 
         # 🔧 STEP 3: 리뷰 컨테이너 확인
         review_count = driver.execute_script("""
@@ -555,15 +889,19 @@ def scrape_reviews(driver, product_name, base_url):
 
         if review_count == 0:
             safe_print(f"      ℹ️  {product_name}: 리뷰 없음 -> 리뷰 0개")
-            return []
+            return 0
 
-        # 🔧 STEP 4: 무한 스크롤로 모든 리뷰 로드
+        # 🔧 STEP 4: 무한 스크롤로 리뷰 로드 + 새로 로드된 리뷰는 바로 추출/저장
         safe_print(f"      ... {product_name}: 모든 리뷰 로딩 중...")
         previous_count = 0
         no_change_count = 0
-        max_no_change = 5
+        max_no_change = REVIEW_SCROLL_MAX_NO_CHANGE
 
         while no_change_count < max_no_change:
+            if deadline.expired():
+                safe_print(f"      ⌛ {product_name}: 리뷰 시간 제한 도달 → 로드된 {previous_count}개까지만 저장")
+                break
+
             current_count = driver.execute_script("""
                 var reviews = document.querySelectorAll('div.fragrance-review-box[itemprop="review"]');
                 if (reviews.length > 0) {
@@ -573,78 +911,35 @@ def scrape_reviews(driver, product_name, base_url):
             """)
 
             if current_count > previous_count:
-                safe_print(f"      📝 {product_name}: {current_count}개 리뷰 로드됨...")
+                with stage_timings.time('review_extraction'):
+                    extracted_count, saved = extract_new_reviews(
+                        driver, product_name, base_url, extracted_count
+                    )
+                saved_count += saved
+                logger.debug(f"      📝 {product_name}: {current_count}개 리뷰 로드됨... (저장: {saved_count}개)")
                 previous_count = current_count
                 no_change_count = 0
-                time.sleep(3)
+                tracer.sleep('review_scroll_round', REVIEW_SCROLL_WAIT, reviews=current_count)
             else:
                 no_change_count += 1
-                safe_print(f"      ⏱ {product_name}: 변화 없음 ({no_change_count}/{max_no_change})")
-                time.sleep(2)
-
-        safe_print(f"      ✅ {product_name}: 총 {previous_count}개 리뷰 로드 완료")
-        time.sleep(2)
-
-        # 🔧 STEP 5: 모든 리뷰 추출
-        review_elements = driver.find_elements(By.CSS_SELECTOR, 'div.fragrance-review-box[itemprop="review"]')
-        safe_print(f"      ... {product_name}: {len(review_elements)}개 리뷰 추출 시작...")
-
-        for idx, review in enumerate(review_elements, 1):
-            try:
-                # 리뷰어 이름
-                reviewer_name_text = "Guest"
-                try:
-                    meta_name = review.find_element(By.CSS_SELECTOR, 'meta[itemprop="name"]')
-                    reviewer_name_text = meta_name.get_attribute("content")
-                except:
-                    pass
-
-                # 날짜
-                review_date_text = "NA"
-                try:
-                    date_span = review.find_element(By.CSS_SELECTOR, 'span[itemprop="datePublished"]')
-                    review_date_text = date_span.text.strip()
-                except:
-                    pass
-
-                # 리뷰 내용
-                content = ""
-                try:
-                    content_div = review.find_element(By.CSS_SELECTOR, 'div[itemprop="reviewBody"]')
-                    paragraphs = content_div.find_elements(By.TAG_NAME, 'p')
-                    content = " ".join([p.text.strip() for p in paragraphs if p.text.strip()])
-                except:
-                    pass
-
-                # 중복 체크
-                unique_id = (reviewer_name_text, review_date_text, content[:50])
-
-                if unique_id in processed_review_identifiers:
-                    continue
+                logger.debug(f"      ⏱ {product_name}: 변화 없음 ({no_change_count}/{max_no_change})")
+                tracer.sleep('review_scroll_round', REVIEW_SCROLL_IDLE_WAIT, no_change=no_change_count)
 
-                processed_review_identifiers.add(unique_id)
-
-                if content:
-                    reviews_batch.append({
-                        'product_name': product_name,
-                        'review_content': content,
-                        'review_date': review_date_text,
-                        'reviewer_name': reviewer_name_text,
-                    })
-
-                    if idx % 20 == 0:
-                        safe_print(f"      ... {product_name}: {len(reviews_batch)}개 처리 중...")
-
-            except Exception as e:
-                continue
+        # 🔧 STEP 5: 마지막 스크롤 이후 로드된 리뷰 추출
+        with stage_timings.time('review_extraction'):
+            extracted_count, saved = extract_new_reviews(
+                driver, product_name, base_url, extracted_count
+            )
+        saved_count += saved
 
-        safe_print(f"      ✅ {product_name}: 총 {len(reviews_batch)}개 리뷰 수집 완료")
-        return reviews_batch
+        safe_print(f"      ✅ {product_name}: 총 {saved_count}개 리뷰 수집 완료 (로드 {extracted_count}개)")
+        return saved_count
 
     except Exception as e:
-        safe_print(f"      ❌ {product_name}: 리뷰 수집 에러: {repr(e)}")
+        # 이미 저장된 청크는 그대로 남음
+        safe_print(f"      ❌ {product_name}: 리뷰 수집 에러 (저장된 {saved_count}개는 유지): {repr(e)}")
         traceback.print_exc()
-        return []
+        return saved_count
 
 # -----------------------
 # 7. 워커 함수
@@ -655,73 +950,99 @@ def process_single_product(args, driver_pool):
     url, index, total = args
     driver = None
     product_name = url.split('/')[-1]
+    stage = 'driver_pool'
+    deadline = Deadline(PRODUCT_DEADLINE, clock=clock, sleep=sleep)
+    stage_timings.begin_task(url)
 
     try:
-        driver = driver_pool.get()
+        with stage_timings.time('pool_wait'):
+            driver = driver_pool.get()
 
         # 1️⃣ 제품 페이지 접속 및 정보 수집
-        driver.get(url)
-        product_name, product_data = scrape_product_details(driver, url)
+        stage = 'details'
+        product_name, product_data = load_product_details(driver, url)
         write_batch_to_csv(PERFUME_CSV_FILE, PERFUME_FIELDNAMES, [product_data])
 
         # 2️⃣ 페이지 전체 스크롤 (Lazy Loading 트리거)
+        stage = 'page_scroll'
         safe_print(f"      ... {product_name}: 페이지 전체 스크롤 중...")
         last_height = driver.execute_script("return document.body.scrollHeight")
         scroll_position = 0
         scroll_step = 800
+        scroll_deadline = deadline.stage('page_scroll', STAGE_DEADLINES.get('page_scroll'))
 
-        while scroll_position < last_height:
-            scroll_position += scroll_step
-            driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-            time.sleep(1)
-
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height > last_height:
-                last_height = new_height
+        with stage_timings.time('page_scroll'):
+            while scroll_position < last_height:
+                if scroll_deadline.expired():
+                    safe_print(f"      ⌛ {product_name}: 페이지 스크롤 시간 제한 도달 → 리뷰 수집으로 넘어감")
+                    break
+                scroll_position += scroll_step
+                driver.execute_script(f"window.scrollTo(0, {scroll_position});")
+                tracer.sleep('scroll_round', 1, position=scroll_position)
 
-        safe_print(f"      ✅ {product_name}: 페이지 전체 스크롤 완료")
-        time.sleep(2)
+                new_height = driver.execute_script("return document.body.scrollHeight")
+                if new_height > last_height:
+                    last_height = new_height
+            else:
+                safe_print(f"      ✅ {product_name}: 페이지 전체 스크롤 완료")
+        tracer.sleep('page_settle', 2)
 
         # 3️⃣ 리뷰 수집 (#all-reviews로 재접속)
-        reviews_batch = scrape_reviews(driver, product_name, url)
-        if reviews_batch:
-            write_batch_to_csv(REVIEW_CSV_FILE, REVIEW_FIELDNAMES, reviews_batch)
+        stage = 'reviews'
+        # 리뷰 로딩(스크롤/대기) 시간 = 전체에서 추출/CSV 기록/rate limit 대기를 뺀 나머지
+        with stage_timings.time('review_loading'):
+            review_count = scrape_reviews(
+                driver, product_name, url, deadline.stage('reviews', STAGE_DEADLINES.get('reviews'))
+            )
+
+        page_metrics = None
+        if BROWSER_METRICS:
+            with stage_timings.time('browser_metrics'):
+                page_metrics = capture_page_metrics(driver)
 
         # 딜레이
         delay = random.uniform(*RATE_LIMIT_DELAY_RANGE)
         safe_print(f"      ... 다음 작업까지 {delay:.1f}초 대기 ...")
-        time.sleep(delay)
+        stage_timings.sleep('rate_limit_sleep', delay)
 
         driver_pool.put(driver)
+        stage_timings.end_task()
 
         return {
             'status': 'success',
             'product_name': product_name,
-            'review_count': len(reviews_batch),
+            'url': url,
+            'review_count': review_count,
+            'partial': deadline.expired_stages,
+            'page_metrics': page_metrics,
+            'elapsed': deadline.elapsed(),
             'index': index,
             'total': total
         }
 
     except Exception as e:
+        # 페이지 오류는 드라이버를 그대로 쓰고, 세션/브라우저가 죽었을 때만 재시작
+        failure = classify_failure(e, driver)
+        failure_stats.record(failure)
         if driver:
-            safe_print(f"  (i) {product_name} 처리 중 오류 발생. 드라이버 재시작...")
-            try:
-                driver.quit()
-            except:
-                pass
-
-            try:
-                new_user_agent = random.choice(USER_AGENT_LIST)
-                new_driver = driver_pool._create_driver(user_agent=new_user_agent)
-                driver_pool.put(new_driver)
-                safe_print(f"  (i) 새 드라이버 생성 후 풀에 반환 완료.")
-            except Exception as e_create:
-                safe_print(f"  (E) 새 드라이버 생성 실패: {e_create}.")
-                pass
+            if failure == FAILURE_PAGE:
+                safe_print(f"  (i) {product_name} 페이지 오류 → 드라이버 유지")
+            else:
+                safe_print(f"  (i) {product_name} {failure} 오류 → 드라이버 재시작...")
+            recover_driver(
+                driver_pool, driver, failure,
+                lambda: driver_pool._create_driver(user_agent=random.choice(USER_AGENT_LIST)),
+                failure_stats,
+            )
 
+        stage_timings.end_task()
         return {
             'status': 'failed',
             'error': repr(e)[:120],
+            'failure': failure,
+            'error_type': type(e).__name__,
+            'stage': stage,
+            'product_name': product_name,
             'url': url,
             'index': index,
             'total': total
@@ -731,77 +1052,187 @@ def process_single_product(args, driver_pool):
 # 8. 메인 실행
 # -----------------------
 
-def main():
-    """메인 실행 함수 (드라이버 풀 사용)."""
+def main(retry_failed=False, workers=None, metrics_port=None, trace_file=None, log_level=None,
+         profile_every=None, profile_mode=None, memory_every=None):
+    """
+    메인 실행 함수 (드라이버 풀 사용).
+    retry_failed=True면 실패 기록(DEAD_LETTER_FILE)의 제품만 낮은 동시성으로 다시 수집.
+    """
+    init_runtime()
     start_time = time.time()
+    max_workers = workers or (RETRY_FAILED_WORKERS if retry_failed else MAX_WORKERS)
 
     print("=" * 60)
     print(f"🚀 Fragrantica 크롤러 시작 (키워드: {SEARCH_KEYWORD})")
-    print(f"   (드라이버 풀: {MAX_WORKERS}개)")
+    print(f"   (드라이버 풀: {max_workers}개)")
     print("=" * 60)
 
-    setup_csv_files()
-
-    formatted_keyword = SEARCH_KEYWORD.title()
-    formatted_keyword = formatted_keyword.replace(" ", "-")
-    start_url = f"https://www.fragrantica.com/designers/{formatted_keyword}.html"
-
-    url_collection_start = time.time()
-    product_urls = collect_all_product_urls(start_url)
-    url_collection_time = time.time() - url_collection_start
-
-    if not product_urls:
-        print(f"❌ '{SEARCH_KEYWORD}'(변환: {formatted_keyword})에 대한 URL이 수집되지 않았습니다. 종료합니다.")
-        return
-
-    print(f"✅ 총 {len(product_urls)}개 제품 발견 (소요 시간: {url_collection_time:.1f}초)")
+    metrics_port = METRICS_PORT if metrics_port is None else metrics_port
+    if metrics_port:
+        crawl_metrics.serve(METRICS_HOST, metrics_port)
+    if log_level:
+        console.set_level(log_level)
+    trace_file = trace_file or TRACE_FILE
+    if trace_file:
+        tracer.start(trace_file)
+        print(f"🧵 실행 타임라인 기록: {trace_file}")
+    task_profiler = TaskProfiler(
+        PROFILE_EVERY if profile_every is None else profile_every, PROFILE_DIR,
+        profile_mode or PROFILE_MODE, log=safe_print,
+    )
+    memory_tracker = MemoryTracker(
+        MEMORY_SNAPSHOT_EVERY if memory_every is None else memory_every, PROFILE_DIR, MEMORY_TOP,
+    )
+    memory_tracker.start()
+    if task_profiler.every or memory_tracker.enabled:
+        print(f"🔬 프로파일링: 작업 {task_profiler.every or '-'}개마다 ({task_profiler.mode}), "
+              f"메모리 스냅샷 {memory_tracker.every or '-'}개마다 → {PROFILE_DIR}/")
+
+    if 'csv' in OUTPUT_FORMATS:
+        setup_csv_files()
+    configure_outputs(csv_writer, 'fragrantica', SEARCH_KEYWORD, OUTPUT_FORMATS, {
+        PERFUME_CSV_FILE: ('perfumes', PERFUME_FIELDNAMES),
+        REVIEW_CSV_FILE: ('reviews', REVIEW_FIELDNAMES),
+    }, parquet_dir=PARQUET_OUTPUT_DIR, sqlite_path=SQLITE_DB_FILE)
+
+    if retry_failed:
+        # 실패 기록에 남은 제품만 다시 수집 (URL 수집 / 수집 이력 필터 생략)
+        product_urls = [entry['url'] for entry in dead_letters.pending('fragrantica', SEARCH_KEYWORD)]
+        url_collection_time = 0.0
+        seen_skipped = 0
+        print(f"♻️  [재처리] '{DEAD_LETTER_FILE}'의 실패 제품 {len(product_urls)}개만 다시 수집합니다.")
+        if not product_urls:
+            print("🎉 재처리할 실패 기록이 없습니다. 종료합니다.")
+            return
+    else:
+        formatted_keyword = SEARCH_KEYWORD.title()
+        formatted_keyword = formatted_keyword.replace(" ", "-")
+        start_url = f"{BASE_URL}/designers/{formatted_keyword}.html"
+
+        url_collection_start = time.time()
+        product_urls = discover_product_urls(start_url, formatted_keyword)
+        url_collection_time = time.time() - url_collection_start
+
+        if not product_urls:
+            print(f"❌ '{SEARCH_KEYWORD}'(변환: {formatted_keyword})에 대한 URL이 수집되지 않았습니다. 종료합니다.")
+            return
+
+        print(f"✅ 총 {len(product_urls)}개 제품 발견 (소요 시간: {url_collection_time:.1f}초)")
+
+        # 다른 키워드/이전 실행에서 이미 수집한 제품은 제외
+        seen_skipped = 0
+        if SKIP_SEEN_PRODUCTS:
+            discovered = len(product_urls)
+            product_urls = url_registry.filter_unseen(product_urls)
+            seen_skipped = discovered - len(product_urls)
+            print(f"   - 수집 이력으로 건너뜀: {seen_skipped}개 (수집 이력 {len(url_registry)}개)")
+            if not product_urls:
+                print("🎉 새로 수집할 제품이 없습니다. 종료합니다.")
+                return
 
     avg_delay = sum(RATE_LIMIT_DELAY_RANGE) / 2
-    avg_time_per_product = 8 + avg_delay
-    estimated_time_parallel = (len(product_urls) * avg_time_per_product) / MAX_WORKERS
-    print(f"\n📊 예상 소요 시간 ({MAX_WORKERS}개 병렬, 평균 딜레이 {avg_delay:.1f}초 포함): 약 {estimated_time_parallel / 60:.1f}분")
+    # 지난 실행의 제품당 평균 소요 시간이 있으면 그것으로 추정
+    avg_time_per_product = previous_task_mean(TIMING_FILE, 8 + avg_delay)
+    estimated_time_parallel = (len(product_urls) * avg_time_per_product) / max_workers
+    print(f"\n📊 예상 소요 시간 ({max_workers}개 병렬, 평균 딜레이 {avg_delay:.1f}초 포함): 약 {estimated_time_parallel / 60:.1f}분")
 
-    driver_pool = DriverPool(size=MAX_WORKERS)
+    driver_pool = DriverPool(size=max_workers)
 
     print("\n[2단계] 제품 스크래핑 시작 (드라이버 풀 사용)...")
     print("-" * 60)
 
     scraping_start = time.time()
     total = len(product_urls)
-    tasks = [(url, i + 1, total) for i, url in enumerate(product_urls)]
+    # 작업은 필요할 때 하나씩 생성 (frontier가 꺼내 갈 때)
+    tasks = ((url, i + 1, total) for i, url in enumerate(product_urls))
 
     success_count = 0
     failed_count = 0
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(process_single_product, task, driver_pool): task
-            for task in tasks
-        }
+    frontier = TaskFrontier(tasks)
 
-        for future in as_completed(futures):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 진행 중인 작업은 워커당 SUBMIT_WINDOW_PER_WORKER개까지만 (나머지는 frontier에서 대기)
+        submitter = BoundedSubmitter(
+            executor, task_profiler.wrap(process_single_product), frontier, max_workers * SUBMIT_WINDOW_PER_WORKER, driver_pool
+        )
+        crawl_metrics.watch_run(total, driver_pool, submitter, frontier)
+
+        for future in submitter.as_completed():
             result = future.result()
             percentage = (result['index'] / result['total']) * 100
 
             if result['status'] == 'success':
                 success_count += 1
+                crawl_metrics.product_done('partial' if result['partial'] else 'success', result['review_count'])
+                dead_letters.resolve('fragrantica', result['url'])
+                if result['page_metrics']:
+                    run_metadata.record_page(
+                        result['url'], result['product_name'], result['page_metrics'],
+                        result['elapsed'], result['review_count'],
+                    )
+                if result['partial']:
+                    # 시간 제한으로 일부만 수집 → 수집 이력에 넣지 않아 다음 실행에서 다시 시도
+                    # (이미 저장한 리뷰는 지문으로 걸러짐)
+                    run_metadata.mark_partial(
+                        result['url'], result['product_name'], result['partial'],
+                        result['review_count'], result['elapsed'],
+                    )
+                    run_metadata.save()
+                else:
+                    url_registry.add(result['url'], 'fragrantica', SEARCH_KEYWORD)
+                note = f" (⌛ 시간 제한: {', '.join(result['partial'])})" if result['partial'] else ""
                 if result['review_count'] > 0:
                     safe_print(
-                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 리뷰 {result['review_count']}개")
+                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 리뷰 {result['review_count']}개{note}")
                 else:
                     safe_print(
-                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 제품 정보만")
+                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 제품 정보만{note}")
             else:
+                if result['failure'] != FAILURE_PAGE and frontier.requeue(submitter.task_for(future), result['url']):
+                    # 드라이버(세션/브라우저) 문제로 실패한 제품은 한 번만 대기열 맨 앞에 다시 넣음
+                    crawl_metrics.product_done('requeued')
+                    safe_print(f"[{result['index']}/{result['total']}] 🔁 {result['failure']} 오류 → 대기열 앞에 다시 넣음")
+                    continue
                 failed_count += 1
+                crawl_metrics.product_done('failed')
+                dead_letters.record(
+                    'fragrantica', SEARCH_KEYWORD, result['url'], result['stage'], result['failure'],
+                    result['error_type'], result['error'], result['product_name'],
+                )
                 safe_print(
                     f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ❌ 처리 실패 - {result['url']} - {result['error']}")
 
+            done_count = success_count + failed_count
+            if done_count % 10 == 0:
+                safe_print(f"   💾 writer 대기 중인 행: {csv_writer.queue_depth()}개")
+            stage_timings.maybe_dump()
+            tracer.counter('tasks', in_flight=submitter.in_flight, writer_queue=csv_writer.queue_depth())
+            for line in memory_tracker.maybe_snapshot(done_count) or ():
+                safe_print(f"   🧠 {line}")
+
+    console.flush()
     print("\n🔧 드라이버 풀 종료 중...")
     driver_pool.close_all()
 
+    print("💾 남은 데이터 저장 중...")
+    csv_writer.close()
+    review_store.close()
+    url_registry.close()
+    selector_registry.save()
+
     scraping_time = time.time() - scraping_start
     total_time = time.time() - start_time
 
+    run_metadata.set('counts', {'success': success_count, 'failed': failed_count})
+    run_metadata.set('workers', max_workers)
+    run_metadata.set('elapsed', {'url_collection': round(url_collection_time, 1), 'scraping': round(scraping_time, 1)})
+    run_metadata.save(finished=True)
+    stage_timings.dump()
+    crawl_metrics.stop()
+    tracer.close()
+    memory_tracker.stop()
+
     print("-" * 60)
     print("\n" + "=" * 60)
     print("✅ 모든 크롤링 완료!")
@@ -809,7 +1240,28 @@ def main():
     print(f"\n📊 통계:")
     print(f"   - 성공: {success_count}개")
     print(f"   - 실패: {failed_count}개")
+    print(f"   - 저장 행: {csv_writer.rows_written}개 (flush {csv_writer.flush_count}회, fsync {csv_writer.fsync_count}회)")
+    print(f"   - 건너뛴 중복 리뷰: {review_store.duplicates}개 (누적 지문 {len(review_store)}개)")
+    print(f"   - 최대 동시 제출 작업: {submitter.max_in_flight}개 (대기열 재투입 {len(frontier.requeued)}건)")
+    print(f"   - 실패 유형: {failure_stats.summary()}")
+    print(f"   - 부분 수집(시간 제한): {run_metadata.partial_count}개 ({RUN_METADATA_FILE})")
+    if BROWSER_METRICS:
+        page_count, means = run_metadata.page_summary()
+        averages = ', '.join(f"{key} {value}" for key, value in means.items()) or '-'
+        print(f"   - 브라우저 지표: {page_count}개 페이지 (평균 {averages})")
+    print(f"   - 실패 기록: 새로 {dead_letters.recorded}개, 재처리 성공 {dead_letters.resolved}개 ({DEAD_LETTER_FILE})")
+    for host, breaker in host_breakers.items():
+        budget = retry_budgets[host]
+        print(f"   - {host}: 브레이커 열림 {breaker.opened_count}회 (대기 {breaker.blocked_time:.0f}초), "
+              f"재시도 {budget.retries}회 / 예산 부족으로 포기 {budget.denied}회")
+    print(f"   - 건너뛴 수집 이력 제품: {seen_skipped}개")
+    for line in selector_registry.summary('fragrantica'):
+        print(f"   - 선택자 적중률 {line}")
     print(f"\n⏱️  소요 시간:")
+    for line in stage_timings.summary():
+        print(f"   - {line}")
+    if task_profiler.profiled:
+        print(f"   - 프로파일: {task_profiler.profiled}개 작업 ({PROFILE_DIR}/)")
     print(f"   - URL 수집: {url_collection_time:.1f}초")
     print(f"   - 제품 스크래핑: {scraping_time / 60:.1f}분")
     print(f"   - 전체: {total_time / 60:.1f}분")
@@ -820,4 +1272,26 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fragrantica 크롤러")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help=f"실패 기록({DEAD_LETTER_FILE})에 남은 제품만 다시 수집")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"동시 드라이버 수 (기본: {MAX_WORKERS}, --retry-failed 시 {RETRY_FAILED_WORKERS})")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help=f"실행 중 지표(/metrics) 포트 (기본: {METRICS_PORT}, 0이면 끔)")
+    parser.add_argument('--trace', default=None, metavar='PATH',
+                        help="워커별 단계 타임라인을 Chrome trace-event JSON으로 기록")
+    parser.add_argument('--log-level', default=None, choices=LEVELS,
+                        help=f"콘솔 출력 수준 (기본: {LOG_LEVEL}, DEBUG면 리뷰/스크롤 단위 메시지까지)")
+    parser.add_argument('--profile-every', type=int, default=None, metavar='N',
+                        help=f"N번째 제품 작업마다 프로파일을 {PROFILE_DIR}/에 저장 (기본: {PROFILE_EVERY}, 0이면 끔)")
+    parser.add_argument('--profile-mode', default=None, choices=PROFILE_MODES,
+                        help=f"프로파일 방식 (기본: {PROFILE_MODE})")
+    parser.add_argument('--memory-every', type=int, default=None, metavar='N',
+                        help=f"제품 N개마다 tracemalloc 스냅샷 비교 (기본: {MEMORY_SNAPSHOT_EVERY}, 0이면 끔)")
+    args = parser.parse_args()
+    main(
+        retry_failed=args.retry_failed, workers=args.workers, metrics_port=args.metrics_port,
+        trace_file=args.trace, log_level=args.log_level, profile_every=args.profile_every,
+        profile_mode=args.profile_mode, memory_every=args.memory_every,
+    )
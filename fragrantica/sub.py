@@ -1,7 +1,6 @@
 import time
 import traceback
 import undetected_chromedriver as uc
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -9,18 +8,36 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     ElementClickInterceptedException,
-    WebDriverException,
 )
+import argparse
 import csv
 import os
 import sys
 from tenacity import retry, stop_after_attempt, wait_exponential
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
 import random
 
+# 공통 모듈 (저장소 루트의 crawler_common)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawler_common.writer import AsyncWriter
+from crawler_common.recovery import FAILURE_PAGE, FailureStats, classify_failure, recover_driver
+from crawler_common.fingerprint import FingerprintStore, review_fingerprint
+from crawler_common.sinks import configure_outputs
+from crawler_common.sinks import products_missing_reviews
+from crawler_common.selector_cache import SelectorRegistry
+from crawler_common.dead_letter import DeadLetterStore
+from crawler_common.frontier import BoundedSubmitter, TaskFrontier
+from crawler_common.deadline import Deadline
+from crawler_common.run_metadata import RunMetadata
+from crawler_common.browser_metrics import capture_page_metrics
+from crawler_common.timing import StageTimings, previous_task_mean
+from crawler_common.metrics import CrawlMetrics, register_common_metrics
+from crawler_common.tracing import TraceRecorder
+from crawler_common.console import LEVELS, AsyncConsole
+from crawler_common.profiling import PROFILE_MODES, MemoryTracker, TaskProfiler
+
 # -----------------------
 # 1. 기본 설정 / 로그
 # -----------------------
@@ -49,6 +66,9 @@ REVIEW_CSV_FILE = f'fragrantica_reviews_{SEARCH_KEYWORD.lower().replace(" ", "-"
 RATE_LIMIT_DELAY_RANGE = (3.0, 7.0)
 MAX_WORKERS = 3
 
+# 화면 없는 리눅스 서버 등에서 돌릴 때 CRAWLER_HEADLESS=1
+HEADLESS = os.environ.get('CRAWLER_HEADLESS') == '1'
+
 USER_AGENT_LIST = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
@@ -62,9 +82,118 @@ REVIEW_FIELDNAMES = [
     'product_name', 'review_content', 'review_date', 'reviewer_name'
 ]
 
-# --- 2.3. 스레드 락 ---
-csv_lock = threading.Lock()
-print_lock = threading.Lock()
+# --- 2.3. 콘솔 로그 ---
+# 출력은 큐 기반 로거로 넘기고 전용 스레드가 콘솔에 씀 (워커는 콘솔 I/O를 기다리지 않음)
+# LOG_LEVEL='DEBUG'면 리뷰/스크롤 단위 진행 메시지까지 출력, LOG_FILE을 지정하면 JSON lines로도 저장
+LOG_LEVEL = 'INFO'
+LOG_FILE = None  # 예: 'crawler_log_reviews.jsonl'
+console = AsyncConsole('fragrantica_reviews', LOG_LEVEL, LOG_FILE)
+logger = console.logger
+
+# --- 2.4. 출력 writer 설정 ---
+# 디스크 쓰기는 전용 writer 스레드가 담당 (워커는 큐에 넣고 바로 다음 작업 진행)
+WRITER_FLUSH_ROWS = 200       # 이만큼 쌓이면 즉시 flush
+WRITER_FLUSH_INTERVAL = 1.0   # 초, 마지막 flush 후 이 시간이 지나면 flush
+WRITER_FSYNC_INTERVAL = 10.0  # 초, 0이면 매 flush마다, None이면 fsync 안 함
+
+# --- 2.5. 출력 형식 ---
+# 'csv', 'parquet', 'sqlite' 조합
+# - parquet: pyarrow 필요, site/brand 파티션으로 저장
+# - sqlite: 제품은 url, 리뷰는 지문 기준 upsert (재실행해도 중복 없음)
+OUTPUT_FORMATS = ('csv',)
+PARQUET_OUTPUT_DIR = 'parquet'
+SQLITE_DB_FILE = 'crawl.sqlite3'
+
+# --- 2.6. 리뷰 중복 제거 ---
+# 리뷰 지문(64비트)을 파일에 누적해서 실행/브랜드 파일이 달라도 같은 리뷰는 다시 쓰지 않음
+REVIEW_FINGERPRINT_FILE = 'seen_reviews.fp'
+
+# --- 2.7. 선택자 캐시 ---
+# 지난 실행에서 맞은 선택자를 먼저 시도하고, 후보 전체를 한 번에 확인
+SELECTOR_CACHE_FILE = 'selector_cache.json'
+
+# --- 2.8. 실패 기록 (dead letter) ---
+# 리뷰 수집에 실패한 제품을 단계/오류 유형과 함께 남김 → `python sub.py --retry-failed` 로 그것만 재처리
+DEAD_LETTER_FILE = 'failed_reviews.jsonl'
+RETRY_FAILED_WORKERS = 1  # 재처리는 낮은 동시성으로
+
+# --- 2.9. 작업 제출 ---
+# 워커당 미리 제출해 두는 작업 수 (나머지는 frontier에서 대기)
+SUBMIT_WINDOW_PER_WORKER = 2
+
+# --- 2.10. 제품별 시간 제한 ---
+# 제한을 넘기면 지금까지 로드한 리뷰만 저장하고 다음 제품으로 넘어감 (RUN_METADATA_FILE에 부분 수집으로 기록)
+# None이면 제한 없음
+PRODUCT_DEADLINE = 600  # 초, rate limit 대기 포함
+RUN_METADATA_FILE = 'run_metadata_reviews.json'
+
+# --- 2.11. 단계별 소요 시간 ---
+# 제품마다 단계별(풀 대기/접속/리뷰 로딩/리뷰 추출/CSV 기록/대기) 시간을
+# 히스토그램으로 모아 p50/p95/p99를 TIMING_FILE에 저장 (실행 중 TIMING_DUMP_INTERVAL초마다 + 종료 시)
+TIMING_FILE = 'stage_timings_reviews.json'
+TIMING_DUMP_INTERVAL = 60.0  # 초
+
+# --- 2.12. 실행 중 지표 ---
+# 실행 중 http://METRICS_HOST:METRICS_PORT/metrics 에서 Prometheus 형식 지표 제공
+# (처리량, 진행 중 작업, 드라이버 풀, 재시도/브레이커, writer 큐, 단계별 소요 시간). None이면 끔
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9108
+
+# --- 2.13. 실행 타임라인 (trace) ---
+# 파일명을 지정하면 워커 스레드별 단계 구간(풀 대기, 접속, 스크롤, 대기, CSV 기록 등)을
+# Chrome trace-event JSON으로 기록 (chrome://tracing 또는 ui.perfetto.dev 에서 열기). None이면 끔
+TRACE_FILE = None  # 예: 'trace.json'
+
+# --- 2.14. 프로파일링 ---
+# PROFILE_EVERY번째 제품 작업마다 하나씩 프로파일을 PROFILE_DIR에 작업별 파일로 저장 (0이면 끔)
+# PROFILE_MODE: 'cprofile'(결정적, .prof) 또는 'sample'(스택 표본, .folded)
+# MEMORY_SNAPSHOT_EVERY개 제품마다 tracemalloc 스냅샷 → 직전 대비 증가 상위 MEMORY_TOP줄 저장 (0이면 끔)
+PROFILE_EVERY = 0
+PROFILE_MODE = 'cprofile'
+PROFILE_DIR = 'profiles'
+MEMORY_SNAPSHOT_EVERY = 0
+MEMORY_TOP = 15
+
+# --- 2.15. 브라우저 페이지 지표 ---
+# True면 리뷰 로딩 후 제품 페이지의 브라우저 지표(Navigation Timing, 요청 수/전송 크기, JS 힙, DOM 노드 수,
+# CDP Performance 지표)를 RUN_METADATA_FILE의 'pages'에 제품별로 기록
+BROWSER_METRICS = False
+
+tracer = TraceRecorder()
+failure_stats = FailureStats()
+run_metadata = RunMetadata(RUN_METADATA_FILE, 'fragrantica', SEARCH_KEYWORD)
+stage_timings = StageTimings(TIMING_FILE, TIMING_DUMP_INTERVAL, tracer=tracer)
+crawl_metrics = CrawlMetrics()
+
+# 파일/스레드를 만드는 객체는 init_runtime()에서 생성 (import만 할 때는 아무것도 만들지 않음)
+csv_writer = None
+review_store = None
+dead_letters = None
+selector_registry = None
+
+
+def init_runtime():
+    """writer/콘솔 스레드, 지문/수집 이력/실패 기록/선택자 캐시 준비 (main() 시작 시, 두 번째 호출부터는 무시)"""
+    global csv_writer, review_store, dead_letters, selector_registry
+    if csv_writer is not None:
+        return
+    console.start()
+    csv_writer = AsyncWriter(
+        flush_rows=WRITER_FLUSH_ROWS,
+        flush_interval=WRITER_FLUSH_INTERVAL,
+        fsync_interval=WRITER_FSYNC_INTERVAL,
+        tracer=tracer,
+    )
+    review_store = FingerprintStore(REVIEW_FINGERPRINT_FILE)
+    # 리뷰 지문은 writer가 그 행을 파일에 쓴 뒤에만 저장, fsync도 writer 주기에 맞춤
+    csv_writer.add_flush_listener(
+        REVIEW_CSV_FILE, lambda rows: review_store.persist_rows('fragrantica', rows), lambda: review_store.fsync(),
+    )
+    dead_letters = DeadLetterStore(DEAD_LETTER_FILE)
+    selector_registry = SelectorRegistry(SELECTOR_CACHE_FILE)
+    register_common_metrics(
+        crawl_metrics.registry, csv_writer=csv_writer, failure_stats=failure_stats, stage_timings=stage_timings,
+    )
 
 
 # -----------------------
@@ -93,6 +222,8 @@ class DriverPool:
         """단일 드라이버 생성"""
         options = uc.ChromeOptions()
         options.add_argument('--no-sandbox')
+        if HEADLESS:
+            options.add_argument('--headless=new')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--disable-extensions')
@@ -131,17 +262,16 @@ class DriverPool:
 # -----------------------
 
 def write_batch_to_csv(filename, fieldnames, data_batch):
+    """배치 데이터를 writer 큐에 넣기 (파일 쓰기는 writer 스레드가 처리)."""
     if not data_batch:
         return
-    with csv_lock:
-        with open(filename, 'a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writerows(data_batch)
+    with stage_timings.time('csv_write'):
+        csv_writer.submit(filename, data_batch, fieldnames=fieldnames)
 
 
-def safe_print(message):
-    with print_lock:
-        print(message)
+def safe_print(message, level=logging.INFO):
+    """콘솔 출력 (로그 큐에 넣고 바로 반환)"""
+    logger.log(level, message)
 
 
 def is_rate_limited_page(driver):
@@ -164,12 +294,105 @@ def is_rate_limited_page(driver):
 # 5. 리뷰 수집 함수
 # -----------------------
 
-def scrape_reviews(driver, product_name, base_url):
+# 리뷰 섹션 후보 (한 번의 probe로 모두 확인)
+REVIEW_SECTION_CSS_CANDIDATES = [
+    '#all-reviews',
+    '[id*="review"]',
+    '.reviews-container',
+    'div[class*="review"]',
+]
+
+REVIEW_CONTAINER_CSS_CANDIDATES = [
+    'div.fragrance-review-box[itemprop="review"]',
+    'div[itemprop="review"]',
+    'div[class*="review-box"]',
+]
+
+NEW_REVIEWS_JS = """
+    return Array.prototype.slice.call(document.querySelectorAll(arguments[0]), arguments[1]);
+"""
+
+
+def extract_new_reviews(driver, product_name, base_url, review_css, start_index):
+    """
+    start_index 이후에 새로 로드된 리뷰만 추출해서 바로 writer로 넘김.
+    (다음 start_index, 이번에 저장한 리뷰 수) 반환
+    """
+    review_elements = driver.execute_script(NEW_REVIEWS_JS, review_css, start_index)
+    reviews_chunk = []
+
+    for review in review_elements:
+        try:
+            # 리뷰어 이름
+            reviewer_name_text = "Guest"
+            try:
+                meta_name = review.find_element(By.CSS_SELECTOR, 'meta[itemprop="name"]')
+                reviewer_name_text = meta_name.get_attribute("content")
+            except:
+                try:
+                    reviewer_link = review.find_element(By.CSS_SELECTOR, 'a[href*="member"]')
+                    reviewer_name_text = reviewer_link.text.strip()
+                except:
+                    pass
+
+            # 날짜
+            review_date_text = "NA"
+            try:
+                date_span = review.find_element(By.CSS_SELECTOR, 'span[itemprop="datePublished"]')
+                review_date_text = date_span.text.strip()
+            except:
+                try:
+                    date_meta = review.find_element(By.CSS_SELECTOR, 'meta[itemprop="datePublished"]')
+                    review_date_text = date_meta.get_attribute("content")
+                except:
+                    pass
+
+            # 리뷰 내용
+            content = ""
+            try:
+                content_div = review.find_element(By.CSS_SELECTOR, 'div[itemprop="reviewBody"]')
+                paragraphs = content_div.find_elements(By.TAG_NAME, 'p')
+                content = " ".join([p.text.strip() for p in paragraphs if p.text.strip()])
+            except:
+                try:
+                    content_div = review.find_element(By.CSS_SELECTOR, 'div[itemprop="reviewBody"]')
+                    content = content_div.text.strip()
+                except:
+                    content = review.text.strip()
+
+            if not content:
+                continue
+
+            review_data = {
+                'product_name': product_name,
+                'review_content': content,
+                'review_date': review_date_text,
+                'reviewer_name': reviewer_name_text,
+                'product_url': base_url,
+            }
+
+            # 중복 체크 (같은 제품 + 이전 실행 + 다른 브랜드 파일까지 전역 지문으로 확인)
+            if not review_store.add(review_fingerprint('fragrantica', review_data)):
+                continue
+
+            reviews_chunk.append(review_data)
+
+        except Exception as e:
+            continue
+
+    write_batch_to_csv(REVIEW_CSV_FILE, REVIEW_FIELDNAMES, reviews_chunk)
+    return start_index + len(review_elements), len(reviews_chunk)
+
+
+def scrape_reviews(driver, product_name, base_url, deadline=None):
     """
     리뷰 수집 (다중 전략)
+    스크롤로 새 리뷰가 로드될 때마다 그 부분만 추출/저장 (저장한 리뷰 수 반환)
+    deadline이 만료되면 이미 로드된 리뷰까지만 저장하고 종료
     """
-    reviews_batch = []
-    processed_review_identifiers = set()
+    deadline = deadline or Deadline()
+    extracted_count = 0
+    saved_count = 0
 
     try:
         # 🔧 STEP 1: 여러 방법으로 리뷰 섹션 찾기
@@ -179,36 +402,38 @@ def scrape_reviews(driver, product_name, base_url):
         max_attempts = 3
         for attempt in range(1, max_attempts + 1):
             review_url = base_url + "#all-reviews"
-            driver.get(review_url)
-            time.sleep(4)
+            with stage_timings.time('navigation'):
+                driver.get(review_url)
+            tracer.sleep('page_settle', 4)
 
             if not is_rate_limited_page(driver):
                 break
 
+            crawl_metrics.rate_limit_events.inc()
             wait_sec = random.randint(60, 180)
             safe_print(
                 f"      ⏱ {product_name}: Rate limit 감지 "
                 f"({attempt}/{max_attempts}) → {wait_sec}초 대기"
             )
-            time.sleep(wait_sec)
+            with stage_timings.time('rate_limit_sleep'):
+                waited = deadline.sleep(wait_sec)
+            if not waited:
+                safe_print(f"      ⌛ {product_name}: rate limit 대기 중 시간 제한 도달 → 리뷰는 건너뜁니다.")
+                return 0
         else:
             safe_print(f"      ❌ {product_name}: Rate limit으로 리뷰 수집 실패")
-            return []
-
-        # 방법 1: #all-reviews 앵커로 이동
-        section_exists = driver.execute_script("""
-            // 여러 가능한 선택자 시도
-            var section = document.getElementById('all-reviews') ||
-                         document.querySelector('[id*="review"]') ||
-                         document.querySelector('.reviews-container') ||
-                         document.querySelector('div[class*="review"]');
-
-            if (section) {
-                section.scrollIntoView({behavior: 'smooth', block: 'center'});
-                return true;
-            }
-            return false;
-        """)
+            return 0
+
+        # 방법 1: 리뷰 섹션으로 이동 (지난번 맞은 선택자 우선)
+        section_css, _ = selector_registry.probe(
+            driver, 'fragrantica', 'review_section', REVIEW_SECTION_CSS_CANDIDATES
+        )
+        section_exists = bool(section_css)
+        if section_exists:
+            driver.execute_script(
+                "document.querySelector(arguments[0]).scrollIntoView({behavior: 'smooth', block: 'center'});",
+                section_css
+            )
 
         if not section_exists:
             # 방법 2: 리뷰 컨테이너를 직접 찾아보기
@@ -222,141 +447,78 @@ def scrape_reviews(driver, product_name, base_url):
                         "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                         review_containers[0]
                     )
-                    time.sleep(2)
+                    tracer.sleep('page_settle', 2)
             except:
                 pass
 
         if not section_exists:
             safe_print(f"      ℹ️  {product_name}: 리뷰 섹션 없음 -> 리뷰 0개")
-            return []
+            return 0
 
         safe_print(f"      ✅ {product_name}: 리뷰 섹션 발견!")
-        time.sleep(2)
-
-        # 🔧 STEP 2: 리뷰 컨테이너 확인
-        review_count = driver.execute_script("""
-            var reviews = document.querySelectorAll('div.fragrance-review-box[itemprop="review"]');
-            if (reviews.length === 0) {
-                reviews = document.querySelectorAll('div[class*="review-box"]') ||
-                         document.querySelectorAll('div[itemprop="review"]') ||
-                         document.querySelectorAll('.review-container');
-            }
-            return reviews.length;
-        """)
+        tracer.sleep('page_settle', 2)
+
+        # 🔧 STEP 2: 리뷰 컨테이너 확인 (지난번 맞은 선택자 우선, 후보 전체를 한 번에 확인)
+        review_css, review_count = selector_registry.probe(
+            driver, 'fragrantica', 'review_container', REVIEW_CONTAINER_CSS_CANDIDATES
+        )
 
         safe_print(f"      ... {product_name}: {review_count}개 리뷰 컨테이너 감지됨")
 
-        if review_count == 0:
+        if not review_css:
             safe_print(f"      ℹ️  {product_name}: 리뷰 없음 -> 리뷰 0개")
-            return []
+            return 0
+
+        if review_css != REVIEW_CONTAINER_CSS_CANDIDATES[0]:
+            safe_print(f"      ... {product_name}: 기본 선택자 실패, 대체 선택자 사용 ({review_css})")
 
-        # 🔧 STEP 3: 무한 스크롤로 모든 리뷰 로드
+        # 🔧 STEP 3: 무한 스크롤로 리뷰 로드 + 새로 로드된 리뷰는 바로 추출/저장
         safe_print(f"      ... {product_name}: 모든 리뷰 로딩 중...")
         previous_count = 0
         no_change_count = 0
         max_no_change = 5
 
         while no_change_count < max_no_change:
+            if deadline.expired():
+                safe_print(f"      ⌛ {product_name}: 리뷰 시간 제한 도달 → 로드된 {previous_count}개까지만 저장")
+                break
+
             current_count = driver.execute_script("""
-                var reviews = document.querySelectorAll('div.fragrance-review-box[itemprop="review"]');
+                var reviews = document.querySelectorAll(arguments[0]);
                 if (reviews.length > 0) {
                     reviews[reviews.length - 1].scrollIntoView({block: 'end', behavior: 'smooth'});
                 }
                 return reviews.length;
-            """)
+            """, review_css)
 
             if current_count > previous_count:
-                safe_print(f"      📝 {product_name}: {current_count}개 리뷰 로드됨...")
+                with stage_timings.time('review_extraction'):
+                    extracted_count, saved = extract_new_reviews(
+                        driver, product_name, base_url, review_css, extracted_count
+                    )
+                saved_count += saved
+                logger.debug(f"      📝 {product_name}: {current_count}개 리뷰 로드됨... (저장: {saved_count}개)")
                 previous_count = current_count
                 no_change_count = 0
-                time.sleep(3)
+                tracer.sleep('review_scroll_round', 3, reviews=current_count)
             else:
                 no_change_count += 1
-                safe_print(f"      ⏱ {product_name}: 변화 없음 ({no_change_count}/{max_no_change})")
-                time.sleep(2)
-
-        safe_print(f"      ✅ {product_name}: 총 {previous_count}개 리뷰 로드 완료")
-        time.sleep(2)
-
-        # 🔧 STEP 4: 모든 리뷰 추출
-        review_elements = driver.find_elements(By.CSS_SELECTOR, 'div.fragrance-review-box[itemprop="review"]')
-
-        # 대체 선택자 시도
-        if not review_elements:
-            safe_print(f"      ... {product_name}: 기본 선택자 실패, 대체 선택자 시도...")
-            review_elements = driver.find_elements(By.CSS_SELECTOR, 'div[itemprop="review"]')
-
-        if not review_elements:
-            review_elements = driver.find_elements(By.CSS_SELECTOR, 'div[class*="review-box"]')
-
-        safe_print(f"      ... {product_name}: {len(review_elements)}개 리뷰 추출 시작...")
-
-        for idx, review in enumerate(review_elements, 1):
-            try:
-                # 리뷰어 이름
-                reviewer_name_text = "Guest"
-                try:
-                    meta_name = review.find_element(By.CSS_SELECTOR, 'meta[itemprop="name"]')
-                    reviewer_name_text = meta_name.get_attribute("content")
-                except:
-                    try:
-                        reviewer_link = review.find_element(By.CSS_SELECTOR, 'a[href*="member"]')
-                        reviewer_name_text = reviewer_link.text.strip()
-                    except:
-                        pass
-
-                # 날짜
-                review_date_text = "NA"
-                try:
-                    date_span = review.find_element(By.CSS_SELECTOR, 'span[itemprop="datePublished"]')
-                    review_date_text = date_span.text.strip()
-                except:
-                    try:
-                        date_meta = review.find_element(By.CSS_SELECTOR, 'meta[itemprop="datePublished"]')
-                        review_date_text = date_meta.get_attribute("content")
-                    except:
-                        pass
-
-                # 리뷰 내용
-                content = ""
-                try:
-                    content_div = review.find_element(By.CSS_SELECTOR, 'div[itemprop="reviewBody"]')
-                    paragraphs = content_div.find_elements(By.TAG_NAME, 'p')
-                    content = " ".join([p.text.strip() for p in paragraphs if p.text.strip()])
-                except:
-                    try:
-                        content_div = review.find_element(By.CSS_SELECTOR, 'div[itemprop="reviewBody"]')
-                        content = content_div.text.strip()
-                    except:
-                        content = review.text.strip()
-
-                # 중복 체크
-                unique_id = (reviewer_name_text, review_date_text, content[:50])
-
-                if unique_id in processed_review_identifiers:
-                    continue
+                logger.debug(f"      ⏱ {product_name}: 변화 없음 ({no_change_count}/{max_no_change})")
+                tracer.sleep('review_scroll_round', 2, no_change=no_change_count)
 
-                processed_review_identifiers.add(unique_id)
-
-                if content:
-                    reviews_batch.append({
-                        'product_name': product_name,
-                        'review_content': content,
-                        'review_date': review_date_text,
-                        'reviewer_name': reviewer_name_text,
-                    })
-
-                    if idx % 20 == 0:
-                        safe_print(f"      ... {product_name}: {len(reviews_batch)}개 처리 중...")
-
-            except Exception as e:
-                continue
+        # 🔧 STEP 4: 마지막 스크롤 이후 로드된 리뷰 추출
+        with stage_timings.time('review_extraction'):
+            extracted_count, saved = extract_new_reviews(
+                driver, product_name, base_url, review_css, extracted_count
+            )
+        saved_count += saved
 
-        safe_print(f"      ✅ {product_name}: 총 {len(reviews_batch)}개 리뷰 수집 완료")
-        return reviews_batch
+        safe_print(f"      ✅ {product_name}: 총 {saved_count}개 리뷰 수집 완료 (로드 {extracted_count}개)")
+        return saved_count
 
     except Exception as e:
-        safe_print(f"      ❌ {product_name}: 리뷰 수집 에러: {repr(e)}")
+        # 이미 저장된 청크는 그대로 남음
+        safe_print(f"      ❌ {product_name}: 리뷰 수집 에러 (저장된 {saved_count}개는 유지): {repr(e)}")
 
         try:
             current_url = driver.current_url
@@ -364,7 +526,7 @@ def scrape_reviews(driver, product_name, base_url):
         except:
             pass
 
-        return []
+        return saved_count
 
 
 # -----------------------
@@ -377,55 +539,71 @@ def process_single_product_reviews_only(args, driver_pool):
     """
     url, product_name, index, total = args
     driver = None
+    stage = 'driver_pool'
+    deadline = Deadline(PRODUCT_DEADLINE)
+    stage_timings.begin_task(url)
 
     try:
-        driver = driver_pool.get()
+        with stage_timings.time('pool_wait'):
+            driver = driver_pool.get()
 
         safe_print(f"      ... {product_name}: 리뷰 수집 시작")
 
-        # 리뷰 수집
-        reviews_batch = scrape_reviews(driver, product_name, url)
+        # 리뷰 수집 (로드되는 대로 청크 단위로 저장됨)
+        stage = 'reviews'
+        # 리뷰 로딩(스크롤/대기) 시간 = 전체에서 접속/추출/CSV 기록/rate limit 대기를 뺀 나머지
+        with stage_timings.time('review_loading'):
+            review_count = scrape_reviews(driver, product_name, url, deadline.stage('reviews'))
 
-        # CSV 저장
-        if reviews_batch:
-            write_batch_to_csv(REVIEW_CSV_FILE, REVIEW_FIELDNAMES, reviews_batch)
+        page_metrics = None
+        if BROWSER_METRICS:
+            with stage_timings.time('browser_metrics'):
+                page_metrics = capture_page_metrics(driver)
 
         # 딜레이
         delay = random.uniform(*RATE_LIMIT_DELAY_RANGE)
         safe_print(f"      ... 다음 작업까지 {delay:.1f}초 대기 ...")
-        time.sleep(delay)
+        stage_timings.sleep('rate_limit_sleep', delay)
 
         # 드라이버 반환
         driver_pool.put(driver)
+        stage_timings.end_task()
 
         return {
             'status': 'success',
             'product_name': product_name,
-            'review_count': len(reviews_batch),
+            'url': url,
+            'review_count': review_count,
+            'partial': deadline.expired_stages,
+            'page_metrics': page_metrics,
+            'elapsed': deadline.elapsed(),
             'index': index,
             'total': total
         }
 
     except Exception as e:
+        # 페이지 오류는 드라이버를 그대로 쓰고, 세션/브라우저가 죽었을 때만 재시작
+        failure = classify_failure(e, driver)
+        failure_stats.record(failure)
         if driver:
-            safe_print(f"  (i) {product_name} 처리 중 오류 발생. 드라이버 재시작...")
-            try:
-                driver.quit()
-            except:
-                pass
-
-            try:
-                new_user_agent = random.choice(USER_AGENT_LIST)
-                new_driver = driver_pool._create_driver(user_agent=new_user_agent)
-                driver_pool.put(new_driver)
-                safe_print(f"  (i) 새 드라이버 생성 후 풀에 반환 완료.")
-            except Exception as e_create:
-                safe_print(f"  (E) 새 드라이버 생성 실패: {e_create}.")
-                pass
+            if failure == FAILURE_PAGE:
+                safe_print(f"  (i) {product_name} 페이지 오류 → 드라이버 유지")
+            else:
+                safe_print(f"  (i) {product_name} {failure} 오류 → 드라이버 재시작...")
+            recover_driver(
+                driver_pool, driver, failure,
+                lambda: driver_pool._create_driver(user_agent=random.choice(USER_AGENT_LIST)),
+                failure_stats,
+            )
 
+        stage_timings.end_task()
         return {
             'status': 'failed',
             'error': repr(e)[:120],
+            'failure': failure,
+            'error_type': type(e).__name__,
+            'stage': stage,
+            'url': url,
             'product_name': product_name,
             'index': index,
             'total': total
@@ -436,20 +614,87 @@ def process_single_product_reviews_only(args, driver_pool):
 # 7. 메인 함수
 # -----------------------
 
-def main_review_only():
+def load_review_targets(retry_failed=False, use_sqlite=False):
+    """
+    리뷰만 수집할 제품 [{'url', 'product_name'}, ...].
+    대상 출처는 하나만 쓰며 위에서부터 우선:
+    1. retry_failed: 실패 기록(dead_letters)에서 아직 해결되지 않은 이 키워드의 제품
+    2. use_sqlite: SQLite 저장소에서 리뷰가 없는 제품
+    3. 향수 목록 CSV(PERFUME_CSV_FILE)의 전체 제품
+    CSV를 읽지 못하면 None
+    """
+    if retry_failed:
+        print(f"\n♻️  [재처리] '{DEAD_LETTER_FILE}'의 실패 제품만 다시 수집합니다.")
+        return [
+            {'url': entry['url'], 'product_name': entry['product_name']}
+            for entry in dead_letters.pending('fragrantica', SEARCH_KEYWORD)
+        ]
+    if use_sqlite:
+        print(f"\n🗄️  '{SQLITE_DB_FILE}'에서 리뷰가 없는 제품 조회 중...")
+        return [
+            {'url': url, 'product_name': product_name}
+            for url, product_name in products_missing_reviews(SQLITE_DB_FILE, 'fragrantica', SEARCH_KEYWORD)
+        ]
+
+    print(f"\n📂 '{PERFUME_CSV_FILE}'에서 URL 로딩 중...")
+    product_data_list = []
+    try:
+        with open(PERFUME_CSV_FILE, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if row.get('url') and row.get('product_name'):
+                    product_data_list.append({
+                        'url': row['url'],
+                        'product_name': row['product_name']
+                    })
+    except Exception as e:
+        print(f"❌ CSV 파일 읽기 오류: {e}")
+        return None
+    return product_data_list
+
+
+def main_review_only(retry_failed=False, workers=None, metrics_port=None, trace_file=None, log_level=None,
+                     profile_every=None, profile_mode=None, memory_every=None):
     """
     기존 향수 목록 CSV에서 URL을 읽어와서 리뷰만 수집
+    retry_failed=True면 실패 기록(DEAD_LETTER_FILE)의 제품만 다시 수집
     """
+    init_runtime()
     start_time = time.time()
+    max_workers = workers or (RETRY_FAILED_WORKERS if retry_failed else MAX_WORKERS)
 
     print("=" * 60)
     print(f"🚀 Fragrantica 리뷰 전용 크롤러 시작")
     print(f"   (키워드: {SEARCH_KEYWORD})")
-    print(f"   (드라이버 풀: {MAX_WORKERS}개)")
+    print(f"   (드라이버 풀: {max_workers}개)")
     print("=" * 60)
 
+    metrics_port = METRICS_PORT if metrics_port is None else metrics_port
+    if metrics_port:
+        crawl_metrics.serve(METRICS_HOST, metrics_port)
+    if log_level:
+        console.set_level(log_level)
+    trace_file = trace_file or TRACE_FILE
+    if trace_file:
+        tracer.start(trace_file)
+        print(f"🧵 실행 타임라인 기록: {trace_file}")
+    task_profiler = TaskProfiler(
+        PROFILE_EVERY if profile_every is None else profile_every, PROFILE_DIR,
+        profile_mode or PROFILE_MODE, log=safe_print,
+    )
+    memory_tracker = MemoryTracker(
+        MEMORY_SNAPSHOT_EVERY if memory_every is None else memory_every, PROFILE_DIR, MEMORY_TOP,
+    )
+    memory_tracker.start()
+    if task_profiler.every or memory_tracker.enabled:
+        print(f"🔬 프로파일링: 작업 {task_profiler.every or '-'}개마다 ({task_profiler.mode}), "
+              f"메모리 스냅샷 {memory_tracker.every or '-'}개마다 → {PROFILE_DIR}/")
+
+    # SQLite 저장소가 있으면 "리뷰가 없는 제품"을 인덱스로 바로 조회
+    use_sqlite = 'sqlite' in OUTPUT_FORMATS and os.path.exists(SQLITE_DB_FILE)
+
     # 1️⃣ 기존 향수 CSV 파일 확인
-    if not os.path.exists(PERFUME_CSV_FILE):
+    if not retry_failed and not use_sqlite and not os.path.exists(PERFUME_CSV_FILE):
         print(f"\n❌ 오류: '{PERFUME_CSV_FILE}' 파일이 존재하지 않습니다!")
         print(f"   먼저 향수 목록을 수집하거나, 파일명을 확인해주세요.")
         return
@@ -468,37 +713,33 @@ def main_review_only():
         print("!" * 60 + "\n")
         sys.exit(1)
 
-    # 3️⃣ 향수 목록 CSV에서 URL 읽기
-    print(f"\n📂 '{PERFUME_CSV_FILE}'에서 URL 로딩 중...")
-    product_data_list = []
+    configure_outputs(csv_writer, 'fragrantica', SEARCH_KEYWORD, OUTPUT_FORMATS, {
+        REVIEW_CSV_FILE: ('reviews', REVIEW_FIELDNAMES),
+    }, parquet_dir=PARQUET_OUTPUT_DIR, sqlite_path=SQLITE_DB_FILE)
 
-    try:
-        with open(PERFUME_CSV_FILE, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('url') and row.get('product_name'):
-                    product_data_list.append({
-                        'url': row['url'],
-                        'product_name': row['product_name']
-                    })
-    except Exception as e:
-        print(f"❌ CSV 파일 읽기 오류: {e}")
+    # 3️⃣ 수집 대상 URL 읽기
+    product_data_list = load_review_targets(retry_failed, use_sqlite)
+    if product_data_list is None:
+        return
+    if retry_failed and not product_data_list:
+        print("🎉 재처리할 실패 기록이 없습니다. 종료합니다.")
         return
 
     if not product_data_list:
-        print(f"❌ '{PERFUME_CSV_FILE}'에서 유효한 URL을 찾지 못했습니다.")
+        print(f"❌ '{SQLITE_DB_FILE if use_sqlite else PERFUME_CSV_FILE}'에서 수집할 URL을 찾지 못했습니다.")
         return
 
     print(f"✅ 총 {len(product_data_list)}개 제품 발견")
 
     # 4️⃣ 예상 시간 계산
     avg_delay = sum(RATE_LIMIT_DELAY_RANGE) / 2
-    avg_time_per_product = 12 + avg_delay
-    estimated_time_parallel = (len(product_data_list) * avg_time_per_product) / MAX_WORKERS
-    print(f"\n📊 예상 소요 시간 ({MAX_WORKERS}개 병렬): 약 {estimated_time_parallel / 60:.1f}분")
+    # 지난 실행의 제품당 평균 소요 시간이 있으면 그것으로 추정
+    avg_time_per_product = previous_task_mean(TIMING_FILE, 12 + avg_delay)
+    estimated_time_parallel = (len(product_data_list) * avg_time_per_product) / max_workers
+    print(f"\n📊 예상 소요 시간 ({max_workers}개 병렬): 약 {estimated_time_parallel / 60:.1f}분")
 
     # 5️⃣ 드라이버 풀 초기화
-    driver_pool = DriverPool(size=MAX_WORKERS)
+    driver_pool = DriverPool(size=max_workers)
 
     print("\n[리뷰 수집 시작]")
     print("-" * 60)
@@ -507,31 +748,53 @@ def main_review_only():
     total = len(product_data_list)
 
     # 6️⃣ 작업 준비
-    tasks = [
+    # 작업은 필요할 때 하나씩 생성 (frontier가 꺼내 갈 때)
+    tasks = (
         (item['url'], item['product_name'], i + 1, total)
         for i, item in enumerate(product_data_list)
-    ]
+    )
 
     success_count = 0
     failed_count = 0
     total_reviews = 0
 
-    # 7️⃣ 병렬 처리
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(process_single_product_reviews_only, task, driver_pool): task
-            for task in tasks
-        }
+    frontier = TaskFrontier(tasks)
 
-        for future in as_completed(futures):
+    # 7️⃣ 병렬 처리
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 진행 중인 작업은 워커당 SUBMIT_WINDOW_PER_WORKER개까지만 (나머지는 frontier에서 대기)
+        submitter = BoundedSubmitter(
+            executor, task_profiler.wrap(process_single_product_reviews_only), frontier, max_workers * SUBMIT_WINDOW_PER_WORKER, driver_pool
+        )
+        crawl_metrics.watch_run(total, driver_pool, submitter, frontier)
+
+        for future in submitter.as_completed():
             result = future.result()
             percentage = (result['index'] / result['total']) * 100
 
             if result['status'] == 'success':
                 success_count += 1
+                crawl_metrics.product_done('partial' if result['partial'] else 'success', result['review_count'])
                 total_reviews += result['review_count']
+                dead_letters.resolve('fragrantica', result['url'])
+                if result['page_metrics']:
+                    run_metadata.record_page(
+                        result['url'], result['product_name'], result['page_metrics'],
+                        result['elapsed'], result['review_count'],
+                    )
 
-                if result['review_count'] > 0:
+                if result['partial']:
+                    # 시간 제한으로 일부만 수집 (저장된 리뷰는 유지)
+                    run_metadata.mark_partial(
+                        result['url'], result['product_name'], result['partial'],
+                        result['review_count'], result['elapsed'],
+                    )
+                    run_metadata.save()
+                    safe_print(
+                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] "
+                        f"⌛ {result['product_name']} - 리뷰 {result['review_count']}개 (시간 제한으로 일부만)"
+                    )
+                elif result['review_count'] > 0:
                     safe_print(
                         f"[{result['index']}/{result['total']} ({percentage:.1f}%)] "
                         f"✅ {result['product_name']} - 리뷰 {result['review_count']}개"
@@ -542,19 +805,52 @@ def main_review_only():
                         f"ℹ️  {result['product_name']} - 리뷰 없음"
                     )
             else:
+                if result['failure'] != FAILURE_PAGE and frontier.requeue(submitter.task_for(future), result['url']):
+                    # 드라이버(세션/브라우저) 문제로 실패한 제품은 한 번만 대기열 맨 앞에 다시 넣음
+                    crawl_metrics.product_done('requeued')
+                    safe_print(f"[{result['index']}/{result['total']}] 🔁 {result['failure']} 오류 → 대기열 앞에 다시 넣음")
+                    continue
                 failed_count += 1
+                crawl_metrics.product_done('failed')
+                dead_letters.record(
+                    'fragrantica', SEARCH_KEYWORD, result['url'], result['stage'], result['failure'],
+                    result['error_type'], result['error'], result['product_name'],
+                )
                 safe_print(
                     f"[{result['index']}/{result['total']} ({percentage:.1f}%)] "
                     f"❌ {result['product_name']} - 처리 실패: {result['error']}"
                 )
 
+            done_count = success_count + failed_count
+            if done_count % 10 == 0:
+                safe_print(f"   💾 writer 대기 중인 행: {csv_writer.queue_depth()}개")
+            stage_timings.maybe_dump()
+            tracer.counter('tasks', in_flight=submitter.in_flight, writer_queue=csv_writer.queue_depth())
+            for line in memory_tracker.maybe_snapshot(done_count) or ():
+                safe_print(f"   🧠 {line}")
+
     # 8️⃣ 드라이버 풀 종료
+    console.flush()
     print("\n🔧 드라이버 풀 종료 중...")
     driver_pool.close_all()
 
+    print("💾 남은 데이터 저장 중...")
+    csv_writer.close()
+    review_store.close()
+    selector_registry.save()
+
     scraping_time = time.time() - scraping_start
     total_time = time.time() - start_time
 
+    run_metadata.set('counts', {'success': success_count, 'failed': failed_count, 'reviews': total_reviews})
+    run_metadata.set('workers', max_workers)
+    run_metadata.set('elapsed', {'scraping': round(scraping_time, 1)})
+    run_metadata.save(finished=True)
+    stage_timings.dump()
+    crawl_metrics.stop()
+    tracer.close()
+    memory_tracker.stop()
+
     # 9️⃣ 최종 결과 출력
     print("-" * 60)
     print("\n" + "=" * 60)
@@ -563,8 +859,24 @@ def main_review_only():
     print(f"\n📊 통계:")
     print(f"   - 성공: {success_count}개")
     print(f"   - 실패: {failed_count}개")
+    print(f"   - 저장 행: {csv_writer.rows_written}개 (flush {csv_writer.flush_count}회, fsync {csv_writer.fsync_count}회)")
+    print(f"   - 건너뛴 중복 리뷰: {review_store.duplicates}개 (누적 지문 {len(review_store)}개)")
+    print(f"   - 최대 동시 제출 작업: {submitter.max_in_flight}개 (대기열 재투입 {len(frontier.requeued)}건)")
+    print(f"   - 실패 유형: {failure_stats.summary()}")
+    print(f"   - 부분 수집(시간 제한): {run_metadata.partial_count}개 ({RUN_METADATA_FILE})")
+    if BROWSER_METRICS:
+        page_count, means = run_metadata.page_summary()
+        averages = ', '.join(f"{key} {value}" for key, value in means.items()) or '-'
+        print(f"   - 브라우저 지표: {page_count}개 페이지 (평균 {averages})")
+    print(f"   - 실패 기록: 새로 {dead_letters.recorded}개, 재처리 성공 {dead_letters.resolved}개 ({DEAD_LETTER_FILE})")
+    for line in selector_registry.summary('fragrantica'):
+        print(f"   - 선택자 적중률 {line}")
     print(f"   - 총 리뷰 수: {total_reviews}개")
     print(f"\n⏱️  소요 시간:")
+    for line in stage_timings.summary():
+        print(f"   - {line}")
+    if task_profiler.profiled:
+        print(f"   - 프로파일: {task_profiler.profiled}개 작업 ({PROFILE_DIR}/)")
     print(f"   - 리뷰 수집: {scraping_time / 60:.1f}분")
     print(f"   - 전체: {total_time / 60:.1f}분")
     print(f"\n📁 저장된 파일:")
@@ -577,4 +889,26 @@ def main_review_only():
 # -----------------------
 
 if __name__ == "__main__":
-    main_review_only()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fragrantica 리뷰 전용 크롤러")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help=f"실패 기록({DEAD_LETTER_FILE})에 남은 제품만 다시 수집")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"동시 드라이버 수 (기본: {MAX_WORKERS}, --retry-failed 시 {RETRY_FAILED_WORKERS})")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help=f"실행 중 지표(/metrics) 포트 (기본: {METRICS_PORT}, 0이면 끔)")
+    parser.add_argument('--trace', default=None, metavar='PATH',
+                        help="워커별 단계 타임라인을 Chrome trace-event JSON으로 기록")
+    parser.add_argument('--log-level', default=None, choices=LEVELS,
+                        help=f"콘솔 출력 수준 (기본: {LOG_LEVEL}, DEBUG면 리뷰/스크롤 단위 메시지까지)")
+    parser.add_argument('--profile-every', type=int, default=None, metavar='N',
+                        help=f"N번째 제품 작업마다 프로파일을 {PROFILE_DIR}/에 저장 (기본: {PROFILE_EVERY}, 0이면 끔)")
+    parser.add_argument('--profile-mode', default=None, choices=PROFILE_MODES,
+                        help=f"프로파일 방식 (기본: {PROFILE_MODE})")
+    parser.add_argument('--memory-every', type=int, default=None, metavar='N',
+                        help=f"제품 N개마다 tracemalloc 스냅샷 비교 (기본: {MEMORY_SNAPSHOT_EVERY}, 0이면 끔)")
+    args = parser.parse_args()
+    main_review_only(
+        retry_failed=args.retry_failed, workers=args.workers, metrics_port=args.metrics_port,
+        trace_file=args.trace, log_level=args.log_level, profile_every=args.profile_every,
+        profile_mode=args.profile_mode, memory_every=args.memory_every,
+    )
@@ -6,18 +6,40 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     ElementClickInterceptedException,
-    WebDriverException,
 )
+import argparse
 import time
 import csv
 import os
+import re
 import sys
-from tenacity import retry, stop_after_attempt, wait_exponential
 import logging
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+# 공통 모듈 (저장소 루트의 crawler_common)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawler_common.writer import AsyncWriter
+from crawler_common.dead_letter import DeadLetterStore
+from crawler_common.frontier import BoundedSubmitter, TaskFrontier
+from crawler_common.resilience import CircuitBreaker, PerHost, RetryBudget, guarded_call
+from crawler_common.recovery import FAILURE_PAGE, FAILURE_SESSION, FailureStats, classify_failure, recover_driver
+from crawler_common.fingerprint import FingerprintStore, review_fingerprint
+from crawler_common.sinks import configure_outputs
+from crawler_common.url_registry import SeenUrlRegistry, canonicalize_url
+from crawler_common.http_fetch import HostRateLimiter, HttpFetcher, extract_cards, extract_links
+from crawler_common.selector_cache import SelectorRegistry
+from crawler_common.deadline import Deadline
+from crawler_common.run_metadata import RunMetadata
+from crawler_common.browser_metrics import capture_page_metrics
+from crawler_common.timing import StageTimings, previous_task_mean
+from crawler_common.metrics import CrawlMetrics, register_common_metrics
+from crawler_common.tracing import TraceRecorder
+from crawler_common.console import LEVELS, AsyncConsole
+from crawler_common.profiling import PROFILE_MODES, MemoryTracker, TaskProfiler
 
 # -----------------------
 # 기본 설정 / 로그
@@ -42,6 +64,92 @@ REVIEW_CSV_FILE = f'parfumo_reviews_{SEARCH_KEYWORD}.csv'
 RATE_LIMIT_DELAY = 0.3
 MAX_WORKERS = 3  # 안정성을 위해 3개로 설정
 
+# 사이트 주소 (오프라인 벤치마크 때는 환경 변수로 로컬 재생 서버를 가리킴, bench/replay_server.py)
+BASE_URL = os.environ.get('PARFUMO_BASE_URL', 'https://www.parfumo.com').rstrip('/')
+# 화면 없는 리눅스 서버 등에서 돌릴 때 CRAWLER_HEADLESS=1
+HEADLESS = os.environ.get('CRAWLER_HEADLESS') == '1'
+
+# 검색 결과에는 다른 브랜드 제품도 섞여 있으므로 목록 카드의 브랜드로 먼저 거름
+BRAND_FILTER = True
+# 'search': 검색 결과 / 'brand_page': 브랜드 카탈로그 페이지 먼저 시도 (없으면 검색으로)
+DISCOVERY_SOURCE = 'search'
+# 2페이지부터는 브라우저 대신 HTTP로 동시 요청 (같은 호스트는 최소 간격 유지)
+DISCOVERY_HTTP = True
+DISCOVERY_HTTP_WORKERS = 4
+DISCOVERY_MIN_INTERVAL = 0.5  # 초, 호스트당 요청 간격
+
+# 지난 실행에서 맞은 선택자를 먼저 시도하고, 후보 전체를 한 번에 확인 (후보마다 15초씩 기다리지 않음)
+SELECTOR_CACHE_FILE = 'selector_cache.json'
+SELECTOR_WAIT_TIMEOUT = 15  # 초, 후보 전체 합산 대기 시간
+
+# --- 제품 정보 재시도 / 서킷 브레이커 ---
+# 재시도는 호스트별 예산(정상 요청의 RETRY_BUDGET_RATIO 비율) 안에서만,
+# 최근 실패율이 BREAKER_FAILURE_RATE 이상이면 BREAKER_COOLDOWN초 동안 모든 워커가 대기 후 워커 하나로 시험
+PRODUCT_MAX_ATTEMPTS = 3
+RETRY_BUDGET_RATIO = 0.2
+BREAKER_WINDOW = 20
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_COOLDOWN = 30.0  # 초
+
+# --- 실패 기록 (dead letter) ---
+# 실패한 제품을 단계/오류 유형과 함께 남김 → `python main.py --retry-failed` 로 그것만 재처리
+DEAD_LETTER_FILE = 'failed_products.jsonl'
+RETRY_FAILED_WORKERS = 1  # 재처리는 낮은 동시성으로
+
+# --- 작업 제출 ---
+# 워커당 미리 제출해 두는 작업 수 (나머지는 frontier에서 대기)
+SUBMIT_WINDOW_PER_WORKER = 2
+
+# --- 제품/단계별 시간 제한 ---
+# 제한을 넘기면 지금까지 로드한 리뷰만 저장하고 다음 제품으로 넘어감 (RUN_METADATA_FILE에 부분 수집으로 기록)
+# None이면 제한 없음, 제품 제한은 세션 재시도까지 합친 시간
+PRODUCT_DEADLINE = 900  # 초
+STAGE_DEADLINES = {
+    'reviews': 600,  # 'More reviews' 클릭 루프
+}
+RUN_METADATA_FILE = 'run_metadata.json'
+
+# --- 단계별 소요 시간 ---
+# 제품마다 단계별(풀 대기/접속/정보 추출/리뷰 로딩/리뷰 추출/CSV 기록/대기) 시간을
+# 히스토그램으로 모아 p50/p95/p99를 TIMING_FILE에 저장 (실행 중 TIMING_DUMP_INTERVAL초마다 + 종료 시)
+TIMING_FILE = 'stage_timings.json'
+TIMING_DUMP_INTERVAL = 60.0  # 초
+
+# --- 실행 중 지표 ---
+# 실행 중 http://METRICS_HOST:METRICS_PORT/metrics 에서 Prometheus 형식 지표 제공
+# (처리량, 진행 중 작업, 드라이버 풀, 재시도/브레이커, writer 큐, 단계별 소요 시간). None이면 끔
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9108
+
+# --- 실행 타임라인 (trace) ---
+# 파일명을 지정하면 워커 스레드별 단계 구간(풀 대기, 접속, 스크롤, 대기, CSV 기록 등)을
+# Chrome trace-event JSON으로 기록 (chrome://tracing 또는 ui.perfetto.dev 에서 열기). None이면 끔
+TRACE_FILE = None  # 예: 'trace.json'
+
+# --- 프로파일링 ---
+# PROFILE_EVERY번째 제품 작업마다 하나씩 프로파일을 PROFILE_DIR에 작업별 파일로 저장 (0이면 끔)
+# PROFILE_MODE: 'cprofile'(결정적, .prof) 또는 'sample'(스택 표본, .folded)
+# MEMORY_SNAPSHOT_EVERY개 제품마다 tracemalloc 스냅샷 → 직전 대비 증가 상위 MEMORY_TOP줄 저장 (0이면 끔)
+PROFILE_EVERY = 0
+PROFILE_MODE = 'cprofile'
+PROFILE_DIR = 'profiles'
+MEMORY_SNAPSHOT_EVERY = 0
+MEMORY_TOP = 15
+
+# --- 브라우저 페이지 지표 ---
+# True면 리뷰 로딩 후 제품 페이지의 브라우저 지표(Navigation Timing, 요청 수/전송 크기, JS 힙, DOM 노드 수,
+# CDP Performance 지표)를 RUN_METADATA_FILE의 'pages'에 제품별로 기록
+BROWSER_METRICS = False
+
+# --- 'More reviews' 클릭 로딩 ---
+# 버튼을 MORE_REVIEWS_BUTTON_WAIT초 안에 못 찾으면 끝, 새 리뷰가 MORE_REVIEWS_LOAD_WAIT초 안에 안 붙어도 끝
+# 클릭 전 MORE_REVIEWS_CLICK_DELAY초, 새 리뷰가 붙은 뒤 MORE_REVIEWS_SETTLE초 대기
+# (bench/bench_loading.py로 지연별 완결성/시간 비교)
+MORE_REVIEWS_BUTTON_WAIT = 5  # 초
+MORE_REVIEWS_LOAD_WAIT = 10  # 초
+MORE_REVIEWS_CLICK_DELAY = 0.5  # 초
+MORE_REVIEWS_SETTLE = 1.0  # 초
+
 # --- 2. CSV 파일 헤더 ---
 PERFUME_FIELDNAMES = [
     'product_name',
@@ -67,6 +175,12 @@ REVIEW_FIELDNAMES = [
 # --- 3. 선택자 ---
 PRODUCT_LINK_SELECTOR = (By.CSS_SELECTOR, 'div.name > a')
 NEXT_PAGE_BUTTON_SELECTOR = (By.CSS_SELECTOR, 'a.paging_links[rel="next"]')
+PAGE_LINK_SELECTOR = (By.CSS_SELECTOR, 'a.paging_links')
+PAGE_LINK_CLASS = 'paging_links'  # PAGE_LINK_SELECTOR의 class (HTTP 응답 파싱용)
+PRODUCT_LINK_PARENT_CLASS = 'name'  # PRODUCT_LINK_SELECTOR의 부모 class (HTTP 응답 파싱용)
+# 목록 카드 안의 브랜드 표시 (위에서부터 시도)
+LISTING_BRAND_CSS_CANDIDATES = ['div.brand a', 'div.brand', 'span.brand']
+LISTING_BRAND_CLASS = 'brand'  # LISTING_BRAND_CSS_CANDIDATES의 class (HTTP 응답 파싱용)
 PRODUCT_NAME_SELECTOR = (By.CSS_SELECTOR, 'h1.p_name_h1')
 BRAND_NAME_SELECTOR = (By.CSS_SELECTOR, 'h1 span[itemprop="brand"] span[itemprop="name"]')
 TARGET_GENDER_SELECTOR = (By.CSS_SELECTOR, 'div.p_gender_big i')
@@ -88,9 +202,84 @@ AWARD_COUNT_SELECTOR = (By.CSS_SELECTOR, 'span[id^="nr_awards_"]')
 MORE_REVIEWS_MAIN_BUTTON_SELECTOR = (By.CSS_SELECTOR, 'span.action_more_reviews')
 
 
-# 락
-csv_lock = threading.Lock()
-print_lock = threading.Lock()
+# --- 출력 writer 설정 ---
+# 디스크 쓰기는 전용 writer 스레드가 담당 (워커는 큐에 넣고 바로 다음 작업 진행)
+WRITER_FLUSH_ROWS = 200       # 이만큼 쌓이면 즉시 flush
+WRITER_FLUSH_INTERVAL = 1.0   # 초, 마지막 flush 후 이 시간이 지나면 flush
+WRITER_FSYNC_INTERVAL = 10.0  # 초, 0이면 매 flush마다, None이면 fsync 안 함
+
+# --- 출력 형식 ---
+# 'csv', 'parquet', 'sqlite' 조합
+# - parquet: pyarrow 필요, site/brand 파티션으로 저장
+# - sqlite: 제품은 url, 리뷰는 지문 기준 upsert (재실행해도 중복 없음)
+OUTPUT_FORMATS = ('csv',)
+PARQUET_OUTPUT_DIR = 'parquet'
+SQLITE_DB_FILE = 'crawl.sqlite3'
+
+# --- 리뷰 중복 제거 ---
+# 리뷰 지문(64비트)을 파일에 누적해서 실행/브랜드 파일이 달라도 같은 리뷰는 다시 쓰지 않음
+REVIEW_FINGERPRINT_FILE = 'seen_reviews.fp'
+
+# --- 제품 수집 이력 ---
+# 수집을 마친 제품 URL(정규화)을 기록해 두고, 다른 키워드/재실행에서 같은 제품은 건너뜀
+SEEN_URL_DB_FILE = 'seen_urls.sqlite3'
+SKIP_SEEN_PRODUCTS = True
+
+
+# --- 콘솔 로그 ---
+# 출력은 큐 기반 로거로 넘기고 전용 스레드가 콘솔에 씀 (워커는 콘솔 I/O를 기다리지 않음)
+# LOG_LEVEL='DEBUG'면 리뷰/스크롤 단위 진행 메시지까지 출력, LOG_FILE을 지정하면 JSON lines로도 저장
+LOG_LEVEL = 'INFO'
+LOG_FILE = None  # 예: 'crawler_log.jsonl'
+console = AsyncConsole('parfumo', LOG_LEVEL, LOG_FILE)
+logger = console.logger
+
+# 워커들이 같이 쓰는 실행 상태 (추적, 실패 통계, 재시도 예산/브레이커, 요청 간격, 실행 기록, 단계 시간/지표)
+tracer = TraceRecorder()
+failure_stats = FailureStats()
+retry_budgets = PerHost(lambda: RetryBudget(ratio=RETRY_BUDGET_RATIO))
+host_breakers = PerHost(lambda: CircuitBreaker(
+    window=BREAKER_WINDOW, min_calls=BREAKER_WINDOW // 2,
+    failure_rate=BREAKER_FAILURE_RATE, cooldown=BREAKER_COOLDOWN,
+))
+discovery_rate_limiter = HostRateLimiter(DISCOVERY_MIN_INTERVAL)
+run_metadata = RunMetadata(RUN_METADATA_FILE, 'parfumo', SEARCH_KEYWORD)
+stage_timings = StageTimings(TIMING_FILE, TIMING_DUMP_INTERVAL, tracer=tracer)
+crawl_metrics = CrawlMetrics()
+brand_filter_stats = Counter()  # 브랜드 필터로 제외한 제품 수 (카드/URL 브랜드별)
+
+# 파일/스레드를 만드는 객체는 init_runtime()에서 생성 (import만 할 때는 아무것도 만들지 않음)
+csv_writer = None
+review_store = None
+dead_letters = None
+url_registry = None
+selector_registry = None
+
+
+def init_runtime():
+    """writer/콘솔 스레드, 지문/수집 이력/실패 기록/선택자 캐시 준비 (main() 시작 시, 두 번째 호출부터는 무시)"""
+    global csv_writer, review_store, dead_letters, url_registry, selector_registry
+    if csv_writer is not None:
+        return
+    console.start()
+    csv_writer = AsyncWriter(
+        flush_rows=WRITER_FLUSH_ROWS,
+        flush_interval=WRITER_FLUSH_INTERVAL,
+        fsync_interval=WRITER_FSYNC_INTERVAL,
+        tracer=tracer,
+    )
+    review_store = FingerprintStore(REVIEW_FINGERPRINT_FILE)
+    # 리뷰 지문은 writer가 그 행을 파일에 쓴 뒤에만 저장, fsync도 writer 주기에 맞춤
+    csv_writer.add_flush_listener(
+        REVIEW_CSV_FILE, lambda rows: review_store.persist_rows('parfumo', rows), lambda: review_store.fsync(),
+    )
+    dead_letters = DeadLetterStore(DEAD_LETTER_FILE)
+    url_registry = SeenUrlRegistry(SEEN_URL_DB_FILE)
+    selector_registry = SelectorRegistry(SELECTOR_CACHE_FILE)
+    register_common_metrics(
+        crawl_metrics.registry, csv_writer=csv_writer, failure_stats=failure_stats, stage_timings=stage_timings,
+        retry_budgets=retry_budgets, host_breakers=host_breakers,
+    )
 
 
 # -----------------------
@@ -169,6 +358,8 @@ class DriverPool:
 
         # 기존 옵션들
         options.add_argument('--no-sandbox')
+        if HEADLESS:
+            options.add_argument('--headless=new')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--disable-extensions')
@@ -186,12 +377,12 @@ class DriverPool:
 
         # 메인 페이지 방문하여 쿠키 처리
         try:
-            driver.get("https://www.parfumo.com/")
+            driver.get(f"{BASE_URL}/")
             if handle_cookie_popup(driver):
                 pass  # 팝업 처리 성공
             time.sleep(0.5)
         except Exception as e:
-            print(f"      ⚠️ 쿠키 처리 중 오류 (계속 진행): {repr(e)[:50]}")
+            safe_print(f"      ⚠️ 쿠키 처리 중 오류 (계속 진행): {repr(e)[:50]}")
 
         return driver
 
@@ -214,7 +405,7 @@ class DriverPool:
 
         # 드라이버 상태 확인
         if not self.is_driver_alive(driver):
-            print(f"      ⚠️ 죽은 드라이버 감지, 새로 생성 중...")
+            safe_print(f"      ⚠️ 죽은 드라이버 감지, 새로 생성 중...")
             try:
                 driver.quit()
             except:
@@ -229,7 +420,7 @@ class DriverPool:
             self.pool.put(driver)
         else:
             # 죽은 드라이버는 새로 생성해서 반환
-            print(f"      ⚠️ 죽은 드라이버 대체 중...")
+            safe_print(f"      ⚠️ 죽은 드라이버 대체 중...")
             try:
                 driver.quit()
             except:
@@ -293,26 +484,56 @@ def get_notes(driver, *selector):
 
 
 def write_batch_to_csv(filename, fieldnames, data_batch):
-    """배치 데이터를 스레드 안전하게 CSV에 쓰기."""
+    """배치 데이터를 writer 큐에 넣기 (파일 쓰기는 writer 스레드가 처리)."""
     if not data_batch:
         return
-    with csv_lock:
-        with open(filename, 'a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writerows(data_batch)
+    with stage_timings.time('csv_write'):
+        csv_writer.submit(filename, data_batch, fieldnames=fieldnames)
 
 
-def safe_print(message):
-    """스레드 안전 출력"""
-    with print_lock:
-        print(message)
+def safe_print(message, level=logging.INFO):
+    """콘솔 출력 (로그 큐에 넣고 바로 반환)"""
+    logger.log(level, message)
 
 
 # -----------------------
 # 6. 핵심 스크래핑 함수
 # -----------------------
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+def needs_navigation(driver, url):
+    """재시도 전에 다시 접속해야 하는지 (다른 페이지에 있거나 제품명 h1이 없으면)"""
+    try:
+        if canonicalize_url(driver.current_url) != canonicalize_url(url):
+            return True
+        return not driver.execute_script(
+            "return !!document.querySelector(arguments[0]);", PRODUCT_NAME_SELECTOR[1]
+        )
+    except Exception:
+        return True
+
+
+def load_product_details(driver, url):
+    """
+    제품 페이지 접속 + 정보 수집 (호스트별 서킷 브레이커 / 재시도 예산 적용).
+    재시도 때는 페이지가 제대로 떠 있으면 다시 접속하지 않고 추출만 다시 시도.
+    """
+    host = urlsplit(url).netloc
+
+    def attempt(n):
+        if n == 0 or needs_navigation(driver, url):
+            with stage_timings.time('navigation'):
+                driver.get(url)
+        with stage_timings.time('detail_extraction'):
+            return scrape_product_details(driver)
+
+    return guarded_call(
+        host_breakers[host], retry_budgets[host], attempt,
+        max_attempts=PRODUCT_MAX_ATTEMPTS,
+        classify=lambda e: classify_failure(e, driver),
+        sleep=lambda seconds: stage_timings.sleep('rate_limit_sleep', seconds),
+    )
+
+
 def scrape_product_details(driver):
     """제품 상세 페이지에서 향수 정보를 스크랩."""
     wait = WebDriverWait(driver, 8)
@@ -356,10 +577,118 @@ def scrape_product_details(driver):
     return product_name, product_data
 
 
-def scrape_reviews(driver, product_name):
-    """제품 페이지의 모든 리뷰 스크랩."""
-    processed_review_texts = set()
-    reviews_batch = []
+NEW_REVIEWS_JS = """
+    return Array.prototype.slice.call(document.querySelectorAll(arguments[0]), arguments[1]);
+"""
+
+
+def extract_new_reviews(driver, product_name, product_url, start_index):
+    """
+    start_index 이후에 새로 로드된 리뷰만 추출해서 바로 writer로 넘김.
+    (다음 start_index, 이번에 저장한 리뷰 수) 반환
+    """
+    review_elements = driver.execute_script(NEW_REVIEWS_JS, REVIEW_CONTAINER_SELECTOR[1], start_index)
+    reviews_chunk = []
+
+    for idx, review in enumerate(review_elements, start_index + 1):
+        try:
+            # "Read more" 버튼 펼치기
+            try:
+                read_more_button = review.find_element(*READ_MORE_BUTTON_SELECTOR)
+                if read_more_button.is_displayed():
+                    click_with_js(driver, read_more_button)
+                    time.sleep(0.3)
+            except NoSuchElementException:
+                pass
+
+            # 리뷰 내용 수집
+            content = safe_find_text(review, *REVIEW_CONTENT_SELECTOR, wait_time=1)
+            if not content:
+                continue
+
+            review_date = safe_find_text(review, *REVIEW_DATE_SELECTOR, wait_time=1)
+            reviewer_name = safe_find_text(review, *REVIEWER_NAME_SELECTOR, wait_time=1)
+
+            # 중복 체크 (전역 지문) - 이미 저장된 리뷰면 나머지 필드는 읽지 않음
+            fingerprint = review_fingerprint('parfumo', {
+                'product_url': product_url,
+                'reviewer_name': reviewer_name,
+                'review_date': review_date,
+                'review_content': content,
+            })
+            if review_store.is_known(fingerprint):
+                continue
+
+            title = safe_find_text(review, *REVIEW_TITLE_SELECTOR, wait_time=1)
+
+            # 리뷰어 성별
+            reviewer_gender = "N/A"
+            try:
+                gender_icon = review.find_element(*REVIEWER_GENDER_SELECTOR)
+                icon_class = gender_icon.get_attribute('class')
+                if 'fa-mars' in icon_class:
+                    reviewer_gender = 'M'
+                elif 'fa-venus' in icon_class:
+                    reviewer_gender = 'F'
+            except NoSuchElementException:
+                pass
+
+            # 리뷰어 총 리뷰 수
+            reviewer_total_reviews = "0"
+            try:
+                reviews_text = safe_find_text(review, *REVIEWER_TOTAL_REVIEWS_SELECTOR, wait_time=1)
+                import re
+                match = re.search(r'(\d+)\s+Reviews?', reviews_text)
+                if match:
+                    reviewer_total_reviews = match.group(1)
+            except:
+                pass
+
+            # 유용성 배지
+            helpful_badge = safe_find_text(review, *HELPFUL_BADGE_SELECTOR, wait_time=1)
+
+            # 어워드 수
+            award_count = "0"
+            try:
+                award_text = safe_find_text(review, *AWARD_COUNT_SELECTOR, wait_time=1)
+                if award_text:
+                    award_count = award_text.strip()
+            except:
+                pass
+
+            if not review_store.add(fingerprint):
+                continue
+
+            reviews_chunk.append({
+                'product_name': product_name,
+                'review_date': review_date,
+                'reviewer_name': reviewer_name,
+                'reviewer_gender': reviewer_gender,
+                'reviewer_total_reviews': reviewer_total_reviews,
+                'helpful_badge': helpful_badge,
+                'award_count': award_count,
+                'review_title': title,
+                'review_content': content,
+                'product_url': product_url,
+            })
+
+        except Exception as e:
+            logger.debug(f"      ⚠️  {product_name}: 리뷰 #{idx} 처리 실패 - {repr(e)[:50]}")
+            continue
+
+    write_batch_to_csv(REVIEW_CSV_FILE, REVIEW_FIELDNAMES, reviews_chunk)
+    return start_index + len(review_elements), len(reviews_chunk)
+
+
+def scrape_reviews(driver, product_name, product_url, deadline=None):
+    """
+    제품 페이지의 모든 리뷰 스크랩.
+    'More reviews'로 새 페이지가 로드될 때마다 그 부분만 추출/저장 (저장한 리뷰 수 반환)
+    deadline이 만료되면 이미 로드된 리뷰까지만 저장하고 종료
+    """
+    deadline = deadline or Deadline()
+    extracted_count = 0
+    saved_count = 0
 
     # 리뷰 섹션 찾기 및 스크롤
     try:
@@ -369,10 +698,10 @@ def scrape_reviews(driver, product_name):
         driver.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", reviews_section
         )
-        time.sleep(1)
+        tracer.sleep('page_settle', 1)
     except Exception:
         safe_print(f"      ℹ️  {product_name}: 리뷰 섹션 없음")
-        return reviews_batch
+        return 0
 
     # 초기 리뷰 개수 확인
     initial_review_count = len(driver.find_elements(*REVIEW_CONTAINER_SELECTOR))
@@ -381,166 +710,92 @@ def scrape_reviews(driver, product_name):
     # 🆕 메인 "More reviews" 버튼 클릭 루프 (페이지 하단)
     click_count = 0
     while True:
+        # 지금까지 로드됐지만 아직 추출하지 않은 리뷰 먼저 저장
+        with stage_timings.time('review_extraction'):
+            extracted_count, saved = extract_new_reviews(
+                driver, product_name, product_url, extracted_count
+            )
+        saved_count += saved
+
+        if deadline.expired():
+            safe_print(f"      ⌛ {product_name}: 리뷰 시간 제한 도달 → 로드된 {extracted_count}개까지만 저장 ({click_count}번 클릭)")
+            break
+
         try:
             # 현재 로드된 리뷰 개수 확인
             current_review_count = len(driver.find_elements(*REVIEW_CONTAINER_SELECTOR))
 
             # 메인 "More reviews" 버튼 찾기
-            more_reviews_main_button = WebDriverWait(driver, 5).until(
+            more_reviews_main_button = WebDriverWait(driver, MORE_REVIEWS_BUTTON_WAIT).until(
                 EC.element_to_be_clickable(MORE_REVIEWS_MAIN_BUTTON_SELECTOR)
             )
 
             # 버튼이 보이면 클릭
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", more_reviews_main_button)
-            time.sleep(0.5)
+            time.sleep(MORE_REVIEWS_CLICK_DELAY)
             click_with_js(driver, more_reviews_main_button)
             click_count += 1
 
             # 새 리뷰가 로드될 때까지 대기
-            WebDriverWait(driver, 10).until(
-                lambda d: len(d.find_elements(*REVIEW_CONTAINER_SELECTOR)) > current_review_count
-            )
+            with tracer.span('more_reviews_round', click=click_count, reviews=current_review_count):
+                WebDriverWait(driver, MORE_REVIEWS_LOAD_WAIT).until(
+                    lambda d: len(d.find_elements(*REVIEW_CONTAINER_SELECTOR)) > current_review_count
+                )
 
             new_review_count = len(driver.find_elements(*REVIEW_CONTAINER_SELECTOR))
-            safe_print(f"      🔄 {product_name}: 'More reviews' 클릭 #{click_count} - 리뷰 {new_review_count}개로 증가")
-            time.sleep(1)
+            logger.debug(f"      🔄 {product_name}: 'More reviews' 클릭 #{click_count} - 리뷰 {new_review_count}개로 증가 (저장: {saved_count}개)")
+            tracer.sleep('page_settle', MORE_REVIEWS_SETTLE)
 
         except (TimeoutException, NoSuchElementException):
-            # 더 이상 버튼이 없으면 종료
+            # 더 이상 버튼이 없으면 종료 (마지막 클릭으로 로드된 리뷰는 아래에서 추출)
             if click_count > 0:
                 safe_print(f"      ✅ {product_name}: 모든 리뷰 로드 완료 (총 {click_count}번 클릭)")
             break
 
-    # 🔄 리뷰 수집 루프 (기존 로직)
-    review_elements = driver.find_elements(*REVIEW_CONTAINER_SELECTOR)
-    total_reviews = len(review_elements)
-    safe_print(f"      📊 {product_name}: {total_reviews}개 리뷰 처리 시작...")
-
-    for idx, review in enumerate(review_elements, 1):
-        try:
-            # "Read more" 버튼 펼치기
-            try:
-                read_more_button = review.find_element(*READ_MORE_BUTTON_SELECTOR)
-                if read_more_button.is_displayed():
-                    click_with_js(driver, read_more_button)
-                    time.sleep(0.3)
-            except NoSuchElementException:
-                pass
-
-            # 리뷰 내용 수집
-            content = safe_find_text(review, *REVIEW_CONTENT_SELECTOR, wait_time=1)
-
-            if content and content not in processed_review_texts:
-                processed_review_texts.add(content)
-
-                # 기존 정보
-                title = safe_find_text(review, *REVIEW_TITLE_SELECTOR, wait_time=1)
-
-                # 새로운 정보 수집
-                review_date = safe_find_text(review, *REVIEW_DATE_SELECTOR, wait_time=1)
-                reviewer_name = safe_find_text(review, *REVIEWER_NAME_SELECTOR, wait_time=1)
-
-                # 리뷰어 성별
-                reviewer_gender = "N/A"
-                try:
-                    gender_icon = review.find_element(*REVIEWER_GENDER_SELECTOR)
-                    icon_class = gender_icon.get_attribute('class')
-                    if 'fa-mars' in icon_class:
-                        reviewer_gender = 'M'
-                    elif 'fa-venus' in icon_class:
-                        reviewer_gender = 'F'
-                except NoSuchElementException:
-                    pass
-
-                # 리뷰어 총 리뷰 수
-                reviewer_total_reviews = "0"
-                try:
-                    reviews_text = safe_find_text(review, *REVIEWER_TOTAL_REVIEWS_SELECTOR, wait_time=1)
-                    import re
-                    match = re.search(r'(\d+)\s+Reviews?', reviews_text)
-                    if match:
-                        reviewer_total_reviews = match.group(1)
-                except:
-                    pass
-
-                # 유용성 배지
-                helpful_badge = safe_find_text(review, *HELPFUL_BADGE_SELECTOR, wait_time=1)
-
-                # 어워드 수
-                award_count = "0"
-                try:
-                    award_text = safe_find_text(review, *AWARD_COUNT_SELECTOR, wait_time=1)
-                    if award_text:
-                        award_count = award_text.strip()
-                except:
-                    pass
+    with stage_timings.time('review_extraction'):
+        extracted_count, saved = extract_new_reviews(
+            driver, product_name, product_url, extracted_count
+        )
+    saved_count += saved
 
-                reviews_batch.append({
-                    'product_name': product_name,
-                    'review_date': review_date,
-                    'reviewer_name': reviewer_name,
-                    'reviewer_gender': reviewer_gender,
-                    'reviewer_total_reviews': reviewer_total_reviews,
-                    'helpful_badge': helpful_badge,
-                    'award_count': award_count,
-                    'review_title': title,
-                    'review_content': content,
-                })
-
-                # 진행 상황 로그 (50개마다)
-                if idx % 50 == 0:
-                    safe_print(f"      ⏳ {product_name}: {idx}/{total_reviews} 리뷰 처리 중... (수집: {len(reviews_batch)}개)")
+    safe_print(f"      ✅ {product_name}: 총 {saved_count}개 리뷰 수집 완료")
+    return saved_count
 
-        except Exception as e:
-            safe_print(f"      ⚠️  {product_name}: 리뷰 #{idx} 처리 실패 - {repr(e)[:50]}")
-            continue
+SEARCH_BAR_CSS_CANDIDATES = [
+    "#s_top",
+    "input[name='q']",
+    "input[type='search']",
+    "input[placeholder*='Perfume']",
+    "input[placeholder*='Search']",
+]
+SEARCH_BUTTON_CSS_CANDIDATES = [
+    "button.btn-s-ext",
+    "button[type='submit']",
+    "form button",
+]
 
-    safe_print(f"      ✅ {product_name}: 총 {len(reviews_batch)}개 리뷰 수집 완료")
-    return reviews_batch
 
 def find_search_bar_and_button(driver, wait, keyword: str):
-    """검색창 & 버튼을 여러 방식으로 시도."""
-    search_candidates = [
-        (By.ID, "s_top"),
-        (By.CSS_SELECTOR, "input[name='q']"),
-        (By.CSS_SELECTOR, "input[type='search']"),
-        (By.CSS_SELECTOR, "input[placeholder*='Perfume']"),
-        (By.CSS_SELECTOR, "input[placeholder*='Search']"),
-    ]
-
-    search_bar = None
-    for by_, sel_ in search_candidates:
-        try:
-            search_bar = wait.until(
-                EC.element_to_be_clickable((by_, sel_))
-            )
-            break
-        except TimeoutException:
-            continue
-
-    if search_bar is None:
+    """검색창 & 버튼을 여러 방식으로 시도 (지난번 맞은 선택자 우선, 후보 전체를 한 번에 확인)."""
+    search_css, _ = selector_registry.wait_for(
+        driver, 'parfumo', 'search_bar', SEARCH_BAR_CSS_CANDIDATES, timeout=SELECTOR_WAIT_TIMEOUT
+    )
+    if search_css is None:
         raise TimeoutException("검색창을 찾지 못했습니다.")
 
+    search_bar = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, search_css)))
     search_bar.clear()
     search_bar.send_keys(keyword)
 
-    button_candidates = [
-        (By.CSS_SELECTOR, "button.btn-s-ext"),
-        (By.CSS_SELECTOR, "button[type='submit']"),
-        (By.CSS_SELECTOR, "form button"),
-    ]
-
     clicked = False
-    for by_, sel_ in button_candidates:
+    button_css, _ = selector_registry.probe(driver, 'parfumo', 'search_button', SEARCH_BUTTON_CSS_CANDIDATES)
+    if button_css:
         try:
-            btn = wait.until(
-                EC.element_to_be_clickable((by_, sel_))
-            )
+            btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, button_css)))
             click_with_js(driver, btn)
             clicked = True
-            break
         except (TimeoutException, ElementClickInterceptedException):
-            continue
+            pass
 
     if not clicked:
         search_bar.send_keys(u"\ue007")
@@ -549,18 +804,290 @@ def find_search_bar_and_button(driver, wait, keyword: str):
 # -----------------------
 # 7. URL 수집 함수
 # -----------------------
+
+# 제품 링크마다 같은 카드 안의 브랜드 텍스트를 찾음 (링크가 2개 이상 든 조상까지는 올라가지 않음)
+LISTING_CARDS_JS = """
+var links = document.querySelectorAll(arguments[0]);
+var brandSelectors = arguments[1];
+var cards = [];
+for (var i = 0; i < links.length; i++) {
+    var brand = '';
+    var node = links[i].parentElement;
+    for (var depth = 0; node && depth < 4 && !brand; depth++) {
+        if (node.querySelectorAll(arguments[0]).length > 1) break;
+        for (var j = 0; j < brandSelectors.length && !brand; j++) {
+            var b = node.querySelector(brandSelectors[j]);
+            if (b) brand = b.textContent.trim();
+        }
+        node = node.parentElement;
+    }
+    cards.push([links[i].href, brand]);
+}
+return cards;
+"""
+
+
+def _brand_tokens(text):
+    """'Acqua di Parma' / 'Acqua_di_Parma' / 'acqua-di-parma' -> ['acqua', 'di', 'parma']"""
+    return re.findall(r'[a-z0-9]+', unquote(text or '').lower())
+
+
+def _brand_prefix_match(brand, keyword):
+    """
+    브랜드가 검색어 단어들로 시작하면 True.
+    'Clean Reserve' / 'Clean_Reserve' ← 'clean', 'AcquadiParma Colonia' ← 'acqua di parma' (붙여 쓴 표기)
+    """
+    tokens = _brand_tokens(brand)
+    target = ''.join(_brand_tokens(keyword))
+    return any(''.join(tokens[:n]) == target for n in range(1, len(tokens) + 1))
+
+
+def _url_brand(url):
+    """/Perfumes/<브랜드>/<제품> → '<브랜드>' (형식이 다르면 None)"""
+    parts = [p for p in urlsplit(url).path.split('/') if p]
+    if len(parts) >= 3 and parts[0].lower() == 'perfumes':
+        return parts[1]
+    return None
+
+
+def brand_matches(url, card_brand, keyword=SEARCH_KEYWORD):
+    """
+    목록 카드가 검색 브랜드(또는 그 하위 라인/공동 브랜드)의 제품인지 판단.
+    카드 브랜드 표시나 URL(/Perfumes/<브랜드>/<제품>)의 브랜드 중 하나라도 검색어 단어들로 시작하면 통과.
+    둘 다 없으면 판단할 수 없으므로 통과.
+    """
+    url_brand = _url_brand(url)
+    if card_brand and _brand_prefix_match(card_brand, keyword):
+        return True
+    if url_brand is not None:
+        return _brand_prefix_match(url_brand, keyword)
+    return not card_brand
+
+
+# 페이지 번호 링크 중 가장 큰 숫자 = 보이는 마지막 페이지
+# (번호 목록이 현재 페이지 주변만 보여 주는 pager면 실제 페이지 수보다 작을 수 있음 → fetch_listing_pages_http에서 확인)
+PAGE_COUNT_JS = """
+var max = 1;
+document.querySelectorAll(arguments[0]).forEach(function(a) {
+    var n = parseInt(a.textContent.trim(), 10);
+    if (!isNaN(n) && n > max) max = n;
+});
+return max;
+"""
+
+
+def filter_listing_cards(cards):
+    """
+    [(href, 카드 브랜드), ...] -> (정규화 URL 리스트, 다른 브랜드라서 제외한 수)
+    제외한 제품은 브랜드별로 brand_filter_stats에 세고 (실행 끝에 출력 + RUN_METADATA_FILE), URL은 DEBUG 로그로
+    """
+    page_urls = []
+    filtered = 0
+    for href, card_brand in cards:
+        if not href:
+            continue
+        if BRAND_FILTER and not brand_matches(href, card_brand):
+            filtered += 1
+            brand_filter_stats[card_brand or _url_brand(href) or '?'] += 1
+            logger.debug(f"   🚫 다른 브랜드 제외: {href} (카드 브랜드: {card_brand or '-'})")
+            continue
+        page_urls.append(canonicalize_url(href))
+    return page_urls, filtered
+
+
+def read_listing_cards(driver):
+    """드라이버에 떠 있는 목록 페이지의 [(제품 링크, 카드 브랜드), ...]"""
+    return driver.execute_script(
+        LISTING_CARDS_JS, PRODUCT_LINK_SELECTOR[1], LISTING_BRAND_CSS_CANDIDATES
+    ) or []
+
+
+def read_listing_page(driver):
+    """드라이버에 떠 있는 목록 페이지의 (URL 리스트, 제외 수)"""
+    return filter_listing_cards(read_listing_cards(driver))
+
+
+def next_page_link(driver):
+    """드라이버에 떠 있는 목록 페이지의 다음 페이지 링크 (없으면 None)"""
+    next_buttons = driver.find_elements(*NEXT_PAGE_BUTTON_SELECTOR)
+    return (next_buttons[0].get_attribute('href') or None) if next_buttons else None
+
+
+def build_page_urls(next_page_url, page_count):
+    """
+    2페이지 링크(rel=next)에서 페이지 번호 파라미터를 찾아 2..page_count 페이지 URL 생성.
+    번호 파라미터를 못 찾으면 None (순차 탐색으로).
+    """
+    parts = urlsplit(next_page_url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    page_keys = [key for key, value in query if value == '2']
+    if len(page_keys) > 1:
+        page_keys = [key for key in page_keys if 'page' in key.lower()]
+    if len(page_keys) != 1:
+        return None
+    page_key = page_keys[0]
+    return [
+        urlunsplit(parts._replace(query=urlencode(
+            [(key, str(page) if key == page_key else value) for key, value in query]
+        )))
+        for page in range(2, page_count + 1)
+    ]
+
+
+def fetch_listing_page_http(fetcher, page_url):
+    """
+    HTTP로 목록 페이지의 ([(제품 링크, 카드 브랜드), ...], 다음 페이지 링크 또는 None) 수집.
+    실패/빈 결과면 None (드라이버로 재시도).
+    """
+    try:
+        html = fetcher.fetch(page_url)
+    except Exception as e:
+        safe_print(f"   ⚠️ HTTP 목록 요청 실패 ({page_url}): {repr(e)[:80]}")
+        return None
+    # 카드 브랜드도 드라이버 경로(LISTING_CARDS_JS)와 같은 규칙으로 읽어야 페이지마다 필터 결과가 같음
+    cards = extract_cards(html, page_url, LISTING_BRAND_CLASS, parent_class=PRODUCT_LINK_PARENT_CLASS)
+    if not cards:
+        return None
+    next_links = extract_links(html, page_url, link_class=PAGE_LINK_CLASS, rel='next')
+    return cards, (next_links[0] if next_links else None)
+
+
+def fetch_listing_pages_http(fetcher, next_page_url, page_count, known=(), fallback=None):
+    """
+    2..page_count 페이지를 HTTP로 동시에 받음 (page_count: 1페이지에 보이는 가장 큰 페이지 번호).
+    pager가 번호를 일부만 보여 주면 page_count 뒤에도 페이지가 있으므로,
+    마지막 페이지에 아직 다음 링크(rel=next)가 있으면 새 카드가 나오는 동안 순차로 이어서 받음.
+    - known: 이미 본 제품 링크 (1페이지, 같은 페이지가 반복되는 사이트에서 끝을 알아보는 용도)
+    - fallback(page_url): HTTP로 못 받은 페이지를 다시 읽는 함수 → (카드, 다음 링크) 또는 None
+    반환: [(페이지 번호, 페이지 URL, 카드 또는 None), ...] (페이지 순서), 페이지 URL을 만들 수 없으면 None
+    """
+    page_urls = build_page_urls(next_page_url, page_count)
+    if not page_urls:
+        return None
+    with ThreadPoolExecutor(max_workers=DISCOVERY_HTTP_WORKERS) as executor:
+        results = list(executor.map(lambda u: fetch_listing_page_http(fetcher, u), page_urls))
+
+    pages = []
+    seen = {canonicalize_url(href) for href in known if href}
+
+    def add(page_num, page_url, result):
+        if result is None and fallback is not None:
+            result = fallback(page_url)
+        cards, next_url = result if result is not None else (None, None)
+        pages.append((page_num, page_url, cards))
+        hrefs = {canonicalize_url(href) for href, _ in cards or () if href}
+        fresh = hrefs - seen
+        seen.update(hrefs)
+        return next_url, fresh
+
+    for page_num, (page_url, result) in enumerate(zip(page_urls, results), start=2):
+        next_url, fresh = add(page_num, page_url, result)
+
+    page_num = page_count
+    while fresh and next_url:
+        page_num += 1
+        next_url, fresh = add(page_num, next_url, fetch_listing_page_http(fetcher, next_url))
+    return pages
+
+
+def collect_listing_pages(driver, wait):
+    """
+    현재 목록 페이지부터 나머지 페이지까지 제품 URL 수집.
+    첫 페이지에서 보이는 페이지 수와 페이지 URL 형식을 읽은 뒤,
+    나머지 페이지는 HTTP로 동시에 받음 (호스트 간격 제한 적용, 실패한 페이지만 드라이버로).
+    보이는 마지막 페이지 뒤에도 페이지가 있으면 순차로 이어서 받음 (fetch_listing_pages_http).
+    페이지 URL을 만들 수 없으면 rel=next 링크를 따라 순차 탐색.
+    반환: (URL 리스트, 다른 브랜드라서 제외한 수)
+    """
+    all_product_urls = []
+    all_product_urls_set = set()
+    filtered_out = 0
+
+    def merge(page_num, page_urls, page_filtered):
+        nonlocal filtered_out
+        # 검색 결과 페이지 간 중복 제거 (순서 유지)
+        new_urls = [u for u in dict.fromkeys(page_urls) if u not in all_product_urls_set]
+        all_product_urls_set.update(new_urls)
+        all_product_urls.extend(new_urls)
+        filtered_out += page_filtered
+        print(f"📄 페이지 {page_num}: {len(new_urls)}개 신규 수집, 다른 브랜드 {page_filtered}개 제외 (누적: {len(all_product_urls)}개)")
+
+    # 1페이지 (드라이버)
+    try:
+        wait.until(EC.presence_of_element_located(PRODUCT_LINK_SELECTOR))
+        first_cards = read_listing_cards(driver)
+        merge(1, *filter_listing_cards(first_cards))
+    except TimeoutException:
+        print("⚠️  페이지 1에서 제품 링크를 찾을 수 없음")
+        return all_product_urls, filtered_out
+
+    next_page_url = next_page_link(driver)
+    if not next_page_url:
+        return all_product_urls, filtered_out
+
+    page_count = driver.execute_script(PAGE_COUNT_JS, PAGE_LINK_SELECTOR[1])
+
+    def read_with_driver(page_url):
+        # HTTP 실패 페이지는 드라이버로
+        try:
+            driver.get(page_url)
+            wait.until(EC.presence_of_element_located(PRODUCT_LINK_SELECTOR))
+        except TimeoutException:
+            return None
+        return read_listing_cards(driver), next_page_link(driver)
+
+    if DISCOVERY_HTTP and page_count > 1:
+        fetcher = HttpFetcher.from_driver(driver, rate_limiter=discovery_rate_limiter)
+        print(f"⚡ 보이는 페이지 {page_count}개 → 나머지 {page_count - 1}페이지 HTTP 동시 수집 ({DISCOVERY_HTTP_WORKERS}개)")
+        pages = fetch_listing_pages_http(
+            fetcher, next_page_url, page_count, known=[href for href, _ in first_cards], fallback=read_with_driver,
+        )
+        if pages is not None:
+            for page_num, _, cards in pages:
+                if cards is None:
+                    print(f"⚠️  페이지 {page_num}에서 제품 링크를 찾을 수 없음")
+                    continue
+                merge(page_num, *filter_listing_cards(cards))
+            if len(pages) + 1 > page_count:
+                print(f"ℹ️  페이지 번호가 {page_count}까지만 보였지만 다음 페이지가 있어 {len(pages) + 1}페이지까지 이어서 수집")
+            print(f"   (HTTP 요청 {fetcher.requests}회, 실패 {fetcher.failures}회, 간격 대기 {discovery_rate_limiter.total_wait:.1f}초)")
+            return all_product_urls, filtered_out
+
+    # 순차 탐색 (rel=next)
+    page_num = 1
+    while next_page_url:
+        driver.get(next_page_url)
+        time.sleep(1)
+        page_num += 1
+        try:
+            wait.until(EC.presence_of_element_located(PRODUCT_LINK_SELECTOR))
+            merge(page_num, *read_listing_page(driver))
+        except TimeoutException:
+            print(f"⚠️  페이지 {page_num}에서 제품 링크를 찾을 수 없음")
+
+        next_page_url = next_page_link(driver)
+
+    return all_product_urls, filtered_out
+
+
 def collect_all_product_urls():
-    """모든 검색 결과 페이지에서 제품 URL 수집."""
+    """
+    모든 목록 페이지에서 제품 URL 수집.
+    반환: (URL 리스트, 다른 브랜드라서 제외한 수 = 아낀 제품 로드 수)
+    """
     options = uc.ChromeOptions()
     options.add_argument('--no-sandbox')
+    if HEADLESS:
+        options.add_argument('--headless=new')
     options.add_argument('--disable-dev-shm-usage')
 
     driver = uc.Chrome(options=options, use_subprocess=False)
     wait = WebDriverWait(driver, 15)
     all_product_urls = []
+    filtered_out = 0
 
     try:
-        driver.get("https://www.parfumo.com/")
+        driver.get(f"{BASE_URL}/")
         time.sleep(2)
 
         # 🔄 handle_cookie_popup() 함수 사용으로 변경
@@ -569,39 +1096,24 @@ def collect_all_product_urls():
         else:
             print("ℹ️  Privacy 팝업이 없거나 이미 처리됨")
 
-        print("🔍 검색창/버튼 찾는 중...")
-        find_search_bar_and_button(driver, wait, SEARCH_KEYWORD)
-        print(f"🔍 '{SEARCH_KEYWORD}' 검색 요청 전송 완료")
-
-        page_num = 1
-        while True:
-            try:
-                wait.until(EC.presence_of_element_located(PRODUCT_LINK_SELECTOR))
-                product_link_elements = driver.find_elements(*PRODUCT_LINK_SELECTOR)
-                page_urls = [
-                    elem.get_attribute('href')
-                    for elem in product_link_elements
-                    if elem.get_attribute('href')
-                ]
-
-                all_product_urls.extend(page_urls)
-                print(f"📄 페이지 {page_num}: {len(page_urls)}개 수집 (누적: {len(all_product_urls)}개)")
-
-            except TimeoutException:
-                print(f"⚠️  페이지 {page_num}에서 제품 링크를 찾을 수 없음")
+        # 브랜드 카탈로그 페이지 (해당 브랜드 제품만 나열됨)
+        if DISCOVERY_SOURCE == 'brand_page':
+            brand_url = f"{BASE_URL}/Perfumes/{quote(SEARCH_KEYWORD.title().replace(' ', '_'))}"
+            print(f"🏷️  브랜드 페이지 시도: {brand_url}")
+            driver.get(brand_url)
+            time.sleep(2)
+            if driver.find_elements(*PRODUCT_LINK_SELECTOR):
+                all_product_urls, filtered_out = collect_listing_pages(driver, wait)
+            else:
+                print("ℹ️  브랜드 페이지에 제품 목록이 없음 → 검색으로 진행")
+                driver.get(f"{BASE_URL}/")
+                time.sleep(2)
 
-            try:
-                next_button = wait.until(
-                    EC.presence_of_element_located(NEXT_PAGE_BUTTON_SELECTOR)
-                )
-                next_page_url = next_button.get_attribute('href')
-                if not next_page_url:
-                    break
-                driver.get(next_page_url)
-                time.sleep(1)
-                page_num += 1
-            except (TimeoutException, NoSuchElementException):
-                break
+        if not all_product_urls:
+            print("🔍 검색창/버튼 찾는 중...")
+            find_search_bar_and_button(driver, wait, SEARCH_KEYWORD)
+            print(f"🔍 '{SEARCH_KEYWORD}' 검색 요청 전송 완료")
+            all_product_urls, filtered_out = collect_listing_pages(driver, wait)
 
     except Exception as e:
         print(f"❌ URL 수집 중 오류: {repr(e)}")
@@ -609,7 +1121,7 @@ def collect_all_product_urls():
     finally:
         driver.quit()
 
-    return all_product_urls
+    return all_product_urls, filtered_out
 
 
 # -----------------------
@@ -622,11 +1134,16 @@ def process_single_product(args, driver_pool):
     driver = None
     retry_count = 0
     max_retries = 3
+    stage = 'driver_pool'
+    deadline = Deadline(PRODUCT_DEADLINE)
+    stage_timings.begin_task(url)
 
     while retry_count < max_retries:
         try:
             # 풀에서 드라이버 가져오기
-            driver = driver_pool.get()
+            stage = 'driver_pool'
+            with stage_timings.time('pool_wait'):
+                driver = driver_pool.get()
 
             # 드라이버 건강 체크
             try:
@@ -639,87 +1156,96 @@ def process_single_product(args, driver_pool):
                 except:
                     pass
                 driver = driver_pool._create_driver()
+                failure_stats.record(FAILURE_SESSION)
+                failure_stats.record_restart()
 
-            driver.get(url)
-
-            # 제품 정보 스크랩
-            product_name, product_data = scrape_product_details(driver)
+            # 제품 접속 + 정보 스크랩
+            stage = 'details'
+            product_name, product_data = load_product_details(driver, url)
+            product_data['url'] = url  # CSV에는 없는 컬럼, SQLite 기본키용
             write_batch_to_csv(PERFUME_CSV_FILE, PERFUME_FIELDNAMES, [product_data])
 
             # 리뷰 스크랩
-            reviews_batch = scrape_reviews(driver, product_name)
-            if reviews_batch:
-                write_batch_to_csv(REVIEW_CSV_FILE, REVIEW_FIELDNAMES, reviews_batch)
+            stage = 'reviews'
+            # 리뷰 로딩('More reviews' 클릭/대기) 시간 = 전체에서 추출/CSV 기록을 뺀 나머지
+            with stage_timings.time('review_loading'):
+                review_count = scrape_reviews(
+                    driver, product_name, url, deadline.stage('reviews', STAGE_DEADLINES.get('reviews'))
+                )
+
+            page_metrics = None
+            if BROWSER_METRICS:
+                with stage_timings.time('browser_metrics'):
+                    page_metrics = capture_page_metrics(driver)
 
-            time.sleep(RATE_LIMIT_DELAY)
+            stage_timings.sleep('rate_limit_sleep', RATE_LIMIT_DELAY)
 
             # 성공 시 드라이버 풀에 반환
             driver_pool.put(driver)
+            stage_timings.end_task()
 
             return {
                 'status': 'success',
                 'product_name': product_name,
-                'review_count': len(reviews_batch),
+                'url': url,
+                'review_count': review_count,
+                'partial': deadline.expired_stages,
+                'page_metrics': page_metrics,
+                'elapsed': deadline.elapsed(),
                 'index': index,
                 'total': total
             }
 
-        except InvalidSessionIdException as e:
-            # 세션 오류 시 재시도
-            retry_count += 1
-            safe_print(f"      🔄 세션 오류 발생, 재시도 {retry_count}/{max_retries}")
+        except Exception as e:
+            failure = classify_failure(e, driver)
+            failure_stats.record(failure)
 
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
-                # 새 드라이버 생성
-                driver = driver_pool._create_driver()
+            if failure == FAILURE_PAGE:
+                # 페이지 오류: 드라이버는 멀쩡하므로 그대로 풀에 반환
+                recover_driver(driver_pool, driver, failure, driver_pool._create_driver, failure_stats)
+                stage_timings.end_task()
+                return {
+                    'status': 'failed',
+                    'error': repr(e)[:120],
+                    'failure': failure,
+                    'error_type': type(e).__name__,
+                    'stage': stage,
+                    'url': url,
+                    'index': index,
+                    'total': total
+                }
+
+            # 세션/브라우저 오류: 새 드라이버로 교체 후 재시도
+            retry_count += 1
+            safe_print(f"      🔄 {failure} 오류 발생, 재시도 {retry_count}/{max_retries}")
+            recover_driver(driver_pool, driver, failure, driver_pool._create_driver, failure_stats)
+            driver = None
 
             if retry_count >= max_retries:
                 # 최대 재시도 횟수 초과
-                if driver:
-                    driver_pool.put(driver)
+                stage_timings.end_task()
                 return {
                     'status': 'failed',
-                    'error': f'InvalidSessionIdException after {max_retries} retries',
+                    'error': f'{type(e).__name__} after {max_retries} retries',
+                    'failure': failure,
+                    'error_type': type(e).__name__,
+                    'stage': stage,
                     'url': url,
                     'index': index,
                     'total': total
                 }
 
-            time.sleep(5)  # 재시도 전 대기
+            stage_timings.sleep('rate_limit_sleep', 5)  # 재시도 전 대기
             continue
 
-        except Exception as e:
-            # 다른 에러 발생 시
-            if driver:
-                # 드라이버가 살아있는지 확인 후 반환
-                try:
-                    _ = driver.current_url
-                    driver_pool.put(driver)
-                except:
-                    # 죽은 드라이버는 새로 생성해서 반환
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                    new_driver = driver_pool._create_driver()
-                    driver_pool.put(new_driver)
-
-            return {
-                'status': 'failed',
-                'error': repr(e)[:120],
-                'url': url,
-                'index': index,
-                'total': total
-            }
-
-    # while 루프 종료 (여기 도달하면 안 됨)
+    # while 루프 종료 (여기 도달하면 안 됨) - main()이 실패 기록을 남길 수 있게 다른 실패와 같은 형태로 반환
+    stage_timings.end_task()
     return {
         'status': 'failed',
         'error': 'Unexpected error',
+        'failure': FAILURE_SESSION,
+        'error_type': 'RuntimeError',
+        'stage': stage,
         'url': url,
         'index': index,
         'total': total
@@ -730,35 +1256,96 @@ def process_single_product(args, driver_pool):
 # 9. 메인 실행
 # -----------------------
 
-def main():
-    """메인 실행 함수 (드라이버 풀 사용)."""
+def main(retry_failed=False, workers=None, metrics_port=None, trace_file=None, log_level=None,
+         profile_every=None, profile_mode=None, memory_every=None):
+    """
+    메인 실행 함수 (드라이버 풀 사용).
+    retry_failed=True면 실패 기록(DEAD_LETTER_FILE)의 제품만 낮은 동시성으로 다시 수집.
+    """
+    init_runtime()
     start_time = time.time()
+    max_workers = workers or (RETRY_FAILED_WORKERS if retry_failed else MAX_WORKERS)
 
     print("=" * 60)
-    print(f"🚀 향수 크롤러 시작 (드라이버 풀: {MAX_WORKERS}개)")
+    print(f"🚀 향수 크롤러 시작 (드라이버 풀: {max_workers}개)")
     print("=" * 60)
 
-    setup_csv_files()
-
-    # 1단계: URL 수집
-    print("\n[1단계] 제품 URL 수집 중...")
-    url_collection_start = time.time()
-    product_urls = collect_all_product_urls()
-    url_collection_time = time.time() - url_collection_start
-
-    if not product_urls:
-        print("❌ 수집된 제품 URL이 없습니다. 종료합니다.")
-        return
-
-    print(f"✅ 총 {len(product_urls)}개 제품 발견 (소요 시간: {url_collection_time:.1f}초)")
+    metrics_port = METRICS_PORT if metrics_port is None else metrics_port
+    if metrics_port:
+        crawl_metrics.serve(METRICS_HOST, metrics_port)
+    if log_level:
+        console.set_level(log_level)
+    trace_file = trace_file or TRACE_FILE
+    if trace_file:
+        tracer.start(trace_file)
+        print(f"🧵 실행 타임라인 기록: {trace_file}")
+    task_profiler = TaskProfiler(
+        PROFILE_EVERY if profile_every is None else profile_every, PROFILE_DIR,
+        profile_mode or PROFILE_MODE, log=safe_print,
+    )
+    memory_tracker = MemoryTracker(
+        MEMORY_SNAPSHOT_EVERY if memory_every is None else memory_every, PROFILE_DIR, MEMORY_TOP,
+    )
+    memory_tracker.start()
+    if task_profiler.every or memory_tracker.enabled:
+        print(f"🔬 프로파일링: 작업 {task_profiler.every or '-'}개마다 ({task_profiler.mode}), "
+              f"메모리 스냅샷 {memory_tracker.every or '-'}개마다 → {PROFILE_DIR}/")
+
+    if 'csv' in OUTPUT_FORMATS:
+        setup_csv_files()
+    configure_outputs(csv_writer, 'parfumo', SEARCH_KEYWORD, OUTPUT_FORMATS, {
+        PERFUME_CSV_FILE: ('perfumes', PERFUME_FIELDNAMES),
+        REVIEW_CSV_FILE: ('reviews', REVIEW_FIELDNAMES),
+    }, parquet_dir=PARQUET_OUTPUT_DIR, sqlite_path=SQLITE_DB_FILE)
+
+    if retry_failed:
+        # 실패 기록에 남은 제품만 다시 수집 (URL 수집 / 수집 이력 필터 생략)
+        product_urls = [entry['url'] for entry in dead_letters.pending('parfumo', SEARCH_KEYWORD)]
+        url_collection_time = 0.0
+        brand_filtered = 0
+        seen_skipped = 0
+        print(f"♻️  [재처리] '{DEAD_LETTER_FILE}'의 실패 제품 {len(product_urls)}개만 다시 수집합니다.")
+        if not product_urls:
+            print("🎉 재처리할 실패 기록이 없습니다. 종료합니다.")
+            return
+    else:
+        # 1단계: URL 수집
+        print("\n[1단계] 제품 URL 수집 중...")
+        url_collection_start = time.time()
+        product_urls, brand_filtered = collect_all_product_urls()
+        url_collection_time = time.time() - url_collection_start
+
+        if not product_urls:
+            print("❌ 수집된 제품 URL이 없습니다. 종료합니다.")
+            return
+
+        print(f"✅ 총 {len(product_urls)}개 제품 발견 (소요 시간: {url_collection_time:.1f}초)")
+        if BRAND_FILTER:
+            print(f"   - 다른 브랜드 제외: {brand_filtered}개 (제품 페이지 로드 생략)")
+            if brand_filter_stats:
+                top = ', '.join(f"{brand} {count}개" for brand, count in brand_filter_stats.most_common(5))
+                print(f"     (제외한 브랜드: {top}{' 외' if len(brand_filter_stats) > 5 else ''})")
+                run_metadata.set('brand_filtered', dict(brand_filter_stats.most_common()))
+
+        # 다른 키워드/이전 실행에서 이미 수집한 제품은 제외
+        seen_skipped = 0
+        if SKIP_SEEN_PRODUCTS:
+            discovered = len(product_urls)
+            product_urls = url_registry.filter_unseen(product_urls)
+            seen_skipped = discovered - len(product_urls)
+            print(f"   - 수집 이력으로 건너뜀: {seen_skipped}개 (수집 이력 {len(url_registry)}개)")
+            if not product_urls:
+                print("🎉 새로 수집할 제품이 없습니다. 종료합니다.")
+                return
 
     # 예상 시간
-    avg_time_per_product = 8
-    estimated_time_parallel = (len(product_urls) * avg_time_per_product) / MAX_WORKERS
-    print(f"\n📊 예상 소요 시간 ({MAX_WORKERS}개 병렬): 약 {estimated_time_parallel / 60:.1f}분")
+    # 지난 실행의 제품당 평균 소요 시간이 있으면 그것으로 추정
+    avg_time_per_product = previous_task_mean(TIMING_FILE, 8)
+    estimated_time_parallel = (len(product_urls) * avg_time_per_product) / max_workers
+    print(f"\n📊 예상 소요 시간 ({max_workers}개 병렬): 약 {estimated_time_parallel / 60:.1f}분")
 
     # 드라이버 풀 생성
-    driver_pool = DriverPool(size=MAX_WORKERS)
+    driver_pool = DriverPool(size=max_workers)
 
     # 2단계: 병렬 처리
     print("[2단계] 제품 스크래핑 시작 (드라이버 풀 사용)...")
@@ -767,42 +1354,93 @@ def main():
     scraping_start = time.time()
     total = len(product_urls)
 
-    tasks = [(url, i + 1, total) for i, url in enumerate(product_urls)]
+    # 작업은 필요할 때 하나씩 생성 (frontier가 꺼내 갈 때)
+    tasks = ((url, i + 1, total) for i, url in enumerate(product_urls))
 
     success_count = 0
     failed_count = 0
 
+    frontier = TaskFrontier(tasks)
+
     # ThreadPoolExecutor로 병렬 실행
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(process_single_product, task, driver_pool): task
-            for task in tasks
-        }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 진행 중인 작업은 워커당 SUBMIT_WINDOW_PER_WORKER개까지만 (나머지는 frontier에서 대기)
+        submitter = BoundedSubmitter(
+            executor, task_profiler.wrap(process_single_product), frontier, max_workers * SUBMIT_WINDOW_PER_WORKER, driver_pool
+        )
+        crawl_metrics.watch_run(total, driver_pool, submitter, frontier)
 
-        for future in as_completed(futures):
+        for future in submitter.as_completed():
             result = future.result()
 
             if result['status'] == 'success':
                 success_count += 1
+                crawl_metrics.product_done('partial' if result['partial'] else 'success', result['review_count'])
+                dead_letters.resolve('parfumo', result['url'])
+                if result['page_metrics']:
+                    run_metadata.record_page(
+                        result['url'], result['product_name'], result['page_metrics'],
+                        result['elapsed'], result['review_count'],
+                    )
+                if result['partial']:
+                    # 시간 제한으로 일부만 수집 → 수집 이력에 넣지 않아 다음 실행에서 다시 시도
+                    # (이미 저장한 리뷰는 지문으로 걸러짐)
+                    run_metadata.mark_partial(
+                        result['url'], result['product_name'], result['partial'],
+                        result['review_count'], result['elapsed'],
+                    )
+                    run_metadata.save()
+                else:
+                    url_registry.add(result['url'], 'parfumo', SEARCH_KEYWORD)
                 percentage = (result['index'] / result['total']) * 100
+                note = f" (⌛ 시간 제한: {', '.join(result['partial'])})" if result['partial'] else ""
                 if result['review_count'] > 0:
                     safe_print(
-                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 리뷰 {result['review_count']}개")
+                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 리뷰 {result['review_count']}개{note}")
                 else:
                     safe_print(
-                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 제품 정보만")
+                        f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ✅ {result['product_name']} - 제품 정보만{note}")
             else:
                 failed_count += 1
+                crawl_metrics.product_done('failed')
+                dead_letters.record(
+                    'parfumo', SEARCH_KEYWORD, result['url'], result['stage'], result['failure'],
+                    result['error_type'], result['error'], result.get('product_name', ''),
+                )
                 percentage = (result['index'] / result['total']) * 100
                 safe_print(f"[{result['index']}/{result['total']} ({percentage:.1f}%)] ❌ 처리 실패 - {result['error']}")
 
+            done_count = success_count + failed_count
+            if done_count % 10 == 0:
+                safe_print(f"   💾 writer 대기 중인 행: {csv_writer.queue_depth()}개")
+            stage_timings.maybe_dump()
+            tracer.counter('tasks', in_flight=submitter.in_flight, writer_queue=csv_writer.queue_depth())
+            for line in memory_tracker.maybe_snapshot(done_count) or ():
+                safe_print(f"   🧠 {line}")
+
     # 드라이버 풀 정리
+    console.flush()
     print("\n🔧 드라이버 풀 종료 중...")
     driver_pool.close_all()
 
+    print("💾 남은 데이터 저장 중...")
+    csv_writer.close()
+    review_store.close()
+    url_registry.close()
+    selector_registry.save()
+
     scraping_time = time.time() - scraping_start
     total_time = time.time() - start_time
 
+    run_metadata.set('counts', {'success': success_count, 'failed': failed_count})
+    run_metadata.set('workers', max_workers)
+    run_metadata.set('elapsed', {'url_collection': round(url_collection_time, 1), 'scraping': round(scraping_time, 1)})
+    run_metadata.save(finished=True)
+    stage_timings.dump()
+    crawl_metrics.stop()
+    tracer.close()
+    memory_tracker.stop()
+
     print("-" * 60)
     print("\n" + "=" * 60)
     print("✅ 모든 크롤링 완료!")
@@ -810,7 +1448,29 @@ def main():
     print(f"\n📊 통계:")
     print(f"   - 성공: {success_count}개")
     print(f"   - 실패: {failed_count}개")
+    print(f"   - 저장 행: {csv_writer.rows_written}개 (flush {csv_writer.flush_count}회, fsync {csv_writer.fsync_count}회)")
+    print(f"   - 건너뛴 중복 리뷰: {review_store.duplicates}개 (누적 지문 {len(review_store)}개)")
+    print(f"   - 최대 동시 제출 작업: {submitter.max_in_flight}개")
+    print(f"   - 실패 유형: {failure_stats.summary()}")
+    print(f"   - 부분 수집(시간 제한): {run_metadata.partial_count}개 ({RUN_METADATA_FILE})")
+    if BROWSER_METRICS:
+        page_count, means = run_metadata.page_summary()
+        averages = ', '.join(f"{key} {value}" for key, value in means.items()) or '-'
+        print(f"   - 브라우저 지표: {page_count}개 페이지 (평균 {averages})")
+    print(f"   - 실패 기록: 새로 {dead_letters.recorded}개, 재처리 성공 {dead_letters.resolved}개 ({DEAD_LETTER_FILE})")
+    for host, breaker in host_breakers.items():
+        budget = retry_budgets[host]
+        print(f"   - {host}: 브레이커 열림 {breaker.opened_count}회 (대기 {breaker.blocked_time:.0f}초), "
+              f"재시도 {budget.retries}회 / 예산 부족으로 포기 {budget.denied}회")
+    print(f"   - 건너뛴 수집 이력 제품: {seen_skipped}개")
+    for line in selector_registry.summary('parfumo'):
+        print(f"   - 선택자 적중률 {line}")
+    print(f"   - 생략한 제품 로드: {brand_filtered + seen_skipped}개 (다른 브랜드 {brand_filtered}개 + 수집 이력 {seen_skipped}개)")
     print(f"\n⏱️  소요 시간:")
+    for line in stage_timings.summary():
+        print(f"   - {line}")
+    if task_profiler.profiled:
+        print(f"   - 프로파일: {task_profiler.profiled}개 작업 ({PROFILE_DIR}/)")
     print(f"   - URL 수집: {url_collection_time:.1f}초")
     print(f"   - 제품 스크래핑: {scraping_time / 60:.1f}분")
     print(f"   - 전체: {total_time / 60:.1f}분")
@@ -823,4 +1483,26 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Parfumo 크롤러")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help=f"실패 기록({DEAD_LETTER_FILE})에 남은 제품만 다시 수집")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"동시 드라이버 수 (기본: {MAX_WORKERS}, --retry-failed 시 {RETRY_FAILED_WORKERS})")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help=f"실행 중 지표(/metrics) 포트 (기본: {METRICS_PORT}, 0이면 끔)")
+    parser.add_argument('--trace', default=None, metavar='PATH',
+                        help="워커별 단계 타임라인을 Chrome trace-event JSON으로 기록")
+    parser.add_argument('--log-level', default=None, choices=LEVELS,
+                        help=f"콘솔 출력 수준 (기본: {LOG_LEVEL}, DEBUG면 리뷰/스크롤 단위 메시지까지)")
+    parser.add_argument('--profile-every', type=int, default=None, metavar='N',
+                        help=f"N번째 제품 작업마다 프로파일을 {PROFILE_DIR}/에 저장 (기본: {PROFILE_EVERY}, 0이면 끔)")
+    parser.add_argument('--profile-mode', default=None, choices=PROFILE_MODES,
+                        help=f"프로파일 방식 (기본: {PROFILE_MODE})")
+    parser.add_argument('--memory-every', type=int, default=None, metavar='N',
+                        help=f"제품 N개마다 tracemalloc 스냅샷 비교 (기본: {MEMORY_SNAPSHOT_EVERY}, 0이면 끔)")
+    args = parser.parse_args()
+    main(
+        retry_failed=args.retry_failed, workers=args.workers, metrics_port=args.metrics_port,
+        trace_file=args.trace, log_level=args.log_level, profile_every=args.profile_every,
+        profile_mode=args.profile_mode, memory_every=args.memory_every,
+    )
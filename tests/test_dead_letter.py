@@ -0,0 +1,162 @@
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'bench'))
+from bench_extraction import load_strategy
+from crawler_common.dead_letter import DeadLetterStore
+from crawler_common.sinks import SqliteSink
+
+# -----------------------
+# 실패 기록 (dead letter) / 리뷰 전용 수집 대상 선택
+# -----------------------
+#
+# 임시 폴더의 JSONL을 다시 열어서 기록/해결 표시가 복원되는지,
+# fragrantica sub.py의 리뷰 전용 실행이 실패 기록 → SQLite(리뷰 없는 제품) → 향수 CSV 순서로
+# 출처 하나만 골라 쓰는지 확인합니다.
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+SITE = 'fragrantica'
+BRAND = 'burberry'
+
+
+def product_url(n):
+    return f"https://www.fragrantica.com/perfume/Burberry/Product-{n}-{1000 + n}.html"
+
+
+class DeadLetterStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='crawler-dead-letter-')
+        self.path = os.path.join(self.workdir, 'failed.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def record(self, store, n, site=SITE, brand=BRAND, error='TimeoutException()'):
+        store.record(site, brand, product_url(n), 'details', 'page', 'TimeoutException', error, f"Product {n}")
+
+    def test_record_survives_reopen(self):
+        store = DeadLetterStore(self.path)
+        self.record(store, 1)
+        self.record(store, 2, brand='chanel')
+        self.record(store, 3, site='parfumo')
+        self.assertEqual(store.recorded, 3)
+
+        reopened = DeadLetterStore(self.path)
+        self.assertEqual([entry['url'] for entry in reopened.pending(SITE)], [product_url(1), product_url(2)])
+        [entry] = reopened.pending(SITE, BRAND)
+        self.assertEqual(
+            {key: entry[key] for key in ('url', 'product_name', 'stage', 'failure', 'error_type')},
+            {'url': product_url(1), 'product_name': 'Product 1', 'stage': 'details',
+             'failure': 'page', 'error_type': 'TimeoutException'},
+        )
+        self.assertEqual([entry['url'] for entry in reopened.pending('parfumo')], [product_url(3)])
+
+    def test_resolve_after_successful_retry(self):
+        store = DeadLetterStore(self.path)
+        self.record(store, 1)
+        self.record(store, 2)
+
+        # --retry-failed 실행: 다시 열어서 재처리, 성공한 제품만 해결 표시
+        retry = DeadLetterStore(self.path)
+        self.assertTrue(retry.resolve(SITE, product_url(1)))
+        self.assertFalse(retry.resolve(SITE, product_url(1)))  # 이미 해결됨
+        self.assertFalse(retry.resolve(SITE, product_url(9)))  # 기록에 없던 제품
+        self.assertEqual(retry.resolved, 1)
+
+        reopened = DeadLetterStore(self.path)
+        self.assertEqual([entry['url'] for entry in reopened.pending(SITE)], [product_url(2)])
+        # 해결 표시는 append만 (파일은 기록 2 + 해결 1줄)
+        with open(self.path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[-1]['resolved'])
+
+    def test_failure_after_resolve_is_pending_again(self):
+        store = DeadLetterStore(self.path)
+        self.record(store, 1, error='first')
+        store.resolve(SITE, product_url(1))
+        self.record(store, 1, error='second')
+        [entry] = DeadLetterStore(self.path).pending(SITE)
+        self.assertEqual(entry['error'], 'second')
+
+    def test_truncated_last_line_is_ignored(self):
+        store = DeadLetterStore(self.path)
+        self.record(store, 1)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://www.fragrantica.com/perfume/cut')  # 쓰다 끊긴 줄
+        self.assertEqual(len(DeadLetterStore(self.path).pending(SITE)), 1)
+
+
+class ReviewTargetSelectionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module = load_strategy('fragrantica.sub')
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='crawler-review-targets-')
+        module = self.module
+        for name in ('dead_letters', 'PERFUME_CSV_FILE', 'SQLITE_DB_FILE'):
+            self.addCleanup(setattr, module, name, getattr(module, name))
+        module.PERFUME_CSV_FILE = os.path.join(self.workdir, 'perfumes.csv')
+        module.SQLITE_DB_FILE = os.path.join(self.workdir, 'crawl.sqlite3')
+        module.dead_letters = DeadLetterStore(os.path.join(self.workdir, 'failed_reviews.jsonl'))
+
+        # 향수 CSV: 1~4, SQLite: 1~4 중 1, 2는 리뷰 있음, 실패 기록: 4
+        products = [{'url': product_url(n), 'product_name': f"Product {n}"} for n in range(1, 5)]
+        with open(module.PERFUME_CSV_FILE, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=['url', 'product_name'])
+            writer.writeheader()
+            writer.writerows(products)
+        self.write_sqlite('perfumes', ['url', 'product_name'], products)
+        self.write_sqlite('reviews', ['product_name', 'review_content', 'reviewer_name', 'product_url'], [
+            {'product_name': f"Product {n}", 'review_content': 'nice', 'reviewer_name': 'member', 'product_url': product_url(n)}
+            for n in (1, 2)
+        ])
+        module.dead_letters.record(SITE, module.SEARCH_KEYWORD, product_url(4), 'reviews', 'page',
+                                   'TimeoutException', 'TimeoutException()', 'Product 4')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def write_sqlite(self, kind, fieldnames, rows):
+        sink = SqliteSink(self.module.SQLITE_DB_FILE, SITE, self.module.SEARCH_KEYWORD, kind, fieldnames)
+        sink.write_rows(rows)
+        sink.close()
+
+    def targets(self, retry_failed, use_sqlite):
+        return [item['url'] for item in self.module.load_review_targets(retry_failed, use_sqlite)]
+
+    def test_dead_letters_win_over_sqlite_and_csv(self):
+        self.assertEqual(self.targets(retry_failed=True, use_sqlite=True), [product_url(4)])
+        self.assertEqual(self.targets(retry_failed=True, use_sqlite=False), [product_url(4)])
+
+    def test_sqlite_wins_over_csv(self):
+        self.assertEqual(sorted(self.targets(retry_failed=False, use_sqlite=True)), [product_url(3), product_url(4)])
+
+    def test_csv_when_no_other_source(self):
+        self.assertEqual(self.targets(retry_failed=False, use_sqlite=False), [product_url(n) for n in range(1, 5)])
+
+    def test_resolved_dead_letter_not_selected_again(self):
+        # 재처리 성공 → main_review_only가 resolve → 다음 --retry-failed 실행에는 대상 없음
+        self.module.dead_letters.resolve(SITE, product_url(4))
+        self.module.dead_letters = DeadLetterStore(self.module.dead_letters.path)
+        self.assertEqual(self.targets(retry_failed=True, use_sqlite=True), [])
+
+    def test_unreadable_csv_returns_none(self):
+        os.remove(self.module.PERFUME_CSV_FILE)
+        self.assertIsNone(self.module.load_review_targets(False, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
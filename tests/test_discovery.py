@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'bench'))
+from crawler_common.discovery import compare_discovery, designer_page_urls, sitemap_urls
+from crawler_common.http_fetch import HttpFetcher
+from crawler_common.url_registry import canonicalize_url
+from replay_server import start_servers
+
+# -----------------------
+# 제품 URL 수집 방식 비교 (재생 서버)
+# -----------------------
+#
+# 디자이너 페이지 HTML / 사이트맵 수집이 기존 브라우저 스크롤 수집(collect_all_product_urls)과
+# 같은 URL 집합을 내는지 확인합니다. 브라우저 쪽은 Chrome이 없으면 건너뜀.
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+DESIGNER = 'Chanel'
+OTHER_DESIGNER = 'Dior'  # 사이트맵에 섞여 있어도 걸러지는지 확인용
+PRODUCTS = 30
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+
+def chrome_available():
+    return importlib.util.find_spec('undetected_chromedriver') is not None and any(
+        shutil.which(name) for name in CHROME_BINARIES
+    )
+
+
+class DiscoveryCrosscheckTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        base_urls, cls.servers, _ = start_servers(
+            ports={'fragrantica': 0, 'parfumo': 0}, products=PRODUCTS,
+            sitemap_designers=[OTHER_DESIGNER, DESIGNER],
+        )
+        cls.base_url = base_urls['fragrantica']
+        catalog = cls.servers[0].RequestHandlerClass.catalog
+        cls.expected = {canonicalize_url(cls.base_url + spec['path']) for spec in catalog.brand(DESIGNER)}
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.shutdown()
+            server.server_close()
+
+    def test_designer_page_matches_sitemap(self):
+        http_urls = designer_page_urls(HttpFetcher(), DESIGNER, self.base_url)
+        sitemap = sitemap_urls(HttpFetcher(), DESIGNER, self.base_url)
+        self.assertEqual(len(http_urls), PRODUCTS)
+        self.assertEqual(set(http_urls), self.expected)
+        self.assertEqual(set(sitemap), self.expected)
+
+    @unittest.skipUnless(chrome_available(), "Chrome / undetected_chromedriver 없음")
+    def test_http_matches_browser_scroll(self):
+        # 스크립트는 import 시점에 BASE_URL / HEADLESS를 읽고, init_runtime() 때 파일을 현재 폴더에 만듦
+        os.environ['FRAGRANTICA_BASE_URL'] = self.base_url
+        os.environ['CRAWLER_HEADLESS'] = '1'
+        workdir = tempfile.mkdtemp(prefix='crawler-discovery-')
+        old_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            spec = importlib.util.spec_from_file_location(
+                'discovery_fragrantica_main', os.path.join(ROOT_DIR, 'fragrantica', 'main.py')
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.console.set_level('WARNING')
+            module.init_runtime()
+
+            start_url = f"{self.base_url}/designers/{DESIGNER}.html"
+            browser_urls = module.collect_all_product_urls(start_url, max_same_rounds=2, wait_between_scrolls=0.5)
+            module.csv_writer.close()
+        finally:
+            os.chdir(old_cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        report = compare_discovery(designer_page_urls(HttpFetcher(), DESIGNER, self.base_url), browser_urls)
+        self.assertEqual(report['only_http'], [])
+        self.assertEqual(report['only_browser'], [])
+        self.assertEqual(report['common'], PRODUCTS)
+
+
+if __name__ == '__main__':
+    unittest.main()
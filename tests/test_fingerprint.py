@@ -0,0 +1,130 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+from crawler_common.fingerprint import FingerprintStore, review_fingerprint
+
+# -----------------------
+# 리뷰 지문 저장소 (FingerprintStore)
+# -----------------------
+#
+# 정렬 배열 + 최근 추가분 set 병합/조회, 다시 열었을 때 파일에서 복원되는지 확인합니다.
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+SITE = 'fragrantica'
+
+
+def review(i, product_url='https://www.fragrantica.com/perfume/Chanel/No-5-40069.html'):
+    return {
+        'product_url': product_url,
+        'reviewer_name': f"member{i}",
+        'review_date': '2024-01-01',
+        'review_content': f"review number {i}",
+    }
+
+
+class ReviewFingerprintTest(unittest.TestCase):
+
+    def test_whitespace_and_case_do_not_change_fingerprint(self):
+        row = review(1)
+        variant = dict(row, reviewer_name='  MEMBER1 ', review_content="Review\n  number   1")
+        self.assertEqual(review_fingerprint(SITE, row), review_fingerprint(SITE, variant))
+
+    def test_site_and_product_are_part_of_fingerprint(self):
+        row = review(1)
+        self.assertNotEqual(review_fingerprint(SITE, row), review_fingerprint('parfumo', row))
+        self.assertNotEqual(review_fingerprint(SITE, row), review_fingerprint(SITE, review(1, 'https://x/other')))
+
+    def test_fingerprint_is_signed_64_bit(self):
+        values = [review_fingerprint(SITE, review(i)) for i in range(200)]
+        self.assertTrue(all(-2 ** 63 <= v < 2 ** 63 for v in values))
+        self.assertTrue(any(v < 0 for v in values))
+
+
+class FingerprintStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='crawler-fingerprint-')
+        self.path = os.path.join(self.workdir, 'seen_reviews.fp')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_merge_keeps_sorted_array_and_lookups(self):
+        store = FingerprintStore(None, merge_threshold=8)
+        rng = random.Random(7)
+        values = list({rng.randrange(-2 ** 63, 2 ** 63) for _ in range(50)})
+        for value in values:
+            self.assertTrue(store.add(value))
+
+        # 8개마다 병합 → 나머지만 최근 추가분에 남음
+        self.assertEqual(len(store._base), 48)
+        self.assertEqual(len(store._recent), 2)
+        self.assertEqual(list(store._base), sorted(store._base))
+        self.assertEqual(len(store), 50)
+
+        for value in values:
+            self.assertIn(value, store)
+            self.assertFalse(store.add(value))
+        self.assertEqual(store.duplicates, 50)
+        for value in (min(values) - 1, max(values) + 1, 0):
+            self.assertNotIn(value, store)
+
+    def test_is_known_does_not_record(self):
+        store = FingerprintStore(None)
+        self.assertFalse(store.is_known(42))
+        self.assertNotIn(42, store)
+        store.add(42)
+        self.assertTrue(store.is_known(42))
+        self.assertEqual(store.duplicates, 1)
+
+    def test_persisted_rows_survive_reopen(self):
+        rows = [review(i) for i in range(20)]
+        store = FingerprintStore(self.path)
+        for row in rows:
+            store.add(review_fingerprint(SITE, row))
+        # 파일에는 writer가 쓴 행만 (persist_rows)
+        store.persist_rows(SITE, rows[:15])
+        store.fsync()
+        store.close()
+
+        reopened = FingerprintStore(self.path)
+        self.assertEqual(len(reopened), 15)
+        self.assertEqual(list(reopened._base), sorted(reopened._base))
+        for row in rows[:15]:
+            self.assertFalse(reopened.add(review_fingerprint(SITE, row)))
+        for row in rows[15:]:
+            self.assertTrue(reopened.add(review_fingerprint(SITE, row)))
+        reopened.close()
+
+    def test_truncated_tail_is_ignored_on_reopen(self):
+        rows = [review(i) for i in range(3)]
+        store = FingerprintStore(self.path)
+        store.persist_rows(SITE, rows)
+        store.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'\x01\x02\x03')  # 쓰다가 죽은 마지막 항목
+
+        reopened = FingerprintStore(self.path)
+        self.assertEqual(len(reopened), 3)
+        for row in rows:
+            self.assertIn(review_fingerprint(SITE, row), reopened)
+
+    def test_in_memory_store_writes_nothing(self):
+        store = FingerprintStore(None)
+        store.add(1)
+        store.persist_rows(SITE, [review(1)])
+        store.fsync()
+        store.close()
+        self.assertEqual(os.listdir(self.workdir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'bench'))
+from bench_extraction import load_strategy
+from crawler_common.frontier import PRIORITY_HIGH, PRIORITY_LOW, BoundedSubmitter, TaskFrontier
+from crawler_common.simulation import (
+    CrawlPolicy, CrawlSimulation, SimulatedDriver, SiteModel, VirtualExecutor, VirtualScheduler,
+)
+
+# -----------------------
+# 작업 frontier / 제한된 제출 / 대기열 재투입
+# -----------------------
+#
+# BoundedSubmitter는 VirtualExecutor + 가상 시계로 돌려서 완료 순서가 매번 같습니다.
+# 드라이버 문제로 실패한 제품을 한 번만 대기열 앞에 다시 넣는 규칙은
+# fragrantica main.py의 제품 작업을 CrawlSimulation으로 돌리고 세션 오류를 내는 드라이버를 끼워서 확인합니다.
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+
+class CountingSource:
+    """꺼내 간 작업 수를 세는 기본 작업 generator"""
+
+    def __init__(self, count):
+        self.count = count
+        self.pulled = 0
+
+    def __iter__(self):
+        for i in range(self.count):
+            self.pulled += 1
+            yield i
+
+
+class TaskFrontierTest(unittest.TestCase):
+
+    def test_pushed_high_priority_goes_before_source(self):
+        source = CountingSource(4)
+        frontier = TaskFrontier(source)
+        self.assertEqual(frontier.pop(), 0)
+        self.assertEqual(source.pulled, 1)  # 필요할 때 하나씩만
+
+        frontier.push('low', PRIORITY_LOW)
+        frontier.push('high-1')
+        frontier.push('high-2', PRIORITY_HIGH)
+        self.assertEqual(frontier.pending_pushed(), 3)
+        popped = [frontier.pop() for _ in range(7)]
+        # 높은 우선순위는 넣은 순서대로 먼저, 낮은 우선순위는 기본 작업이 끝난 뒤
+        self.assertEqual(popped, ['high-1', 'high-2', 1, 2, 3, 'low', None])
+
+    def test_requeue_once_per_key(self):
+        frontier = TaskFrontier(['b', 'c'])
+        self.assertTrue(frontier.requeue(('a', 1), 'a'))
+        self.assertFalse(frontier.requeue(('a', 2), 'a'))
+        self.assertEqual(frontier.requeued, {'a'})
+        self.assertEqual([frontier.pop() for _ in range(4)], [('a', 1), 'b', 'c', None])
+
+
+class BoundedSubmitterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = VirtualScheduler()
+        self.executor = VirtualExecutor(self.scheduler, max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def task(self, i):
+        self.scheduler.sleep(1.0 + (i % 3))
+        return i
+
+    def test_in_flight_bounded_by_window(self):
+        source = CountingSource(10)
+        frontier = TaskFrontier(source)
+        submitter = BoundedSubmitter(self.executor, self.task, frontier, 3, wait=self.executor.wait)
+        completed = []
+        for future in submitter.as_completed():
+            completed.append(future.result())
+            self.assertEqual(submitter.task_for(future), future.result())
+            # 끝난 작업 + 진행 중(window) 이상은 generator에서 꺼내지 않음
+            self.assertLessEqual(source.pulled, len(completed) + 3)
+            self.assertLessEqual(submitter.in_flight, 3)
+
+        self.assertEqual(sorted(completed), list(range(10)))
+        self.assertEqual(submitter.submitted, 10)
+        self.assertEqual(submitter.max_in_flight, 3)
+
+    def test_pushed_task_submitted_during_iteration(self):
+        frontier = TaskFrontier(range(5))
+        submitter = BoundedSubmitter(self.executor, self.task, frontier, 1, wait=self.executor.wait)
+        order = []
+        for future in submitter.as_completed():
+            order.append(future.result())
+            if future.result() == 1:
+                frontier.push(100)
+        self.assertEqual(order, [0, 1, 100, 2, 3, 4])
+
+    def test_stop_finishes_in_flight_only(self):
+        frontier = TaskFrontier(range(10))
+        submitter = BoundedSubmitter(self.executor, self.task, frontier, 2, wait=self.executor.wait)
+        completed = []
+        for future in submitter.as_completed():
+            completed.append(future.result())
+            if len(completed) == 3:
+                submitter.stop()
+        self.assertEqual(submitter.submitted, 4)
+        self.assertEqual(len(completed), 4)
+
+
+class InvalidSessionIdException(Exception):
+    """selenium의 같은 이름 예외처럼 세션 오류로 분류됨"""
+
+
+class FlakySessionDriver(SimulatedDriver):
+    """제품마다 정해진 횟수만큼 접속 때 세션 오류를 냄 (재시작한 드라이버도 같은 기록을 씀)"""
+
+    failures = {}
+    visits = []
+
+    def get(self, url):
+        if url != 'about:blank' and '#' not in url:
+            self.visits.append(url)
+            if self.failures.get(url):
+                self.failures[url] -= 1
+                raise InvalidSessionIdException("invalid session id")
+        super().get(url)
+
+
+class RequeueOnceTest(unittest.TestCase):
+
+    def test_session_failure_requeued_once_ahead_of_remaining(self):
+        module = load_strategy('fragrantica.main')
+        FlakySessionDriver.visits = []
+        simulation = CrawlSimulation(
+            module, 6, SiteModel(block_rate=0.0), CrawlPolicy(workers=1, delay_range=(1.0, 1.0)),
+            seed=1, driver_class=FlakySessionDriver,
+        )
+        urls = simulation.product_urls()
+        # 2번은 한 번만 실패 → 다시 넣은 작업이 성공, 4번은 계속 실패 → 한 번만 다시 넣고 실패 처리
+        FlakySessionDriver.failures = {urls[1]: 1, urls[3]: 5}
+        result = simulation.run()
+
+        self.assertEqual(result['requeued'], 2)
+        self.assertEqual(result['success'] + result['partial'], 5)
+        self.assertEqual(result['failed'], 1)
+        visits = FlakySessionDriver.visits
+        self.assertEqual(visits.count(urls[1]), 2)
+        self.assertEqual(visits.count(urls[3]), 2)
+        # 다시 넣은 작업은 아직 꺼내지 않은 기본 작업보다 먼저
+        window = module.SUBMIT_WINDOW_PER_WORKER
+        second_visit = len(visits) - 1 - visits[::-1].index(urls[3])
+        self.assertLess(second_visit, visits.index(urls[min(len(urls) - 1, 3 + window)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import re
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'bench'))
+from bench_extraction import load_strategy
+from crawler_common.http_fetch import HostRateLimiter, HttpFetcher, extract_links
+from crawler_common.url_registry import canonicalize_url
+from replay_server import LISTING_PAGE_SIZE, start_servers
+
+# -----------------------
+# parfumo 목록 페이지 수집 (재생 서버)
+# -----------------------
+#
+# 페이지 번호가 현재 페이지 앞뒤 몇 개만 보이는 pager(pager_window)에서도
+# fetch_listing_pages_http가 보이는 마지막 페이지 뒤까지 rel=next를 따라 모든 페이지를 받는지 확인합니다.
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+BRAND = 'Chanel'
+PRODUCTS = LISTING_PAGE_SIZE * 5 + 10  # 6페이지 (마지막 페이지는 덜 참)
+
+
+def local_fetcher():
+    # 로컬 서버라 호스트 간격 제한 없이
+    return HttpFetcher(rate_limiter=HostRateLimiter(min_interval=0))
+
+
+class ListingPagesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        base_urls, cls.servers, _ = start_servers(ports={'fragrantica': 0, 'parfumo': 0}, products=PRODUCTS)
+        cls.base_url = base_urls['parfumo']
+        cls.config = cls.servers[1].RequestHandlerClass.config
+        catalog = cls.servers[1].RequestHandlerClass.catalog
+        cls.expected = {canonicalize_url(cls.base_url + spec['path']) for spec in catalog.brand(BRAND)}
+        cls.module = load_strategy('parfumo.main')
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.shutdown()
+            server.server_close()
+
+    def setUp(self):
+        self.config['pager_window'] = 0
+        self.addCleanup(self.config.update, {'pager_window': 0})
+
+    def collect(self):
+        """1페이지를 읽고 (보이는 페이지 수, 나머지 페이지 결과, 전체 제품 URL 집합)"""
+        fetcher = local_fetcher()
+        first_url = f"{self.base_url}/Perfumes/{BRAND}"
+        html = fetcher.fetch(first_url)
+        cards, next_page_url = self.module.fetch_listing_page_http(fetcher, first_url)
+        # 드라이버 쪽 PAGE_COUNT_JS와 같은 규칙: 페이지 번호 링크 중 가장 큰 숫자
+        page_count = max(int(n) for n in re.findall(r'class="paging_links"[^>]*>(\d+)</a>', html))
+        self.assertEqual(next_page_url, extract_links(html, first_url, link_class='paging_links', rel='next')[0])
+
+        pages = self.module.fetch_listing_pages_http(
+            fetcher, next_page_url, page_count, known=[href for href, _ in cards]
+        )
+        urls = {canonicalize_url(href) for href, _ in cards}
+        for _, _, page_cards in pages:
+            urls.update(canonicalize_url(href) for href, _ in page_cards)
+        return page_count, pages, urls
+
+    def test_full_pager(self):
+        page_count, pages, urls = self.collect()
+        self.assertEqual(page_count, 6)
+        self.assertEqual([page_num for page_num, _, _ in pages], [2, 3, 4, 5, 6])
+        self.assertEqual(urls, self.expected)
+
+    def test_windowed_pager_continues_past_last_visible_page(self):
+        self.config['pager_window'] = 1
+        page_count, pages, urls = self.collect()
+        # 1페이지에는 1, 2만 보임 → 3~6페이지는 rel=next를 따라 이어서 받아야 함
+        self.assertEqual(page_count, 2)
+        self.assertEqual([page_num for page_num, _, _ in pages], [2, 3, 4, 5, 6])
+        self.assertTrue(all(page_cards for _, _, page_cards in pages))
+        self.assertEqual(len(urls), PRODUCTS)
+        self.assertEqual(urls, self.expected)
+
+    def test_failed_page_goes_to_fallback(self):
+        fallback_calls = []
+
+        def fallback(page_url):
+            fallback_calls.append(page_url)
+            return None
+
+        fetcher = local_fetcher()
+        pages = self.module.fetch_listing_pages_http(
+            fetcher, f"{self.base_url}/Perfumes/{BRAND}?current_page=2", 3, fallback=fallback,
+        )
+        self.assertEqual(fallback_calls, [])
+        self.assertEqual([page_num for page_num, _, _ in pages], [2, 3, 4, 5, 6])
+
+        # 없는 브랜드 경로 → 빈 목록이라 모든 페이지가 fallback으로
+        pages = self.module.fetch_listing_pages_http(
+            fetcher, f"{self.base_url}/Nothing/{BRAND}?current_page=2", 3, fallback=fallback,
+        )
+        self.assertEqual(len(fallback_calls), 2)
+        self.assertEqual([cards for _, _, cards in pages], [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
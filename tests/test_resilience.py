@@ -0,0 +1,218 @@
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+from crawler_common.recovery import FAILURE_SESSION
+from crawler_common.resilience import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, RetryBudget, guarded_call,
+)
+from crawler_common.simulation import VirtualExecutor, VirtualScheduler
+
+# -----------------------
+# 재시도 예산 / 서킷 브레이커 / guarded_call
+# -----------------------
+#
+# 시간은 모두 가상 시계(VirtualScheduler)로 흐르게 해서 결과가 매번 같습니다.
+# 여러 워커가 동시에 브레이커를 기다리는 경우는 VirtualExecutor로 실행 (한 번에 한 스레드만 진행).
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+
+class PageError(Exception):
+    pass
+
+
+def always_fail(attempt):
+    raise PageError(attempt)
+
+
+def open_breaker(scheduler, **kwargs):
+    """최근 결과 4개가 모두 실패해서 열린 브레이커 (cooldown 10초)"""
+    options = dict(window=4, min_calls=4, failure_rate=0.5, cooldown=10.0, max_cooldown=35.0)
+    options.update(kwargs)
+    breaker = CircuitBreaker(clock=scheduler, sleep=scheduler.sleep, **options)
+    for _ in range(options['min_calls']):
+        breaker.record_failure()
+    return breaker
+
+
+def run_all(executor, futures):
+    pending = set(futures)
+    while pending:
+        _, pending = executor.wait(pending)
+    executor.shutdown()
+    return [future.result() for future in futures]
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = VirtualScheduler()
+
+    def test_opens_only_after_min_calls_at_failure_rate(self):
+        breaker = CircuitBreaker(window=4, min_calls=4, failure_rate=0.5, clock=self.scheduler, sleep=self.scheduler.sleep)
+        for _ in range(3):
+            breaker.record_failure()
+        self.assertEqual(breaker.state, STATE_CLOSED)  # min_calls 전에는 판단하지 않음
+        breaker.record_success()  # 실패율은 실패가 기록될 때만 확인
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        breaker.record_failure()  # 최근 4개 중 실패 3개
+        self.assertEqual(breaker.state, STATE_OPEN)
+        self.assertEqual(breaker.opened_count, 1)
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = open_breaker(self.scheduler)
+        executor = VirtualExecutor(self.scheduler, max_workers=3)
+        log = []
+
+        def worker(name):
+            breaker.acquire()
+            log.append((name, self.scheduler(), breaker.state))
+            self.scheduler.sleep(5.0)  # 요청 시간
+            breaker.record_success()
+            return self.scheduler()
+
+        finished = run_all(executor, [executor.submit(worker, name) for name in ('a', 'b', 'c')])
+
+        # cooldown이 끝난 10초에 시험 요청 하나만 반열림 상태로 통과
+        self.assertEqual(log[0], ('a', 10.0, STATE_HALF_OPEN))
+        # 나머지는 시험 요청이 성공해서 닫힌 뒤에야 통과
+        for name, at, state in log[1:]:
+            self.assertGreaterEqual(at, finished[0])
+            self.assertEqual(state, STATE_CLOSED)
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        self.assertEqual(breaker.opened_count, 1)
+
+    def test_failed_probe_doubles_cooldown_up_to_max(self):
+        breaker = open_breaker(self.scheduler)
+        opened_at = []
+        for _ in range(4):
+            breaker.acquire()
+            self.assertEqual(breaker.state, STATE_HALF_OPEN)
+            opened_at.append(self.scheduler())
+            breaker.record_failure()
+        # 10초 → 20초 → 35초(max_cooldown) → 35초
+        gaps = [b - a for a, b in zip(opened_at, opened_at[1:])]
+        self.assertEqual(opened_at[0], 10.0)
+        self.assertEqual(gaps, [20.0, 35.0, 35.0])
+        self.assertEqual(breaker.opened_count, 5)
+        self.assertEqual(breaker.blocked_time, self.scheduler())
+
+        # 시험 성공 → 닫히고 cooldown은 처음 값으로
+        breaker.acquire()
+        breaker.record_success()
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        for _ in range(4):
+            breaker.record_failure()
+        started = self.scheduler()
+        breaker.acquire()
+        self.assertEqual(self.scheduler() - started, 10.0)
+
+    def test_release_returns_probe_without_result(self):
+        breaker = open_breaker(self.scheduler)
+        executor = VirtualExecutor(self.scheduler, max_workers=2)
+        log = []
+
+        def worker(name, result):
+            breaker.acquire()
+            log.append((name, self.scheduler()))
+            self.scheduler.sleep(2.0)
+            getattr(breaker, result)()
+
+        run_all(executor, [executor.submit(worker, 'a', 'release'), executor.submit(worker, 'b', 'record_success')])
+        # a가 결과 없이 반납 → b가 다음 시험 요청 (여전히 반열림에서 한 번에 하나)
+        self.assertEqual(log[0], ('a', 10.0))
+        self.assertEqual(log[1][0], 'b')
+        self.assertGreaterEqual(log[1][1], 12.0)
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        self.assertEqual(breaker.opened_count, 1)
+
+
+class RetryBudgetTest(unittest.TestCase):
+
+    def test_withdraw_denied_when_tokens_run_out(self):
+        budget = RetryBudget(ratio=0.5, initial_tokens=1.0, max_tokens=2.0)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        self.assertEqual((budget.retries, budget.denied), (1, 1))
+
+        # 정상 요청 2번 = 재시도 1번
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+        self.assertEqual((budget.retries, budget.denied), (2, 2))
+
+    def test_tokens_capped(self):
+        budget = RetryBudget(ratio=0.5, initial_tokens=0.0, max_tokens=2.0)
+        for _ in range(100):
+            budget.deposit()
+        self.assertEqual(budget.tokens, 2.0)
+        self.assertEqual(sum(budget.withdraw() for _ in range(5)), 2)
+
+
+class GuardedCallTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = VirtualScheduler()
+        self.breaker = CircuitBreaker(window=10, min_calls=10, clock=self.scheduler, sleep=self.scheduler.sleep)
+        self.sleeps = []
+
+    def call(self, attempt_fn, budget, **kwargs):
+        return guarded_call(self.breaker, budget, attempt_fn, sleep=self.sleeps.append, **kwargs)
+
+    def test_page_failures_retried_with_backoff(self):
+        attempts = []
+
+        def attempt(n):
+            attempts.append(n)
+            if n < 2:
+                raise PageError("element not found")
+            return 'ok'
+
+        budget = RetryBudget(initial_tokens=5.0)
+        self.assertEqual(self.call(attempt, budget, backoff_base=2.0, backoff_max=3.0), 'ok')
+        self.assertEqual(attempts, [0, 1, 2])
+        self.assertEqual(self.sleeps, [2.0, 3.0])
+        self.assertEqual(budget.retries, 2)
+        self.assertEqual(list(self.breaker._results), [False, False, True])
+
+    def test_denied_budget_stops_retrying(self):
+        budget = RetryBudget(initial_tokens=0.0)
+        with self.assertRaises(PageError):
+            self.call(always_fail, budget)
+        self.assertEqual(self.sleeps, [])
+        self.assertEqual(budget.denied, 1)
+
+    def test_last_attempt_error_is_raised(self):
+        budget = RetryBudget(initial_tokens=5.0)
+        with self.assertRaises(PageError) as raised:
+            self.call(always_fail, budget, max_attempts=3)
+        self.assertEqual(raised.exception.args, (2,))
+        self.assertEqual(budget.retries, 2)
+
+    def test_session_failure_not_counted_against_site(self):
+        budget = RetryBudget(initial_tokens=5.0)
+        self.breaker = open_breaker(self.scheduler, window=2, min_calls=1)
+        attempts = []
+
+        def attempt(n):
+            attempts.append(n)
+            raise PageError("invalid session id")
+
+        with self.assertRaises(PageError):
+            self.call(attempt, budget, classify=lambda e: FAILURE_SESSION)
+        # 재시도 없음, 브레이커에는 결과 없이 시험 권한만 반납 (열리지 않고 반열림 그대로)
+        self.assertEqual(attempts, [0])
+        self.assertEqual(budget.retries, 0)
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+        self.assertEqual(self.breaker.opened_count, 1)
+        self.breaker.acquire()
+        self.assertEqual(self.scheduler(), 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+from crawler_common.fingerprint import review_fingerprint
+from crawler_common.sinks import ParquetSink, SqliteSink, products_missing_reviews
+
+# -----------------------
+# 출력 대상 (Parquet / SQLite)
+# -----------------------
+#
+# 임시 폴더에 쓰고 닫은 뒤 다시 열어서 확인합니다. Parquet은 pyarrow가 없으면 건너뜀.
+# SQLite는 리뷰 지문(부호 있는 64비트) 기준 upsert라 같은 행을 다시 써도 늘어나지 않아야 함
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+REVIEW_FIELDNAMES = ['product_name', 'review_content', 'review_date', 'reviewer_name', 'product_url']
+PERFUME_FIELDNAMES = ['url', 'product_name', 'brand_name', 'top_notes']
+
+
+def review_row(i, product_url='https://example.com/p/1'):
+    return {
+        'product_name': 'Product',
+        'review_content': f"review {i}",
+        'review_date': '2024-01-01',
+        'reviewer_name': f"member{i}",
+        'product_url': product_url,
+    }
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow') is not None, "pyarrow 없음")
+class ParquetSinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='crawler-sinks-')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_parts_opened_in_same_second_do_not_collide(self):
+        import pyarrow.parquet as pq
+
+        first = ParquetSink(self.root, 'fragrantica', 'Chanel', 'reviews', REVIEW_FIELDNAMES)
+        second = ParquetSink(self.root, 'fragrantica', 'Chanel', 'reviews', REVIEW_FIELDNAMES)
+        self.assertNotEqual(first.filename, second.filename)
+        self.assertIn(f"-{os.getpid()}-", os.path.basename(first.filename))
+
+        first.write_rows([review_row(1), review_row(2)])
+        second.write_rows([review_row(3)])
+        first.close()
+        second.close()
+
+        # close()의 이름 바꾸기가 앞 part를 덮어쓰지 않음
+        self.assertEqual(pq.read_table(first.filename).num_rows, 2)
+        self.assertEqual(pq.read_table(second.filename).num_rows, 1)
+        leftovers = [name for name in os.listdir(os.path.dirname(first.filename)) if name.endswith('.inprogress')]
+        self.assertEqual(leftovers, [])
+
+
+class SqliteSinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='crawler-sqlite-')
+        self.db_path = os.path.join(self.workdir, 'crawl.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def write(self, kind, fieldnames, rows):
+        sink = SqliteSink(self.db_path, 'fragrantica', 'Chanel', kind, fieldnames)
+        sink.write_rows(rows)
+        sink.flush()
+        sink.close()
+
+    def query(self, sql, params=()):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return list(conn.execute(sql, params))
+        finally:
+            conn.close()
+
+    def test_review_upsert_is_idempotent_across_reopen(self):
+        # 부호 있는 64비트 지문이 음수/양수 모두 나오도록 충분히
+        rows = [review_row(i) for i in range(40)]
+        fingerprints = sorted(review_fingerprint('fragrantica', row) for row in rows)
+        self.assertTrue(fingerprints[0] < 0 < fingerprints[-1])
+
+        self.write('reviews', REVIEW_FIELDNAMES, rows)
+        self.write('reviews', REVIEW_FIELDNAMES, rows + rows[:5])  # 재실행 + 같은 묶음 안 중복
+
+        stored = self.query('SELECT fingerprint FROM "fragrantica_reviews" ORDER BY fingerprint')
+        self.assertEqual([fp for (fp,) in stored], fingerprints)
+        self.assertEqual(
+            self.query('SELECT typeof(fingerprint) FROM "fragrantica_reviews" GROUP BY 1'), [('integer',)]
+        )
+
+    def test_review_upsert_updates_non_key_columns(self):
+        row = review_row(1)
+        self.write('reviews', REVIEW_FIELDNAMES, [row])
+        # 지문에 들어가지 않는 컬럼(product_name)이 바뀌면 같은 행을 갱신
+        self.write('reviews', REVIEW_FIELDNAMES, [dict(row, product_name='Renamed')])
+        self.assertEqual(
+            self.query('SELECT fingerprint, product_name, brand FROM "fragrantica_reviews"'),
+            [(review_fingerprint('fragrantica', row), 'Renamed', 'chanel')],
+        )
+
+    def test_perfume_upsert_by_url_and_missing_reviews(self):
+        perfumes = [
+            {'url': 'https://example.com/p/1', 'product_name': 'One', 'brand_name': 'Chanel', 'top_notes': 'a'},
+            {'url': 'https://example.com/p/2', 'product_name': 'Two', 'brand_name': 'Chanel', 'top_notes': 'b'},
+        ]
+        self.write('perfumes', PERFUME_FIELDNAMES, perfumes)
+        self.write('perfumes', PERFUME_FIELDNAMES, [dict(perfumes[0], top_notes='changed')])
+        self.assertEqual(
+            self.query('SELECT url, top_notes FROM "fragrantica_perfumes" ORDER BY url'),
+            [('https://example.com/p/1', 'changed'), ('https://example.com/p/2', 'b')],
+        )
+
+        self.assertEqual(len(products_missing_reviews(self.db_path, 'fragrantica', 'Chanel')), 2)
+        self.write('reviews', REVIEW_FIELDNAMES, [review_row(1, 'https://example.com/p/1')])
+        self.assertEqual(
+            products_missing_reviews(self.db_path, 'fragrantica', 'Chanel'), [('https://example.com/p/2', 'Two')]
+        )
+
+    def test_new_fieldnames_add_columns_to_existing_table(self):
+        self.write('reviews', REVIEW_FIELDNAMES, [review_row(1)])
+        self.write('reviews', REVIEW_FIELDNAMES + ['reviewer_total_reviews'],
+                   [dict(review_row(2), reviewer_total_reviews='12')])
+        self.assertEqual(
+            self.query('SELECT reviewer_total_reviews FROM "fragrantica_reviews" ORDER BY reviewer_name'),
+            [(None,), ('12',)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+from crawler_common.url_registry import BloomFilter, SeenUrlRegistry, canonicalize_url
+
+# -----------------------
+# URL 정규화 / Bloom filter / 수집 이력
+# -----------------------
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+PRODUCT_URL = 'https://www.fragrantica.com/perfume/Chanel/No-5-40069.html'
+
+
+class CanonicalizeUrlTest(unittest.TestCase):
+
+    def test_fragment_removed(self):
+        self.assertEqual(canonicalize_url(PRODUCT_URL + '#all-reviews'), PRODUCT_URL)
+
+    def test_scheme_and_host_lowercased_path_kept(self):
+        self.assertEqual(
+            canonicalize_url('HTTPS://WWW.Fragrantica.COM/perfume/Chanel/No-5-40069.html'), PRODUCT_URL
+        )
+        # 경로는 대소문자를 구분하는 사이트가 있으므로 그대로
+        self.assertNotEqual(canonicalize_url(PRODUCT_URL.lower()), PRODUCT_URL)
+
+    def test_trailing_slash_and_index_removed(self):
+        self.assertEqual(canonicalize_url('https://x.com/perfume/a/'), 'https://x.com/perfume/a')
+        self.assertEqual(canonicalize_url('https://x.com/perfume/a/index.html'), 'https://x.com/perfume/a')
+        self.assertEqual(canonicalize_url('https://x.com/perfume/a/index.php'), 'https://x.com/perfume/a')
+        # 루트는 '/' 유지
+        self.assertEqual(canonicalize_url('https://x.com/'), 'https://x.com/')
+        self.assertEqual(canonicalize_url('https://x.com'), 'https://x.com/')
+
+    def test_query_sorted_and_noise_removed(self):
+        expected = 'https://x.com/p?a=1&b=2'
+        self.assertEqual(canonicalize_url('https://x.com/p?b=2&a=1'), expected)
+        self.assertEqual(canonicalize_url('https://x.com/p?utm_source=mail&b=2&page=3&a=1&fbclid=z'), expected)
+        self.assertEqual(canonicalize_url('https://x.com/p?UTM_Campaign=x'), 'https://x.com/p')
+        self.assertEqual(canonicalize_url('https://x.com/p?a='), 'https://x.com/p?a=')
+
+    def test_default_port_removed_other_port_kept(self):
+        self.assertEqual(canonicalize_url('https://x.com:443/p'), 'https://x.com/p')
+        self.assertEqual(canonicalize_url('http://x.com:80/p'), 'http://x.com/p')
+        self.assertEqual(canonicalize_url('http://127.0.0.1:8765/p/'), 'http://127.0.0.1:8765/p')
+
+    def test_idempotent_and_empty(self):
+        once = canonicalize_url('HTTPS://X.com/P/?b=2&a=1#top')
+        self.assertEqual(canonicalize_url(once), once)
+        self.assertEqual(canonicalize_url(''), '')
+        self.assertIsNone(canonicalize_url(None))
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        keys = [f"{PRODUCT_URL}?id={i}" for i in range(5000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertEqual(bloom.count, 5000)
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate_near_configured(self):
+        for error_rate in (0.01, 0.001):
+            bloom = BloomFilter(capacity=10000, error_rate=error_rate)
+            for i in range(10000):
+                bloom.add(f"seen-{i}")
+            trials = 100000
+            hits = sum(f"other-{i}" in bloom for i in range(trials))
+            # 정원(capacity)만큼 채웠을 때 설정 오탐률 근처 (해시 고정이라 결과도 고정)
+            self.assertLess(hits / trials, error_rate * 1.5, error_rate)
+
+    def test_size_follows_capacity(self):
+        small = BloomFilter(capacity=1000, error_rate=0.01)
+        large = BloomFilter(capacity=100000, error_rate=0.01)
+        self.assertGreater(large.size_bytes, small.size_bytes * 50)
+        self.assertEqual(small.num_hashes, 7)
+
+
+class SeenUrlRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='crawler-seen-')
+        self.path = os.path.join(self.workdir, 'seen_urls.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_add_is_canonical_and_survives_reopen(self):
+        registry = SeenUrlRegistry(self.path, capacity=1000)
+        self.assertTrue(registry.add(PRODUCT_URL + '#all-reviews', 'fragrantica', 'chanel'))
+        self.assertFalse(registry.add(PRODUCT_URL.replace('https://www.', 'HTTPS://WWW.')))
+        self.assertIn(PRODUCT_URL + '?utm_source=x', registry)
+        registry.close()
+
+        reopened = SeenUrlRegistry(self.path, capacity=1000)
+        self.assertEqual(len(reopened), 1)
+        self.assertIn(PRODUCT_URL, reopened)
+        self.assertNotIn(PRODUCT_URL.replace('40069', '40070'), reopened)
+        reopened.close()
+
+    def test_filter_unseen_dedupes_and_keeps_order(self):
+        registry = SeenUrlRegistry(self.path, capacity=1000)
+        registry.add('https://x.com/p/2')
+        unseen = registry.filter_unseen([
+            'https://x.com/p/3', 'https://x.com/p/2/', 'https://x.com/p/1#r', 'https://X.com/p/3',
+        ])
+        self.assertEqual(unseen, ['https://x.com/p/3', 'https://x.com/p/1'])
+        registry.close()
+
+    def test_bloom_hit_is_confirmed_in_database(self):
+        registry = SeenUrlRegistry(self.path, capacity=1000)
+        # Bloom filter에만 있는 키 → DB 확인 후 오탐으로 처리
+        registry._bloom.add(canonicalize_url('https://x.com/only-in-bloom'))
+        self.assertNotIn('https://x.com/only-in-bloom', registry)
+        self.assertNotIn('https://x.com/never-added', registry)
+        stats = registry.stats()
+        self.assertEqual(stats['false_positives'], 1)
+        self.assertEqual(stats['exact_lookups'], 1)
+        self.assertEqual(stats['bloom_negatives'], 1)
+        registry.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import csv
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, ROOT_DIR)
+from crawler_common.fingerprint import FingerprintStore, review_fingerprint
+from crawler_common.writer import AsyncWriter, CsvSink
+
+# -----------------------
+# 비동기 writer (AsyncWriter)
+# -----------------------
+#
+# 임시 폴더에 쓰고 writer를 닫은 뒤 파일/지문 저장소를 다시 열어서 확인합니다.
+# - flush listener는 행이 출력 파일에 들어간 뒤에만 호출 (리뷰 지문 저장이 여기에 의존)
+# - 출력 대상이 없는 key는 submit()에서 ValueError, writer 스레드에서 발견하면 rows_dropped로 집계
+#
+# 사용법: python -m pytest tests   (또는 python -m unittest discover tests)
+
+SITE = 'fragrantica'
+FIELDNAMES = ['product_name', 'review_content', 'review_date', 'reviewer_name', 'product_url']
+
+
+def review_rows(start, count):
+    return [{
+        'product_name': 'Product',
+        'review_content': f"review {i}",
+        'review_date': '2024-01-01',
+        'reviewer_name': f"member{i}",
+        'product_url': 'https://www.fragrantica.com/perfume/Chanel/No-5-40069.html',
+    } for i in range(start, start + count)]
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+
+class FailingSink:
+    """항상 쓰기에 실패하는 출력 대상"""
+
+    filename = 'failing'
+
+    def write_rows(self, rows):
+        raise OSError("disk full")
+
+    def flush(self):
+        pass
+
+    def fsync(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class AsyncWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='crawler-writer-')
+        self.csv_path = os.path.join(self.workdir, 'reviews.csv')
+        self.fp_path = os.path.join(self.workdir, 'seen_reviews.fp')
+        # 의도한 실패의 오류 로그는 숨김
+        self._log_level = logging.getLogger('crawler_common.writer').level
+        logging.getLogger('crawler_common.writer').setLevel(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.getLogger('crawler_common.writer').setLevel(self._log_level)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def writer(self, **kwargs):
+        writer = AsyncWriter(**dict({'flush_rows': 5, 'flush_interval': 60.0, 'fsync_interval': None}, **kwargs))
+        self.addCleanup(writer.close, 5.0)
+        return writer
+
+    def test_flush_listener_runs_after_rows_are_on_disk(self):
+        writer = self.writer()
+        writer.add_sink(self.csv_path, CsvSink(self.csv_path, FIELDNAMES))
+        seen_on_disk = []
+        notified = []
+
+        def on_flush(rows):
+            # 알림 시점에 그 행들이 이미 파일에 있어야 함
+            on_disk = {row['review_content'] for row in read_csv(self.csv_path)}
+            seen_on_disk.append(all(row['review_content'] in on_disk for row in rows))
+            notified.extend(rows)
+
+        writer.add_flush_listener(self.csv_path, on_flush)
+        writer.submit(self.csv_path, review_rows(0, 5))
+        writer.submit(self.csv_path, review_rows(5, 3))
+        writer.close()
+
+        self.assertEqual(len(notified), 8)
+        self.assertTrue(seen_on_disk and all(seen_on_disk))
+        self.assertEqual(writer.rows_written, 8)
+        self.assertEqual(len(read_csv(self.csv_path)), 8)
+
+    def test_fsync_listener_runs_after_sink_fsync(self):
+        order = []
+        sink = CsvSink(self.csv_path, FIELDNAMES)
+        original_fsync = sink.fsync
+
+        def fsync():
+            original_fsync()
+            order.append('sink')
+
+        sink.fsync = fsync
+        writer = self.writer(fsync_interval=0)
+        writer.add_sink(self.csv_path, sink)
+        writer.add_flush_listener(self.csv_path, lambda rows: order.append('flush'), lambda: order.append('fsync'))
+        writer.submit(self.csv_path, review_rows(0, 5))
+        writer.close()
+
+        self.assertEqual(order[:3], ['flush', 'sink', 'fsync'])
+
+    def test_fingerprints_persisted_only_for_written_rows(self):
+        good_path = self.csv_path
+        bad_key = os.path.join(self.workdir, 'broken.csv')
+        store = FingerprintStore(self.fp_path)
+        writer = self.writer()
+        writer.add_sink(good_path, CsvSink(good_path, FIELDNAMES))
+        writer.add_sink(bad_key, CsvSink(bad_key, FIELDNAMES))
+        writer.add_sink(bad_key, FailingSink())
+        for key in (good_path, bad_key):
+            writer.add_flush_listener(key, lambda rows: store.persist_rows(SITE, rows), store.fsync)
+
+        written, lost = review_rows(0, 5), review_rows(100, 5)
+        for rows in (written, lost):
+            for row in rows:
+                store.add(review_fingerprint(SITE, row))
+        writer.submit(good_path, written)
+        writer.submit(bad_key, lost)
+        writer.close()
+        store.close()
+        self.assertGreaterEqual(writer.errors, 1)
+
+        # 다시 열면 실제로 기록된 묶음의 지문만 남아 있음 → 실패한 묶음은 다음 실행에서 다시 수집됨
+        reopened = FingerprintStore(self.fp_path)
+        self.assertEqual(len(reopened), 5)
+        for row in written:
+            self.assertIn(review_fingerprint(SITE, row), reopened)
+        for row in lost:
+            self.assertNotIn(review_fingerprint(SITE, row), reopened)
+
+    def test_submit_without_sink_raises(self):
+        writer = self.writer()
+        nowhere = os.path.join(self.workdir, 'nowhere.csv')
+        with self.assertRaises(ValueError):
+            writer.submit(nowhere, review_rows(0, 1))
+        # 빈 묶음은 검사 없이 무시
+        writer.submit(nowhere, [])
+        writer.close()
+        self.assertEqual(writer.stats()['rows_written'], 0)
+        self.assertFalse(os.path.exists(nowhere))
+
+    def test_fieldnames_create_csv_sink(self):
+        writer = self.writer()
+        writer.submit(self.csv_path, review_rows(0, 2), fieldnames=FIELDNAMES)
+        writer.close()
+        self.assertEqual([row['reviewer_name'] for row in read_csv(self.csv_path)], ['member0', 'member1'])
+
+    def test_rows_without_sink_in_writer_thread_are_counted_as_dropped(self):
+        writer = self.writer()
+        writer.add_sink(self.csv_path, CsvSink(self.csv_path, FIELDNAMES))
+        # submit() 검사 뒤에 대상이 사라진 경우 (writer 스레드에 직접 넣음)
+        writer._queue.put(('vanished.csv', review_rows(0, 4), None))
+        writer.submit(self.csv_path, review_rows(4, 2))
+        writer.close()
+
+        stats = writer.stats()
+        self.assertEqual(stats['rows_dropped'], 4)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['rows_written'], 2)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(len(read_csv(self.csv_path)), 2)
+
+    def test_reopened_csv_appends_without_second_header(self):
+        for start in (0, 3):
+            writer = self.writer()
+            writer.submit(self.csv_path, review_rows(start, 3), fieldnames=FIELDNAMES)
+            writer.close()
+        rows = read_csv(self.csv_path)
+        self.assertEqual([row['reviewer_name'] for row in rows], [f"member{i}" for i in range(6)])
+
+    def test_submit_from_many_threads(self):
+        writer = self.writer(flush_rows=50)
+        writer.add_sink(self.csv_path, CsvSink(self.csv_path, FIELDNAMES))
+        threads = [
+            threading.Thread(target=lambda n=n: [writer.submit(self.csv_path, review_rows(n * 100 + i, 1))
+                                                 for i in range(25)])
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+        self.assertEqual(len(read_csv(self.csv_path)), 100)
+        self.assertEqual(writer.rows_written, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()